@@ -28,17 +28,27 @@ import psutil
 import urwid
 
 from s_tui.builtin_stresser import (
+    ROTATE_PERIOD,
     STRATEGIES,
     STRATEGY_LABELS,
     get_default_strategy,
     strategy_available,
 )
+from s_tui.placement import (
+    PLACEMENT_HELP,
+    PLACEMENT_NONE,
+    format_cpu_list,
+    parse_placement,
+    placement_cpus,
+)
 
 
 class BuiltinStressMenu:
     MAX_TITLE_LEN = 50
 
-    def __init__(self, return_fn: Callable[[], None]) -> None:
+    def __init__(
+        self, return_fn: Callable[[], None], placement: str = PLACEMENT_NONE
+    ) -> None:
         self.return_fn = return_fn
 
         self.num_workers = "1"
@@ -50,8 +60,20 @@ class BuiltinStressMenu:
 
         self.strategy = get_default_strategy()
         self._pending_strategy = self.strategy
+        # Utilisation of every worker in percent
+        self.load = "100"
+        # Seconds each workload of the rotate strategy runs
+        self.rotate = str(round(ROTATE_PERIOD))
 
         self.num_workers_ctrl = urwid.Edit("CPU worker count: ", self.num_workers)
+        self.load_ctrl = urwid.Edit("Load per worker [%]: ", self.load)
+        self.rotate_ctrl = urwid.Edit("Rotate every [s]: ", self.rotate)
+        self.placement = placement
+        self.placement_ctrl = urwid.Edit("Placement: ", self.placement)
+        self.placement_view = urwid.Text("")
+        urwid.connect_signal(self.num_workers_ctrl, "postchange", self._show_placement)
+        urwid.connect_signal(self.placement_ctrl, "postchange", self._show_placement)
+        self._show_placement()
 
         # Strategy radio buttons
         self._strategy_group: list[urwid.RadioButton] = []
@@ -87,9 +109,14 @@ class BuiltinStressMenu:
         self.titles = [
             title,
             self.num_workers_ctrl,
+            self.load_ctrl,
+            self.placement_ctrl,
+            urwid.Text(PLACEMENT_HELP),
+            self.placement_view,
             urwid.Divider("-"),
             urwid.Text(("bold text", "Strategy:")),
             *strategy_widgets,
+            self.rotate_ctrl,
             urwid.Divider("-"),
             if_buttons,
         ]
@@ -102,6 +129,21 @@ class BuiltinStressMenu:
         if state:
             self._pending_strategy = key
 
+    def _show_placement(self, *_: object) -> None:
+        """Previews the CPUs the workers of the edited settings would use"""
+        try:
+            cpus = placement_cpus(self.placement_ctrl.get_edit_text())
+        except ValueError as err:
+            self.placement_view.set_text(("high temp txt", str(err)))
+            return
+        if not cpus:
+            self.placement_view.set_text("Workers are not pinned")
+            return
+        raw = self.num_workers_ctrl.get_edit_text()
+        workers = int(raw) if re.match(r"\A[0-9]+\Z", raw) else len(cpus)
+        used = [cpus[worker % len(cpus)] for worker in range(workers)]
+        self.placement_view.set_text("Workers on CPUs " + format_cpu_list(used))
+
     def get_size(self) -> tuple[int, int]:
         return len(self.titles) + 5, self.MAX_TITLE_LEN
 
@@ -112,6 +154,24 @@ class BuiltinStressMenu:
         except ValueError:
             return 1
 
+    def get_duty(self) -> float:
+        """Return the configured load as a duty level from 0.01 to 1.0."""
+        try:
+            return min(max(int(self.load), 1), 100) / 100
+        except ValueError:
+            return 1.0
+
+    def get_rotate_period(self) -> float:
+        """Return the seconds each workload of the rotate strategy runs."""
+        try:
+            return max(int(self.rotate), 1)
+        except ValueError:
+            return ROTATE_PERIOD
+
+    def get_placement(self) -> str:
+        """Return the CPU placement policy of the workers."""
+        return self.placement
+
     def get_strategy(self) -> str:
         """Return the selected strategy key."""
         return self.strategy
@@ -119,12 +179,18 @@ class BuiltinStressMenu:
     def _restore_ui(self) -> None:
         """Reset UI controls to match committed state."""
         self.num_workers_ctrl.set_edit_text(self.num_workers)
+        self.load_ctrl.set_edit_text(self.load)
+        self.rotate_ctrl.set_edit_text(self.rotate)
+        self.placement_ctrl.set_edit_text(self.placement)
         self._strategy_buttons[self.strategy].set_state(True)
         self._pending_strategy = self.strategy
 
     def on_default(self, _) -> None:
         self.num_workers = str(psutil.cpu_count() or 1)
         self.strategy = get_default_strategy()
+        self.load = "100"
+        self.rotate = str(round(ROTATE_PERIOD))
+        self.placement = PLACEMENT_NONE
         self._restore_ui()
         self.return_fn()
 
@@ -134,6 +200,22 @@ class BuiltinStressMenu:
             self.num_workers = raw
         else:
             self.num_workers = str(psutil.cpu_count() or 1)
+        raw = self.load_ctrl.get_edit_text()
+        if re.match(r"\A[0-9]+\Z", raw) and 0 < int(raw) <= 100:
+            self.load = raw
+        else:
+            self.load = "100"
+        raw = self.rotate_ctrl.get_edit_text()
+        if re.match(r"\A[0-9]+\Z", raw) and int(raw) > 0:
+            self.rotate = raw
+        else:
+            self.rotate = str(round(ROTATE_PERIOD))
+        try:
+            placement = parse_placement(self.placement_ctrl.get_edit_text())
+            placement_cpus(placement)
+            self.placement = placement
+        except ValueError as err:
+            logging.info("Keeping placement %s: %s", self.placement, err)
         self.strategy = self._pending_strategy
         self._restore_ui()
         self.return_fn()
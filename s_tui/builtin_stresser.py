@@ -18,22 +18,63 @@
 
 """Built-in Python CPU stresser using multiprocessing.
 
-Provides a zero-external-dependency CPU stress test. Two workload strategies
-are available, selectable at runtime:
+Provides a zero-external-dependency CPU stress test. These workload
+strategies are available, selectable at runtime:
 
 1. numpy FP burn — mixed FMA/sqrt/sin on L2-resident arrays for maximum
    sustained thermal output without triggering AVX-512 frequency penalties.
 2. hashlib SHA-256 — stdlib fallback; tight C-backed loop on 64KB blocks.
+3. L1 integer — integer add/xor on a working set of half the L1 data cache.
+4. L3 stream — copy and triad on half of the worker's share of the L3.
+5. DRAM stream — copy and triad on several times the L3, so every pass
+   goes to memory and loads the memory controller and uncore.
+6. scalar integer — modular exponentiation of 1024-bit numbers, digit by
+   digit multiplies and divides that do not vectorize.
+7. unpredictable branches — sorting random data, every comparison is a
+   coin flip for the branch predictor.
+8. SIMD float32 — multiply-add on wide float32 vectors, which draws the
+   most power per core and may lower the frequency licence (AVX).
+9. rotate — cycles through the instruction mixes on a timer, so one run
+   shows how power and frequency respond to each of them.
+
+The memory workloads are sized from the caches in sysfs and use numpy
+when available, memory copies and integer arithmetic otherwise.
+
+The workers are forked once and then parked on a shared control block.
+Starting, stopping, changing the strategy or the load only flips values
+in shared memory, so it takes effect within milliseconds instead of
+paying process start-up, imports and allocations on every load step.
+Workers can run below 100% with a busy/sleep duty cycle.
+
+Every worker counts its completed work steps in a shared counter of its
+own, so the throughput lost to throttling can be measured.  The memory
+workloads also count the bytes they move, giving the bandwidth in GB/s.
 """
 
 from __future__ import annotations
 
+import glob
 import hashlib
 import logging
-from multiprocessing import Event, Process
+import math
+import os
+import random
+import re
+import time
+from collections.abc import Callable
+from multiprocessing import Event, Process, RawValue
 from typing import TYPE_CHECKING
 
+from s_tui.helper_functions import cat
+from s_tui.placement import (
+    PLACEMENT_NONE,
+    assign_cpus,
+    parse_cpu_list,
+    parse_placement,
+)
+
 if TYPE_CHECKING:
+    from ctypes import c_double, c_int, c_uint64
     from multiprocessing.synchronize import Event as EventType
 
 try:
@@ -45,13 +86,90 @@ except ImportError:
 
 STRATEGY_NUMPY = "numpy"
 STRATEGY_HASHLIB = "hashlib"
-STRATEGIES = [STRATEGY_NUMPY, STRATEGY_HASHLIB]
+STRATEGY_L1 = "l1"
+STRATEGY_L3 = "l3"
+STRATEGY_DRAM = "dram"
+STRATEGY_INT = "int"
+STRATEGY_BRANCH = "branch"
+STRATEGY_SIMD = "simd"
+STRATEGY_ROTATE = "rotate"
+STRATEGIES = [
+    STRATEGY_NUMPY,
+    STRATEGY_HASHLIB,
+    STRATEGY_L1,
+    STRATEGY_L3,
+    STRATEGY_DRAM,
+    STRATEGY_INT,
+    STRATEGY_BRANCH,
+    STRATEGY_SIMD,
+    STRATEGY_ROTATE,
+]
 
 STRATEGY_LABELS = {
     STRATEGY_NUMPY: "numpy FP burn",
     STRATEGY_HASHLIB: "hashlib SHA-256",
+    STRATEGY_L1: "L1 integer",
+    STRATEGY_L3: "L3 copy/triad",
+    STRATEGY_DRAM: "DRAM copy/triad",
+    STRATEGY_INT: "scalar integer",
+    STRATEGY_BRANCH: "unpredictable branches",
+    STRATEGY_SIMD: "SIMD float32",
+    STRATEGY_ROTATE: "rotate instruction mixes",
 }
 
+# Workloads the rotate strategy cycles through, unavailable ones are skipped
+ROTATION = [
+    STRATEGY_INT,
+    STRATEGY_BRANCH,
+    STRATEGY_SIMD,
+    STRATEGY_NUMPY,
+    STRATEGY_HASHLIB,
+]
+# Seconds each workload of the rotation runs by default
+ROTATE_PERIOD = 30.0
+
+# Length of one busy/sleep cycle in seconds.  A work step takes about a
+# millisecond, which gives a load resolution of about 1%.
+DUTY_PERIOD = 0.1
+
+SYSFS_CACHES = "/sys/devices/system/cpu/cpu0/cache/index[0-9]*/"
+# Cache sizes per CPU where sysfs does not describe them
+DEFAULT_CACHE_SIZES = {1: 32 << 10, 2: 1 << 20, 3: 8 << 20}
+# Bytes one step of a streaming workload walks through
+STREAM_CHUNK = 4 << 20
+# Bounds of the DRAM working set of one worker
+DRAM_MIN = 64 << 20
+DRAM_MAX = 512 << 20
+
+
+def parse_cache_size(text: str) -> int:
+    """Parses a sysfs cache size such as "48K" into bytes."""
+    match = re.match(r"\A\s*([0-9]+)\s*([KMG]?)\s*\Z", text.upper())
+    if not match:
+        raise ValueError("Invalid cache size: " + text)
+    return int(match.group(1)) << {"": 0, "K": 10, "M": 20, "G": 30}[match.group(2)]
+
+
+def read_cache_sizes() -> dict[int, int]:
+    """Return the data cache size per level, as a share of one CPU.
+
+    A cache shared by several CPUs (e.g. the L3 of a package) is divided
+    among them, which is the working set one worker per CPU may use.
+    Levels missing from sysfs get a typical size.
+    """
+    sizes = dict(DEFAULT_CACHE_SIZES)
+    for path in glob.glob(SYSFS_CACHES):
+        try:
+            if cat(path + "type", binary=False) == "Instruction":
+                continue
+            level = int(cat(path + "level", binary=False))
+            size = parse_cache_size(cat(path + "size", binary=False))
+            shared = len(parse_cpu_list(cat(path + "shared_cpu_list", binary=False)))
+        except (OSError, ValueError):
+            continue
+        sizes[level] = size // max(shared, 1)
+    return sizes
+
 
 def get_default_strategy() -> str:
     """Return the best available strategy key."""
@@ -60,13 +178,65 @@ def get_default_strategy() -> str:
 
 def strategy_available(strategy: str) -> bool:
     """Return True if the given strategy can actually run."""
-    if strategy == STRATEGY_NUMPY:
+    if strategy in (STRATEGY_NUMPY, STRATEGY_SIMD):
         return _HAS_NUMPY
-    return True
+    return strategy in STRATEGIES
+
+
+def rotation_workloads() -> list[str]:
+    """Return the workloads the rotate strategy runs, in order."""
+    return [key for key in ROTATION if strategy_available(key)]
+
 
+def rotation_slot(elapsed: float, period: float) -> tuple[str, float]:
+    """Return the rotation workload *elapsed* seconds into a run.
 
-def _worker_numpy(stop_event: EventType) -> None:
-    """CPU-intensive worker using mixed numpy FP operations.
+    Also returns when, in seconds into the run, the workload ends.
+    """
+    workloads = rotation_workloads()
+    slot = int(elapsed // period)
+    return workloads[slot % len(workloads)], (slot + 1) * period
+
+
+def clamp_duty(duty: float) -> float:
+    """Limit a duty level to the 0.0 to 1.0 range."""
+    return min(max(float(duty), 0.0), 1.0)
+
+
+def _run_duty_cycle(
+    running: Callable[[], bool],
+    duty: c_double | None,
+    step: Callable[[], int | None],
+    counters: _WorkerCounters | None = None,
+) -> None:
+    """Run *step* for the *duty* share of every period, sleep the rest.
+
+    Returns as soon as *running* turns false, which is checked after
+    every step.  *duty* is read once per period without a lock; a torn
+    read is impossible for an aligned double and a stale one lasts one
+    period.  Every finished step is counted in *counters*, along with the
+    bytes it returns as moved; the worker is their only writer, so they
+    need no lock either.
+    """
+    while running():
+        start = time.monotonic()
+        level = 1.0 if duty is None else duty.value
+        busy_until = start + level * DUTY_PERIOD
+        while time.monotonic() < busy_until:
+            moved = step()
+            if counters is not None:
+                counters.ops.value += 1
+                if moved:
+                    counters.traffic.value += moved
+            if not running():
+                return
+        idle = start + DUTY_PERIOD - time.monotonic()
+        if idle > 0:
+            time.sleep(idle)
+
+
+def _numpy_step() -> Callable[[], None]:
+    """CPU-intensive step using mixed numpy FP operations.
 
     Uses a combination of multiply, sqrt, add, and sin on arrays sized
     to stay resident in L2 cache.  This mix of instruction types keeps
@@ -82,75 +252,433 @@ def _worker_numpy(stop_event: EventType) -> None:
     a = np.random.random(size) + 1.0
     b = np.random.random(size) + 1.0
     out = np.empty(size, dtype=np.float64)
-    while not stop_event.is_set():
+
+    def step() -> None:
         np.multiply(a, b, out=out)
         np.sqrt(out, out=out)
         np.add(out, a, out=out)
         np.sin(out, out=out)
 
+    return step
+
 
-def _worker_hashlib(stop_event: EventType) -> None:
-    """CPU-intensive worker using SHA-256 hashing."""
+def _hashlib_step() -> Callable[[], None]:
+    """CPU-intensive step using SHA-256 hashing."""
     block = b"\x00" * 65536  # 64KB
-    while not stop_event.is_set():
+
+    def step() -> None:
         hashlib.sha256(block).digest()
 
+    return step
+
+
+def _l1_step() -> Callable[[], int]:
+    """Integer add/xor on half of the L1 data cache, returns bytes touched."""
+    working_set = read_cache_sizes()[1] // 2
+    # Every operation reads two operands and writes one
+    ops = 64
+    traffic = ops * 3 * (working_set // 2)
+    if _HAS_NUMPY:
+        import numpy as np  # pyright: ignore[reportMissingImports]
+
+        a = np.arange(working_set // 8, dtype=np.int32)
+        b = np.full_like(a, 0x9E3779B9 & 0x7FFFFFFF)
+
+        def step() -> int:
+            for _ in range(ops // 2):
+                np.add(a, b, out=a)
+                np.bitwise_xor(a, b, out=a)
+            return traffic
+
+        return step
+
+    # One big integer per operand, CPython adds them digit by digit
+    bits = working_set // 2 * 8
+    mask = (1 << bits) - 1
+    value = int.from_bytes(os.urandom(working_set // 2), "little")
+    key = int.from_bytes(os.urandom(working_set // 2), "little")
+
+    def int_step() -> int:
+        nonlocal value
+        for _ in range(ops // 2):
+            value = ((value + key) & mask) ^ key
+        return traffic
+
+    return int_step
+
+
+def _stream_step(working_set: int) -> Callable[[], int]:
+    """Copy and triad over *working_set* bytes, one chunk per step.
+
+    Walking the whole working set chunk by chunk keeps a step short, so
+    the duty cycle and a stop stay responsive even for DRAM sized sets.
+    Returns the bytes moved, counted like STREAM does.
+    """
+    if _HAS_NUMPY:
+        import numpy as np  # pyright: ignore[reportMissingImports]
+
+        # Three float64 arrays.  The triad factor keeps the values
+        # bounded, away from infinities and denormals.
+        size = max(working_set // 24, 1)
+        a = np.zeros(size)
+        b = np.ones(size)
+        c = np.ones(size)
+        chunk = max(min(size, STREAM_CHUNK // 24), 1)
+        position = 0
+
+        def step() -> int:
+            nonlocal position
+            end = min(position + chunk, size)
+            sa, sb, sc = a[position:end], b[position:end], c[position:end]
+            np.copyto(sc, sa)  # c = a
+            np.multiply(sc, 0.5, out=sa)  # a = b + s*c
+            np.add(sa, sb, out=sa)
+            # 16 bytes per element copied, 24 per element of the triad
+            moved = 40 * (end - position)
+            position = 0 if end == size else end
+            return moved
+
+        return step
+
+    # Without numpy the copy alone still streams through memory
+    size = max(working_set // 2, 1)
+    # Filled, so the source is not backed by the shared zero page
+    src = memoryview(bytearray(b"\x5a") * size)
+    dst = memoryview(bytearray(size))
+    chunk = max(min(size, STREAM_CHUNK // 2), 1)
+    position = 0
+
+    def copy_step() -> int:
+        nonlocal position
+        end = min(position + chunk, size)
+        dst[position:end] = src[position:end]
+        moved = 2 * (end - position)
+        position = 0 if end == size else end
+        return moved
+
+    return copy_step
+
+
+def _l3_step() -> Callable[[], int]:
+    """Copy and triad on half of this CPU's share of the L3."""
+    return _stream_step(read_cache_sizes()[3] // 2)
+
+
+def _dram_step() -> Callable[[], int]:
+    """Copy and triad on four times this CPU's share of the L3.
+
+    With a worker on every CPU that shares the L3, the working sets add
+    up to four times its size, so nearly every access misses.
+    """
+    working_set = min(max(4 * read_cache_sizes()[3], DRAM_MIN), DRAM_MAX)
+    return _stream_step(working_set)
+
+
+def _int_step() -> Callable[[], None]:
+    """Scalar integer step: modular exponentiation of 1024-bit numbers.
+
+    CPython multiplies and reduces big integers digit by digit, a chain
+    of dependent integer multiplies, adds and divides that compilers do
+    not vectorize.
+    """
+    rng = random.Random(0x5EED)
+    modulus = rng.getrandbits(1024) | (1 << 1023) | 1
+    base = rng.getrandbits(1022)
+    exponent = rng.getrandbits(64)
+
+    def step() -> None:
+        pow(base, exponent, modulus)
+
+    return step
+
+
+def _branch_step() -> Callable[[], None]:
+    """Branch heavy step: sorting random floats.
+
+    Whether two random values are in order is a coin flip, so about half
+    of the comparisons of the sort are mispredicted.  Cycling through a
+    few data sets keeps the predictor from learning the sequence.
+    """
+    rng = random.Random(0xB7A)
+    data_sets = [[rng.random() for _ in range(2048)] for _ in range(8)]
+    position = 0
+
+    def step() -> None:
+        nonlocal position
+        sorted(data_sets[position])
+        position = (position + 1) % len(data_sets)
+
+    return step
+
+
+def _simd_step() -> Callable[[], None]:
+    """Wide SIMD step: float32 multiply-add on L2-resident vectors.
+
+    numpy runs float32 arithmetic on the widest vector unit of the CPU,
+    8 or 16 lanes per instruction.  The values converge to 1.0, so they
+    never overflow or turn denormal.
+    """
+    import numpy as np  # pyright: ignore[reportMissingImports]
+
+    # Three float32 vectors in half of the L2
+    size = max(read_cache_sizes()[2] // 24, 1024)
+    scale = np.full(size, 0.999, dtype=np.float32)
+    offset = np.full(size, 0.001, dtype=np.float32)
+    out = np.zeros(size, dtype=np.float32)
+
+    def step() -> None:
+        for _ in range(8):
+            np.multiply(out, scale, out=out)
+            np.add(out, offset, out=out)
+
+    return step
+
+
+_STEP_FACTORIES: dict[str, Callable[[], Callable[[], int | None]]] = {
+    STRATEGY_NUMPY: _numpy_step,
+    STRATEGY_HASHLIB: _hashlib_step,
+    STRATEGY_L1: _l1_step,
+    STRATEGY_L3: _l3_step,
+    STRATEGY_DRAM: _dram_step,
+    STRATEGY_INT: _int_step,
+    STRATEGY_BRANCH: _branch_step,
+    STRATEGY_SIMD: _simd_step,
+}
+
+# Workloads too large to keep allocated in every parked worker.  They
+# are set up when they start and freed when they stop.
+_LAZY_STRATEGIES = {STRATEGY_L3, STRATEGY_DRAM}
+
+
+class _PoolControl:
+    """Shared memory the parked workers of a pool follow."""
+
+    def __init__(self) -> None:
+        self.shutdown = Event()
+        # Index into STRATEGIES of the running workload
+        self.strategy: c_int = RawValue("i", 0)
+        self.duty: c_double = RawValue("d", 1.0)
+        # Monotonic time the run started, the rotation counts from it
+        self.started: c_double = RawValue("d", 0.0)
+        self.rotate_period: c_double = RawValue("d", ROTATE_PERIOD)
+
+
+class _WorkerCounters:
+    """Shared counters of one worker, written only by that worker."""
+
+    def __init__(self) -> None:
+        # Work steps completed since the worker was forked
+        self.ops: c_uint64 = RawValue("Q", 0)
+        # Bytes moved by the memory workloads
+        self.traffic: c_uint64 = RawValue("Q", 0)
+
+
+def _pool_worker(
+    control: _PoolControl, go: EventType, counters: _WorkerCounters
+) -> None:
+    """Runs the workload of *control* while *go* is set, parks otherwise.
+
+    Every available workload but the lazy ones is imported and allocated
+    up front, so a parked worker starts or switches strategy without any
+    set-up.
+    """
+    steps = {
+        key: factory()
+        for key, factory in _STEP_FACTORIES.items()
+        if strategy_available(key) and key not in _LAZY_STRATEGIES
+    }
+    while True:
+        go.wait()
+        if control.shutdown.is_set():
+            return
+        code = control.strategy.value
+        key = STRATEGIES[code]
+        until = math.inf
+        if key == STRATEGY_ROTATE:
+            started = control.started.value
+            key, end = rotation_slot(
+                time.monotonic() - started, control.rotate_period.value
+            )
+            until = started + end
+        step = steps.get(key) or _STEP_FACTORIES[key]()
+        _run_duty_cycle(
+            lambda code=code, until=until: (
+                go.is_set()
+                and control.strategy.value == code
+                and not control.shutdown.is_set()
+                and time.monotonic() < until
+            ),
+            control.duty,
+            step,
+            counters,
+        )
+        # A lazy workload is freed while the worker is parked
+        del step
+
 
 class BuiltinStresser:
-    """Manages CPU stress worker processes.
+    """Manages a pool of CPU stress worker processes.
 
-    Uses multiprocessing.Event for clean shutdown signaling and a graduated
-    teardown (join → terminate → kill) to ensure workers are cleaned up.
+    Workers are forked on first use (or by prefork) and parked between
+    runs.  A stop only parks them; close tears the pool down with a
+    graduated teardown (join → terminate → kill).
     """
 
     def __init__(self) -> None:
-        self._stop_event: EventType | None = None
+        self._control: _PoolControl | None = None
         self._workers: list[Process] = []
+        # One event per worker, set while the worker should run
+        self._go: list[EventType] = []
+        self._counters: list[_WorkerCounters] = []
+        # Target utilisation of every worker, 1.0 is full load
+        self.duty = 1.0
+        # Placement policy of the next start, see s_tui.placement
+        self.placement = PLACEMENT_NONE
+        # Strategy of the current or last run
+        self.strategy: str | None = None
+        # Seconds every workload of the rotate strategy runs
+        self.rotate_period = ROTATE_PERIOD
+        # CPU each running worker is pinned to, None when unpinned
+        self.worker_cpus: list[int | None] = []
+        self._all_cpus: set[int] = set()
 
-    def start(self, num_workers: int, strategy: str | None = None) -> None:
-        """Spawn *num_workers* CPU stress worker processes.
+    def set_placement(self, policy: str) -> None:
+        """Set the placement policy used by the next start.
 
-        *strategy* selects the workload: ``STRATEGY_NUMPY`` or
-        ``STRATEGY_HASHLIB``.  Falls back to hashlib if the requested
-        strategy is unavailable.
+        Raises ValueError for a malformed policy.
         """
-        if strategy is None:
-            strategy = get_default_strategy()
-        if not strategy_available(strategy):
-            logging.warning(
-                "Strategy %s unavailable, falling back to hashlib", strategy
-            )
-            strategy = STRATEGY_HASHLIB
+        self.placement = parse_placement(policy)
+
+    def set_rotate_period(self, period: float) -> None:
+        """Set how long each workload of the rotation runs, live as well.
 
-        worker_fn = _worker_numpy if strategy == STRATEGY_NUMPY else _worker_hashlib
+        Raises ValueError for a period that is not positive.
+        """
+        if not period > 0:
+            raise ValueError("Invalid rotate period: " + str(period))
+        self.rotate_period = float(period)
+        if self._control is not None:
+            self._control.rotate_period.value = self.rotate_period
 
-        self.stop()  # clean up any previous run
-        self._stop_event = Event()
+    def current_workload(self) -> str | None:
+        """Return the workload the workers run now, None when stopped.
+
+        For the rotate strategy this is the workload of the rotation.
+        """
+        if self._control is None or self.strategy is None or not self.is_running():
+            return None
+        if self.strategy != STRATEGY_ROTATE:
+            return self.strategy
+        elapsed = time.monotonic() - self._control.started.value
+        return rotation_slot(elapsed, self.rotate_period)[0]
+
+    def set_duty(self, duty: float) -> None:
+        """Set the utilisation of the workers, live if they are running."""
+        self.duty = clamp_duty(duty)
+        if self._control is not None:
+            self._control.duty.value = self.duty
+
+    def prefork(self, num_workers: int) -> None:
+        """Grow the pool of parked workers to *num_workers*."""
+        if self._control is None:
+            self._control = _PoolControl()
+            self._control.duty.value = self.duty
+            self._all_cpus = os.sched_getaffinity(0)
+        added = 0
         try:
-            for _ in range(num_workers):
-                p = Process(target=worker_fn, args=(self._stop_event,), daemon=True)
+            while len(self._workers) < num_workers:
+                go = Event()
+                counters = _WorkerCounters()
+                p = Process(
+                    target=_pool_worker,
+                    args=(self._control, go, counters),
+                    daemon=True,
+                )
                 p.start()
                 self._workers.append(p)
+                self._go.append(go)
+                self._counters.append(counters)
+                added += 1
         except OSError:
             logging.exception(
-                "Failed to start all built-in stress workers; cleaning up %d "
-                "already-started workers",
+                "Failed to fork all built-in stress workers; closing %d "
+                "already-forked workers",
                 len(self._workers),
             )
-            self.stop()
+            self.close()
             raise
+        if added:
+            logging.info("Built-in stresser forked %d parked workers", added)
+
+    def start(self, num_workers: int, strategy: str | None = None) -> None:
+        """Run *num_workers* CPU stress workers of the pool.
+
+        *strategy* selects the workload, one of ``STRATEGIES``.  Falls back to hashlib if the requested
+        strategy is unavailable.  Workers beyond *num_workers* are parked.
+        """
+        if strategy is None:
+            strategy = get_default_strategy()
+        if not strategy_available(strategy):
+            logging.warning(
+                "Strategy %s unavailable, falling back to hashlib", strategy
+            )
+            strategy = STRATEGY_HASHLIB
+
+        self.stop()  # park any previous run
+        self.prefork(num_workers)
+        assert self._control is not None
+        self.strategy = strategy
+        self._control.strategy.value = STRATEGIES.index(strategy)
+        self._control.duty.value = self.duty
+        self._control.rotate_period.value = self.rotate_period
+        self._control.started.value = time.monotonic()
+        for p, cpu in zip(self._workers, assign_cpus(self.placement, num_workers)):
+            self.worker_cpus.append(self._pin(p, cpu))
+        for go in self._go[:num_workers]:
+            go.set()
         logging.info(
-            "Built-in stresser started %d workers (strategy: %s)",
+            "Built-in stresser started %d workers (strategy: %s, load: %d%%, "
+            "placement: %s)",
             num_workers,
             STRATEGY_LABELS.get(strategy, strategy),
+            round(self.duty * 100),
+            self.placement,
         )
 
+    def _pin(self, process: Process, cpu: int | None) -> int | None:
+        """Pin a worker to *cpu*, returns the CPU it is pinned to.
+
+        Unpinned workers get back every CPU, as they may have been pinned
+        by the previous run.
+        """
+        if process.pid is None:
+            return None
+        try:
+            os.sched_setaffinity(process.pid, self._all_cpus if cpu is None else {cpu})
+        except OSError as err:
+            if cpu is not None:
+                logging.warning("Unable to pin stress worker to CPU %d: %s", cpu, err)
+            return None
+        return cpu
+
     def stop(self, timeout: int = 3) -> None:
-        """Graduated teardown: signal → join → terminate → kill."""
-        if not self._workers:
+        """Park all workers, they stop working within one work step.
+
+        *timeout* is accepted for compatibility, parking does not wait.
+        """
+        if not any(go.is_set() for go in self._go):
             return
-        if self._stop_event is not None:
-            self._stop_event.set()
+        for go in self._go:
+            go.clear()
+        self.worker_cpus.clear()
+        logging.info("Built-in stresser stopped")
+
+    def close(self, timeout: int = 3) -> None:
+        """Graduated teardown of the pool: signal → join → terminate → kill."""
+        if self._control is not None:
+            self._control.shutdown.set()
+        for go in self._go:
+            go.set()
         for p in self._workers:
             p.join(timeout=timeout)
         for p in self._workers:
@@ -164,9 +692,28 @@ class BuiltinStresser:
                 p.kill()
         for p in self._workers:
             p.join(timeout=1)
+        if self._workers:
+            logging.info("Built-in stresser closed")
         self._workers.clear()
-        logging.info("Built-in stresser stopped")
+        self._go.clear()
+        self._counters.clear()
+        self.worker_cpus.clear()
+        self._control = None
+
+    def get_ops(self) -> list[int]:
+        """Return the work steps every worker of the pool completed so far.
+
+        The counters only grow while the pool lives, a rate is the
+        difference of two reads.  Parked workers keep their count.
+        """
+        return [counters.ops.value for counters in self._counters]
+
+    def get_traffic(self) -> list[int]:
+        """Return the bytes every worker moved in memory workloads so far."""
+        return [counters.traffic.value for counters in self._counters]
 
     def is_running(self) -> bool:
-        """Return True if any worker process is still alive."""
-        return any(p.is_alive() for p in self._workers)
+        """Return True if any worker process is running a workload."""
+        return any(
+            go.is_set() and p.is_alive() for go, p in zip(self._go, self._workers)
+        )
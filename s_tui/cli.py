@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Command line entry point of s-tui
+
+The headless modes (--json-stream, --terminal, --json) return before the
+TUI module is imported, so they do not need urwid.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+
+from s_tui import collector
+from s_tui.helper_functions import __version__, output_to_json, output_to_terminal
+from s_tui.sources.fan_source import FanSource
+from s_tui.sources.freq_source import FreqSource
+from s_tui.sources.rapl_power_source import RaplPowerSource
+from s_tui.sources.stats import SUMMARY_STATS
+from s_tui.sources.temp_source import TempSource
+from s_tui.sources.util_source import UtilSource
+
+HELP_MESSAGE = """
+TUI interface:
+
+The side bar houses the controls for the displayed graphs.\n\
+At the bottom, all sensors reading are presented in text form.\n\
+
+* Use the arrow keys or 'hjkl' to navigate the side bar
+* Toggle between stressed and regular operation using the radio buttons in \
+'Modes'.\n\
+* If you wish to alternate stress defaults, you can do it in <Stress \
+options>\n\
+* Select graphs to display in the <Graphs> menu \n\
+* Select summaries to display in the <Summaries> menu \n\
+* Cycle the summaries between the last value and run statistics with the \
+<Summary> button\n\
+* Change time between updates using the 'Refresh' field\n\
+* Use the <Throttle log> button to list the throttle episodes of the run\n\
+* Use the <Reset> button to reset graphs and statistics\n\
+* If your system supports it, you can use the UTF-8 button to get a smoother \
+graph\n\
+* Save your current configuration with the <Save Settings> button\n\
+* Press 'q' or the <Quit> button to quit\n\
+* When replaying (--replay), press space to pause, '+'/'-' to change the \
+speed and left/right to seek\n\
+\n\
+* Run `s-tui --help` to get this message and additional cli options\n\
+\n\
+Throttle indicators (shown on frequency labels):\n\
+  With root + msr module:\n\
+    T = Thermal    H = PROCHOT (external)\n\
+    C = Critical   W = Power limit (watts)\n\
+    A = Current limit (amps)  X = Cross-domain\n\
+  Without root (sysfs fallback):\n\
+    Tc = Core thermal   Tp = Package thermal\n\
+  Labels combine with / (e.g. T/W = thermal + power limit)\n\
+"""
+
+DEFAULT_LOG_FILE = "_s-tui.log"
+
+VERSION_MESSAGE = (
+    "s-tui "
+    + __version__
+    + " - (C) 2017-2025 Alex Manuskin, Gil Tsuker\n\
+    Released under GNU GPLv2"
+)
+
+
+def main() -> None:
+    args = get_args()
+    # Print version and exit
+    if args.version:
+        print(VERSION_MESSAGE)
+        sys.exit(0)
+
+    # Setup logging util
+    log_file = DEFAULT_LOG_FILE
+    if args.debug_run:
+        args.debug = True
+
+    log_formatter = logging.Formatter(
+        "%(asctime)s [%(funcName)s()] [%(levelname)-5.5s]  %(message)s"
+    )
+    root_logger = logging.getLogger()
+
+    if args.debug or args.debug_file is not None:
+        level = logging.DEBUG
+        if args.debug_file is not None:
+            log_file = args.debug_file
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setFormatter(log_formatter)
+        root_logger.addHandler(file_handler)
+    else:
+        level = logging.ERROR
+    root_logger.setLevel(level)
+
+    if args.json_stream is not None:
+        logging.info("Streaming JSON lines without tui")
+        sys.exit(collector.run(args))
+
+    if args.terminal or args.json:
+        logging.info("Printing single line to terminal")
+        sources = [
+            FreqSource(),
+            TempSource(),
+            UtilSource(),
+            RaplPowerSource(),
+            FanSource(),
+        ]
+        if args.terminal:
+            output_to_terminal(sources)
+        elif args.json:
+            output_to_json(sources)
+
+    # The TUI and its menus import urwid
+    from s_tui import s_tui
+
+    s_tui.main(args)
+
+
+def get_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=HELP_MESSAGE, formatter_class=argparse.RawTextHelpFormatter
+    )
+
+    parser.add_argument(
+        "-d",
+        "--debug",
+        default=False,
+        action="store_true",
+        help="Output debug log to _s-tui.log",
+    )
+    parser.add_argument(
+        "--debug-file",
+        default=None,
+        help="Use a custom debug file. Default: " + "_s-tui.log",
+    )
+    # This is mainly to be used for testing purposes
+    parser.add_argument(
+        "-dr",
+        "--debug_run",
+        default=False,
+        action="store_true",
+        help="Run for 5 seconds and quit",
+    )
+    parser.add_argument(
+        "-c", "--csv", action="store_true", default=False, help="Save stats to csv file"
+    )
+    parser.add_argument(
+        "--csv-file",
+        default=None,
+        help="Use a custom CSV file. Default: " + "s-tui_log_<TIME>.csv",
+    )
+    parser.add_argument(
+        "-t",
+        "--terminal",
+        action="store_true",
+        default=False,
+        help="Display a single line of stats without tui",
+    )
+    parser.add_argument(
+        "-j",
+        "--json",
+        action="store_true",
+        default=False,
+        help="Display a single line of stats in JSON format",
+    )
+    parser.add_argument(
+        "-nm",
+        "--no-mouse",
+        action="store_true",
+        default=False,
+        help="Disable Mouse for TTY systems",
+    )
+    parser.add_argument(
+        "-v", "--version", default=False, action="store_true", help="Display version"
+    )
+    parser.add_argument(
+        "-tt",
+        "--t_thresh",
+        default=None,
+        help="High Temperature threshold. Default: 80",
+    )
+    parser.add_argument(
+        "-r",
+        "--refresh-rate",
+        dest="refresh_rate",
+        default="2.0",
+        help="Refresh rate in seconds. Default: 2.0",
+    )
+    parser.add_argument(
+        "--replay",
+        default=None,
+        metavar="FILE",
+        help="Replay a CSV log or binary recording instead of reading sensors."
+        ' "synthetic[:CORES]" replays generated data',
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=1.0,
+        help="Initial replay speed, 1-1000. Default: 1",
+    )
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        default=None,
+        metavar=("A", "B"),
+        help="Replay two recordings side by side, aligned on their stress start",
+    )
+    parser.add_argument(
+        "--connect",
+        default=None,
+        metavar="SOCKET",
+        help="View the samples of a shared sampler (s-tui-collect --serve) "
+        "instead of reading sensors",
+    )
+    parser.add_argument(
+        "--fleet",
+        nargs="+",
+        default=None,
+        metavar="HOST:PORT",
+        help="Show the nodes of a fleet, streamed by s-tui-collect --agent",
+    )
+    parser.add_argument(
+        "--summary-stat",
+        default=None,
+        choices=SUMMARY_STATS,
+        help="Statistic shown in the summaries. Default: last",
+    )
+    parser.add_argument(
+        "--compare-threshold",
+        type=float,
+        default=50.0,
+        help="Average utilization (%%) marking the stress start. Default: 50",
+    )
+    collector.add_collector_args(parser)
+    args = parser.parse_args()
+    return args
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,947 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Headless sampling loop for s-tui
+
+The collector updates the same Source objects as the TUI and hands a
+Sample of every tick to a list of sinks.  It must never import urwid,
+either directly or through the menus, so it can run on machines
+without a terminal.
+"""
+
+from __future__ import annotations
+
+import argparse
+import configparser
+import contextlib
+import logging
+import logging.handlers
+import os
+import signal
+import sys
+import threading
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from s_tui.helper_functions import (
+    get_user_config_dir,
+    get_user_config_file,
+    make_user_config_dir,
+    user_config_dir_exists,
+    user_config_file_exists,
+    which,
+)
+from s_tui.placement import PLACEMENT_HELP, parse_placement
+from s_tui.report import ReportWriter, render_markdown
+from s_tui.schedule import ScheduleRunner, load_schedule
+from s_tui.sinks.csv_sink import CsvSink
+from s_tui.sinks.json_stream_sink import JsonStreamSink
+from s_tui.sinks.prometheus import ExporterSink, TextfileSink
+from s_tui.sinks.push import InfluxSink, StatsdSink
+from s_tui.sinks.recording import RecordingSink
+from s_tui.sinks.rotation import COMPRESSORS, LogRotator, parse_duration, parse_size
+from s_tui.sinks.sampler import AgentServer, SamplerServer
+from s_tui.sinks.sink import FlushPolicy, Sample, Sink, take_sample
+from s_tui.sinks.sqlite_sink import SqliteSink
+from s_tui.sinks.throttle_journal import ThrottleJournal, ThrottleJournalSink
+from s_tui.sources.fan_source import FanSource
+from s_tui.sources.freq_source import FreqSource
+from s_tui.sources.rapl_power_source import RaplPowerSource
+from s_tui.sources.script_hook_loader import ScriptHookLoader
+from s_tui.sources.source import Source
+from s_tui.sources.stats import DEFAULT_WINDOW, parse_stats
+from s_tui.sources.stress_source import (
+    BandwidthSource,
+    StressNgSource,
+    StressSource,
+)
+from s_tui.sources.temp_source import TempSource
+from s_tui.sources.util_source import UtilSource
+from s_tui.stability import (
+    DEFAULT_SLOPE,
+    DEFAULT_SOAK,
+    DEFAULT_STDDEV,
+    DEFAULT_STEADY_WINDOW,
+    DEFAULT_TIMEOUT,
+    StabilityCriteria,
+    StabilityTest,
+    SteadyStateDetector,
+)
+from s_tui.stress_controller import StressController
+from s_tui.stress_ng import is_stress_ng
+
+if TYPE_CHECKING:
+    from s_tui.sources.remote_source import RemoteStressController
+
+DEFAULT_REFRESH_RATE = "2.0"
+DEFAULT_CSV_FILE = "s-tui_log_" + time.strftime("%Y-%m-%d_%H_%M_%S") + ".csv"
+HOOK_INTERVAL = 30 * 1000
+# Options naming an output file, made absolute before detaching
+FILE_ARGS = (
+    "json_stream",
+    "csv_file",
+    "record",
+    "sqlite",
+    "textfile",
+    "influx",
+    "serve",
+    "throttle_log",
+)
+# At least one output is needed to run detached
+OUTPUT_ARGS = (*FILE_ARGS, "exporter", "statsd", "agent", "stability")
+
+
+def get_sources(t_thresh: int | str | None = None) -> list[Source]:
+    """Returns all the sources available on this machine"""
+    possible_sources = [
+        TempSource(t_thresh),
+        FreqSource(),
+        UtilSource(),
+        RaplPowerSource(),
+        FanSource(),
+    ]
+    return [s for s in possible_sources if s.get_is_available()]
+
+
+def load_t_thresh() -> str | None:
+    """Returns the temperature threshold saved in the user config, if any"""
+    if not user_config_file_exists():
+        return None
+    conf = configparser.ConfigParser(delimiters="=")
+    conf.read(get_user_config_file())
+    try:
+        return conf.get("GraphControl", "TTHRESH")
+    except (configparser.NoOptionError, configparser.NoSectionError):
+        return None
+
+
+def attach_script_hooks(sources: list[Source]) -> bool:
+    """Attaches the user's hooks.d threshold scripts to the sources"""
+    if not user_config_dir_exists():
+        user_config_dir = make_user_config_dir()
+    else:
+        user_config_dir = get_user_config_dir()
+    if user_config_dir is None:
+        logging.warning("Failed to find or create scripts directory")
+        return False
+
+    script_loader = ScriptHookLoader(user_config_dir)
+    for source in sources:
+        source.add_edge_hook(
+            script_loader.load_script(source.__class__.__name__, HOOK_INTERVAL)
+        )
+    return True
+
+
+class Collector:
+    """Samples sources on a fixed interval and writes them to sinks"""
+
+    def __init__(
+        self,
+        sources: list[Source],
+        sinks: list[Sink],
+        interval: float,
+        stats: tuple[str, ...] = (),
+    ) -> None:
+        self.sources = sources
+        self.sinks = sinks
+        self.interval = interval
+        # Running statistics attached to every sample
+        self.stats = stats
+        # Called every tick for the annotations of the sample
+        self.annotate: Callable[[], dict[str, Any]] | None = None
+        self.source_update_errors: dict[str, str] = {}
+        self.sink_write_errors: dict[Sink, str] = {}
+        self._stop_event = threading.Event()
+        self._reopen_requested = False
+
+    def prime(self) -> None:
+        """Take a baseline reading so rate based values (e.g. RAPL watts,
+        utilization) are valid from the first emitted sample"""
+        self.update_sources()
+        # The baseline reading must not count in the statistics
+        for source in self.sources:
+            source.reset_stats()
+
+    def update_sources(self) -> None:
+        """Update every source, logging failures only when they change"""
+        for source in self.sources:
+            source_name = source.get_source_name()
+            try:
+                source.update()
+                source.update_stats()
+                previous_error = self.source_update_errors.pop(source_name, None)
+                if previous_error is not None:
+                    logging.info(
+                        "Source %s recovered from update errors (%s)",
+                        source_name,
+                        previous_error,
+                    )
+            except (OSError, TypeError, ValueError) as err:
+                error_name = err.__class__.__name__
+                if self.source_update_errors.get(source_name) != error_name:
+                    logging.warning(
+                        "Source %s update failed with recoverable %s: %s",
+                        source_name,
+                        error_name,
+                        err,
+                    )
+                self.source_update_errors[source_name] = error_name
+
+    def sample(self, annotations: dict[str, Any] | None = None) -> None:
+        """Update all sources and write one sample to every sink"""
+        self.update_sources()
+        sample = take_sample(self.sources, annotations, self.stats)
+        self.write_sinks(sample)
+
+    def write_sinks(self, sample: Sample) -> None:
+        """Writes a sample to every sink.  A sink that fails is retried on
+        the next sample, so e.g. a full disk does not stop the others."""
+        for sink in self.sinks:
+            try:
+                sink.write(sample)
+                previous_error = self.sink_write_errors.pop(sink, None)
+                if previous_error is not None:
+                    logging.info(
+                        "Sink %s recovered from write errors (%s)",
+                        sink.__class__.__name__,
+                        previous_error,
+                    )
+            except BrokenPipeError:
+                # The reader of our stdout went away, run() stops on this
+                raise
+            except (OSError, ValueError) as err:
+                error_name = err.__class__.__name__
+                if self.sink_write_errors.get(sink) != error_name:
+                    logging.error(
+                        "Sink %s failed to write with %s: %s",
+                        sink.__class__.__name__,
+                        error_name,
+                        err,
+                    )
+                self.sink_write_errors[sink] = error_name
+
+    def run(self, count: int | None = None) -> None:
+        """Sample every interval until stopped or *count* samples were taken.
+
+        Ticks are scheduled on absolute monotonic deadlines, so the time
+        spent sampling does not accumulate as drift.
+        """
+        self.prime()
+        deadline = time.monotonic()
+        taken = 0
+        while count is None or taken < count:
+            deadline += self.interval
+            now = time.monotonic()
+            if deadline < now:
+                # We fell behind (e.g. suspend), skip the missed ticks
+                missed = int((now - deadline) / self.interval) + 1
+                deadline += missed * self.interval
+                logging.debug("Collector skipped %d ticks", missed)
+            if self._stop_event.wait(deadline - now):
+                break
+            if self._reopen_requested:
+                self._reopen_requested = False
+                self.reopen()
+            self.sample(None if self.annotate is None else self.annotate())
+            taken += 1
+
+    def stop(self) -> None:
+        """Makes run() return after the current tick"""
+        self._stop_event.set()
+
+    def reopen(self) -> None:
+        """Reopen all sink destinations, e.g. after logrotate moved them"""
+        logging.info("Reopening sinks")
+        for sink in self.sinks:
+            try:
+                sink.reopen()
+            except OSError as err:
+                logging.error("Failed to reopen sink %s: %s", sink, err)
+
+    def install_signal_handlers(self) -> None:
+        """SIGTERM/SIGINT stop the loop, SIGHUP reopens the sinks.
+
+        The handlers only set flags; the actual work happens on the
+        sampling thread between ticks.
+        """
+        signal.signal(signal.SIGTERM, self._on_stop_signal)
+        signal.signal(signal.SIGINT, self._on_stop_signal)
+        signal.signal(signal.SIGHUP, self._on_reopen_signal)
+
+    def _on_stop_signal(self, signum: int, frame: object) -> None:
+        logging.info("Caught signal %s, stopping", signum)
+        self.stop()
+
+    def _on_reopen_signal(self, signum: int, frame: object) -> None:
+        self._reopen_requested = True
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except OSError as err:
+                logging.error("Failed to close sink %s: %s", sink, err)
+
+
+def stats_list(text: str) -> tuple[str, ...]:
+    """argparse type of --stats"""
+    try:
+        return parse_stats(text)
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(str(err)) from err
+
+
+def set_stats_window(sources: list[Source], window: int) -> None:
+    """Sets the number of samples per p95 window of every source"""
+    for source in sources:
+        source.stats.set_window(window)
+
+
+def add_stress_source(
+    collector: Collector,
+    controller: StressController | RemoteStressController,
+    window: int,
+) -> None:
+    """Samples the throughput and memory bandwidth of the built-in stress
+    workers of *controller*"""
+    for source in (StressSource(controller), BandwidthSource(controller)):
+        source.stats.set_window(window)
+        collector.sources.append(source)
+
+
+def add_stress_ng_source(
+    collector: Collector,
+    controller: StressController | RemoteStressController,
+    window: int,
+) -> None:
+    """Samples the bogo operations stress-ng reports for its stressors"""
+    source = StressNgSource(controller, "stress-ng")
+    source.stats.set_window(window)
+    collector.sources.append(source)
+
+
+def add_collector_args(parser: argparse.ArgumentParser) -> None:
+    """Adds the headless output options to an argument parser"""
+    parser.add_argument(
+        "--json-stream",
+        nargs="?",
+        const="-",
+        default=None,
+        metavar="FILE",
+        help="Continuously write one JSON line per refresh to FILE. "
+        + "Default: stdout",
+    )
+    parser.add_argument(
+        "--json-stream-flush",
+        default="line",
+        metavar="POLICY",
+        help='Flush the JSON stream every "line", every N lines or every Ns '
+        + "seconds (e.g. 5s). Default: line",
+    )
+    parser.add_argument(
+        "--record",
+        default=None,
+        metavar="FILE",
+        help="Record samples to a compact binary FILE "
+        + "(convert with python -m s_tui.sinks.recording)",
+    )
+    parser.add_argument(
+        "--sqlite",
+        default=None,
+        metavar="FILE",
+        help="Store samples in an SQLite database FILE, one run per start",
+    )
+    parser.add_argument(
+        "--sqlite-commit",
+        default=5.0,
+        type=float,
+        metavar="SECONDS",
+        help="Commit queued SQLite rows every SECONDS. Default: 5",
+    )
+    parser.add_argument(
+        "--exporter",
+        default=None,
+        metavar="[HOST]:PORT",
+        help="Serve metrics for Prometheus over HTTP, e.g. :9101",
+    )
+    parser.add_argument(
+        "--textfile",
+        default=None,
+        metavar="PATH",
+        help="Write metrics for the node_exporter textfile collector to PATH "
+        + "(a .prom file or a directory)",
+    )
+    parser.add_argument(
+        "--textfile-interval",
+        default=15.0,
+        type=float,
+        metavar="SECONDS",
+        help="Rewrite the textfile at most every SECONDS. Default: 15",
+    )
+    parser.add_argument(
+        "--influx",
+        default=None,
+        metavar="TARGET",
+        help="Push InfluxDB line protocol to a file, udp://HOST:PORT "
+        + "or unix:///PATH",
+    )
+    parser.add_argument(
+        "--statsd",
+        default=None,
+        metavar="TARGET",
+        help="Push StatsD gauges to udp://HOST:PORT or unix:///PATH",
+    )
+    parser.add_argument(
+        "--report",
+        default=None,
+        metavar="FILE",
+        help="Append a report of every stress run to FILE, as Markdown or, "
+        + "for a .json FILE, as JSON lines",
+    )
+    parser.add_argument(
+        "--schedule",
+        default=None,
+        metavar="FILE",
+        help='Stress along the phases in FILE, e.g. "idle 60s, 50%% 2m, '
+        + 'ramp 0%%-100%% 5m, cycle 100%%/0%% 20s 10m", and mark the phase '
+        + "of every sample",
+    )
+    parser.add_argument(
+        "--schedule-stress",
+        default="builtin",
+        choices=["builtin", "external"],
+        help="Stress used by --schedule. Default: builtin",
+    )
+    parser.add_argument(
+        "--placement",
+        default="none",
+        type=placement_policy,
+        metavar="POLICY",
+        help="Pin the built-in stress workers to CPUs: " + PLACEMENT_HELP + ". "
+        "Default: none",
+    )
+    parser.add_argument(
+        "--throttle-log",
+        default=None,
+        metavar="FILE",
+        help="Append every throttle episode (core, reason, start, duration, "
+        + "temperature and power at onset) to the CSV FILE",
+    )
+    parser.add_argument(
+        "--stats",
+        default=(),
+        type=stats_list,
+        metavar="LIST",
+        help="Add running statistics of every sensor to the JSON and CSV "
+        + "output, any of min,max,mean,stddev,p95",
+    )
+    parser.add_argument(
+        "--stats-window",
+        default=DEFAULT_WINDOW,
+        type=int,
+        metavar="N",
+        help="Samples per p95 window. Default: " + str(DEFAULT_WINDOW),
+    )
+    parser.add_argument(
+        "--csv-flush",
+        default="10s",
+        metavar="POLICY",
+        help='Write buffered CSV rows every "line", every N rows or every Ns '
+        + "seconds. Default: 10s",
+    )
+    parser.add_argument(
+        "--csv-fsync",
+        default=False,
+        action="store_true",
+        help="fsync the CSV file after every flush",
+    )
+    parser.add_argument(
+        "--rotate-size",
+        default=None,
+        metavar="SIZE",
+        help="Rotate CSV/JSON logs when they reach SIZE (e.g. 100M)",
+    )
+    parser.add_argument(
+        "--rotate-interval",
+        default=None,
+        metavar="DURATION",
+        help="Rotate CSV/JSON logs every DURATION (e.g. 1h, 1d)",
+    )
+    parser.add_argument(
+        "--rotate-keep",
+        default=None,
+        type=int,
+        metavar="N",
+        help="Keep only the N most recent rotated logs",
+    )
+    parser.add_argument(
+        "--compress",
+        default=None,
+        choices=sorted(COMPRESSORS),
+        help="Compress rotated logs in the background",
+    )
+
+
+def daemonize(pid_file: str | None = None) -> None:
+    """Detach from the terminal using the classic double fork"""
+    if os.fork() > 0:
+        os._exit(0)
+    os.setsid()
+    if os.fork() > 0:
+        os._exit(0)
+
+    dev_null = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(dev_null, fd)
+    os.close(dev_null)
+
+    if pid_file is not None:
+        with open(pid_file, "w") as pid_fd:
+            pid_fd.write(str(os.getpid()) + "\n")
+
+
+def make_rotator(args: argparse.Namespace) -> LogRotator | None:
+    """Creates a LogRotator if any rotation option was given"""
+    if args.rotate_size is None and args.rotate_interval is None:
+        if args.rotate_keep is not None or args.compress is not None:
+            logging.warning("--rotate-keep/--compress need a rotation size or time")
+        return None
+    return LogRotator(
+        max_bytes=parse_size(args.rotate_size) if args.rotate_size else None,
+        interval=(
+            parse_duration(args.rotate_interval) if args.rotate_interval else None
+        ),
+        keep=args.rotate_keep,
+        compress=args.compress,
+    )
+
+
+def build_sinks(
+    args: argparse.Namespace, throttle_journal: ThrottleJournal | None = None
+) -> list[Sink]:
+    """Creates the sinks requested on the command line
+
+    *throttle_journal* lets the TUI show the episodes that --throttle-log
+    writes.
+    """
+    sinks: list[Sink] = []
+    try:
+        if args.json_stream is not None:
+            sinks.append(
+                JsonStreamSink(
+                    args.json_stream,
+                    FlushPolicy.parse(args.json_stream_flush),
+                    rotator=make_rotator(args),
+                )
+            )
+        if args.record is not None:
+            sinks.append(RecordingSink(args.record))
+        if args.sqlite is not None:
+            sinks.append(SqliteSink(args.sqlite, args.sqlite_commit))
+        if args.exporter is not None:
+            sinks.append(ExporterSink(args.exporter))
+        if args.textfile is not None:
+            sinks.append(TextfileSink(args.textfile, args.textfile_interval))
+        if args.influx is not None:
+            sinks.append(InfluxSink(args.influx))
+        if args.statsd is not None:
+            sinks.append(StatsdSink(args.statsd))
+        if args.throttle_log is not None:
+            sinks.append(ThrottleJournalSink(args.throttle_log, throttle_journal))
+        serve = getattr(args, "serve", None)
+        if serve is not None:
+            # The sampler runs the only stress workers, on behalf of its viewers
+            stress_exe = which("stress") or which("stress-ng")
+            sinks.append(
+                SamplerServer(
+                    serve, StressController(stress_exe is not None), stress_exe
+                )
+            )
+        agent = getattr(args, "agent", None)
+        if agent is not None:
+            sinks.append(AgentServer(agent))
+        csv_file = getattr(args, "csv_file", None)
+        if csv_file is None and getattr(args, "csv", False):
+            csv_file = DEFAULT_CSV_FILE
+        if csv_file is not None:
+            sinks.append(
+                CsvSink(
+                    csv_file,
+                    FlushPolicy.parse(args.csv_flush),
+                    fsync=args.csv_fsync,
+                    rotator=make_rotator(args),
+                )
+            )
+    except (OSError, ValueError):
+        # Stop the threads and servers of the sinks already created
+        for sink in sinks:
+            with contextlib.suppress(OSError):
+                sink.close()
+        raise
+    return sinks
+
+
+def make_stability_test(args: argparse.Namespace) -> StabilityTest:
+    """Creates the stability test configured on the command line"""
+    return StabilityTest(
+        "Stress (ext)" if args.stability == "external" else "s-tui stress",
+        StabilityCriteria(
+            args.fail_temp, args.fail_throttle, args.min_power, args.max_power
+        ),
+        SteadyStateDetector(args.steady_window, args.steady_slope, args.steady_stddev),
+        soak=args.soak,
+        timeout=args.steady_timeout,
+    )
+
+
+def start_stability_stress(mode: str, placement: str = "none") -> StressController:
+    """Starts the stress of a stability test on every CPU"""
+    stress_exe = which("stress") or which("stress-ng")
+    controller = StressController(stress_exe is not None)
+    controller.set_builtin_placement(placement)
+    workers = os.cpu_count() or 1
+    if mode == "Stress (ext)":
+        if stress_exe is None:
+            raise ValueError("external stress needs stress or stress-ng installed")
+        controller.set_mode(mode)
+        controller.start_stress([stress_exe, "-c", str(workers)])
+    else:
+        controller.set_mode(mode)
+        controller.start_builtin_stress(workers)
+    return controller
+
+
+def placement_policy(text: str) -> str:
+    """argparse type of --placement"""
+    try:
+        return parse_placement(text)
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(str(err)) from err
+
+
+def make_schedule_runner(args: argparse.Namespace) -> ScheduleRunner:
+    """Loads the --schedule file, raises OSError or ValueError"""
+    phases = load_schedule(args.schedule)
+    stress_exe = None
+    if args.schedule_stress == "external":
+        stress_exe = which("stress") or which("stress-ng")
+        if stress_exe is None:
+            raise ValueError("external stress needs stress or stress-ng installed")
+    controller = StressController(stress_exe is not None)
+    controller.set_builtin_placement(args.placement)
+    return ScheduleRunner(phases, controller, stress_exe)
+
+
+def finish_stability_test(test: StabilityTest, args: argparse.Namespace) -> int:
+    """Prints the report of a stability test, returns its exit code"""
+    if test.report is None:
+        sys.stderr.write("s-tui: the stability test took no samples\n")
+        return 1
+    result = test.result()
+    out = sys.stderr if args.json_stream == "-" else sys.stdout
+    out.write(render_markdown(result))
+    out.flush()
+    if args.report is not None:
+        ReportWriter(args.report).write(result)
+    return 0 if result["stability"]["passed"] else 1
+
+
+def run(args: argparse.Namespace, count: int | None = None) -> int:
+    """Runs the collector according to *args*, returns an exit code
+
+    A stability test exits with 0 when it passed and 1 when it failed.
+    """
+    # The s-tui parser has no stability test options
+    stability = getattr(args, "stability", None)
+    runner = None
+    if args.schedule is not None:
+        if stability is not None:
+            sys.stderr.write("s-tui: --schedule and --stability both stress\n")
+            return 2
+        try:
+            runner = make_schedule_runner(args)
+        except (OSError, ValueError) as err:
+            sys.stderr.write("s-tui: " + str(err) + "\n")
+            return 2
+    # Built after the checks, exporters and writers start threads
+    try:
+        sinks = build_sinks(args)
+    except (OSError, ValueError) as err:
+        logging.error("Unable to create output: %s", err)
+        sys.stderr.write("s-tui: " + str(err) + "\n")
+        return 2
+    test = None
+    if stability is not None:
+        test = make_stability_test(args)
+        sinks.append(test)
+
+    t_thresh = args.t_thresh if args.t_thresh is not None else load_t_thresh()
+    sources = get_sources(t_thresh)
+    if not getattr(args, "no_hooks", False):
+        attach_script_hooks(sources)
+
+    set_stats_window(sources, args.stats_window)
+
+    collector = Collector(sources, sinks, float(args.refresh_rate), args.stats)
+    collector.install_signal_handlers()
+    stress = None
+    if test is not None:
+        test.on_done = collector.stop
+        try:
+            stress = start_stability_stress(test.mode, args.placement)
+        except ValueError as err:
+            sys.stderr.write("s-tui: " + str(err) + "\n")
+            collector.close()
+            return 2
+        if stress.get_current_mode() == "s-tui stress":
+            add_stress_source(collector, stress, args.stats_window)
+        elif stress.runs_stress_ng():
+            add_stress_ng_source(collector, stress, args.stats_window)
+    if runner is not None:
+        schedule = runner
+        if runner.stress_exe is None:
+            add_stress_source(collector, runner.controller, args.stats_window)
+        elif is_stress_ng(runner.stress_exe):
+            add_stress_ng_source(collector, runner.controller, args.stats_window)
+
+        def annotate() -> dict[str, Any]:
+            annotations = schedule.tick()
+            if schedule.finished:
+                collector.stop()
+            return annotations
+
+        collector.annotate = annotate
+        runner.start()
+    try:
+        collector.run(count)
+    except KeyboardInterrupt:
+        logging.debug("Collector interrupted")
+    except BrokenPipeError:
+        # The reader of our stdout went away, silence the final flush
+        logging.debug("Output pipe closed")
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        if stress is not None:
+            stress.close()
+            # stress-ng has reported its metrics once it stopped
+            if test is not None and test.report is not None:
+                test.report.set_bogo_ops(stress.get_last_stress_ng_metrics().values())
+        if runner is not None:
+            runner.stop()
+            runner.controller.close()
+        collector.close()
+    if test is not None:
+        return finish_stability_test(test, args)
+    return 0
+
+
+def get_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="s-tui headless collector, samples sensors without a TUI"
+    )
+    parser.add_argument(
+        "-r",
+        "--refresh-rate",
+        dest="refresh_rate",
+        default=DEFAULT_REFRESH_RATE,
+        help="Refresh rate in seconds. Default: " + DEFAULT_REFRESH_RATE,
+    )
+    parser.add_argument(
+        "-tt",
+        "--t_thresh",
+        default=None,
+        help="High Temperature threshold. Default: 80",
+    )
+    parser.add_argument(
+        "-d",
+        "--debug",
+        default=False,
+        action="store_true",
+        help="Log debug messages",
+    )
+    parser.add_argument(
+        "--log-file",
+        default=None,
+        help="Write the log to a file instead of stderr. "
+        + "The file is reopened when it is rotated",
+    )
+    parser.add_argument(
+        "--csv-file",
+        default=None,
+        help="Append samples to a CSV file",
+    )
+    parser.add_argument(
+        "--serve",
+        default=None,
+        metavar="SOCKET",
+        help="Share the samples and stress control with s-tui viewers "
+        + "attached to a Unix socket (s-tui --connect SOCKET)",
+    )
+    parser.add_argument(
+        "--agent",
+        default=None,
+        metavar="[HOST]:PORT",
+        help="Stream samples over TCP to s-tui --fleet viewers, e.g. :9102",
+    )
+    parser.add_argument(
+        "--daemon",
+        default=False,
+        action="store_true",
+        help="Detach from the terminal and run in the background",
+    )
+    parser.add_argument(
+        "--pid-file",
+        default=None,
+        help="Write the daemon process id to a file",
+    )
+    parser.add_argument(
+        "--no-hooks",
+        default=False,
+        action="store_true",
+        help="Do not run the threshold scripts in hooks.d",
+    )
+    stability = parser.add_argument_group(
+        "stability test",
+        "Stress until the temperature is steady, soak, then exit with 0 "
+        "if every limit held and 1 otherwise",
+    )
+    stability.add_argument(
+        "--stability",
+        default=None,
+        choices=["builtin", "external"],
+        help="Run a stability test with the built-in or the external stress",
+    )
+    stability.add_argument(
+        "--steady-window",
+        default=DEFAULT_STEADY_WINDOW,
+        type=float,
+        metavar="SECONDS",
+        help="Window of the steady state test. Default: "
+        + str(round(DEFAULT_STEADY_WINDOW)),
+    )
+    stability.add_argument(
+        "--steady-slope",
+        default=DEFAULT_SLOPE,
+        type=float,
+        metavar="C_PER_MIN",
+        help="Largest temperature trend in the window considered steady. "
+        + "Default: "
+        + str(DEFAULT_SLOPE),
+    )
+    stability.add_argument(
+        "--steady-stddev",
+        default=DEFAULT_STDDEV,
+        type=float,
+        metavar="C",
+        help="Largest temperature deviation in the window considered steady. "
+        + "Default: "
+        + str(DEFAULT_STDDEV),
+    )
+    stability.add_argument(
+        "--steady-timeout",
+        default=DEFAULT_TIMEOUT,
+        type=float,
+        metavar="SECONDS",
+        help="Fail if no steady state is reached in time. Default: "
+        + str(round(DEFAULT_TIMEOUT)),
+    )
+    stability.add_argument(
+        "--soak",
+        default=DEFAULT_SOAK,
+        type=float,
+        metavar="SECONDS",
+        help="Time to hold the steady state. Default: " + str(round(DEFAULT_SOAK)),
+    )
+    stability.add_argument(
+        "--fail-temp",
+        default=None,
+        type=float,
+        metavar="C",
+        help="Fail if any temperature exceeds C",
+    )
+    stability.add_argument(
+        "--fail-throttle",
+        default=None,
+        type=float,
+        metavar="SECONDS",
+        help="Fail if the CPU throttled for longer than SECONDS (0: at all)",
+    )
+    stability.add_argument(
+        "--min-power",
+        default=None,
+        type=float,
+        metavar="W",
+        help="Fail if the average package power of the soak is below W",
+    )
+    stability.add_argument(
+        "--max-power",
+        default=None,
+        type=float,
+        metavar="W",
+        help="Fail if the average package power of the soak is above W",
+    )
+    add_collector_args(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = get_args(argv)
+
+    if all(getattr(args, attr) is None for attr in OUTPUT_ARGS):
+        if args.daemon:
+            sys.stderr.write("s-tui-collect: --daemon needs an output\n")
+            sys.exit(2)
+        args.json_stream = "-"
+    if args.daemon and args.json_stream == "-":
+        sys.stderr.write("s-tui-collect: cannot stream to stdout in --daemon\n")
+        sys.exit(2)
+
+    # Relative paths would otherwise depend on where the daemon was started
+    for attr in (*FILE_ARGS, "report", "schedule", "log_file", "pid_file"):
+        path = getattr(args, attr)
+        if path is not None and path != "-" and "://" not in path:
+            setattr(args, attr, os.path.abspath(path))
+
+    log_formatter = logging.Formatter(
+        "%(asctime)s [%(funcName)s()] [%(levelname)-5.5s]  %(message)s"
+    )
+    if args.log_file is not None:
+        log_handler: logging.Handler = logging.handlers.WatchedFileHandler(
+            args.log_file
+        )
+    else:
+        log_handler = logging.StreamHandler()
+    log_handler.setFormatter(log_formatter)
+    root_logger = logging.getLogger()
+    root_logger.addHandler(log_handler)
+    root_logger.setLevel(logging.DEBUG if args.debug else logging.WARNING)
+
+    if args.daemon:
+        daemonize(args.pid_file)
+
+    try:
+        sys.exit(run(args))
+    finally:
+        if args.daemon and args.pid_file is not None:
+            with contextlib.suppress(OSError):
+                os.unlink(args.pid_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Displays one row of key metrics per node of a fleet"""
+
+import urwid
+
+from s_tui.sturwid.ui_elements import ViListBox
+
+COLUMNS = (
+    ("Node", 24),
+    ("Host", 16),
+    ("State", 8),
+    ("Max C", 8),
+    ("Pkg W", 8),
+    ("Avg MHz", 9),
+    ("Throttle", 9),
+)
+
+NO_DATA = "--"
+
+FLEET_HELP = "Enter: show node graphs   Esc: back to the fleet   q: quit"
+
+
+def _format(value, digits=1):
+    if value is None:
+        return NO_DATA
+    return str(round(value, digits) if digits else round(value))
+
+
+class NodeRow(urwid.WidgetWrap):
+    """A selectable row of the fleet table"""
+
+    def __init__(self, index, node, select_fn):
+        self.index = index
+        self.node = node
+        self.select_fn = select_fn
+        self.cells = [urwid.Text("", wrap="clip") for _ in COLUMNS]
+        cells = [(width, cell) for (_, width), cell in zip(COLUMNS, self.cells)]
+        columns = urwid.Columns(cells, dividechars=1)  # type: ignore[arg-type]
+        super().__init__(urwid.AttrMap(columns, None, "button select"))
+        self.update()
+
+    def selectable(self):
+        return True
+
+    def keypress(self, size, key):
+        if key == "enter":
+            self.select_fn(self.index)
+            return None
+        return key
+
+    def mouse_event(self, size, event, button, col, row, focus):
+        if event == "mouse press" and button == 1:
+            self.select_fn(self.index)
+            return True
+        return False
+
+    def update(self, temp_thresh=None):
+        node = self.node
+        summary = node.summary()
+        if node.connected:
+            state = "up"
+        elif node.error:
+            state = "down"
+        else:
+            state = "..."
+        texts = [node.address, node.host or NO_DATA, state]
+        if summary is None:
+            texts += [NO_DATA] * 4
+        else:
+            texts += [
+                _format(summary.max_temp),
+                _format(summary.package_power),
+                _format(summary.avg_freq, 0),
+                summary.throttle,
+            ]
+        for cell, text in zip(self.cells, texts):
+            cell.set_text(text)
+        if (
+            summary is not None
+            and summary.max_temp is not None
+            and temp_thresh is not None
+            and summary.max_temp > temp_thresh
+        ):
+            self.cells[3].set_text(("high temp txt", texts[3]))
+        if summary is not None and summary.throttle:
+            self.cells[6].set_text(("throttle txt", texts[6]))
+        if state == "down":
+            self.cells[2].set_text(("high temp txt", state))
+
+
+class FleetView(urwid.WidgetPlaceholder):
+    """Fleet table, replaced by the graphs of a node when drilling down"""
+
+    def __init__(self, controller):
+        self.controller = controller
+        self.node_rows = [
+            NodeRow(index, node, controller.on_node_selected)
+            for index, node in enumerate(controller.fleet.nodes)
+        ]
+        titles = [(width, urwid.Text(("bold text", title))) for title, width in COLUMNS]
+        title_row = urwid.Columns(titles, dividechars=1)  # type: ignore[arg-type]
+        self.status = urwid.Text("")
+        body = ViListBox(urwid.SimpleFocusListWalker(self.node_rows))  # type: ignore[call-overload]
+        header = urwid.Pile([title_row, urwid.Divider("-")])
+        footer = urwid.Pile([urwid.Divider(), self.status, urwid.Text(FLEET_HELP)])
+        self.table = urwid.Frame(body, header=header, footer=footer)  # type: ignore[arg-type]
+        fleet_box = urwid.LineBox(self.table, title="s-tui fleet")
+        urwid.WidgetPlaceholder.__init__(self, fleet_box)  # type: ignore[call-arg]
+        self.fleet_widget = self.original_widget
+
+    def update(self, temp_thresh=None):
+        for row in self.node_rows:
+            row.update(temp_thresh)
+        nodes = self.controller.fleet.nodes
+        connected = sum(node.connected for node in nodes)
+        throttled = sum(
+            1 for node in nodes if node.current is not None and node.current.throttle
+        )
+        self.status.set_text(
+            f"{connected}/{len(nodes)} nodes connected, {throttled} throttling"
+        )
+
+    def show_node(self, node_view):
+        self.original_widget = node_view
+
+    def show_fleet(self):
+        self.original_widget = self.fleet_widget
+
+    def showing_fleet(self):
+        return self.original_widget is self.fleet_widget
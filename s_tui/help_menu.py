@@ -20,40 +20,9 @@
 
 import urwid
 
+from s_tui.cli import HELP_MESSAGE
 from s_tui.sturwid.ui_elements import ViListBox
 
-HELP_MESSAGE = """
-TUI interface:
-
-The side bar houses the controls for the displayed graphs.\n\
-At the bottom, all sensors reading are presented in text form.\n\
-
-* Use the arrow keys or 'hjkl' to navigate the side bar
-* Toggle between stressed and regular operation using the radio buttons in \
-'Modes'.\n\
-* If you wish to alternate stress defaults, you can do it in <Stress \
-options>\n\
-* Select graphs to display in the <Graphs> menu \n\
-* Select summaries to display in the <Summaries> menu \n\
-* Change time between updates using the 'Refresh' field\n\
-* Use the <Reset> button to reset graphs and statistics\n\
-* If your system supports it, you can use the UTF-8 button to get a smoother \
-graph\n\
-* Save your current configuration with the <Save Settings> button\n\
-* Press 'q' or the <Quit> button to quit\n\
-\n\
-* Run `s-tui --help` to get this message and additional cli options\n\
-\n\
-Throttle indicators (shown on frequency labels):\n\
-  With root + msr module:\n\
-    T = Thermal    H = PROCHOT (external)\n\
-    C = Critical   W = Power limit (watts)\n\
-    A = Current limit (amps)  X = Cross-domain\n\
-  Without root (sysfs fallback):\n\
-    Tc = Core thermal   Tp = Package thermal\n\
-  Labels combine with / (e.g. T/W = thermal + power limit)\n\
-"""
-
 MESSAGE_LEN = 40
 
 
@@ -20,7 +20,6 @@
 from __future__ import annotations
 
 import contextlib
-import csv
 import json
 import logging
 import os
@@ -29,7 +28,6 @@ import re
 import signal
 import subprocess
 import sys
-import time
 from typing import IO, TYPE_CHECKING, Any, Literal, overload
 
 if TYPE_CHECKING:
@@ -122,30 +120,6 @@ def _get_throttle_label(sources: Any) -> str:
     return ""
 
 
-def output_to_csv(sources: dict, csv_writeable_file: str) -> None:
-    """Print statistics to csv file"""
-    file_exists = os.path.isfile(csv_writeable_file)
-
-    with open(csv_writeable_file, "a") as csvfile:
-        csv_dict = OrderedDict()
-        csv_dict.update({"Time": time.strftime("%Y-%m-%d_%H:%M:%S")})
-        summaries = [val for key, val in sources.items()]
-        for summarie in summaries:
-            source = summarie.source
-            prefix = source.get_source_name() + ":"
-            for prob, val in source.get_sensors_summary().items():
-                csv_dict[prefix + prob] = val
-
-        csv_dict["Throttle"] = _get_throttle_label([s.source for s in summaries])
-
-        fieldnames = list(csv_dict.keys())
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-        if not file_exists:
-            writer.writeheader()  # file doesn't exist yet, write a header
-        writer.writerow(csv_dict)
-
-
 def output_to_terminal(sources: list) -> None:
     """Print statistics to the terminal"""
     results = OrderedDict()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Placement of the built-in stress workers on CPUs
+
+A placement policy is one of:
+
+    none          leave placement to the scheduler
+    physical      one worker per physical core
+    smt           both SMT siblings of a core before the next core
+    socket:N      the CPUs of package N
+    node:N        the CPUs of NUMA node N
+    0-3,8         an explicit CPU list
+
+Workers are pinned in turn to the CPUs of the policy, wrapping around
+when there are more workers than CPUs.
+"""
+
+from __future__ import annotations
+
+import glob
+import logging
+import os
+import re
+from typing import NamedTuple
+
+from s_tui.helper_functions import cat
+
+PLACEMENT_NONE = "none"
+PLACEMENT_PHYSICAL = "physical"
+PLACEMENT_SMT = "smt"
+PLACEMENT_HELP = "none, physical, smt, socket:N, node:N or a CPU list"
+
+SYSFS_CPU_TOPOLOGY = "/sys/devices/system/cpu/cpu{}/topology/"
+SYSFS_NODES = "/sys/devices/system/node/node[0-9]*"
+
+
+class CpuInfo(NamedTuple):
+    """Where a logical CPU sits"""
+
+    cpu: int
+    package: int
+    core: int
+    node: int
+
+
+def parse_cpu_list(text: str) -> list[int]:
+    """Parses a CPU list in the sysfs format, e.g. "0-3,8" """
+    cpus: list[int] = []
+    for part in text.strip().split(","):
+        match = re.match(r"\A\s*([0-9]+)\s*(?:-\s*([0-9]+)\s*)?\Z", part)
+        if not match:
+            raise ValueError("Invalid CPU list: " + text)
+        first = int(match.group(1))
+        last = int(match.group(2) or first)
+        if last < first:
+            raise ValueError("Invalid CPU list: " + text)
+        cpus.extend(cpu for cpu in range(first, last + 1) if cpu not in cpus)
+    return cpus
+
+
+def format_cpu_list(cpus: list[int]) -> str:
+    """Formats CPUs as a compact list, e.g. "0-3,8" """
+    ranges: list[list[int]] = []
+    for cpu in sorted(set(cpus)):
+        if ranges and ranges[-1][1] == cpu - 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(
+        str(first) if first == last else str(first) + "-" + str(last)
+        for first, last in ranges
+    )
+
+
+def parse_placement(text: str) -> str:
+    """Checks the syntax of a placement policy, returns it normalized"""
+    policy = text.strip().lower().replace(" ", "")
+    if policy in (PLACEMENT_NONE, PLACEMENT_PHYSICAL, PLACEMENT_SMT):
+        return policy
+    if re.match(r"\A(socket|node):[0-9]+\Z", policy):
+        return policy
+    return format_cpu_list(parse_cpu_list(policy))
+
+
+def _read_int(path: str) -> int:
+    try:
+        return int(cat(path, binary=False))
+    except (OSError, ValueError):
+        return 0
+
+
+def read_topology() -> list[CpuInfo]:
+    """Returns the CPUs this process may run on, with their core and node"""
+    nodes = {}
+    for node_dir in glob.glob(SYSFS_NODES):
+        try:
+            cpulist = cat(os.path.join(node_dir, "cpulist"), binary=False)
+        except OSError:
+            continue
+        if not cpulist.strip():
+            continue
+        node = int(os.path.basename(node_dir)[len("node") :])
+        for cpu in parse_cpu_list(cpulist):
+            nodes[cpu] = node
+    topology = []
+    for cpu in sorted(os.sched_getaffinity(0)):
+        path = SYSFS_CPU_TOPOLOGY.format(cpu)
+        topology.append(
+            CpuInfo(
+                cpu,
+                _read_int(path + "physical_package_id"),
+                _read_int(path + "core_id"),
+                nodes.get(cpu, 0),
+            )
+        )
+    return topology
+
+
+def _by_core(topology: list[CpuInfo]) -> list[list[CpuInfo]]:
+    """Groups CPUs into physical cores, each sorted by CPU number"""
+    cores: dict[tuple[int, int], list[CpuInfo]] = {}
+    for info in sorted(topology):
+        cores.setdefault((info.package, info.core), []).append(info)
+    return sorted(cores.values(), key=lambda threads: threads[0].cpu)
+
+
+def _spread(topology: list[CpuInfo]) -> list[int]:
+    """First thread of every core, then the second threads and so on"""
+    cores = _by_core(topology)
+    depth = max((len(threads) for threads in cores), default=0)
+    return [
+        threads[thread].cpu
+        for thread in range(depth)
+        for threads in cores
+        if thread < len(threads)
+    ]
+
+
+def placement_cpus(policy: str, topology: list[CpuInfo] | None = None) -> list[int]:
+    """Returns the CPUs to pin workers to in turn, empty when unpinned
+
+    Raises ValueError if the policy selects no CPU of this machine.
+    """
+    policy = parse_placement(policy)
+    if policy == PLACEMENT_NONE:
+        return []
+    if topology is None:
+        topology = read_topology()
+    if policy == PLACEMENT_PHYSICAL:
+        cpus = [threads[0].cpu for threads in _by_core(topology)]
+    elif policy == PLACEMENT_SMT:
+        cpus = [
+            info.cpu
+            for threads in _by_core(topology)
+            if len(threads) > 1
+            for info in threads
+        ]
+        if not cpus:
+            raise ValueError("No core has SMT siblings")
+    elif policy.startswith(("socket:", "node:")):
+        kind, _, number = policy.partition(":")
+        cpus = _spread(
+            [
+                info
+                for info in topology
+                if (info.package if kind == "socket" else info.node) == int(number)
+            ]
+        )
+        if not cpus:
+            raise ValueError("No CPU on " + kind + " " + number)
+    else:
+        cpus = parse_cpu_list(policy)
+        allowed = {info.cpu for info in topology}
+        unknown = [cpu for cpu in cpus if cpu not in allowed]
+        if unknown:
+            raise ValueError("Unavailable CPUs: " + format_cpu_list(unknown))
+    return cpus
+
+
+def assign_cpus(
+    policy: str, num_workers: int, topology: list[CpuInfo] | None = None
+) -> list[int | None]:
+    """Returns the CPU of every worker, None for unpinned workers"""
+    try:
+        cpus = placement_cpus(policy, topology)
+    except ValueError as err:
+        logging.warning("Not pinning stress workers: %s", err)
+        cpus = []
+    if not cpus:
+        return [None] * num_workers
+    return [cpus[worker % len(cpus)] for worker in range(num_workers)]
@@ -0,0 +1,344 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""End-of-run stress reports
+
+A StressReport is fed every sample of a stress run and keeps only what
+the report needs: peaks, sums and the samples of the last minute.  The
+report of a run is therefore ready as soon as the run ends, no matter
+how long it took.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections import deque
+from collections.abc import Iterable
+from typing import Any
+
+from s_tui.sinks.sink import Sample, summarize_sample
+from s_tui.stress_ng import StressorMetrics
+
+# Steady state values are averaged over the end of the run
+STEADY_SECONDS = 60.0
+
+THROTTLE_REASONS = {
+    "T": "thermal",
+    "H": "PROCHOT",
+    "C": "critical temperature",
+    "W": "power limit",
+    "A": "current limit",
+    "X": "cross-domain",
+    "Tc": "core thermal",
+    "Tp": "package thermal",
+}
+
+
+def describe_throttle(label: str) -> str:
+    """Spells out a throttle label, e.g. "T/W" as "thermal, power limit" """
+    return ", ".join(THROTTLE_REASONS.get(part, part) for part in label.split("/"))
+
+
+def _mean(values: list[float]) -> float | None:
+    return sum(values) / len(values) if values else None
+
+
+def _round(value: float | None, digits: int = 1) -> float | None:
+    return None if value is None else round(value, digits)
+
+
+class StressReport:
+    """Incrementally computed summary of one stress run"""
+
+    def __init__(
+        self,
+        mode: str,
+        start: float | None = None,
+        monotonic: float | None = None,
+    ) -> None:
+        self.mode = mode
+        self.start = time.time() if start is None else start
+        self.start_monotonic = time.monotonic() if monotonic is None else monotonic
+        self.last_monotonic = self.start_monotonic
+        self.samples = 0
+        self.peak_temps: dict[str, float] = {}
+        self.first_throttle: tuple[float, str] | None = None
+        self.power_sum = 0.0
+        self.power_count = 0
+        self.peak_power: float | None = None
+        self.energy = 0.0
+        self.peak_freq: float | None = None
+        self.peak_ops: float | None = None
+        # stress-ng bogo operations by stressor, reported when it stops
+        self.bogo_ops: list[dict[str, Any]] | None = None
+        # (monotonic, temperatures, average frequency, stress ops/s) of the
+        # last minute
+        self.recent: deque[
+            tuple[float, dict[str, float], float | None, float | None]
+        ] = deque()
+
+    def add(self, sample: Sample) -> None:
+        """Accounts for one sample of the run"""
+        now = sample.monotonic
+        summary = summarize_sample(sample)
+        self.samples += 1
+
+        temps = {
+            sensor: value
+            for reading in sample.readings
+            if reading.name == "Temp"
+            for sensor, value in zip(reading.sensors, reading.values)
+            if value is not None
+        }
+        for sensor, value in temps.items():
+            self.peak_temps[sensor] = max(value, self.peak_temps.get(sensor, value))
+
+        power = summary.package_power
+        if power is not None:
+            self.power_sum += power
+            self.power_count += 1
+            self.peak_power = (
+                power if self.peak_power is None else max(self.peak_power, power)
+            )
+            # RAPL watts are averaged over the time since the last sample
+            self.energy += power * max(now - self.last_monotonic, 0.0)
+
+        freq = summary.avg_freq
+        if freq is not None:
+            self.peak_freq = (
+                freq if self.peak_freq is None else max(self.peak_freq, freq)
+            )
+
+        ops = summary.stress_ops
+        if ops is not None:
+            self.peak_ops = ops if self.peak_ops is None else max(self.peak_ops, ops)
+
+        if summary.throttle and self.first_throttle is None:
+            self.first_throttle = (now - self.start_monotonic, summary.throttle)
+
+        self.recent.append((now, temps, freq, ops))
+        while self.recent[0][0] < now - STEADY_SECONDS:
+            self.recent.popleft()
+        self.last_monotonic = now
+
+    def set_bogo_ops(self, metrics: Iterable[StressorMetrics]) -> None:
+        """Adds the bogo operations stress-ng reported for the run"""
+        self.bogo_ops = [
+            {
+                "stressor": stressor.stressor,
+                "ops": stressor.bogo_ops,
+                "rate": _round(stressor.rate),
+            }
+            for stressor in metrics
+        ] or None
+
+    def finish(self, monotonic: float | None = None) -> dict[str, Any]:
+        """Returns the report of the run, ended at *monotonic*"""
+        end = time.monotonic() if monotonic is None else monotonic
+        temperature = {
+            sensor: {
+                "peak": _round(peak),
+                "steady": _round(
+                    _mean(
+                        [
+                            temps[sensor]
+                            for _, temps, _, _ in self.recent
+                            if sensor in temps
+                        ]
+                    )
+                ),
+            }
+            for sensor, peak in self.peak_temps.items()
+        }
+        throttle = None
+        if self.first_throttle is not None:
+            after, label = self.first_throttle
+            throttle = {
+                "after": round(after, 1),
+                "label": label,
+                "reason": describe_throttle(label),
+            }
+        power = None
+        if self.power_count:
+            power = {
+                "average": _round(self.power_sum / self.power_count),
+                "peak": _round(self.peak_power),
+                "energy": round(self.energy),
+            }
+        frequency = None
+        if self.peak_freq is not None:
+            frequency = {
+                "peak": round(self.peak_freq),
+                "sustained": round(
+                    _mean([freq for _, _, freq, _ in self.recent if freq is not None])
+                    or 0.0
+                ),
+            }
+        throughput = None
+        if self.peak_ops is not None:
+            sustained = (
+                _mean([ops for _, _, _, ops in self.recent if ops is not None]) or 0.0
+            )
+            throughput = {
+                "peak": round(self.peak_ops),
+                "sustained": round(sustained),
+                # Share of the peak throughput left at the end of the run
+                "retained": _round(100 * sustained / self.peak_ops)
+                if self.peak_ops
+                else None,
+            }
+        return {
+            "mode": self.mode,
+            "start": round(self.start, 3),
+            "duration": round(end - self.start_monotonic, 1),
+            "samples": self.samples,
+            "temperature": temperature,
+            "first_throttle": throttle,
+            "power": power,
+            "frequency": frequency,
+            "throughput": throughput,
+            "bogo_ops": self.bogo_ops,
+        }
+
+
+def render_markdown(report: dict[str, Any]) -> str:
+    """Formats a finished report as a Markdown section"""
+    start = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(report["start"]))
+    lines = [
+        "## Stress report: " + report["mode"] + ", " + start,
+        "",
+        "- Duration: " + str(report["duration"]) + " s",
+        "- Samples: " + str(report["samples"]),
+    ]
+    stability = report.get("stability")
+    if stability is not None:
+        verdict = "PASS" if stability["passed"] else "FAIL"
+        if stability["reasons"]:
+            verdict += " (" + "; ".join(stability["reasons"]) + ")"
+        steady = stability["steady_after"]
+        lines += [
+            "- Verdict: " + verdict,
+            "- Steady state after: "
+            + ("never" if steady is None else str(steady) + " s"),
+            "- Throttled for: " + str(stability["throttled"]) + " s",
+        ]
+    throttle = report["first_throttle"]
+    if throttle is None:
+        lines.append("- First throttle: none")
+    else:
+        lines.append(
+            "- First throttle: after "
+            + str(throttle["after"])
+            + " s ("
+            + throttle["label"]
+            + ": "
+            + throttle["reason"]
+            + ")"
+        )
+    power = report["power"]
+    if power is not None:
+        lines.append(
+            "- Package power: "
+            + str(power["average"])
+            + " W average, "
+            + str(power["peak"])
+            + " W peak, "
+            + str(power["energy"])
+            + " J total"
+        )
+    frequency = report["frequency"]
+    if frequency is not None:
+        lines.append(
+            "- Frequency: "
+            + str(frequency["sustained"])
+            + " MHz sustained, "
+            + str(frequency["peak"])
+            + " MHz peak"
+        )
+    throughput = report["throughput"]
+    if throughput is not None:
+        lines.append(
+            "- Stress throughput: "
+            + str(throughput["sustained"])
+            + " ops/s sustained, "
+            + str(throughput["peak"])
+            + " ops/s peak"
+            + (
+                ""
+                if throughput["retained"] is None
+                else " (" + str(throughput["retained"]) + "% retained)"
+            )
+        )
+    if report["temperature"]:
+        lines += [
+            "",
+            "| Sensor | Peak [C] | Steady [C] |",
+            "| ------ | -------- | ---------- |",
+        ]
+        for sensor, temps in report["temperature"].items():
+            lines.append(
+                "| "
+                + sensor
+                + " | "
+                + str(temps["peak"])
+                + " | "
+                + ("N/A" if temps["steady"] is None else str(temps["steady"]))
+                + " |"
+            )
+    if report.get("bogo_ops"):
+        lines += [
+            "",
+            "| Stressor | Bogo ops | Bogo ops/s |",
+            "| -------- | -------- | ---------- |",
+        ]
+        for stressor in report["bogo_ops"]:
+            lines.append(
+                "| "
+                + stressor["stressor"]
+                + " | "
+                + str(stressor["ops"])
+                + " | "
+                + str(stressor["rate"])
+                + " |"
+            )
+    return "\n".join(lines) + "\n"
+
+
+class ReportWriter:
+    """Appends finished reports to a file
+
+    A path ending in .json gets one JSON object per line and run, any
+    other path a Markdown section per run.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def write(self, report: dict[str, Any]) -> None:
+        if self.path.endswith(".json"):
+            text = json.dumps(report, separators=(",", ":")) + "\n"
+        else:
+            text = render_markdown(report) + "\n"
+        try:
+            with open(self.path, "a") as report_file:
+                report_file.write(text)
+        except OSError as err:
+            logging.error("Failed to write the stress report to %s: %s", self.path, err)
+            return
+        logging.info("Stress report written to %s", self.path)
@@ -20,14 +20,13 @@
 
 """CPU stress and monitoring utility"""
 
-import argparse
+import asyncio
 import atexit
 import configparser
 import contextlib
 import logging
 import os
 import signal
-import subprocess
 import sys
 import time
 import timeit
@@ -36,24 +35,22 @@ from collections import OrderedDict, defaultdict
 import psutil
 import urwid
 
+from s_tui import cli, collector
+
 # Menus
 from s_tui.about_menu import AboutMenu
 from s_tui.builtin_stress_menu import BuiltinStressMenu
-from s_tui.builtin_stresser import BuiltinStresser
-from s_tui.help_menu import HELP_MESSAGE, HelpMenu
+from s_tui.builtin_stresser import STRATEGY_LABELS
+from s_tui.fleet_view import FleetView
+from s_tui.help_menu import HelpMenu
 
 # Helpers
 from s_tui.helper_functions import (
-    __version__,
     cat,
     get_processor_name,
     get_user_config_dir,
     get_user_config_file,
-    kill_child_processes,
     make_user_config_dir,
-    output_to_csv,
-    output_to_json,
-    output_to_terminal,
     seconds_to_text,
     str_to_bool,
     user_config_dir_exists,
@@ -68,43 +65,50 @@ from s_tui.power_profile_menu import (
     PowerProfileMenu,
     read_available,
 )
+from s_tui.report import ReportWriter, StressReport
+from s_tui.schedule import ScheduleRunner, load_schedule
 from s_tui.sensors_menu import SensorsMenu
+from s_tui.sinks.sink import take_sample
+from s_tui.sinks.throttle_journal import ThrottleJournal, ThrottleJournalSink
+from s_tui.sources.compare_source import Comparison
 from s_tui.sources.fan_source import FanSource
+from s_tui.sources.fleet_source import Fleet
 from s_tui.sources.freq_source import FreqSource
 from s_tui.sources.rapl_power_source import RaplPowerSource
+from s_tui.sources.remote_source import RemoteStressController, SamplerClient
+from s_tui.sources.replay_source import Replayer, open_recording, parse_temp_thresh
 from s_tui.sources.script_hook_loader import ScriptHookLoader
+from s_tui.sources.stats import SUMMARY_STATS
+from s_tui.sources.stress_source import (
+    BandwidthSource,
+    StressNgSource,
+    StressSource,
+)
 from s_tui.sources.temp_source import TempSource
 
 # Sources
 from s_tui.sources.util_source import UtilSource
+from s_tui.stress_controller import StressController
 from s_tui.stress_menu import StressMenu
 from s_tui.sturwid.bar_graph_vector import BarGraphVector
 from s_tui.sturwid.summary_text_list import SummaryTextList
 
 # Ui Elements
 from s_tui.sturwid.ui_elements import DEFAULT_PALETTE, ViListBox, button, radio_button
+from s_tui.throttle_menu import ThrottleMenu
 
 UPDATE_INTERVAL = 1
 HOOK_INTERVAL = 30 * 1000
+REPLAY_SEEK_TICKS = 30
 DEGREE_SIGN = "\N{DEGREE SIGN}"
 ZERO_TIME = seconds_to_text(0)
 
-DEFAULT_LOG_FILE = "_s-tui.log"
-
-DEFAULT_CSV_FILE = "s-tui_log_" + time.strftime("%Y-%m-%d_%H_%M_%S") + ".csv"
-
-VERSION_MESSAGE = (
-    "s-tui "
-    + __version__
-    + " - (C) 2017-2025 Alex Manuskin, Gil Tsuker\n\
-    Released under GNU GPLv2"
-)
-
 ERROR_MESSAGE = "\n\
         Oops! s-tui has encountered a fatal error\n\
         Please report this bug here: https://github.com/amanusk/s-tui"
 
 graph_controller = None
+fleet_controller = None
 
 
 class MainLoop(urwid.MainLoop):
@@ -135,87 +139,23 @@ class MainLoop(urwid.MainLoop):
         if data == "esc":
             graph_controller.view.on_menu_close()
 
-
-class StressController:
-    """
-    Responsible for storing the data related to stress test options
-    and operation
-    """
-
-    def __init__(self, stress_installed):
-        self.stress_modes = ["Monitor"]
-        self.stress_modes.append("s-tui stress")
-
-        if stress_installed:
-            self.stress_modes.append("Stress (ext)")
-
-        self.current_mode = self.stress_modes[0]
-        self.stress_process = None
-        self._builtin_stresser = None
-
-    def get_modes(self):
-        """Returns all possible stress_modes for stress operations"""
-        return self.stress_modes
-
-    def get_current_mode(self):
-        """Returns the current stress test mode, monitor/stress/other"""
-        return self.current_mode
-
-    def set_mode(self, mode):
-        """Sets a stress test mode monitor/stress/other"""
-        self.current_mode = mode
-
-    def get_stress_process(self):
-        """Returns the current external stress process running"""
-        return self.stress_process
-
-    def set_stress_process(self, proc):
-        """Sets the current stress process running"""
-        self.stress_process = proc
-
-    @property
-    def builtin_stresser(self):
-        """Lazy-init BuiltinStresser on first use.
-
-        Avoids creating multiprocessing primitives at startup, which can
-        fail in restricted environments (e.g. containers without
-        /dev/shm).
-        """
-        if self._builtin_stresser is None:
-            self._builtin_stresser = BuiltinStresser()
-        return self._builtin_stresser
-
-    def kill_stress_process(self):
-        """Kills the current running stress process"""
-        try:
-            kill_child_processes(self.stress_process)
-        except psutil.NoSuchProcess:
-            logging.debug("Stress process no longer exists")
-        self.stress_process = None
-        if self._builtin_stresser is not None:
-            self._builtin_stresser.stop()
-
-    def start_stress(self, stress_cmd):
-        """Starts a new stress process with a given cmd"""
-        with open(os.devnull, "w") as dev_null:
-            try:
-                stress_proc = subprocess.Popen(
-                    stress_cmd,
-                    stdout=dev_null,
-                    stderr=dev_null,
-                    start_new_session=True,
-                )
-                self.set_stress_process(psutil.Process(stress_proc.pid))
-            except OSError:
-                logging.debug("Unable to start stress")
-
-    def start_builtin_stress(self, num_workers, strategy=None):
-        """Starts the built-in Python CPU stresser."""
-        try:
-            self.builtin_stresser.start(num_workers, strategy=strategy)
-        except OSError as err:
-            logging.error("Unable to start built-in stresser: %s", err)
-            self.current_mode = "Monitor"
+        replayer = graph_controller.replayer
+        if replayer is not None:
+            # Seek by REPLAY_SEEK_TICKS refreshes at the current speed
+            seek = REPLAY_SEEK_TICKS * float(graph_controller.refresh_rate)
+            if data == " ":
+                replayer.toggle_pause()
+            elif data == "+":
+                replayer.faster()
+            elif data == "-":
+                replayer.slower()
+            elif data in ("left", "<"):
+                replayer.seek(-seek * replayer.speed)
+            elif data in ("right", ">"):
+                replayer.seek(seek * replayer.speed)
+            elif data == "home":
+                replayer.restart()
+            graph_controller.view.clock_view.set_text(replayer.status())
 
 
 class GraphView(urwid.WidgetPlaceholder):
@@ -240,6 +180,7 @@ class GraphView(urwid.WidgetPlaceholder):
 
         # general urwid items
         self.clock_view = urwid.Text(ZERO_TIME, align="center")
+        self.phase_view = urwid.Text("", align="center")
         self.governor_view = urwid.Text("", align="center")
         self.epp_view = urwid.Text("", align="center")
         self._update_cpu_policy()
@@ -261,9 +202,14 @@ class GraphView(urwid.WidgetPlaceholder):
 
         # construct the various menus during init phase
         self.stress_menu = StressMenu(self.on_menu_close, self.controller.stress_exe)
-        self.builtin_stress_menu = BuiltinStressMenu(self.on_menu_close)
+        self.builtin_stress_menu = BuiltinStressMenu(
+            self.on_builtin_stress_menu_close, self.controller.args.placement
+        )
         self.help_menu = HelpMenu(self.on_menu_close)
         self.about_menu = AboutMenu(self.on_menu_close)
+        self.throttle_menu = ThrottleMenu(
+            self.on_menu_close, self.controller.throttle_journal
+        )
         self.graphs_menu = SensorsMenu(
             self.on_graphs_menu_close,
             self.controller.sources,
@@ -308,6 +254,7 @@ class GraphView(urwid.WidgetPlaceholder):
             ):
                 try:
                     source.update()
+                    source.update_stats()
                     previous_error = self.source_update_errors.pop(source_name, None)
                     if previous_error is not None:
                         logging.info(
@@ -359,7 +306,16 @@ class GraphView(urwid.WidgetPlaceholder):
         self._update_cpu_policy()
 
         # Only update clock if not is stress mode
-        if self.controller.stress_controller.get_current_mode() != "Monitor":
+        if self.controller.replayer is not None:
+            self.clock_view.set_text(self.controller.replayer.status())
+        elif (
+            self.controller.remote is not None and not self.controller.remote.connected
+        ):
+            self.clock_view.set_text("offline")
+        elif (
+            self.controller.stress_controller.get_current_mode() != "Monitor"
+            or self.controller.schedule_running()
+        ):
             self.clock_view.set_text(
                 seconds_to_text(
                     timeit.default_timer() - self.controller.stress_start_time
@@ -373,15 +329,47 @@ class GraphView(urwid.WidgetPlaceholder):
         for graph in self.graphs.values():
             with contextlib.suppress(NotImplementedError):
                 graph.source.reset()
+        for source in self.controller.sources:
+            source.reset_stats()
         # Reset clock
         self.clock_view.set_text(ZERO_TIME)
 
         self.update_displayed_information()
 
+    def set_pinned_cpus(self, cpus):
+        """Marks the per-core graphs of the CPUs running pinned stress"""
+        names = {"Core " + str(cpu) for cpu in cpus}
+        for graph in self.graphs.values():
+            graph.set_highlighted(
+                idx
+                for idx, sensor in enumerate(graph.source.get_sensor_list())
+                if sensor in names
+            )
+
+    def set_phase(self, text, title="Phase"):
+        """Shows the current schedule phase, or another stage of the stress
+        such as the workload of a rotation, in the sidebar and graph titles"""
+        if text == self.phase_view.text:
+            return
+        self.phase_view.set_text(text)
+        for graph in self.graphs.values():
+            graph.set_annotation(title + " " + text if text else "")
+
     def on_menu_close(self):
         """Return to main screen"""
         self.original_widget = self.main_window_w
 
+    def on_builtin_stress_menu_close(self):
+        """Return to main screen, running workers take the new load and
+        rotate period at once"""
+        stress_controller = self.controller.stress_controller
+        if not self.controller.schedule_running():
+            stress_controller.set_builtin_duty(self.builtin_stress_menu.get_duty())
+        stress_controller.set_builtin_rotate_period(
+            self.builtin_stress_menu.get_rotate_period()
+        )
+        self.original_widget = self.main_window_w
+
     def on_graphs_menu_close(self, update):
         """Return to main screen and update sensor that
         are active in the view"""
@@ -440,6 +428,11 @@ class GraphView(urwid.WidgetPlaceholder):
         """Open About menu"""
         self._open_menu_overlay(self.about_menu)
 
+    def on_throttle_menu_open(self, widget):
+        """Open the throttle episodes of this run"""
+        self.throttle_menu.refresh()
+        self._open_menu_overlay(self.throttle_menu)
+
     def on_graphs_menu_open(self, widget):
         """Open Sensor menu on top of existing frame"""
         self._open_menu_overlay(self.graphs_menu)
@@ -501,6 +494,15 @@ class GraphView(urwid.WidgetPlaceholder):
 
         self.show_graphs()
 
+    def on_summary_stat_button(self, w):
+        """Shows the next statistic in the summaries"""
+        stats = list(SUMMARY_STATS)
+        stat = stats[(stats.index(self.controller.summary_stat) + 1) % len(stats)]
+        self.controller.set_summary_stat(stat)
+        w.set_label("Summary: " + stat)
+        for summary in self.visible_summaries.values():
+            summary.update()
+
     def on_save_settings(self, w=None):
         """Calls controller save settings method"""
         self.controller.save_settings()
@@ -531,6 +533,7 @@ class GraphView(urwid.WidgetPlaceholder):
             control_options.append(
                 button("Power Profile", self.on_power_profile_menu_open)
             )
+        control_options.append(button("Throttle log", self.on_throttle_menu_open))
         control_options.append(button("Reset", self.on_reset_button))
         control_options.append(button("Help", self.on_help_menu_open))
         control_options.append(button("About", self.on_about_menu_open))
@@ -556,6 +559,8 @@ class GraphView(urwid.WidgetPlaceholder):
             urwid.Text(("bold text", "Stress Timer"), align="center"),
             self.clock_view,
         ]
+        if self.controller.args.schedule is not None:
+            clock_widget.append(self.phase_view)
 
         controls = [urwid.Text(("bold text", "Modes"), align="center")]
         controls += self.mode_buttons
@@ -569,6 +574,10 @@ class GraphView(urwid.WidgetPlaceholder):
             urwid.Text(("bold text", "Visual Options"), align="center"),
             unicode_checkbox,
             self.refresh_rate_ctrl,
+            button(
+                "Summary: " + self.controller.summary_stat,
+                self.on_summary_stat_button,
+            ),
             urwid.Divider(),
             urwid.Text(("bold text", "Summaries"), align="center"),
         ]
@@ -767,6 +776,13 @@ class GraphController:
             ):
                 logging.debug("No user config for utf8")
 
+            try:
+                stat = self.conf.get("GraphControl", "SUMMARYSTAT")
+                if stat in SUMMARY_STATS:
+                    self.summary_stat = stat
+            except (configparser.NoOptionError, configparser.NoSectionError):
+                logging.debug("No user config for summary statistic")
+
             if t_thresh is None:
                 try:
                     self.temp_thresh = self.conf.get("GraphControl", "TTHRESH")
@@ -788,6 +804,9 @@ class GraphController:
             UtilSource(),
             RaplPowerSource(),
             FanSource(),
+            StressSource(self.stress_controller),
+            BandwidthSource(self.stress_controller),
+            StressNgSource(self.stress_controller, self.stress_exe),
         ]
 
         # Load sensors config if available
@@ -833,7 +852,7 @@ class GraphController:
 
         return StressController(stress_installed)
 
-    def __init__(self, args):
+    def __init__(self, args, replayer=None, remote=None):
         self.conf = None
         self.script_hooks_enabled = True
         self.script_loader = None
@@ -846,13 +865,20 @@ class GraphController:
         self.graphs_default_conf = defaultdict(dict)
 
         self.temp_thresh = None
-
-        possible_sources = self._load_config(args.t_thresh)
+        self.summary_stat = "last"
+        # Throttle episodes of this run, also written by --throttle-log
+        self.throttle_journal = ThrottleJournal()
 
         # Needed for use in view
         self.args = args
 
         self.stress_controller = self._config_stress()
+        possible_sources = self._load_config(args.t_thresh)
+        if args.summary_stat in SUMMARY_STATS:
+            self.summary_stat = args.summary_stat
+
+        if remote is not None:
+            self.stress_controller = RemoteStressController(remote)
 
         self.powerprofilesctl_exe = which("powerprofilesctl")
 
@@ -861,22 +887,106 @@ class GraphController:
         self.stress_start_time = 0
 
         # construct sources
-        self.sources = [s for s in possible_sources if s.get_is_available()]
+        self.replayer = replayer
+        self.remote = remote
+        if remote is not None:
+            # The sampler reads the sensors and runs the threshold scripts
+            self.script_hooks_enabled = False
+            self.sources = remote.get_sources(self.temp_thresh)
+        elif replayer is not None:
+            # Replayed data must not trigger the threshold scripts
+            self.script_hooks_enabled = False
+            self.sources = replayer.get_sources(self.temp_thresh)
+            for source_name, conf in replayer.default_graphs_conf().items():
+                for sensor, visible in conf.items():
+                    self.graphs_default_conf[source_name].setdefault(sensor, visible)
+        else:
+            self.sources = [s for s in possible_sources if s.get_is_available()]
+            for source in self.sources:
+                if isinstance(source, StressSource):
+                    for source_name, conf in source.default_graphs_conf().items():
+                        for sensor, visible in conf.items():
+                            self.graphs_default_conf[source_name].setdefault(
+                                sensor, visible
+                            )
+        for source in self.sources:
+            source.summary_stat = self.summary_stat
+            source.stats.set_window(args.stats_window)
 
         # The view has a reference to the controller and visa versa
         self.view = GraphView(self)
 
-        # Update csv file to save
-        self.csv_file = None
-        self.save_csv = args.csv
-        if args.csv_file is not None:
-            self.csv_file = args.csv_file
-            logging.info("Printing output to csv %s", self.csv_file)
-        elif args.csv_file is None and args.csv:
-            self.csv_file = DEFAULT_CSV_FILE
+        # Output sinks (e.g. csv), created by main() before the loop starts
+        self.sinks = []
+        # Summary of the current stress run, written when the run ends
+        self.report_writer = ReportWriter(args.report) if args.report else None
+        self.stress_report = None
+        # Report of a stress-ng run that is stopping, with its end
+        self.stopping_report = None
+        # A --schedule drives the stress mode until it ends or is overridden
+        self.schedule = None
+        # Whether samples carry the workload of a rotation
+        self.rotation_seen = False
         # Debug counter
         self.debug_run_counter = 0
 
+    def set_summary_stat(self, stat):
+        """Selects the statistic shown in the summaries"""
+        self.summary_stat = stat
+        for source in self.sources:
+            source.summary_stat = stat
+
+    def start_schedule(self, phases):
+        """Stresses along *phases* of a schedule"""
+        stress_exe = None
+        if self.args.schedule_stress == "external":
+            stress_exe = self.stress_exe
+        self.schedule = ScheduleRunner(
+            phases,
+            self.stress_controller,
+            stress_exe,
+            strategy=self.view.builtin_stress_menu.get_strategy(),
+        )
+        self.stress_controller.set_builtin_placement(
+            self.view.builtin_stress_menu.get_placement()
+        )
+        self.stress_controller.set_builtin_rotate_period(
+            self.view.builtin_stress_menu.get_rotate_period()
+        )
+        self.stress_start_time = timeit.default_timer()
+        self.schedule.start()
+
+    def schedule_running(self):
+        return self.schedule is not None and not self.schedule.finished
+
+    def _tick_schedule(self):
+        """Applies the load of the schedule, returns the sample annotations"""
+        schedule = self.schedule
+        if schedule is None:
+            return None
+        annotations = schedule.tick()
+        mode = self.stress_controller.get_current_mode()
+        self.view.set_pinned_cpus(self.stress_controller.get_builtin_cpus())
+        for mode_button in self.view.mode_buttons:
+            radio = mode_button.original_widget
+            if radio.get_label() == mode and not radio.get_state():
+                radio.set_state(True, do_callback=False)
+        if not schedule.finished:
+            self.view.set_phase(schedule.status())
+        return annotations
+
+    def _tick_rotation(self):
+        """Shows the workload of a rotating built-in stress, returns the
+        sample annotations once a rotation ran"""
+        workload = self.stress_controller.get_builtin_rotation()
+        label = "" if workload is None else STRATEGY_LABELS[workload]
+        if not self.schedule_running():
+            self.view.set_phase(label, "Workload")
+        if workload is not None:
+            self.rotation_seen = True
+        # Keep the column once it exists, like the schedule columns
+        return {"Workload": label} if self.rotation_seen else None
+
     def set_mode(self, mode):
         """Allow our view to set the mode."""
         self.stress_controller.set_mode(mode)
@@ -884,6 +994,14 @@ class GraphController:
 
     def main(self):
         """Starts the main loop and graph animation"""
+        # Replays are not saved again
+        if not self.replayer:
+            try:
+                self.sinks = collector.build_sinks(self.args, self.throttle_journal)
+            except (OSError, ValueError) as err:
+                logging.error("Unable to create output: %s", err)
+                sys.stderr.write("s-tui: " + str(err) + "\n")
+                sys.exit(2)
         loop = MainLoop(
             self.view,
             DEFAULT_PALETTE,
@@ -891,8 +1009,8 @@ class GraphController:
             # screen=urwid.curses_display.Screen()
         )
         self.view.show_graphs()
-        self.animate_graph(loop)
         try:
+            self.animate_graph(loop)
             loop.run()
         except ZeroDivisionError as err:
             # In case of Zero division, we want an error to return, and
@@ -916,7 +1034,14 @@ class GraphController:
     def update_stress_mode(self):
         """Updates stress mode according to radio buttons state"""
 
+        schedule = self.schedule
+        if schedule is not None and not schedule.finished:
+            # Choosing a mode by hand takes over from the schedule
+            schedule.cancel()
+            self.view.set_phase("")
+        # stress-ng reports its metrics as it stops, before the report ends
         self.stress_controller.kill_stress_process()
+        self.finish_stress_report()
 
         # Start a new clock upon starting a new stress test
         self.view.clock_view.set_text(ZERO_TIME)
@@ -925,12 +1050,63 @@ class GraphController:
         if self.stress_controller.get_current_mode() == "s-tui stress":
             num_workers = self.view.builtin_stress_menu.get_num_workers()
             strategy = self.view.builtin_stress_menu.get_strategy()
+            self.stress_controller.set_builtin_duty(
+                self.view.builtin_stress_menu.get_duty()
+            )
+            self.stress_controller.set_builtin_placement(
+                self.view.builtin_stress_menu.get_placement()
+            )
+            self.stress_controller.set_builtin_rotate_period(
+                self.view.builtin_stress_menu.get_rotate_period()
+            )
             self.stress_controller.start_builtin_stress(num_workers, strategy)
 
         elif self.stress_controller.get_current_mode() == "Stress (ext)":
             stress_cmd = self.view.stress_menu.get_stress_cmd()
             self.stress_controller.start_stress(stress_cmd)
 
+        mode = self.stress_controller.get_current_mode()
+        self.view.set_pinned_cpus(self.stress_controller.get_builtin_cpus())
+        if self.report_writer is not None and mode != "Monitor":
+            self.stress_report = StressReport(mode)
+
+    def _check_stress_exited(self):
+        """Ends an external stress run that stopped on its own, e.g. at the
+        end of its -t timeout, and goes back to monitoring"""
+        controller = self.stress_controller
+        if (
+            controller.get_current_mode() != "Stress (ext)"
+            or self.schedule_running()
+            or not controller.stress_exited()
+        ):
+            return
+        logging.info("External stress ended")
+        controller.kill_stress_process()
+        controller.set_mode("Monitor")
+        self.finish_stress_report()
+        for mode_button in self.view.mode_buttons:
+            radio = mode_button.original_widget
+            if radio.get_label() == "Monitor":
+                radio.set_state(True, do_callback=False)
+
+    def _follow_remote_stress(self):
+        """Shows the stress mode of the sampler, set by any of its viewers"""
+        controller = self.stress_controller
+        if not isinstance(controller, RemoteStressController):
+            return
+        state = controller.sync()
+        if state is None:
+            return
+        self.view.clock_view.set_text(ZERO_TIME)
+        if state["started"] is not None:
+            self.stress_start_time = timeit.default_timer() - (
+                time.time() - state["started"]
+            )
+        for mode_button in self.view.mode_buttons:
+            radio = mode_button.original_widget
+            if radio.get_label() == state["mode"]:
+                radio.set_state(True, do_callback=False)
+
     def save_settings(self):
         """Save the current configuration to a user config file"""
         # Build source lookup dict once for O(1) access
@@ -973,26 +1149,109 @@ class GraphController:
             # Save the configured t_thresh
             if self.temp_thresh:
                 conf.set("GraphControl", "TTHRESH", str(self.temp_thresh))
+            conf.set("GraphControl", "SUMMARYSTAT", self.summary_stat)
 
             _save_displayed_setting(conf, "Graphs")
             _save_displayed_setting(conf, "Summaries")
             conf.write(cfgfile)
 
+    def finish_stress_report(self):
+        """Ends the report of the stress run in progress, if any.  The
+        report of a stress-ng run is written once stress-ng stopped and
+        reported its metrics."""
+        report = self.stress_report
+        if report is None:
+            return
+        self.stress_report = None
+        self._write_stopping_report()
+        end = time.monotonic()
+        if report.mode == "Stress (ext)" and self.stress_controller.poll_stress_ng():
+            self.stopping_report = (report, end)
+        else:
+            self._write_stress_report(report, end)
+
+    def _check_stopping_report(self):
+        """Writes the report of a stopping stress-ng run once it stopped"""
+        if self.stopping_report is not None and not (
+            self.stress_controller.poll_stress_ng()
+        ):
+            self._write_stopping_report()
+
+    def _write_stopping_report(self):
+        if self.stopping_report is not None:
+            self._write_stress_report(*self.stopping_report)
+            self.stopping_report = None
+
+    def _write_stress_report(self, report, end):
+        if report.mode == "Stress (ext)":
+            report.set_bogo_ops(
+                self.stress_controller.get_last_stress_ng_metrics().values()
+            )
+        if self.report_writer is not None:
+            self.report_writer.write(report.finish(end))
+
+    def close_stress_report(self):
+        """Writes the pending reports when s-tui exits, after stress-ng
+        stopped"""
+        self.stress_controller.wait_stress_ng()
+        self.finish_stress_report()
+        self._write_stopping_report()
+
+    def _update_stress_report(self, sample):
+        """Feeds the report of the current stress run"""
+        mode = self.stress_controller.get_current_mode()
+        if self.stress_report is not None and self.stress_report.mode != mode:
+            # A viewer of a shared sampler may see the mode change directly
+            self.finish_stress_report()
+        if mode == "Monitor":
+            return
+        if self.stress_report is None:
+            self.stress_report = StressReport(mode)
+        self.stress_report.add(sample)
+
     def exit_program(self):
         """Kill all stress operations upon exit"""
         self.stress_controller.kill_stress_process()
+        self.finish_stress_report()
         raise urwid.ExitMainLoop()
 
+    def close_sinks(self):
+        """Flush and close all output sinks"""
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except OSError as err:
+                logging.error("Failed to close sink %s: %s", sink, err)
+        self.sinks = []
+
     def animate_graph(self, loop, user_data=None):
         """
         Update the graph and schedule the next update
         This is where the magic happens
         """
+        if self.replayer is not None:
+            self.replayer.advance(float(self.refresh_rate))
+        if self.remote is not None:
+            self._follow_remote_stress()
+        self._check_stress_exited()
+        annotations = None
+        if self.schedule is not None:
+            annotations = self._tick_schedule()
+        rotation = self._tick_rotation()
+        if rotation is not None:
+            annotations = {**(annotations or {}), **rotation}
+
         self.view.update_displayed_information()
 
-        # Save to CSV if configured
-        if (self.save_csv or self.csv_file is not None) and self.csv_file is not None:
-            output_to_csv(self.view.summaries, self.csv_file)
+        # Save to CSV and other configured sinks
+        sample = take_sample(self.sources, annotations, self.args.stats)
+        for sink in self.sinks:
+            sink.write(sample)
+        if not any(isinstance(sink, ThrottleJournalSink) for sink in self.sinks):
+            self.throttle_journal.add(sample)
+        if self.report_writer is not None:
+            self._check_stopping_report()
+            self._update_stress_report(sample)
 
         # Set next update
         self.animate_alarm = loop.set_alarm_in(
@@ -1006,127 +1265,165 @@ class GraphController:
                 self.exit_program()
 
 
-def main():
-    args = get_args()
-    # Print version and exit
-    if args.version:
-        print(VERSION_MESSAGE)
-        sys.exit(0)
-
-    # Setup logging util
-    log_file = DEFAULT_LOG_FILE
-    if args.debug_run:
-        args.debug = True
-
-    log_formatter = logging.Formatter(
-        "%(asctime)s [%(funcName)s()] [%(levelname)-5.5s]  %(message)s"
-    )
-    root_logger = logging.getLogger()
-
-    if args.debug or args.debug_file is not None:
-        level = logging.DEBUG
-        if args.debug_file is not None:
-            log_file = args.debug_file
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(log_formatter)
-        root_logger.addHandler(file_handler)
-    else:
-        level = logging.ERROR
-    root_logger.setLevel(level)
-
-    if args.terminal or args.json:
-        logging.info("Printing single line to terminal")
-        sources = [
-            FreqSource(),
-            TempSource(),
-            UtilSource(),
-            RaplPowerSource(),
-            FanSource(),
-        ]
-        if args.terminal:
-            output_to_terminal(sources)
-        elif args.json:
-            output_to_json(sources)
+class FleetLoop(MainLoop):
+    """Main loop of the fleet view, Esc goes back from a node's graphs"""
+
+    def unhandled_input(self, data):  # type: ignore[override]
+        if graph_controller is None:
+            if data == "q":
+                raise urwid.ExitMainLoop()
+            return
+        view = graph_controller.view
+        if (
+            data == "esc"
+            and view.original_widget is view.main_window_w
+            and fleet_controller is not None
+        ):
+            fleet_controller.show_fleet()
+            return
+        super().unhandled_input(data)
 
-    global graph_controller
-    graph_controller = GraphController(args)
-    atexit.register(graph_controller.stress_controller.kill_stress_process)
-    graph_controller.main()
 
+class FleetController:
+    """Shows a row per agent of a fleet and the graphs of one node
 
-def get_args():
-    parser = argparse.ArgumentParser(
-        description=HELP_MESSAGE, formatter_class=argparse.RawTextHelpFormatter
-    )
-
-    parser.add_argument(
-        "-d",
-        "--debug",
-        default=False,
-        action="store_true",
-        help="Output debug log to _s-tui.log",
-    )
-    parser.add_argument(
-        "--debug-file",
-        default=None,
-        help="Use a custom debug file. Default: " + "_s-tui.log",
-    )
-    # This is mainly to be used for testing purposes
-    parser.add_argument(
-        "-dr",
-        "--debug_run",
-        default=False,
-        action="store_true",
-        help="Run for 5 seconds and quit",
-    )
-    parser.add_argument(
-        "-c", "--csv", action="store_true", default=False, help="Save stats to csv file"
-    )
-    parser.add_argument(
-        "--csv-file",
-        default=None,
-        help="Use a custom CSV file. Default: " + "s-tui_log_<TIME>.csv",
-    )
-    parser.add_argument(
-        "-t",
-        "--terminal",
-        action="store_true",
-        default=False,
-        help="Display a single line of stats without tui",
-    )
-    parser.add_argument(
-        "-j",
-        "--json",
-        action="store_true",
-        default=False,
-        help="Display a single line of stats in JSON format",
-    )
-    parser.add_argument(
-        "-nm",
-        "--no-mouse",
-        action="store_true",
-        default=False,
-        help="Disable Mouse for TTY systems",
-    )
-    parser.add_argument(
-        "-v", "--version", default=False, action="store_true", help="Display version"
-    )
-    parser.add_argument(
-        "-tt",
-        "--t_thresh",
-        default=None,
-        help="High Temperature threshold. Default: 80",
-    )
-    parser.add_argument(
-        "-r",
-        "--refresh-rate",
-        dest="refresh_rate",
-        default="2.0",
-        help="Refresh rate in seconds. Default: 2.0",
-    )
-    args = parser.parse_args()
-    return args
+    The agent connections run on the asyncio loop that also drives urwid,
+    so the nodes are only touched from one thread.
+    """
+
+    def __init__(self, args, fleet):
+        self.args = args
+        self.fleet = fleet
+        self.refresh_rate = args.refresh_rate
+        self.temp_thresh = parse_temp_thresh(args.t_thresh)
+        self.view = FleetView(self)
+        # Graphs of a node are built on the first drill-down and kept
+        self.node_controllers = {}
+        self.loop = None
+        self.animate_alarm = None
+        self.debug_run_counter = 0
+
+    def on_node_selected(self, index):
+        global graph_controller
+        node = self.fleet.nodes[index]
+        if not node.sources:
+            return
+        controller = self.node_controllers.get(index)
+        if controller is None:
+            # Node graphs are not saved, and all share the fleet's outputs
+            controller = GraphController(self.args, remote=node)
+            self._replay_history(controller, node)
+            self.node_controllers[index] = controller
+        graph_controller = controller
+        self.view.show_node(controller.view)
+        controller.animate_graph(self.loop)
+
+    @staticmethod
+    def _replay_history(controller, node):
+        """Fills the new graphs with the samples buffered for the node"""
+        latest = node.current
+        for sample in list(node.history)[:-1]:
+            node.current = sample
+            controller.view.update_displayed_information()
+        node.current = latest
+
+    def show_fleet(self):
+        global graph_controller
+        if graph_controller is not None:
+            if self.loop is not None:
+                self.loop.remove_alarm(graph_controller.animate_alarm)
+            graph_controller = None
+        self.view.show_fleet()
+        self.view.update(self.temp_thresh)
+
+    def animate(self, loop, user_data=None):
+        if self.view.showing_fleet():
+            self.view.update(self.temp_thresh)
+        self.animate_alarm = loop.set_alarm_in(float(self.refresh_rate), self.animate)
+
+        if self.args.debug_run:
+            self.debug_run_counter += int(float(self.refresh_rate))
+            if self.debug_run_counter >= 8:
+                raise urwid.ExitMainLoop()
+
+    def main(self):
+        event_loop = asyncio.new_event_loop()
+        self.loop = FleetLoop(
+            self.view,
+            DEFAULT_PALETTE,
+            handle_mouse=not self.args.no_mouse,
+            event_loop=urwid.AsyncioEventLoop(loop=event_loop),
+        )
+        self.fleet.start(event_loop)
+        self.animate(self.loop)
+        try:
+            self.loop.run()
+        finally:
+            event_loop.run_until_complete(self.fleet.close())
+            event_loop.close()
+
+
+def main(args):
+    """Runs the TUI, or the fleet view, configured by *args*"""
+    if args.fleet is not None:
+        try:
+            fleet = Fleet(args.fleet)
+        except ValueError as err:
+            sys.stderr.write(str(err) + "\n")
+            sys.exit(2)
+        global fleet_controller
+        fleet_controller = FleetController(args, fleet)
+        fleet_controller.main()
+        return
+
+    remote = None
+    if args.connect is not None:
+        remote = SamplerClient(args.connect)
+        try:
+            remote.connect()
+        except (OSError, ValueError) as err:
+            sys.stderr.write("Cannot connect to the sampler: " + str(err) + "\n")
+            sys.exit(1)
+
+    replayer = None
+    try:
+        if args.compare is not None:
+            replayer = Comparison(
+                open_recording(args.compare[0]),
+                open_recording(args.compare[1]),
+                args.replay_speed,
+                args.compare_threshold,
+            )
+        elif args.replay is not None:
+            replayer = Replayer(open_recording(args.replay), args.replay_speed)
+    except (OSError, ValueError) as err:
+        sys.stderr.write("Cannot replay: " + str(err) + "\n")
+        sys.exit(1)
+
+    phases = None
+    if args.schedule is not None:
+        if replayer is not None or remote is not None:
+            sys.stderr.write("--schedule needs the local sensors\n")
+            sys.exit(2)
+        try:
+            phases = load_schedule(args.schedule)
+        except (OSError, ValueError) as err:
+            sys.stderr.write("Cannot load the schedule: " + str(err) + "\n")
+            sys.exit(2)
+
+    global graph_controller
+    graph_controller = GraphController(args, replayer, remote)
+    if replayer is not None:
+        atexit.register(replayer.close)
+    if remote is not None:
+        atexit.register(remote.close)
+    atexit.register(graph_controller.stress_controller.close)
+    atexit.register(graph_controller.close_sinks)
+    atexit.register(graph_controller.close_stress_report)
+    if phases is not None:
+        graph_controller.start_schedule(phases)
+    graph_controller.main()
 
 
 if __name__ == "__main__":
-    main()
+    cli.main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Scripted stress schedules
+
+A schedule is a list of phases, separated by commas or new lines::
+
+    idle 60s, 25% 120s, 50% 120s, 100% 10m, idle 5m
+    ramp 0%-100% 5m          # linear ramp
+    cycle 100%/0% 20s 10m    # square wave: 10 s at 100%, 10 s idle
+
+Loads are a share of the CPUs and durations use the units of the log
+rotation options (s, m, h, d).  The ScheduleRunner follows the phases
+on the monotonic clock and drives a StressController accordingly.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from s_tui.sinks.rotation import parse_duration
+
+if TYPE_CHECKING:
+    from s_tui.sources.remote_source import RemoteStressController
+    from s_tui.stress_controller import StressController
+
+_LOAD = r"(idle|[0-9]*\.?[0-9]+%)"
+
+
+def parse_load(text: str) -> float:
+    """Parses "idle" or a percentage such as "50%" """
+    if text == "idle":
+        return 0.0
+    match = re.match(r"\A([0-9]*\.?[0-9]+)%\Z", text)
+    if not match or float(match.group(1)) > 100:
+        raise ValueError("Invalid load: " + text)
+    return float(match.group(1))
+
+
+class Phase(NamedTuple):
+    """One step of a schedule, *start* and *end* are loads in percent"""
+
+    label: str
+    start: float
+    end: float
+    duration: float
+    # Square wave period, alternating between start and end
+    period: float | None = None
+
+    def load_at(self, elapsed: float) -> float:
+        if self.period is not None:
+            return self.start if elapsed % self.period < self.period / 2 else self.end
+        fraction = min(max(elapsed / self.duration, 0.0), 1.0)
+        return self.start + (self.end - self.start) * fraction
+
+
+def parse_phase(text: str) -> Phase:
+    words = text.split()
+    # "load" is optional filler, as in "25% load 120s"
+    words = [word for word in words if word != "load"]
+    label = " ".join(words)
+    if len(words) == 2:
+        load = parse_load(words[0]) if "-" not in words[0] else None
+        if load is not None:
+            return Phase(label, load, load, parse_duration(words[1]))
+        words = ["ramp", *words]
+    if len(words) == 3 and words[0] == "ramp":
+        match = re.match(r"\A" + _LOAD + "-" + _LOAD + r"\Z", words[1])
+        if match:
+            return Phase(
+                label,
+                parse_load(match.group(1)),
+                parse_load(match.group(2)),
+                parse_duration(words[2]),
+            )
+    if len(words) == 4 and words[0] == "cycle":
+        match = re.match(r"\A" + _LOAD + "/" + _LOAD + r"\Z", words[1])
+        if match:
+            return Phase(
+                label,
+                parse_load(match.group(1)),
+                parse_load(match.group(2)),
+                parse_duration(words[3]),
+                parse_duration(words[2]),
+            )
+    raise ValueError("Invalid schedule phase: " + text)
+
+
+def parse_schedule(text: str) -> list[Phase]:
+    """Parses a schedule, raises ValueError naming the bad phase"""
+    phases = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0]
+        for part in re.split(r"[,;]", line):
+            if part.strip():
+                phases.append(parse_phase(part.strip()))
+    if not phases:
+        raise ValueError("The schedule has no phases")
+    return phases
+
+
+def load_schedule(path: str) -> list[Phase]:
+    with open(path) as schedule_file:
+        return parse_schedule(schedule_file.read())
+
+
+class ScheduleRunner:
+    """Applies the load of the current phase to a StressController
+
+    The built-in stress runs a worker per CPU and sets the load as
+    their duty level, which follows a ramp without restarting them.
+    The external stress has no partial load, so the load is spread by
+    the number of workers (25% of 8 CPUs runs 2) and they are restarted
+    whenever that number changes.
+    """
+
+    def __init__(
+        self,
+        phases: list[Phase],
+        controller: StressController | RemoteStressController,
+        stress_exe: str | None = None,
+        cpus: int | None = None,
+        strategy: str | None = None,
+    ) -> None:
+        self.phases = phases
+        self.controller = controller
+        # With a stress executable the external stress is driven
+        self.stress_exe = stress_exe
+        self.cpus = cpus or os.cpu_count() or 1
+        self.strategy = strategy
+        self.started: float | None = None
+        self.index = -1
+        self.load = 0.0
+        self.workers = 0
+        self.finished = False
+
+    @property
+    def duration(self) -> float:
+        return sum(phase.duration for phase in self.phases)
+
+    def start(self, now: float | None = None) -> None:
+        if self.stress_exe is None:
+            # Load steps must not wait for workers to start up
+            self.controller.prefork_builtin_stress(self.cpus)
+        self.started = time.monotonic() if now is None else now
+        self.tick(self.started)
+
+    def _locate(self, elapsed: float) -> tuple[int, float]:
+        """Returns the phase at *elapsed* and the time spent in it"""
+        for index, phase in enumerate(self.phases):
+            if elapsed < phase.duration:
+                return index, elapsed
+            elapsed -= phase.duration
+        return len(self.phases), 0.0
+
+    def _set_workers(self, workers: int) -> None:
+        if workers == self.workers:
+            return
+        self.workers = workers
+        self.controller.kill_stress_process()
+        if workers == 0:
+            self.controller.set_mode("Monitor")
+        elif self.stress_exe is not None:
+            self.controller.set_mode("Stress (ext)")
+            self.controller.start_stress([self.stress_exe, "-c", str(workers)])
+        else:
+            self.controller.set_mode("s-tui stress")
+            self.controller.start_builtin_stress(workers, self.strategy)
+
+    def tick(self, now: float | None = None) -> dict[str, Any]:
+        """Applies the load due at *now*, returns annotations for a sample"""
+        if self.started is None:
+            return {}
+        if self.finished:
+            # Keep the annotation columns of CSV logs stable
+            return {"Phase": "", "Load": 0.0}
+        now = time.monotonic() if now is None else now
+        index, elapsed = self._locate(now - self.started)
+        if index != self.index:
+            self.index = index
+            if index < len(self.phases):
+                logging.info("Schedule phase %s", self.status())
+        if index >= len(self.phases):
+            self.stop()
+            return {"Phase": "", "Load": 0.0}
+        phase = self.phases[index]
+        self.load = phase.load_at(elapsed)
+        if self.load == 0:
+            self._set_workers(0)
+        elif self.stress_exe is not None:
+            self._set_workers(max(round(self.load / 100 * self.cpus), 1))
+        else:
+            self.controller.set_builtin_duty(self.load / 100)
+            self._set_workers(self.cpus)
+        return {"Phase": self.status(), "Load": round(self.load, 1)}
+
+    def status(self) -> str:
+        """Current phase, e.g. "3/5 50% 120s" """
+        if self.finished or not 0 <= self.index < len(self.phases):
+            return ""
+        return (
+            str(self.index + 1)
+            + "/"
+            + str(len(self.phases))
+            + " "
+            + self.phases[self.index].label
+        )
+
+    def cancel(self) -> None:
+        """Ends the schedule, leaving the stress to the caller"""
+        if not self.finished:
+            self.finished = True
+            logging.info("Schedule cancelled")
+
+    def stop(self) -> None:
+        """Ends the schedule and its stress"""
+        if self.finished:
+            return
+        self.finished = True
+        self._set_workers(0)
+        logging.info("Schedule finished")
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Writes samples as rows of a CSV file"""
+
+from __future__ import annotations
+
+import csv
+import logging
+import os
+import time
+from array import array
+from typing import IO, Any
+
+from s_tui.sinks.rotation import LogRotator
+from s_tui.sinks.sink import FlushPolicy, Sample, SampleReader, Sink
+
+TIME_FORMAT = "%Y-%m-%d_%H:%M:%S"
+
+# CSV headers only carry "Source:sensor", units are known per source
+SOURCE_UNITS = {
+    "Temp": "C",
+    "Frequency": "MHz",
+    "Util": "%",
+    "Power": "W",
+    "Fan": "RPM",
+    "Stress": "ops/s",
+    "Bandwidth": "GB/s",
+    "stress-ng": "bogo ops/s",
+}
+
+
+def format_time(timestamp: float) -> str:
+    """Formats a sample time as used in the "Time" column"""
+    millis = int((timestamp % 1) * 1000)
+    return time.strftime(TIME_FORMAT, time.localtime(timestamp)) + f".{millis:03d}"
+
+
+def parse_time(text: str) -> float:
+    """Parses a "Time" column value back into a timestamp"""
+    stamp, _, millis = text.partition(".")
+    timestamp = time.mktime(time.strptime(stamp, TIME_FORMAT))
+    if millis:
+        timestamp += int(millis) / 1000
+    return timestamp
+
+
+def _read_header(path: str) -> list[str] | None:
+    try:
+        with open(path, newline="") as csvfile:
+            return next(csv.reader(csvfile), None)
+    except OSError:
+        return None
+
+
+class CsvSink(Sink):
+    """Keeps a CSV file open and appends one row per sample
+
+    The column order is fixed by the first sample.  Rows are buffered and
+    written according to the flush policy.  If the set of sensors changes
+    mid-run, the current file is closed and a new numbered file is
+    started with a fresh header, so columns never get misaligned.
+    An optional LogRotator rotates the file by size or age.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_policy: FlushPolicy | None = None,
+        fsync: bool = False,
+        rotator: LogRotator | None = None,
+    ) -> None:
+        self.base_path = path
+        self.path = path
+        self.part = 0
+        self.flush_policy = flush_policy or FlushPolicy()
+        self.fsync = fsync
+        self.rotator = rotator
+        self.columns: list[str] | None = None
+        self.stat_columns: list[str] = []
+        self.annotation_columns: list[str] = []
+        self.rows: list[list[Any]] = []
+        self.csvfile: IO[str] | None = None
+        self.writer = None
+        self.existing_header: list[str] | None = None
+        self.header_pending = False
+        self.reopen()
+
+    def reopen(self) -> None:
+        if self.csvfile is not None:
+            self._close_file()
+        self.existing_header = _read_header(self.path)
+        self.header_pending = self.existing_header is None
+        self.csvfile = open(self.path, "a", newline="")  # noqa: SIM115
+        self.writer = csv.writer(self.csvfile)
+        if self.rotator is not None:
+            self.rotator.opened()
+        logging.info("Writing CSV samples to %s", self.path)
+
+    def _next_path(self) -> str:
+        self.part += 1
+        root, ext = os.path.splitext(self.base_path)
+        return root + "." + str(self.part) + ext
+
+    def _rotate(self) -> None:
+        """Continue in a new numbered file, e.g. log.1.csv"""
+        self._close_file()
+        self.path = self._next_path()
+        while os.path.exists(self.path):
+            self.path = self._next_path()
+        logging.info("CSV columns changed, continuing in %s", self.path)
+        self.reopen()
+
+    def _header(self) -> list[str]:
+        assert self.columns is not None
+        return [
+            "Time",
+            *self.columns,
+            "Throttle",
+            *self.stat_columns,
+            *self.annotation_columns,
+        ]
+
+    def write(self, sample: Sample) -> None:
+        if self.writer is None:
+            return
+        columns = sample.columns()
+        stat_columns = sample.stat_columns()
+        annotation_columns = sample.annotation_columns()
+        if (
+            columns != self.columns
+            or stat_columns != self.stat_columns
+            or annotation_columns != self.annotation_columns
+        ):
+            sensors_changed = self.columns is not None
+            self.columns = columns
+            self.stat_columns = stat_columns
+            self.annotation_columns = annotation_columns
+            if sensors_changed or self.existing_header not in (None, self._header()):
+                self._rotate()
+        if self.header_pending:
+            self.rows.append(self._header())
+            self.header_pending = False
+        self.rows.append(
+            [
+                format_time(sample.time),
+                *["" if v is None else v for v in sample.values()],
+                sample.throttle,
+                *["" if v is None else v for v in sample.stat_values()],
+                *sample.annotations.values(),
+            ]
+        )
+        if self.flush_policy.row_written():
+            self.flush()
+
+    def _write_rows(self) -> None:
+        assert self.csvfile is not None and self.writer is not None
+        self.writer.writerows(self.rows)
+        self.rows.clear()
+        self.csvfile.flush()
+        if self.fsync:
+            os.fsync(self.csvfile.fileno())
+        self.flush_policy.flushed()
+
+    def flush(self) -> None:
+        if self.csvfile is None:
+            return
+        self._write_rows()
+        if self.rotator is not None and self.rotator.due(self.csvfile.tell()):
+            self._close_file()
+            self.rotator.rotate(self.path, self.base_path)
+            self.reopen()
+
+    def _close_file(self) -> None:
+        if self.csvfile is None:
+            return
+        self._write_rows()
+        self.csvfile.close()
+        self.csvfile = None
+        self.writer = None
+
+    def close(self) -> None:
+        self._close_file()
+        if self.rotator is not None:
+            self.rotator.close()
+
+
+class CsvReader(SampleReader):
+    """Random access to the rows of a CSV log
+
+    Opening the file builds an index of row offsets in one pass, after
+    which any row (or time, by bisection) is read with a single seek.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.csvfile: IO[bytes] | None = open(path, "rb")  # noqa: SIM115
+        header = next(csv.reader([self.csvfile.readline().decode()]), None)
+        if not header or header[0] != "Time" or "Throttle" not in header:
+            self.close()
+            raise ValueError(path + " is not an s-tui CSV log")
+        # Statistics and annotation columns, if any, follow the throttle
+        self.throttle_column = header.index("Throttle")
+        self.columns = header[1 : self.throttle_column]
+
+        self.sources: list[tuple[str, str, list[str]]] = []
+        for column in self.columns:
+            name, _, sensor = column.partition(":")
+            if not self.sources or self.sources[-1][0] != name:
+                self.sources.append((name, SOURCE_UNITS.get(name, ""), []))
+            self.sources[-1][2].append(sensor)
+
+        self.offsets = array("q")
+        offset = self.csvfile.tell()
+        for line in self.csvfile:
+            # A trailing partial row (e.g. after a crash) is ignored
+            if not line.endswith(b"\n"):
+                break
+            self.offsets.append(offset)
+            offset += len(line)
+
+        self.host = ""
+        self.start = self.timestamp(0) if self.offsets else 0.0
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def _row(self, index: int) -> list[str]:
+        if not 0 <= index < len(self):
+            raise IndexError("row out of range")
+        assert self.csvfile is not None
+        self.csvfile.seek(self.offsets[index])
+        return next(csv.reader([self.csvfile.readline().decode()]))
+
+    def timestamp(self, index: int) -> float:
+        return parse_time(self._row(index)[0])
+
+    def read(self, index: int) -> tuple[float, list[float | None], str]:
+        row = self._row(index)
+        values: list[float | None] = []
+        for value in row[1 : len(self.columns) + 1]:
+            try:
+                values.append(float(value))
+            except ValueError:
+                values.append(None)
+        return parse_time(row[0]), values, row[self.throttle_column]
+
+    def close(self) -> None:
+        if self.csvfile is not None:
+            self.csvfile.close()
+            self.csvfile = None
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Writes one compact JSON object per sample (NDJSON)"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+from typing import IO
+
+from s_tui.sinks.rotation import LogRotator
+from s_tui.sinks.sink import FlushPolicy, Sample, Sink
+
+
+class JsonStreamSink(Sink):
+    """Streams samples as newline delimited JSON to stdout or a file"""
+
+    def __init__(
+        self,
+        path: str = "-",
+        flush_policy: FlushPolicy | None = None,
+        fsync: bool = False,
+        rotator: LogRotator | None = None,
+    ) -> None:
+        self.path = path
+        self.flush_policy = flush_policy or FlushPolicy()
+        self.fsync = fsync
+        self.rotator = rotator if path != "-" else None
+        self.stream: IO[str] | None = None
+        self.reopen()
+
+    def reopen(self) -> None:
+        if self.path == "-":
+            self.stream = sys.stdout
+            return
+        if self.stream is not None:
+            self._close_file()
+        self.stream = open(self.path, "a")  # noqa: SIM115
+        if self.rotator is not None:
+            self.rotator.opened()
+        logging.info("Streaming JSON samples to %s", self.path)
+
+    def write(self, sample: Sample) -> None:
+        if self.stream is None:
+            return
+        self.stream.write(json.dumps(sample.as_dict(), separators=(",", ":")))
+        self.stream.write("\n")
+        if self.flush_policy.row_written():
+            self.flush()
+
+    def _flush_stream(self) -> None:
+        assert self.stream is not None
+        self.stream.flush()
+        if self.fsync and self.stream is not sys.stdout:
+            os.fsync(self.stream.fileno())
+        self.flush_policy.flushed()
+
+    def flush(self) -> None:
+        if self.stream is None:
+            return
+        self._flush_stream()
+        if self.rotator is not None and self.rotator.due(self.stream.tell()):
+            self._close_file()
+            self.rotator.rotate(self.path)
+            self.reopen()
+
+    def _close_file(self) -> None:
+        if self.stream is None:
+            return
+        self._flush_stream()
+        if self.stream is not sys.stdout:
+            self.stream.close()
+        self.stream = None
+
+    def close(self) -> None:
+        self._close_file()
+        if self.rotator is not None:
+            self.rotator.close()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Serves samples to Prometheus
+
+Samples are serialized to the OpenMetrics text format once per tick.
+The embedded HTTP exporter only hands out the last serialized snapshot,
+so the cost of a scrape does not depend on the sensors or on how many
+scrapers there are.  Without an HTTP server, the same metrics can be
+left in a file for the node_exporter textfile collector.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import cast
+
+from s_tui.sinks.recording import THROTTLE_BITS
+from s_tui.sinks.sink import Sample, Sink
+
+# Metric family, scale to the base unit and help text per source
+METRICS = {
+    "Temp": ("s_tui_temperature_celsius", 1.0, "Temperature"),
+    "Frequency": ("s_tui_frequency_hertz", 1e6, "CPU frequency"),
+    "Util": ("s_tui_utilization_ratio", 0.01, "CPU utilization"),
+    "Power": ("s_tui_power_watts", 1.0, "Power draw"),
+    "Fan": ("s_tui_fan_rpm", 1.0, "Fan speed"),
+}
+
+OPENMETRICS_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+TEXT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_CORE_RE = re.compile(r"\ACore (\d+)\Z")
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _metric_name(source: str) -> str:
+    return "s_tui_" + re.sub(r"[^a-zA-Z0-9_]", "_", source.lower())
+
+
+def format_metrics(sample: Sample, timestamp: bool = True) -> str:
+    """Serializes a sample as OpenMetrics gauges, without the "# EOF" line
+
+    Every sensor is one gauge labelled with its source and sensor name,
+    per core sensors also carry a "core" label.  Throttle reasons are
+    gauges that are 1 while the reason is active.
+    """
+    lines = []
+    for reading in sample.readings:
+        name, scale, help_text = METRICS.get(
+            reading.name, (_metric_name(reading.name), 1.0, reading.name)
+        )
+        lines.append("# HELP " + name + " " + help_text)
+        lines.append("# TYPE " + name + " gauge")
+        for sensor, value in zip(reading.sensors, reading.values):
+            if value is None:
+                continue
+            labels = f'source="{_label(reading.name)}",sensor="{_label(sensor)}"'
+            core = _CORE_RE.match(sensor)
+            if core:
+                labels += f',core="{core.group(1)}"'
+            lines.append(f"{name}{{{labels}}} {value * scale!r}")
+
+    active = sample.throttle.split("/")
+    lines.append("# HELP s_tui_throttle Active CPU throttle reasons")
+    lines.append("# TYPE s_tui_throttle gauge")
+    for reason in THROTTLE_BITS:
+        state = "1" if reason in active else "0"
+        lines.append('s_tui_throttle{reason="' + reason + '"} ' + state)
+
+    if timestamp:
+        lines.append("# HELP s_tui_sample_timestamp_seconds Time of the sample")
+        lines.append("# TYPE s_tui_sample_timestamp_seconds gauge")
+        lines.append("s_tui_sample_timestamp_seconds " + repr(round(sample.time, 3)))
+    return "\n".join(lines) + "\n"
+
+
+def parse_address(address: str) -> tuple[str, int]:
+    """Parses "[HOST]:PORT", an empty host listens on all interfaces"""
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError("Invalid address: " + address)
+    return host.strip("[]"), int(port)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body, openmetrics = cast(_MetricsServer, self.server).exporter.snapshot
+        if "application/openmetrics-text" in self.headers.get("Accept", ""):
+            body, content_type = openmetrics, OPENMETRICS_TYPE
+        else:
+            content_type = TEXT_TYPE
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        # The default handler writes to stderr, which would garble the TUI
+        logging.debug("Exporter: " + format, *args)
+
+
+class _MetricsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], exporter: ExporterSink) -> None:
+        if ":" in address[0]:
+            self.address_family = socket.AF_INET6
+        self.exporter = exporter
+        super().__init__(address, _MetricsHandler)
+
+
+class ExporterSink(Sink):
+    """Serves the latest sample over HTTP for Prometheus to scrape"""
+
+    def __init__(self, address: str) -> None:
+        self.address = parse_address(address)
+        # Prometheus text and OpenMetrics bodies, replaced as one tuple
+        self.snapshot = (b"", b"# EOF\n")
+        self.server = _MetricsServer(self.address, self)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        logging.info("Serving metrics on port %s", self.server.server_address[1])
+
+    def write(self, sample: Sample) -> None:
+        body = format_metrics(sample).encode()
+        self.snapshot = (body, body + b"# EOF\n")
+
+    def close(self) -> None:
+        if self.thread is None:
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.thread = None
+
+
+class TextfileSink(Sink):
+    """Writes metrics for the node_exporter textfile collector
+
+    The file is replaced atomically (tmp file and rename) at most every
+    *interval* seconds, and not at all while the metrics are unchanged.
+    A directory path gets an "s-tui.prom" file.
+    """
+
+    def __init__(self, path: str, interval: float = 15.0) -> None:
+        if os.path.isdir(path):
+            path = os.path.join(path, "s-tui.prom")
+        self.path = path
+        self.interval = interval
+        self.pending: str | None = None
+        self.written: str | None = None
+        self.last_write: float | None = None
+
+    def write(self, sample: Sample) -> None:
+        # node_exporter reports the file mtime, a sample time is not needed
+        self.pending = format_metrics(sample, timestamp=False)
+        if self.last_write is None or (
+            time.monotonic() - self.last_write >= self.interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if self.pending is None:
+            return
+        metrics = self.pending
+        self.pending = None
+        self.last_write = time.monotonic()
+        if metrics == self.written:
+            return
+        # node_exporter only reads *.prom files, so it never sees the tmp file
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as tmp_file:
+            tmp_file.write(metrics)
+        os.replace(tmp_path, self.path)
+        self.written = metrics
@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Pushes samples to InfluxDB/Telegraf and StatsD listeners
+
+Each tick is serialized into one payload, InfluxDB line protocol or
+StatsD gauges, and handed to a PushTarget: an appended file, a UDP
+address or a unix datagram socket.  Sockets are non-blocking and send
+errors are only logged, so a missing or slow listener never holds up
+sampling; the tick is simply lost.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import socket
+from typing import IO
+
+from s_tui.sinks.recording import THROTTLE_BITS
+from s_tui.sinks.sink import Sample, Sink
+
+# Largest UDP payload, bigger ticks are split on line boundaries
+MAX_DATAGRAM = 65507
+
+_CORE_RE = re.compile(r"\ACore (\d+)\Z")
+
+
+class PushTarget:
+    """Destination of a push sink
+
+    "udp://HOST:PORT" and "unix:///PATH" send datagrams, anything else
+    is a file path that payloads are appended to.
+    """
+
+    def __init__(self, target: str) -> None:
+        self.target = target
+        self.sock: socket.socket | None = None
+        self.address: str | tuple[str, int] = ""
+        self.file: IO[bytes] | None = None
+        self.failing = False
+        if target.startswith("udp://"):
+            host, sep, port = target[len("udp://") :].rpartition(":")
+            if not sep or not port.isdigit():
+                raise ValueError("Invalid UDP target: " + target)
+            family, _, _, _, sockaddr = socket.getaddrinfo(
+                host.strip("[]") or "localhost", int(port), type=socket.SOCK_DGRAM
+            )[0]
+            self.address = (str(sockaddr[0]), int(sockaddr[1]))
+            self.sock = socket.socket(family, socket.SOCK_DGRAM)
+        elif target.startswith("unix://"):
+            self.address = target[len("unix://") :]
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        else:
+            self.reopen()
+        if self.sock is not None:
+            self.sock.setblocking(False)
+
+    def reopen(self) -> None:
+        if self.sock is not None:
+            return
+        if self.file is not None:
+            self.file.close()
+        self.file = open(self.target, "ab")  # noqa: SIM115
+
+    def send(self, payload: bytes) -> None:
+        """Sends a payload, dropping it if the destination is not ready"""
+        if self.file is not None:
+            self.file.write(payload)
+            self.file.flush()
+            return
+        assert self.sock is not None
+        try:
+            for chunk in _split(payload, MAX_DATAGRAM):
+                self.sock.sendto(chunk, self.address)
+        except OSError as err:
+            # Log only the first failure of a streak
+            if not self.failing:
+                logging.warning("Cannot push to %s: %s", self.target, err)
+            self.failing = True
+        else:
+            if self.failing:
+                logging.info("Pushing to %s again", self.target)
+            self.failing = False
+
+    def close(self) -> None:
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def _split(payload: bytes, limit: int) -> list[bytes]:
+    """Splits newline separated lines into chunks of at most *limit* bytes"""
+    if len(payload) <= limit:
+        return [payload]
+    chunks = []
+    chunk = b""
+    for line in payload.splitlines(keepends=True):
+        if chunk and len(chunk) + len(line) > limit:
+            chunks.append(chunk)
+            chunk = b""
+        chunk += line
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _escape_tag(value: str) -> str:
+    return re.sub(r"([,= ])", r"\\\1", value)
+
+
+def format_line_protocol(sample: Sample, host: str) -> str:
+    """Serializes a sample as InfluxDB line protocol, one line per sensor
+
+    The measurement is the source name ("temp", "frequency", ...), tagged
+    with host, sensor and for per core sensors the core number.  The
+    throttle state goes to a "throttle" measurement.
+    """
+    # Nanoseconds, rounded to the millisecond float times can represent
+    stamp = " " + str(round(sample.time * 1000) * 1000000)
+    host_tag = ",host=" + _escape_tag(host)
+    lines = []
+    for reading in sample.readings:
+        measurement = _escape_tag(reading.name.lower())
+        for sensor, value in zip(reading.sensors, reading.values):
+            if value is None:
+                continue
+            tags = host_tag + ",sensor=" + _escape_tag(sensor)
+            core = _CORE_RE.match(sensor)
+            if core:
+                tags += ",core=" + core.group(1)
+            lines.append(measurement + tags + " value=" + repr(value) + stamp)
+    active = 1 if sample.throttle else 0
+    reasons = sample.throttle.replace("\\", "\\\\").replace('"', '\\"')
+    lines.append(
+        "throttle"
+        + host_tag
+        + ' reasons="'
+        + reasons
+        + '",active='
+        + str(active)
+        + "i"
+        + stamp
+    )
+    return "\n".join(lines) + "\n"
+
+
+def _statsd_name(name: str) -> str:
+    return re.sub(r"[^a-z0-9_]", "_", name.lower())
+
+
+def format_statsd(sample: Sample, prefix: str = "s_tui") -> str:
+    """Serializes a sample as StatsD gauges, e.g. s_tui.temp.core_0:45.0|g"""
+    lines = []
+    for reading in sample.readings:
+        source = prefix + "." + _statsd_name(reading.name) + "."
+        for sensor, value in zip(reading.sensors, reading.values):
+            # A leading sign would make the gauge relative
+            if value is None or value < 0:
+                continue
+            lines.append(source + _statsd_name(sensor) + ":" + repr(value) + "|g")
+    active = sample.throttle.split("/")
+    for reason in THROTTLE_BITS:
+        state = "1" if reason in active else "0"
+        lines.append(prefix + ".throttle." + reason + ":" + state + "|g")
+    return "\n".join(lines) + "\n"
+
+
+class InfluxSink(Sink):
+    """Pushes every sample as InfluxDB line protocol"""
+
+    def __init__(self, target: str) -> None:
+        self.target = PushTarget(target)
+        self.host = socket.gethostname()
+
+    def write(self, sample: Sample) -> None:
+        self.target.send(format_line_protocol(sample, self.host).encode())
+
+    def reopen(self) -> None:
+        self.target.reopen()
+
+    def close(self) -> None:
+        self.target.close()
+
+
+class StatsdSink(Sink):
+    """Pushes every sample as StatsD gauges"""
+
+    def __init__(self, target: str, prefix: str = "s_tui") -> None:
+        self.target = PushTarget(target)
+        self.prefix = prefix
+
+    def write(self, sample: Sample) -> None:
+        self.target.send(format_statsd(sample, self.prefix).encode())
+
+    def reopen(self) -> None:
+        self.target.reopen()
+
+    def close(self) -> None:
+        self.target.close()
@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Compact binary recording of samples
+
+A recording starts with a small header describing the sensor schema,
+followed by fixed width rows::
+
+    magic   8 bytes  b"STUIREC" + format version
+    length  uint32   size of the JSON header
+    header  JSON     host, start time and the sources with their sensors
+    padding          up to an 8 byte boundary
+    rows             float64 time, float32 per sensor (NaN = N/A),
+                     uint32 throttle reason bit mask
+
+Because every row has the same size, the reader memory maps the file and
+seeks to any row (or time, by bisection) without loading the recording.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import logging
+import math
+import mmap
+import os
+import socket
+import struct
+import sys
+from typing import IO
+
+from s_tui.sinks.csv_sink import format_time
+from s_tui.sinks.sink import FlushPolicy, Sample, SampleReader, Sink
+
+MAGIC = b"STUIREC"
+VERSION = 1
+_PREFIX = struct.Struct("<7sBI")
+
+# Every throttle label s-tui can produce gets one bit
+THROTTLE_BITS = {
+    "T": 1 << 0,
+    "H": 1 << 1,
+    "C": 1 << 2,
+    "W": 1 << 3,
+    "A": 1 << 4,
+    "X": 1 << 5,
+    "Tc": 1 << 6,
+    "Tp": 1 << 7,
+}
+
+
+def throttle_to_mask(label: str) -> int:
+    """Encodes a throttle label such as "T/W" as a bit mask"""
+    mask = 0
+    for part in label.split("/"):
+        mask |= THROTTLE_BITS.get(part, 0)
+    return mask
+
+
+def mask_to_throttle(mask: int) -> str:
+    """Decodes a bit mask back into a throttle label"""
+    return "/".join(lbl for lbl, bit in THROTTLE_BITS.items() if mask & bit)
+
+
+def row_struct(num_values: int) -> struct.Struct:
+    """Row layout: float64 time, float32 per value, uint32 throttle mask"""
+    return struct.Struct("<d" + str(num_values) + "fI")
+
+
+class RecordingSink(Sink):
+    """Appends samples to a binary recording
+
+    Like the CSV sink, a change in the set of sensors continues the
+    recording in a new numbered file (run.1.strec) with its own header.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_policy: FlushPolicy | None = None,
+    ) -> None:
+        self.base_path = path
+        self.path = path
+        self.part = 0
+        self.flush_policy = flush_policy or FlushPolicy(every_rows=32)
+        self.columns: list[str] | None = None
+        self.row: struct.Struct | None = None
+        self.buffer = bytearray()
+        self.recfile: IO[bytes] | None = None
+
+    def _next_path(self) -> str:
+        self.part += 1
+        root, ext = os.path.splitext(self.base_path)
+        return root + "." + str(self.part) + ext
+
+    def _start(self, sample: Sample) -> None:
+        """Opens a new recording file and writes the header for *sample*"""
+        if self.recfile is not None:
+            self.close()
+            self.path = self._next_path()
+        while os.path.exists(self.path):
+            self.path = self._next_path()
+        self.columns = sample.columns()
+        self.row = row_struct(len(self.columns))
+        header = json.dumps(
+            {
+                "version": VERSION,
+                "host": socket.gethostname(),
+                "start": sample.time,
+                "sources": [
+                    [reading.name, reading.unit, reading.sensors]
+                    for reading in sample.readings
+                ],
+            }
+        ).encode()
+        padding = -(_PREFIX.size + len(header)) % 8
+        self.recfile = open(self.path, "wb")  # noqa: SIM115
+        self.recfile.write(_PREFIX.pack(MAGIC, VERSION, len(header) + padding))
+        self.recfile.write(header + b" " * padding)
+        logging.info("Recording samples to %s", self.path)
+
+    def write(self, sample: Sample) -> None:
+        if self.recfile is None or sample.columns() != self.columns:
+            self._start(sample)
+        assert self.row is not None
+        self.buffer += self.row.pack(
+            sample.time,
+            *[math.nan if v is None else v for v in sample.values()],
+            throttle_to_mask(sample.throttle),
+        )
+        if self.flush_policy.row_written():
+            self.flush()
+
+    def flush(self) -> None:
+        if self.recfile is None:
+            return
+        self.recfile.write(self.buffer)
+        self.buffer.clear()
+        self.recfile.flush()
+        self.flush_policy.flushed()
+
+    def close(self) -> None:
+        if self.recfile is None:
+            return
+        self.flush()
+        self.recfile.close()
+        self.recfile = None
+
+
+class RecordingReader(SampleReader):
+    """Random access to a binary recording through mmap"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as recfile:
+            prefix = recfile.read(_PREFIX.size)
+            if len(prefix) < _PREFIX.size:
+                raise ValueError(path + " is not an s-tui recording")
+            magic, version, header_len = _PREFIX.unpack(prefix)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(path + " is not an s-tui recording")
+            header = json.loads(recfile.read(header_len))
+            self.mmap: mmap.mmap | None = None
+            if os.fstat(recfile.fileno()).st_size > _PREFIX.size + header_len:
+                self.mmap = mmap.mmap(recfile.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.host: str = header.get("host", "")
+        self.start: float = header.get("start", 0.0)
+        self.sources: list[tuple[str, str, list[str]]] = [
+            (name, unit, sensors) for name, unit, sensors in header["sources"]
+        ]
+        self.columns = [
+            name + ":" + sensor
+            for name, _, sensors in self.sources
+            for sensor in sensors
+        ]
+        self.row = row_struct(len(self.columns))
+        self.data_offset = _PREFIX.size + header_len
+
+    def __len__(self) -> int:
+        if self.mmap is None:
+            return 0
+        # A trailing partial row (e.g. after a crash) is ignored
+        return (len(self.mmap) - self.data_offset) // self.row.size
+
+    def timestamp(self, index: int) -> float:
+        assert self.mmap is not None
+        return struct.unpack_from(
+            "<d", self.mmap, self.data_offset + index * self.row.size
+        )[0]
+
+    def read(self, index: int) -> tuple[float, list[float | None], str]:
+        if not 0 <= index < len(self):
+            raise IndexError("row out of range")
+        assert self.mmap is not None
+        timestamp, *values, mask = self.row.unpack_from(
+            self.mmap, self.data_offset + index * self.row.size
+        )
+        return (
+            timestamp,
+            [None if math.isnan(v) else v for v in values],
+            mask_to_throttle(mask),
+        )
+
+    def close(self) -> None:
+        if self.mmap is not None:
+            self.mmap.close()
+            self.mmap = None
+
+
+def convert(
+    reader: RecordingReader,
+    out: IO[str],
+    fmt: str,
+    start: float | None = None,
+    end: float | None = None,
+) -> int:
+    """Writes a recording as CSV or NDJSON, returns the number of rows"""
+    rows = 0
+    writer = csv.writer(out) if fmt == "csv" else None
+    if writer is not None:
+        writer.writerow(["Time", *reader.columns, "Throttle"])
+    for sample in reader.samples(start, end):
+        if writer is not None:
+            writer.writerow(
+                [
+                    format_time(sample.time),
+                    *["" if v is None else v for v in sample.values()],
+                    sample.throttle,
+                ]
+            )
+        else:
+            out.write(json.dumps(sample.as_dict(), separators=(",", ":")) + "\n")
+        rows += 1
+    return rows
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert an s-tui binary recording to CSV or JSON lines"
+    )
+    parser.add_argument("recording", help="Recording file to read")
+    parser.add_argument(
+        "output", nargs="?", default="-", help="Output file. Default: stdout"
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=["csv", "json"],
+        default=None,
+        help="Output format. Default: from the output extension, else csv",
+    )
+    parser.add_argument("--start", type=float, default=None, help="Start (epoch)")
+    parser.add_argument("--end", type=float, default=None, help="End (epoch)")
+    args = parser.parse_args(argv)
+
+    fmt = args.format
+    if fmt is None:
+        fmt = "json" if args.output.endswith((".json", ".ndjson")) else "csv"
+
+    try:
+        reader = RecordingReader(args.recording)
+    except (OSError, ValueError) as err:
+        sys.stderr.write(str(err) + "\n")
+        sys.exit(2)
+
+    try:
+        if args.output == "-":
+            convert(reader, sys.stdout, fmt, args.start, args.end)
+        else:
+            with open(args.output, "w", newline="") as out:
+                convert(reader, out, fmt, args.start, args.end)
+    finally:
+        reader.close()
+
+
+if __name__ == "__main__":
+    main()
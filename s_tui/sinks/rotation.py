@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Size and time based rotation of log sinks
+
+Rotated segments are renamed to <file>.<YYYYmmdd-HHMMSS>, compressed on a
+background thread and pruned to a retention count, so the sampling tick
+never waits on the compressor.  The numbered parts of a file (e.g.
+log.1.csv next to log.csv) share its retention count.
+"""
+
+from __future__ import annotations
+
+import glob
+import gzip
+import logging
+import lzma
+import math
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from collections.abc import Callable
+from typing import IO, Any
+
+try:
+    from compression import zstd  # type: ignore[import-not-found]
+
+    _zstd_open: Callable[..., IO[bytes]] | None = zstd.open
+except ImportError:
+    try:
+        import zstandard  # pyright: ignore[reportMissingImports]
+
+        _zstd_open = zstandard.open
+    except ImportError:
+        _zstd_open = None
+
+COMPRESSORS: dict[str, tuple[str, Callable[..., Any]]] = {
+    "gzip": (".gz", gzip.open),
+    "xz": (".xz", lzma.open),
+}
+if _zstd_open is not None:
+    COMPRESSORS["zstd"] = (".zst", _zstd_open)
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+_DURATION_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+CHUNK_SIZE = 1024 * 1024
+
+# <part>.<stamp>[-<n>][.<compression>], after the root of the base file
+_SEGMENT_PATTERN = (
+    r"(?:\.[0-9]+)?{ext}\.([0-9]{{8}}-[0-9]{{6}})(?:-([0-9]+))?(?:\.[a-z]+)?\Z"
+)
+
+
+def parse_size(size: str) -> int:
+    """Parses a size such as 500K, 100M or 1G into bytes"""
+    match = re.match(r"\A([0-9]+)([KMG]?)B?\Z", size.strip(), re.I)
+    if not match or int(match.group(1)) == 0:
+        raise ValueError("Invalid size: " + size)
+    return int(match.group(1)) * _SIZE_UNITS[match.group(2).upper()]
+
+
+def parse_duration(duration: str) -> float:
+    """Parses a duration such as 90, 30m, 1h or 1d into seconds"""
+    match = re.match(r"\A([0-9]*\.?[0-9]+)([smhd]?)\Z", duration.strip())
+    if not match or float(match.group(1)) == 0:
+        raise ValueError("Invalid duration: " + duration)
+    return float(match.group(1)) * _DURATION_UNITS[match.group(2)]
+
+
+def compress_file(path: str, method: str) -> str:
+    """Compresses *path* next to itself and removes the original"""
+    ext, opener = COMPRESSORS[method]
+    target = path + ext
+    tmp_target = target + ".tmp"
+    with open(path, "rb") as src, opener(tmp_target, "wb") as dst:
+        shutil.copyfileobj(src, dst, CHUNK_SIZE)
+    os.replace(tmp_target, target)
+    os.unlink(path)
+    return target
+
+
+class LogRotator:
+    """Decides when a sink file is due and disposes of old segments"""
+
+    def __init__(
+        self,
+        max_bytes: int | None = None,
+        interval: float | None = None,
+        keep: int | None = None,
+        compress: str | None = None,
+    ) -> None:
+        if compress is not None and compress not in COMPRESSORS:
+            raise ValueError("Compression not available: " + compress)
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.keep = keep
+        self.compress = compress
+        self.next_rotation: float | None = None
+        # Stamp of the last segment, pruning may already have removed it
+        self._last_key: tuple[str, int] | None = None
+        self._queue: queue.Queue[tuple[str, str] | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self.opened()
+
+    def opened(self) -> None:
+        """Starts a new interval for a freshly opened file.
+
+        Interval rotation is aligned to wall clock boundaries, e.g. an
+        hourly log rotates on the hour.
+        """
+        if self.interval is not None:
+            now = time.time()
+            self.next_rotation = math.floor(now / self.interval + 1) * self.interval
+
+    def due(self, size: int) -> bool:
+        """Returns True if a file of *size* bytes should be rotated now"""
+        if self.max_bytes is not None and size >= self.max_bytes:
+            return True
+        return self.next_rotation is not None and time.time() >= self.next_rotation
+
+    def rotate(self, path: str, base_path: str | None = None) -> str:
+        """Renames the closed file *path* away and schedules compression
+
+        *base_path* is the file *path* is a numbered part of, its segments
+        are pruned together with those of *path*.
+        """
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        # Unique among all the parts, so the segments sort by rotation
+        taken = {key for key, _ in self._find_segments(base_path or path)}
+        last = self._last_key
+        suffix = last[1] + 1 if last is not None and last[0] == stamp else 0
+        while (stamp, suffix) in taken:
+            suffix += 1
+        self._last_key = (stamp, suffix)
+        rotated = path + "." + stamp + ("-" + str(suffix) if suffix else "")
+        os.rename(path, rotated)
+        logging.info("Rotated %s to %s", path, rotated)
+        self._queue.put((rotated, base_path or path))
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._worker, daemon=True)
+            self._thread.start()
+        return rotated
+
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            rotated, path = item
+            if self.compress is not None:
+                try:
+                    compress_file(rotated, self.compress)
+                except OSError as err:
+                    logging.error("Failed to compress %s: %s", rotated, err)
+            self.prune(path)
+
+    def _find_segments(self, path: str) -> list[tuple[tuple[str, int], str]]:
+        root, ext = os.path.splitext(path)
+        segment_re = re.compile(_SEGMENT_PATTERN.format(ext=re.escape(ext)))
+        segments = []
+        for segment in glob.glob(glob.escape(root) + ".*"):
+            match = segment_re.match(segment[len(root) :])
+            if match and not segment.endswith(".tmp"):
+                segments.append(((match.group(1), int(match.group(2) or 0)), segment))
+        return segments
+
+    def segments(self, path: str) -> list[str]:
+        """Returns rotated segments of *path* and of its numbered parts (e.g.
+        log.1.csv), oldest first"""
+        return [segment for _, segment in sorted(self._find_segments(path))]
+
+    def prune(self, path: str) -> None:
+        """Deletes rotated segments beyond the retention count"""
+        if self.keep is None:
+            return
+        segments = self.segments(path)
+        for old in segments[: max(0, len(segments) - self.keep)]:
+            try:
+                os.unlink(old)
+                logging.info("Removed old log segment %s", old)
+            except OSError as err:
+                logging.error("Failed to remove %s: %s", old, err)
+
+    def close(self) -> None:
+        """Waits for pending compressions to finish"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._thread = None
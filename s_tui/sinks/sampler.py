@@ -0,0 +1,457 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Shares one sampler between several viewers over a Unix socket
+
+The sampler reads the hardware once per tick and publishes every sample
+to the attached viewers, which render it without polling sensors
+themselves.  Each message is a frame::
+
+    kind    uint8    SCHEMA, SAMPLE, STATE or COMMAND
+    length  uint32   size of the payload
+    payload          JSON, except for SAMPLE which is a recording row
+
+A SCHEMA (the sources and their sensors) is sent before the first
+sample and whenever the sensors change, so samples are as compact as
+the rows of a binary recording.  STATE carries the stress mode of the
+sampler, and viewers send COMMAND frames to change it.  The same
+frames are streamed over TCP by fleet agents.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import math
+import os
+import queue
+import re
+import selectors
+import socket
+import stat
+import struct
+import threading
+import time
+from typing import Any
+
+from s_tui.builtin_stresser import ROTATE_PERIOD
+from s_tui.placement import parse_placement
+from s_tui.sinks.prometheus import parse_address
+from s_tui.sinks.recording import row_struct, throttle_to_mask
+from s_tui.sinks.sink import Sample, Sink
+
+SCHEMA = 1
+SAMPLE = 2
+STATE = 3
+COMMAND = 4
+
+FRAME = struct.Struct("<BI")
+MAX_FRAME = 1 << 20
+# Bytes queued for a viewer before it is considered stuck and dropped
+MAX_BUFFER = 1 << 20
+
+_COUNT = re.compile(r"\A[0-9]+\Z")
+_BYTES = re.compile(r"\A[0-9]+[bkmg]?b?\Z", re.I)
+_METHOD = re.compile(r"\A[a-z0-9_]+\Z")
+# The stress and stress-ng options a viewer may set, with the pattern
+# of their value, None for flags.  The stress menu builds no others.
+STRESS_OPTIONS = {
+    "-c": _COUNT,
+    "--cpu": _COUNT,
+    "--cpu-method": _METHOD,
+    "--matrix": _COUNT,
+    "--cache": _COUNT,
+    "-i": _COUNT,
+    "--io": _COUNT,
+    "--vm": _COUNT,
+    "--vm-bytes": _BYTES,
+    "--vm-stride": _BYTES,
+    "--vm-keep": None,
+    "--hdd": _COUNT,
+    "--hdd-bytes": _BYTES,
+    "-t": _COUNT,
+}
+
+
+def encode_frame(kind: int, payload: bytes) -> bytes:
+    return FRAME.pack(kind, len(payload)) + payload
+
+
+def encode_json(kind: int, message: Any) -> bytes:
+    return encode_frame(kind, json.dumps(message, separators=(",", ":")).encode())
+
+
+class FrameDecoder:
+    """Splits a byte stream into (kind, payload) frames"""
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+
+    def feed(self, data: bytes) -> list[tuple[int, bytes]]:
+        """Adds received bytes, returns the frames completed by them"""
+        self.buffer += data
+        frames = []
+        while len(self.buffer) >= FRAME.size:
+            kind, length = FRAME.unpack_from(self.buffer)
+            if length > MAX_FRAME:
+                raise ValueError("Frame of " + str(length) + " bytes is too large")
+            end = FRAME.size + length
+            if len(self.buffer) < end:
+                break
+            frames.append((kind, bytes(self.buffer[FRAME.size : end])))
+            del self.buffer[:end]
+        return frames
+
+
+def check_stress_args(args: list[Any]) -> list[str]:
+    """Returns the stress arguments of a viewer, raises ValueError unless
+    every option is one of STRESS_OPTIONS with a valid value"""
+    checked = []
+    remaining = iter(str(arg) for arg in args)
+    for option in remaining:
+        if option not in STRESS_OPTIONS:
+            raise ValueError("stress option " + repr(option) + " is not allowed")
+        checked.append(option)
+        pattern = STRESS_OPTIONS[option]
+        if pattern is None:
+            continue
+        value = next(remaining, "")
+        if not pattern.match(value):
+            raise ValueError("invalid value " + repr(value) + " of " + option)
+        checked.append(value)
+    return checked
+
+
+def listen_unix(path: str) -> socket.socket:
+    """Binds a Unix stream socket, replacing a stale one left by a crash"""
+    if os.path.lexists(path):
+        if not stat.S_ISSOCK(os.lstat(path).st_mode):
+            raise FileExistsError(path + " exists and is not a socket")
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)
+        else:
+            raise OSError("Another sampler is serving " + path)
+        finally:
+            probe.close()
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        listener.bind(path)
+        # Viewers of other users in the socket group may attach
+        os.chmod(path, 0o660)
+        listener.listen(16)
+    except OSError:
+        listener.close()
+        raise
+    listener.setblocking(False)
+    return listener
+
+
+class _Viewer:
+    __slots__ = ("decoder", "dropped", "events", "outbuf", "sock")
+
+    def __init__(self, sock: socket.socket, outbuf: bytes) -> None:
+        self.sock = sock
+        self.decoder = FrameDecoder()
+        self.outbuf = bytearray(outbuf)
+        self.events = selectors.EVENT_READ
+        self.dropped = False
+
+
+class SamplerServer(Sink):
+    """Publishes samples to the viewers attached to a Unix socket
+
+    Each sample is encoded once and queued for every viewer, an I/O
+    thread does the non-blocking sends.  A viewer that falls more than
+    MAX_BUFFER bytes behind is dropped instead of stalling the sampler.
+    Viewers switch the stress mode through commands, so the server's
+    StressController is the only one running stress workers.  Commands
+    run on a thread of their own, stopping a stress may take a while.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        stress_controller: Any = None,
+        stress_exe: str | None = None,
+    ) -> None:
+        self.path = path
+        self.stress_controller = stress_controller
+        self.stress_exe = stress_exe
+        self.stress_started: float | None = None
+        self.columns: list[str] | None = None
+        self.row: struct.Struct | None = None
+        # What a new viewer gets before the next sample
+        self.schema_frame = b""
+        self.state_frame = self._state_frame()
+        self.sample_frame = b""
+
+        self.viewers: dict[socket.socket, _Viewer] = {}
+        self.lock = threading.Lock()
+        self.listener = self._listen()
+        self.wakeup, self.waker = socket.socketpair()
+        self.wakeup.setblocking(False)
+        self.waker.setblocking(False)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        self.selector.register(self.wakeup, selectors.EVENT_READ)
+        self.running = True
+        self.thread: threading.Thread | None = threading.Thread(
+            target=self._serve, daemon=True
+        )
+        self.commands: queue.Queue[bytes | None] = queue.Queue()
+        self.command_thread = threading.Thread(target=self._run_commands, daemon=True)
+        self.command_thread.start()
+        self.thread.start()
+        logging.info("Serving samples on %s", path)
+
+    def _listen(self) -> socket.socket:
+        return listen_unix(self.path)
+
+    def _state_frame(self) -> bytes:
+        controller = self.stress_controller
+        if controller is None:
+            mode, modes = "Monitor", ["Monitor"]
+        else:
+            mode, modes = controller.get_current_mode(), controller.get_modes()
+        return encode_json(
+            STATE, {"mode": mode, "modes": modes, "started": self.stress_started}
+        )
+
+    def _wake(self) -> None:
+        with contextlib.suppress(BlockingIOError):
+            self.waker.send(b"\0")
+
+    def _broadcast(self, data: bytes) -> None:
+        """Queues *data* for every viewer, call with the lock held"""
+        for viewer in self.viewers.values():
+            if len(viewer.outbuf) + len(data) > MAX_BUFFER:
+                if not viewer.dropped:
+                    logging.warning("Dropping a viewer that stopped reading")
+                viewer.dropped = True
+            else:
+                viewer.outbuf += data
+        self._wake()
+
+    def write(self, sample: Sample) -> None:
+        with self.lock:
+            data = b""
+            columns = sample.columns()
+            if columns != self.columns:
+                self.columns = columns
+                self.row = row_struct(len(columns))
+                self.schema_frame = encode_json(
+                    SCHEMA,
+                    {
+                        "host": socket.gethostname(),
+                        "sources": [
+                            [reading.name, reading.unit, reading.sensors]
+                            for reading in sample.readings
+                        ],
+                    },
+                )
+                data = self.schema_frame
+            assert self.row is not None
+            self.sample_frame = encode_frame(
+                SAMPLE,
+                self.row.pack(
+                    sample.time,
+                    *[math.nan if v is None else v for v in sample.values()],
+                    throttle_to_mask(sample.throttle),
+                ),
+            )
+            self._broadcast(data + self.sample_frame)
+
+    def _run_commands(self) -> None:
+        while True:
+            payload = self.commands.get()
+            if payload is None:
+                return
+            self._command(payload)
+
+    def _command(self, payload: bytes) -> None:
+        """Applies a stress mode change requested by a viewer"""
+        controller = self.stress_controller
+        if controller is None:
+            logging.info("Ignoring a stress command, stress is not served")
+            return
+        try:
+            command = json.loads(payload)
+            mode = command["mode"]
+            if mode not in controller.get_modes():
+                raise ValueError("unknown mode " + repr(mode))
+            workers = int(command.get("workers") or 0)
+            strategy = command.get("strategy")
+            duty = float(command.get("duty", 1.0))
+            placement = parse_placement(str(command.get("placement", "none")))
+            rotate_period = float(command.get("rotate_period", ROTATE_PERIOD))
+            if not rotate_period > 0:
+                raise ValueError("rotate period must be positive")
+            # Only checked options come from the viewer, never the program
+            args = check_stress_args(command.get("args", []))
+        except (ValueError, TypeError, KeyError, AttributeError) as err:
+            logging.warning("Ignoring an invalid stress command: %s", err)
+            return
+
+        controller.kill_stress_process()
+        controller.set_mode(mode)
+        if mode == "s-tui stress":
+            cpus = os.cpu_count() or 1
+            controller.set_builtin_duty(duty)
+            controller.set_builtin_placement(placement)
+            controller.set_builtin_rotate_period(rotate_period)
+            controller.start_builtin_stress(min(max(workers, 1), cpus), strategy)
+        elif mode == "Stress (ext)":
+            controller.start_stress([self.stress_exe, *args])
+        logging.info("A viewer switched stress to %s", mode)
+        self.stress_started = (
+            None if controller.get_current_mode() == "Monitor" else time.time()
+        )
+        with self.lock:
+            self.state_frame = self._state_frame()
+            self._broadcast(self.state_frame)
+
+    def _remove(self, viewer: _Viewer) -> None:
+        """Disconnects a viewer, call with the lock held"""
+        self.selector.unregister(viewer.sock)
+        viewer.sock.close()
+        del self.viewers[viewer.sock]
+
+    def _accept(self) -> None:
+        try:
+            sock, _ = self.listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        if sock.family != socket.AF_UNIX:
+            # Frames are small, send them as soon as they are queued
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.lock:
+            viewer = _Viewer(
+                sock, self.schema_frame + self.state_frame + self.sample_frame
+            )
+            self.viewers[sock] = viewer
+            self.selector.register(sock, selectors.EVENT_READ, viewer)
+        logging.info("Viewer attached, %d connected", len(self.viewers))
+
+    def _send(self, viewer: _Viewer) -> None:
+        with self.lock:
+            try:
+                sent = viewer.sock.send(viewer.outbuf)
+            except BlockingIOError:
+                return
+            except OSError:
+                viewer.dropped = True
+                return
+            del viewer.outbuf[:sent]
+
+    def _receive(self, viewer: _Viewer) -> None:
+        try:
+            data = viewer.sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        try:
+            if not data:
+                raise ValueError("connection closed")
+            frames = viewer.decoder.feed(data)
+        except ValueError:
+            viewer.dropped = True
+            return
+        for kind, payload in frames:
+            if kind == COMMAND:
+                self.commands.put(payload)
+
+    def _serve(self) -> None:
+        while self.running:
+            with self.lock:
+                for viewer in list(self.viewers.values()):
+                    if viewer.dropped:
+                        self._remove(viewer)
+                        continue
+                    events = selectors.EVENT_READ
+                    if viewer.outbuf:
+                        events |= selectors.EVENT_WRITE
+                    if events != viewer.events:
+                        self.selector.modify(viewer.sock, events, viewer)
+                        viewer.events = events
+            for key, events in self.selector.select():
+                if key.fileobj is self.listener:
+                    self._accept()
+                elif key.fileobj is self.wakeup:
+                    with contextlib.suppress(BlockingIOError):
+                        self.wakeup.recv(4096)
+                else:
+                    if events & selectors.EVENT_WRITE:
+                        self._send(key.data)
+                    if events & selectors.EVENT_READ:
+                        self._receive(key.data)
+
+    def close(self) -> None:
+        if self.thread is None:
+            return
+        self.running = False
+        self._wake()
+        self.thread.join()
+        self.thread = None
+        self.commands.put(None)
+        self.command_thread.join()
+        with self.lock:
+            for viewer in list(self.viewers.values()):
+                self._remove(viewer)
+        self.selector.close()
+        self.wakeup.close()
+        self.waker.close()
+        self.listener.close()
+        if self.listener.family == socket.AF_UNIX:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.path)
+        if self.stress_controller is not None:
+            self.stress_controller.close()
+
+
+class AgentServer(SamplerServer):
+    """Streams samples over TCP to a fleet view
+
+    Agents only publish: remote viewers cannot change the stress mode.
+    """
+
+    def __init__(self, address: str) -> None:
+        self.address = parse_address(address)
+        SamplerServer.__init__(self, address)
+
+    def _listen(self) -> socket.socket:
+        host, port = self.address
+        family = socket.AF_INET6 if ":" in host else socket.AF_INET
+        listener = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            listener.bind((host, port))
+            listener.listen(64)
+        except OSError:
+            listener.close()
+            raise
+        listener.setblocking(False)
+        return listener
+
+    @property
+    def port(self) -> int:
+        return self.listener.getsockname()[1]
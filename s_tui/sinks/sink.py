@@ -0,0 +1,326 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Per-tick samples and the parent sink class for s-tui.
+
+A Sample is an immutable snapshot of every source taken once per
+sampling tick.  Sinks consume samples and persist or publish them.
+Nothing in this package may import urwid, so sinks can be used by the
+headless collector as well as by the TUI.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from typing import Any, NamedTuple
+
+
+class SourceReading(NamedTuple):
+    """Raw readings of a single source at one tick"""
+
+    name: str
+    unit: str
+    sensors: list[str]
+    values: list[float | None]
+    suffixes: list[str]
+    # Per sensor {statistic: value}, only when statistics were requested
+    stats: list[dict[str, float | None]] | None = None
+
+
+class Sample:
+    """A snapshot of all sources taken at one sampling tick"""
+
+    __slots__ = ("annotations", "monotonic", "readings", "throttle", "time")
+
+    def __init__(
+        self,
+        readings: list[SourceReading],
+        throttle: str = "",
+        timestamp: float | None = None,
+        monotonic: float | None = None,
+        annotations: dict[str, Any] | None = None,
+    ) -> None:
+        self.readings = readings
+        self.throttle = throttle
+        self.time = time.time() if timestamp is None else timestamp
+        self.monotonic = time.monotonic() if monotonic is None else monotonic
+        self.annotations = annotations or {}
+
+    def columns(self) -> list[str]:
+        """Returns flat "Source:sensor" column names"""
+        return [
+            reading.name + ":" + sensor
+            for reading in self.readings
+            for sensor in reading.sensors
+        ]
+
+    def values(self) -> list[float | None]:
+        """Returns flat values matching columns(), None when unavailable"""
+        return [value for reading in self.readings for value in reading.values]
+
+    def stat_columns(self) -> list[str]:
+        """Returns flat "Source:sensor:statistic" column names"""
+        return [
+            reading.name + ":" + sensor + ":" + stat
+            for reading in self.readings
+            if reading.stats
+            for sensor, stats in zip(reading.sensors, reading.stats)
+            for stat in stats
+        ]
+
+    def stat_values(self) -> list[float | None]:
+        """Returns flat statistics matching stat_columns()"""
+        return [
+            value
+            for reading in self.readings
+            if reading.stats
+            for stats in reading.stats
+            for value in stats.values()
+        ]
+
+    def annotation_columns(self) -> list[str]:
+        """Returns the names of the annotations, e.g. a schedule phase"""
+        return list(self.annotations)
+
+    def as_dict(self) -> OrderedDict[str, Any]:
+        """Returns a nested dict in the layout used by the JSON output"""
+        result: OrderedDict[str, Any] = OrderedDict()
+        result["Time"] = round(self.time, 3)
+        for reading in self.readings:
+            result[reading.name] = OrderedDict(zip(reading.sensors, reading.values))
+        result["Throttle"] = self.throttle
+        stats = OrderedDict(
+            (reading.name, OrderedDict(zip(reading.sensors, reading.stats)))
+            for reading in self.readings
+            if reading.stats
+        )
+        if stats:
+            result["Stats"] = stats
+        result.update(self.annotations)
+        return result
+
+
+class SampleSummary(NamedTuple):
+    """Key metrics of a sample, e.g. for a fleet row or a report"""
+
+    max_temp: float | None
+    package_power: float | None
+    avg_freq: float | None
+    throttle: str
+    # Total ops/s of the built-in stress workers
+    stress_ops: float | None = None
+
+
+def _values(sample: Sample, source: str) -> list[tuple[str, float]]:
+    for reading in sample.readings:
+        if reading.name == source:
+            return [
+                (sensor, value)
+                for sensor, value in zip(reading.sensors, reading.values)
+                if value is not None
+            ]
+    return []
+
+
+def summarize_sample(sample: Sample) -> SampleSummary:
+    """Picks the hottest sensor, package power, average frequency and the
+    total stress throughput"""
+    temps = [value for _, value in _values(sample, "Temp")]
+    power = _values(sample, "Power")
+    # RAPL names its package domains package-0, package-1...
+    packages = [value for sensor, value in power if sensor.lower().startswith("pack")]
+    freq = dict(_values(sample, "Frequency"))
+    return SampleSummary(
+        max(temps) if temps else None,
+        sum(packages) if packages else (power[0][1] if power else None),
+        freq.get("Avg"),
+        sample.throttle,
+        dict(_values(sample, "Stress")).get("Total"),
+    )
+
+
+def _get_reading(source: Any, stats: tuple[str, ...] = ()) -> SourceReading:
+    sensors = list(source.get_sensor_list())
+    readings = source.get_reading_list()
+    available = source.sensor_available
+    values: list[float | None] = []
+    for idx in range(len(sensors)):
+        if idx < len(available) and not available[idx]:
+            values.append(None)
+        elif idx < len(readings):
+            values.append(float(readings[idx]))
+        else:
+            values.append(None)
+    return SourceReading(
+        source.get_source_name(),
+        source.get_measurement_unit(),
+        sensors,
+        values,
+        list(source.get_sensor_suffixes()),
+        [
+            {name: source.stats.get(idx, name) for name in stats}
+            for idx in range(len(sensors))
+        ]
+        if stats
+        else None,
+    )
+
+
+def take_sample(
+    sources: list[Any],
+    annotations: dict[str, Any] | None = None,
+    stats: tuple[str, ...] = (),
+) -> Sample:
+    """Builds a Sample from the last measurement of every available source
+
+    *stats* names the running statistics (see s_tui.sources.stats) to
+    attach to every sensor reading.
+    """
+    readings = [_get_reading(s, stats) for s in sources if s.get_is_available()]
+    throttle = ""
+    for reading in readings:
+        throttle = next((s for s in reading.suffixes if s), "")
+        if throttle:
+            break
+    return Sample(readings, throttle, annotations=annotations)
+
+
+class FlushPolicy:
+    """Decides when a buffered sink should flush
+
+    The policy is parsed from a string: "line" flushes every row, a plain
+    number N flushes every N rows and a number with an "s" suffix
+    (e.g. "5s") flushes at most every that many seconds.
+    """
+
+    def __init__(self, every_rows: int = 1, every_seconds: float | None = None):
+        self.every_rows = max(1, every_rows)
+        self.every_seconds = every_seconds
+        self.pending = 0
+        self.last_flush = time.monotonic()
+
+    @classmethod
+    def parse(cls, policy: str | None) -> FlushPolicy:
+        if policy is None or policy == "line":
+            return cls()
+        match = re.match(r"\A([0-9]*\.?[0-9]+)s\Z", policy)
+        if match:
+            return cls(every_rows=2**31, every_seconds=float(match.group(1)))
+        if re.match(r"\A[0-9]+\Z", policy) and int(policy) > 0:
+            return cls(every_rows=int(policy))
+        raise ValueError("Invalid flush policy: " + policy)
+
+    def row_written(self) -> bool:
+        """Registers a written row, returns True if a flush is due"""
+        self.pending += 1
+        if self.pending >= self.every_rows:
+            return True
+        return (
+            self.every_seconds is not None
+            and time.monotonic() - self.last_flush >= self.every_seconds
+        )
+
+    def flushed(self) -> None:
+        self.pending = 0
+        self.last_flush = time.monotonic()
+
+
+def rebuild_sample(
+    sources: list[tuple[str, str, list[str]]],
+    timestamp: float,
+    values: list[float | None],
+    throttle: str,
+) -> Sample:
+    """Splits a flat row of values back into the readings of *sources*"""
+    readings = []
+    offset = 0
+    for name, unit, sensors in sources:
+        readings.append(
+            SourceReading(
+                name,
+                unit,
+                sensors,
+                values[offset : offset + len(sensors)],
+                [""] * len(sensors),
+            )
+        )
+        offset += len(sensors)
+    return Sample(readings, throttle, timestamp=timestamp, monotonic=timestamp)
+
+
+class SampleReader:
+    """Random access to the rows of stored samples
+
+    A reader provides its sources, __len__, timestamp() and read(), rows
+    are in time order.
+    """
+
+    sources: list[tuple[str, str, list[str]]]
+
+    def __len__(self) -> int:
+        raise NotImplementedError("__len__ is not implemented")
+
+    def timestamp(self, index: int) -> float:
+        """Returns the time of row *index*"""
+        raise NotImplementedError("timestamp is not implemented")
+
+    def read(self, index: int) -> tuple[float, list[float | None], str]:
+        """Returns time, values (None when N/A) and throttle label of a row"""
+        raise NotImplementedError("read is not implemented")
+
+    def sample(self, index: int) -> Sample:
+        """Rebuilds the Sample stored in row *index*"""
+        timestamp, values, throttle = self.read(index)
+        return rebuild_sample(self.sources, timestamp, values, throttle)
+
+    def find(self, timestamp: float) -> int:
+        """Returns the index of the first row at or after *timestamp*"""
+        return bisect.bisect_left(range(len(self)), timestamp, key=self.timestamp)
+
+    def samples(
+        self, start: float | None = None, end: float | None = None
+    ) -> Iterator[Sample]:
+        """Iterates over the samples between two timestamps"""
+        first = 0 if start is None else self.find(start)
+        last = len(self) if end is None else self.find(end)
+        for index in range(first, last):
+            yield self.sample(index)
+
+    def close(self) -> None:
+        """Releases the stored samples"""
+
+
+class Sink:
+    """This is a basic sink class for s-tui"""
+
+    def write(self, sample: Sample) -> None:
+        """Consumes one sample"""
+        raise NotImplementedError("write is not implemented")
+
+    def flush(self) -> None:
+        """Pushes any buffered data to its destination"""
+
+    def reopen(self) -> None:
+        """Reopens the destination, e.g. after log rotation (SIGHUP)"""
+
+    def close(self) -> None:
+        """Flushes and releases the destination"""
+        self.flush()
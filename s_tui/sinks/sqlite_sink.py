@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Stores samples in an SQLite database
+
+Every sink instance is one run in the runs table.  Samples go to a
+single samples table with one REAL column per "Source:sensor", added
+with ALTER TABLE when a new sensor shows up.  Past runs can then be
+queried with plain SQL, e.g.::
+
+    SELECT runs.id, MAX(samples."Temp:Package id 0")
+    FROM samples JOIN runs ON runs.id = samples.run_id
+    WHERE runs.started > strftime('%s', 'now', '-7 days')
+    GROUP BY runs.id;
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import socket
+import sqlite3
+import threading
+import time
+
+from s_tui.sinks.sink import Sample, Sink
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    host TEXT NOT NULL,
+    started REAL NOT NULL,
+    ended REAL
+);
+CREATE INDEX IF NOT EXISTS runs_host_started ON runs (host, started);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    ts REAL NOT NULL,
+    throttle TEXT
+);
+CREATE INDEX IF NOT EXISTS samples_run_ts ON samples (run_id, ts);
+"""
+
+# Queue marker asking the writer thread to commit right away
+_COMMIT = object()
+
+
+def quote(name: str) -> str:
+    """Quotes a column name such as "Temp:Package id 0" for SQL"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SqliteSink(Sink):
+    """Writes samples to SQLite from a background thread
+
+    write() only queues the row.  The writer thread inserts the queued
+    rows in one transaction every *commit_interval* seconds.  The
+    database runs in WAL mode with synchronous=NORMAL, so commits do not
+    wait for fsync and readers never block the writer.
+    """
+
+    def __init__(self, path: str, commit_interval: float = 5.0) -> None:
+        self.path = path
+        self.commit_interval = commit_interval
+        try:
+            self.connection: sqlite3.Connection | None = sqlite3.connect(
+                path, isolation_level=None, check_same_thread=False
+            )
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.executescript(SCHEMA)
+            cursor = self.connection.execute(
+                "INSERT INTO runs (host, started) VALUES (?, ?)",
+                (socket.gethostname(), time.time()),
+            )
+        except sqlite3.Error as err:
+            raise OSError("Cannot use database " + path + ": " + str(err)) from err
+        self.run_id = cursor.lastrowid
+        self.table_columns = self._read_table_columns(self.connection)
+        self.columns: list[str] | None = None
+        self.insert = ""
+        self._queue: queue.Queue[object] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        logging.info("Writing samples to %s as run %s", path, self.run_id)
+
+    def write(self, sample: Sample) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, daemon=True)
+            self._thread.start()
+        self._queue.put(
+            (sample.time, sample.throttle, sample.columns(), sample.values())
+        )
+
+    def flush(self) -> None:
+        """Asks the writer thread to commit, without waiting for it"""
+        if self._thread is not None:
+            self._queue.put(_COMMIT)
+
+    @staticmethod
+    def _read_table_columns(connection: sqlite3.Connection) -> set[str]:
+        return {row[1] for row in connection.execute("PRAGMA table_info(samples)")}
+
+    def _use_columns(self, connection: sqlite3.Connection, columns: list[str]) -> None:
+        for column in columns:
+            if column not in self.table_columns:
+                connection.execute(
+                    "ALTER TABLE samples ADD COLUMN " + quote(column) + " REAL"
+                )
+                self.table_columns.add(column)
+        self.columns = columns
+        self.insert = (
+            "INSERT INTO samples (run_id, ts, throttle, "
+            + ", ".join(quote(c) for c in columns)
+            + ") VALUES (?, ?, ?"
+            + ", ?" * len(columns)
+            + ")"
+        )
+
+    def _commit(self, rows: list) -> None:
+        connection = self.connection
+        if connection is None:
+            return
+        try:
+            connection.execute("BEGIN")
+            for timestamp, throttle, columns, values in rows:
+                if columns != self.columns:
+                    self._use_columns(connection, columns)
+                connection.execute(
+                    self.insert, (self.run_id, timestamp, throttle, *values)
+                )
+            connection.execute("COMMIT")
+        except sqlite3.Error as err:
+            logging.error(
+                "Failed to store %s samples in %s: %s", len(rows), self.path, err
+            )
+            try:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                # The rollback also undid the columns added in the batch
+                self.table_columns = self._read_table_columns(connection)
+            except sqlite3.Error as rollback_err:
+                logging.error("Failed to roll back %s: %s", self.path, rollback_err)
+            # Column names are checked again on the next batch
+            self.columns = None
+
+    def _worker(self) -> None:
+        rows: list = []
+        deadline = time.monotonic() + self.commit_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                item = _COMMIT
+            if item is not None and item is not _COMMIT:
+                rows.append(item)
+                if time.monotonic() < deadline:
+                    continue
+            if rows:
+                self._commit(rows)
+                rows = []
+            deadline = time.monotonic() + self.commit_interval
+            if item is None:
+                return
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if self.connection is None:
+            return
+        try:
+            self.connection.execute(
+                "UPDATE runs SET ended = ? WHERE id = ?", (time.time(), self.run_id)
+            )
+            self.connection.close()
+        except sqlite3.Error as err:
+            logging.error("Failed to close %s: %s", self.path, err)
+        self.connection = None
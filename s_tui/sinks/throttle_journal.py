@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Journal of throttle episodes
+
+FreqSource labels every throttled core with its reasons (e.g. "T/W")
+on every tick.  The journal turns these labels into episodes: one
+record per core and reason with the monotonic start and end, and the
+temperature and package power when it started.  Consecutive throttled
+ticks extend the open episode, so a long run yields a few records
+rather than one per tick.
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+from collections import deque
+from typing import IO, Any
+
+from s_tui.sinks.csv_sink import format_time
+from s_tui.sinks.sink import Sample, Sink, summarize_sample
+
+# Closed episodes kept in memory for the UI
+MAX_EPISODES = 1000
+
+JOURNAL_HEADER = [
+    "Start",
+    "Core",
+    "Reason",
+    "Duration",
+    "Temp",
+    "Power",
+    "Start monotonic",
+    "End monotonic",
+]
+
+
+class ThrottleEpisode:
+    """A stretch of ticks in which one core throttled for one reason"""
+
+    __slots__ = ("core", "end", "power", "reason", "start", "start_time", "temp")
+
+    def __init__(
+        self,
+        core: str,
+        reason: str,
+        start: float,
+        start_time: float,
+        temp: float | None,
+        power: float | None,
+    ) -> None:
+        self.core = core
+        self.reason = reason
+        self.start = start
+        self.start_time = start_time
+        self.end: float | None = None
+        self.temp = temp
+        self.power = power
+
+    def duration(self, now: float) -> float:
+        """Seconds throttled, up to *now* while the episode is open"""
+        return (now if self.end is None else self.end) - self.start
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "core": self.core,
+            "reason": self.reason,
+            "start": self.start,
+            "end": self.end,
+            "start_time": round(self.start_time, 3),
+            "temp": self.temp,
+            "power": self.power,
+        }
+
+
+class ThrottleJournal:
+    """Coalesces the per-core throttle labels of samples into episodes"""
+
+    def __init__(self, max_episodes: int = MAX_EPISODES) -> None:
+        self.closed: deque[ThrottleEpisode] = deque(maxlen=max_episodes)
+        self.open: dict[tuple[str, str], ThrottleEpisode] = {}
+        self.count = 0
+        self.last_monotonic = 0.0
+
+    def add(self, sample: Sample) -> list[ThrottleEpisode]:
+        """Accounts for one sample, returns the episodes that ended in it"""
+        self.last_monotonic = sample.monotonic
+        active: set[tuple[str, str]] = set()
+        for reading in sample.readings:
+            if reading.name != "Frequency":
+                continue
+            labels = dict(zip(reading.sensors, reading.suffixes))
+            # "Avg" repeats the label of the first throttled core, it only
+            # stands for the CPU when no per-core labels are known (replays)
+            average = labels.pop("Avg", "")
+            if not any(labels.values()) and average:
+                labels = {"Avg": average}
+            for sensor, label in labels.items():
+                if label:
+                    active.update((sensor, reason) for reason in label.split("/"))
+
+        ended = [key for key in self.open if key not in active]
+        closed = [self.open.pop(key) for key in ended]
+        for episode in closed:
+            episode.end = sample.monotonic
+            self.closed.append(episode)
+
+        started = [key for key in active if key not in self.open]
+        if started:
+            summary = summarize_sample(sample)
+            for core, reason in sorted(started):
+                self.open[(core, reason)] = ThrottleEpisode(
+                    core,
+                    reason,
+                    sample.monotonic,
+                    sample.time,
+                    summary.max_temp,
+                    summary.package_power,
+                )
+                self.count += 1
+        return closed
+
+    def close(self) -> list[ThrottleEpisode]:
+        """Ends all open episodes at the last sample"""
+        closed = list(self.open.values())
+        self.open.clear()
+        for episode in closed:
+            episode.end = self.last_monotonic
+            self.closed.append(episode)
+        return closed
+
+    def episodes(self) -> list[ThrottleEpisode]:
+        """Returns the kept episodes, open ones last, oldest first"""
+        return [*self.closed, *self.open.values()]
+
+    def reset(self) -> None:
+        self.closed.clear()
+        self.open.clear()
+        self.count = 0
+
+
+def episode_row(episode: ThrottleEpisode) -> list[object]:
+    """Formats a closed episode as a journal CSV row"""
+    return [
+        format_time(episode.start_time),
+        episode.core,
+        episode.reason,
+        "" if episode.end is None else round(episode.end - episode.start, 3),
+        "" if episode.temp is None else episode.temp,
+        "" if episode.power is None else round(episode.power, 2),
+        round(episode.start, 3),
+        "" if episode.end is None else round(episode.end, 3),
+    ]
+
+
+class ThrottleJournalSink(Sink):
+    """Appends every finished throttle episode to a CSV file
+
+    Rows are written when an episode ends, episodes still open when
+    the sink is closed are ended at the last sample.
+    """
+
+    def __init__(self, path: str, journal: ThrottleJournal | None = None) -> None:
+        self.path = path
+        self.journal = journal or ThrottleJournal()
+        self.journal_file: IO[str] | None = None
+        self.writer = None
+        self.reopen()
+
+    def reopen(self) -> None:
+        if self.journal_file is not None:
+            self.journal_file.close()
+        self.journal_file = open(self.path, "a", newline="")  # noqa: SIM115
+        self.writer = csv.writer(self.journal_file)
+        if self.journal_file.tell() == 0:
+            self.writer.writerow(JOURNAL_HEADER)
+        logging.info("Writing throttle episodes to %s", self.path)
+
+    def _write(self, episodes: list[ThrottleEpisode]) -> None:
+        if not episodes or self.writer is None:
+            return
+        assert self.journal_file is not None
+        self.writer.writerows(episode_row(episode) for episode in episodes)
+        self.journal_file.flush()
+
+    def write(self, sample: Sample) -> None:
+        self._write(self.journal.add(sample))
+
+    def close(self) -> None:
+        if self.journal_file is None:
+            return
+        self._write(self.journal.close())
+        self.journal_file.close()
+        self.journal_file = None
+        self.writer = None
@@ -0,0 +1,322 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Side by side playback of two recorded runs
+
+Both runs are aligned on their stress start, the first row where the
+average utilization reaches a threshold, and played back on one clock
+counting from that moment.  Every sensor is split into an A, a B and a
+delta (B - A) graph.  Rows are read through the recording indexes, so
+neither run is loaded into memory.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+
+from s_tui.sinks.sink import Sample
+from s_tui.sources.replay_source import (
+    PALLETS,
+    TOPS,
+    PlaybackClock,
+    Recording,
+    parse_temp_thresh,
+    row_at,
+)
+from s_tui.sources.source import Source
+
+STRESS_UTIL = 50.0
+LABELS = ("A", "B")
+DELTA = "\N{GREEK CAPITAL LETTER DELTA}"
+
+
+def find_stress_start(recording: Recording, threshold: float = STRESS_UTIL) -> float:
+    """Returns the time the run first reached *threshold* average utilization
+
+    Runs without utilization data, or that never reach the threshold,
+    are aligned on their first row.
+    """
+    if "Util:Avg" not in recording.columns:
+        return recording.timestamp(0)
+    column = recording.columns.index("Util:Avg")
+    for index in range(len(recording)):
+        timestamp, values, _ = recording.read(index)
+        value = values[column]
+        if value is not None and value >= threshold:
+            return timestamp
+    return recording.timestamp(0)
+
+
+def summarize(
+    recording: Recording, start: float
+) -> tuple[float | None, float | None, float | None]:
+    """Returns time to throttle, sustained frequency and max temperature
+
+    Only rows from the stress start on are considered.  Values are None
+    when the run has no such data (or never throttled).
+    """
+    freq_column = None
+    if "Frequency:Avg" in recording.columns:
+        freq_column = recording.columns.index("Frequency:Avg")
+    temp_columns = [
+        idx
+        for idx, column in enumerate(recording.columns)
+        if column.startswith("Temp:")
+    ]
+    time_to_throttle = None
+    freq_total = 0.0
+    freq_count = 0
+    max_temp = None
+    for index in range(recording.find(start), len(recording)):
+        timestamp, values, throttle = recording.read(index)
+        if throttle and time_to_throttle is None:
+            time_to_throttle = timestamp - start
+        freq = None if freq_column is None else values[freq_column]
+        if freq is not None:
+            freq_total += freq
+            freq_count += 1
+        for idx in temp_columns:
+            value = values[idx]
+            if value is not None and (max_temp is None or value > max_temp):
+                max_temp = value
+    sustained_freq = freq_total / freq_count if freq_count else None
+    return time_to_throttle, sustained_freq, max_temp
+
+
+class Comparison(PlaybackClock):
+    """Plays back two recordings aligned on their stress start
+
+    The clock counts seconds from the stress start, so it is negative
+    during the idle lead-in.  A run that has no row at the current time
+    (it started later or already ended) reads as N/A.
+    """
+
+    def __init__(
+        self,
+        recording_a: Recording,
+        recording_b: Recording,
+        speed: float = 1.0,
+        threshold: float = STRESS_UTIL,
+    ) -> None:
+        self.recordings = (recording_a, recording_b)
+        self.starts = [find_stress_start(r, threshold) for r in self.recordings]
+        self.summaries = [
+            summarize(r, start) for r, start in zip(self.recordings, self.starts)
+        ]
+        self.ends = [r.timestamp(len(r) - 1) for r in self.recordings]
+        self.indexes = [-1, -1]
+        self.current: list[Sample | None] = [None, None]
+        PlaybackClock.__init__(
+            self,
+            min(r.timestamp(0) - s for r, s in zip(self.recordings, self.starts)),
+            max(end - s for end, s in zip(self.ends, self.starts)),
+            0.0,
+            speed,
+        )
+        self._locate()
+
+    def _locate(self) -> None:
+        for side, recording in enumerate(self.recordings):
+            timestamp = self.starts[side] + self.clock
+            index = row_at(recording, timestamp)
+            if timestamp > self.ends[side]:
+                index = -1
+            if index != self.indexes[side]:
+                self.indexes[side] = index
+                self.current[side] = recording.sample(index) if index >= 0 else None
+
+    def samples(self) -> list[Sample | None]:
+        """Returns the sample of each run at the playback clock"""
+        return self.current
+
+    def source_names(self) -> list[str]:
+        names: list[str] = []
+        for recording in self.recordings:
+            for name, _, _ in recording.sources:
+                if name not in names:
+                    names.append(name)
+        return names
+
+    def get_sources(self, temp_thresh: int | str | None = None) -> list[Source]:
+        sources: list[Source] = [
+            CompareSource(self, name, temp_thresh) for name in self.source_names()
+        ]
+        sources.append(RunSummarySource(self))
+        return sources
+
+    def default_graphs_conf(self) -> dict[str, dict[str, bool]]:
+        """Deltas and the run summary are shown as text only"""
+        conf: dict[str, dict[str, bool]] = {}
+        for source in self.get_sources():
+            name = source.get_source_name()
+            conf[name] = {
+                sensor.lower(): False
+                for sensor in source.get_sensor_list()
+                if name == RunSummarySource.NAME or sensor.startswith(DELTA)
+            }
+        return conf
+
+    def close(self) -> None:
+        for recording in self.recordings:
+            recording.close()
+
+
+class CompareSource(Source):
+    """One source of both runs, as A, B and delta sensors"""
+
+    def __init__(
+        self, comparison: Comparison, name: str, temp_thresh: int | str | None = None
+    ) -> None:
+        Source.__init__(self)
+        self.comparison = comparison
+        self.name = name
+        if name in PALLETS:
+            self.pallet, self.alert_pallet = PALLETS[name]
+
+        # Index of the source in each recording, None if it was not recorded
+        self.indexes: list[int | None] = [None, None]
+        self.sensors: list[str] = []
+        for side, recording in enumerate(comparison.recordings):
+            for index, (src_name, unit, sensors) in enumerate(recording.sources):
+                if src_name != name:
+                    continue
+                self.indexes[side] = index
+                self.measurement_unit = self.measurement_unit or unit
+                self.sensors += [s for s in sensors if s not in self.sensors]
+
+        self.available_sensors = [
+            label + " " + sensor
+            for sensor in self.sensors
+            for label in (*LABELS, DELTA)
+        ]
+        self.last_measurement = [0.0] * len(self.available_sensors)
+        self.last_thresholds = [None] * len(self.available_sensors)
+        self.sensor_available = [False] * len(self.available_sensors)
+
+        self.temp_thresh = parse_temp_thresh(temp_thresh)
+        self.throttles = ["", ""]
+        self.max_value = 0.0
+
+    def _values(self, side: int, sample: Sample | None) -> dict[str, float | None]:
+        index = self.indexes[side]
+        if sample is None or index is None:
+            return {}
+        reading = sample.readings[index]
+        return dict(zip(reading.sensors, reading.values))
+
+    def update(self) -> None:
+        samples = self.comparison.samples()
+        values = [self._values(side, sample) for side, sample in enumerate(samples)]
+        self.throttles = [sample.throttle if sample else "" for sample in samples]
+
+        measurement: list[float | None] = []
+        for sensor in self.sensors:
+            value_a = values[0].get(sensor)
+            value_b = values[1].get(sensor)
+            delta = None
+            if value_a is not None and value_b is not None:
+                delta = value_b - value_a
+            measurement += [value_a, value_b, delta]
+
+        self.sensor_available = [value is not None for value in measurement]
+        self.last_measurement = [0.0 if v is None else v for v in measurement]
+        self.max_value = max(self.max_value, *self.last_measurement)
+
+        # Alert colors are set per sensor, deltas never alert
+        thresholds: list[float | None] = [None] * len(measurement)
+        for idx in range(len(measurement)):
+            side = idx % 3
+            if side == 2:
+                continue
+            if self.name == "Temp":
+                thresholds[idx] = self.temp_thresh
+            elif self.name == "Frequency" and self.throttles[side]:
+                thresholds[idx] = 0.0
+        self.last_thresholds = thresholds
+
+    def get_sensors_summary(self) -> OrderedDict[str, str]:
+        summary = Source.get_sensors_summary(self)
+        for name, value in summary.items():
+            if name.startswith(DELTA) and value != "N/A" and not value.startswith("-"):
+                summary[name] = "+" + value
+        return summary
+
+    def get_edge_triggered(self) -> bool:
+        return False
+
+    def get_sensor_alerts(self) -> list[str | None]:
+        alerts: list[str | None] = [None] * len(self.available_sensors)
+        for idx, thresh in enumerate(self.last_thresholds):
+            if (
+                thresh is not None
+                and self.sensor_available[idx]
+                and self.last_measurement[idx] > thresh
+            ):
+                alerts[idx] = "high temp txt" if self.name == "Temp" else "throttle txt"
+        return alerts
+
+    def get_sensor_suffixes(self) -> list[str]:
+        suffixes = [""] * len(self.available_sensors)
+        if self.name == "Frequency":
+            # The throttle label of each run goes next to its first sensor
+            suffixes[0] = self.throttles[0]
+            suffixes[1] = self.throttles[1]
+        return suffixes
+
+    def get_maximum(self) -> float:
+        return self.max_value
+
+    def get_top(self) -> float:
+        return TOPS.get(self.measurement_unit, 1)
+
+    def reset(self) -> None:
+        self.max_value = 0.0
+
+
+class RunSummarySource(Source):
+    """Time to throttle, sustained frequency and max temperature per run"""
+
+    NAME = "Runs"
+
+    def __init__(self, comparison: Comparison) -> None:
+        Source.__init__(self)
+        self.name = self.NAME
+        self.measurement_unit = "A/B"
+        self.available_sensors = [
+            label + " " + metric
+            for metric in ("throttle s", "sust. MHz", "max C")
+            for label in LABELS
+        ]
+        # Summaries are fixed, ordered like the sensors
+        values = [
+            summary[metric] for metric in range(3) for summary in comparison.summaries
+        ]
+        self.sensor_available = [value is not None for value in values]
+        self.last_measurement = [0.0 if v is None else v for v in values]
+        self.last_thresholds = [None] * len(values)
+
+    def get_edge_triggered(self) -> bool:
+        return False
+
+    def get_maximum(self) -> float:
+        return max(self.last_measurement)
+
+    def get_top(self) -> float:
+        return 1
+
+    def reset(self) -> None:
+        pass
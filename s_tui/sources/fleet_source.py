@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Nodes of a fleet of agents
+
+The fleet view follows many "s-tui-collect --agent" processes at once.
+Every Node keeps one connection to its agent on an asyncio loop,
+reconnecting with backoff, and a bounded history of the samples it
+received.  A Node feeds ReplaySource objects like a SamplerClient, so a
+node can be drilled into with the regular graphs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import random
+import struct
+from collections import deque
+
+from s_tui.sinks.prometheus import parse_address
+from s_tui.sinks.sampler import FrameDecoder
+from s_tui.sinks.sink import Sample, SampleSummary, summarize_sample
+from s_tui.sources.remote_source import SampleDecoder
+
+# Samples kept per node, 10 minutes at the default refresh rate
+HISTORY = 300
+CONNECT_TIMEOUT = 5.0
+# Agents send a sample every refresh, a silent agent is considered lost
+READ_TIMEOUT = 30.0
+READ_SIZE = 1 << 16
+RECONNECT_DELAY = 0.5
+MAX_RECONNECT_DELAY = 30.0
+
+
+class Node(SampleDecoder):
+    """One agent of the fleet and what it last sent"""
+
+    def __init__(self, address: str, history: int = HISTORY) -> None:
+        SampleDecoder.__init__(self)
+        self.address = address
+        host, self.port = parse_address(address)
+        # self.host is the name the agent reports for itself
+        self.agent_host = host or "localhost"
+        self.history: deque[Sample] = deque(maxlen=history)
+        self.received = 0
+        self.error = ""
+
+    def summary(self) -> SampleSummary | None:
+        if self.current is None:
+            return None
+        return summarize_sample(self.current)
+
+    async def _receive(self, reader: asyncio.StreamReader) -> None:
+        decoder = FrameDecoder()
+        while True:
+            data = await asyncio.wait_for(reader.read(READ_SIZE), READ_TIMEOUT)
+            if not data:
+                raise ConnectionError("the agent closed the connection")
+            for kind, payload in decoder.feed(data):
+                if self.handle(kind, payload):
+                    assert self.current is not None
+                    self.history.append(self.current)
+                    self.received += 1
+
+    async def run(self) -> None:
+        """Follows the agent until cancelled"""
+        delay = RECONNECT_DELAY
+        while True:
+            received = self.received
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.agent_host, self.port), CONNECT_TIMEOUT
+                )
+            except (OSError, asyncio.TimeoutError) as err:
+                self.error = str(err) or "connection timed out"
+            else:
+                self.connected = True
+                self.error = ""
+                try:
+                    await self._receive(reader)
+                except (
+                    OSError,
+                    ValueError,
+                    KeyError,
+                    struct.error,
+                    asyncio.TimeoutError,
+                ) as err:
+                    self.error = str(err) or "no data from the agent"
+                finally:
+                    writer.close()
+                    with contextlib.suppress(OSError):
+                        await writer.wait_closed()
+                self.disconnected()
+            # A connection that delivered samples starts the backoff over
+            if self.received != received:
+                delay = RECONNECT_DELAY
+            await asyncio.sleep(random.uniform(delay / 2, delay))
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+
+class Fleet:
+    """The nodes of a fleet, connected concurrently on one asyncio loop"""
+
+    def __init__(self, addresses: list[str], history: int = HISTORY) -> None:
+        self.nodes = [Node(address, history) for address in addresses]
+        self.tasks: list[asyncio.Task[None]] = []
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.tasks = [loop.create_task(node.run()) for node in self.nodes]
+
+    async def close(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
@@ -220,6 +220,8 @@ class FreqSource(Source):
         self.last_measurement[0] = (
             sum(online_freqs) / len(online_freqs) if online_freqs else 0.0
         )
+        if online_freqs:
+            self.max_freq = max(self.max_freq, *online_freqs)
 
         self._update_throttle_state()
 
@@ -238,6 +240,9 @@ class FreqSource(Source):
     def get_maximum(self) -> float:
         return self.max_freq
 
+    def reset(self) -> None:
+        self.max_freq = self.top_freq
+
     def get_top(self) -> float:
         logging.debug("Returning top %s", self.top_freq)
         return self.top_freq
@@ -114,9 +114,13 @@ class RaplPowerSource(Source):
 
         self.last_probe = current_measurement_value
         self.last_probe_time = current_measurement_time
+        self.max_power = max([self.max_power, *self.last_measurement])
 
     def get_maximum(self) -> float:
         return self.max_power
 
+    def reset(self) -> None:
+        self.max_power = 1
+
     def get_top(self) -> int:
         return 1
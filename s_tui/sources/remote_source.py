@@ -0,0 +1,332 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Viewer side of a shared sampler
+
+A SamplerClient attaches to a sampler served by "s-tui-collect --serve"
+and keeps its last sample, which ReplaySource objects display as if
+they read the hardware.  Stress mode changes are sent to the sampler
+through RemoteStressController.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import math
+import socket
+import struct
+import threading
+import time
+from typing import Any
+
+from s_tui.builtin_stresser import ROTATE_PERIOD
+from s_tui.sinks.recording import mask_to_throttle, row_struct
+from s_tui.sinks.sampler import (
+    COMMAND,
+    SAMPLE,
+    SCHEMA,
+    STATE,
+    FrameDecoder,
+    encode_json,
+)
+from s_tui.sinks.sink import Sample, rebuild_sample
+from s_tui.sources.replay_source import ReplaySource
+from s_tui.sources.source import Source
+
+RECONNECT_DELAY = 0.5
+MAX_RECONNECT_DELAY = 10.0
+
+
+class SampleDecoder:
+    """Rebuilds the samples of a sampler from its frames
+
+    Samples are mapped onto the sensors of the first schema, because the
+    TUI cannot add graphs later; sensors that disappear read as N/A.
+    """
+
+    def __init__(self) -> None:
+        self.host = ""
+        self.sources: list[tuple[str, str, list[str]]] = []
+        self.columns: list[str] = []
+        # Index of each of our columns in the sampler's rows
+        self.mapping: list[int | None] = []
+        self.row: struct.Struct | None = None
+        self.current: Sample | None = None
+        self.state: dict[str, Any] = {
+            "mode": "Monitor",
+            "modes": ["Monitor"],
+            "started": None,
+        }
+        self.connected = False
+
+    def handle(self, kind: int, payload: bytes) -> bool:
+        """Applies one frame, returns True if it was a new sample"""
+        if kind == SCHEMA:
+            schema = json.loads(payload)
+            sources = [
+                (name, unit, list(sensors)) for name, unit, sensors in schema["sources"]
+            ]
+            columns = [
+                name + ":" + sensor
+                for name, _, sensors in sources
+                for sensor in sensors
+            ]
+            if not self.sources:
+                self.host = schema.get("host", "")
+                self.sources = sources
+                self.columns = columns
+            positions = {column: idx for idx, column in enumerate(columns)}
+            self.mapping = [positions.get(column) for column in self.columns]
+            self.row = row_struct(len(columns))
+        elif kind == SAMPLE and self.row is not None:
+            timestamp, *values, mask = self.row.unpack(payload)
+            self.current = rebuild_sample(
+                self.sources,
+                timestamp,
+                [
+                    None if idx is None or math.isnan(values[idx]) else values[idx]
+                    for idx in self.mapping
+                ],
+                mask_to_throttle(mask),
+            )
+            return True
+        elif kind == STATE:
+            self.state = json.loads(payload)
+        return False
+
+    def disconnected(self) -> None:
+        """Shows every sensor as N/A until the sampler is back"""
+        self.connected = False
+        self.row = None
+        if self.sources:
+            self.current = rebuild_sample(
+                self.sources, time.time(), [None] * len(self.columns), ""
+            )
+
+    def sample(self) -> Sample:
+        """Returns the last sample received from the sampler"""
+        assert self.current is not None
+        return self.current
+
+    def send_command(self, command: dict[str, Any]) -> None:
+        logging.info("Cannot send commands to this sampler")
+
+    def get_sources(self, temp_thresh: int | str | None = None) -> list[Source]:
+        """Returns one stand-in source per source of the sampler"""
+        return [
+            ReplaySource(self, index, temp_thresh) for index in range(len(self.sources))
+        ]
+
+
+class SamplerClient(SampleDecoder):
+    """Connection of a viewer to a shared sampler
+
+    A reader thread keeps the last sample and stress state sent by the
+    sampler.  A lost connection is retried with backoff.
+    """
+
+    def __init__(self, path: str) -> None:
+        SampleDecoder.__init__(self)
+        self.path = path
+        self.sock: socket.socket | None = None
+        self.decoder = FrameDecoder()
+        self.send_lock = threading.Lock()
+        self.closed = threading.Event()
+        self.thread: threading.Thread | None = None
+
+    def _open(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        self.decoder = FrameDecoder()
+        self.sock = sock
+        self.connected = True
+
+    def _receive(self) -> None:
+        assert self.sock is not None
+        data = self.sock.recv(65536)
+        if not data:
+            raise ConnectionError("the sampler closed the connection")
+        for kind, payload in self.decoder.feed(data):
+            self.handle(kind, payload)
+
+    def connect(self, timeout: float = 5.0) -> None:
+        """Connects and waits for the sensors and the first sample"""
+        self._open()
+        assert self.sock is not None
+        self.sock.settimeout(timeout)
+        try:
+            while self.current is None:
+                self._receive()
+        except (OSError, ValueError, struct.error):
+            self.sock.close()
+            self.connected = False
+            raise
+        self.sock.settimeout(None)
+        self.thread = threading.Thread(target=self._read, daemon=True)
+        self.thread.start()
+
+    def _read(self) -> None:
+        while not self.closed.is_set():
+            try:
+                self._receive()
+                continue
+            except (OSError, ValueError, struct.error) as err:
+                if self.closed.is_set():
+                    return
+                logging.warning("Lost the sampler at %s: %s", self.path, err)
+            if self.sock is not None:
+                self.sock.close()
+            self.disconnected()
+            delay = RECONNECT_DELAY
+            while not self.closed.wait(delay):
+                try:
+                    self._open()
+                    logging.info("Reconnected to the sampler at %s", self.path)
+                    break
+                except OSError:
+                    delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    def send_command(self, command: dict[str, Any]) -> None:
+        with self.send_lock:
+            try:
+                if self.sock is None or not self.connected:
+                    raise ConnectionError("not connected")
+                self.sock.sendall(encode_json(COMMAND, command))
+            except OSError as err:
+                logging.warning("Cannot send a command to the sampler: %s", err)
+
+    def close(self) -> None:
+        self.closed.set()
+        if self.sock is not None:
+            with contextlib.suppress(OSError):
+                self.sock.shutdown(socket.SHUT_RDWR)
+            self.sock.close()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+
+class RemoteStressController:
+    """Stands in for StressController, switching the sampler's stress
+
+    The stress runs in the sampler and keeps running when a viewer quits.
+    The mode follows the sampler, whichever viewer changed it.
+    """
+
+    def __init__(self, client: SamplerClient) -> None:
+        self.client = client
+        self.state: dict[str, Any] | None = None
+        self.current_mode = client.state["mode"]
+        # Sent with the next start of the sampler's built-in stress
+        self.duty = 1.0
+        self.placement = "none"
+        self.rotate_period = ROTATE_PERIOD
+
+    def get_modes(self) -> list[str]:
+        return list(self.client.state["modes"])
+
+    def get_current_mode(self) -> str:
+        return self.current_mode
+
+    def set_mode(self, mode: str) -> None:
+        self.current_mode = mode
+        if mode == "Monitor":
+            self.client.send_command({"mode": mode})
+
+    def get_stress_process(self) -> None:
+        return None
+
+    def kill_stress_process(self) -> None:
+        """The stress belongs to the sampler, viewers never stop it"""
+
+    def stress_exited(self) -> bool:
+        """The sampler reports the mode once its stress ended"""
+        return False
+
+    def close(self) -> None:
+        """The stress belongs to the sampler, viewers never stop it"""
+
+    def prefork_builtin_stress(self, num_workers: int) -> None:
+        """The sampler forks its own workers"""
+
+    def start_stress(self, stress_cmd: list[str]) -> None:
+        self.client.send_command({"mode": "Stress (ext)", "args": stress_cmd[1:]})
+
+    def set_builtin_duty(self, duty: float) -> None:
+        self.duty = duty
+
+    def set_builtin_placement(self, policy: str) -> None:
+        self.placement = policy
+
+    def set_builtin_rotate_period(self, period: float) -> None:
+        self.rotate_period = period
+
+    def get_builtin_rotation(self) -> str | None:
+        """The sampler does not report the workload of its rotation"""
+        return None
+
+    def get_stress_ng_metrics(self) -> dict[str, Any]:
+        """The sampler does not report stress-ng metrics"""
+        return {}
+
+    def get_last_stress_ng_metrics(self) -> dict[str, Any]:
+        return {}
+
+    def poll_stress_ng(self) -> bool:
+        """The sampler stops its own stress-ng"""
+        return False
+
+    def wait_stress_ng(self) -> None:
+        """The sampler stops its own stress-ng"""
+
+    def get_builtin_cpus(self) -> list[int]:
+        """Placement happens on the sampler, which does not report it"""
+        return []
+
+    def get_builtin_ops(self) -> list[int]:
+        """The sampler does not report worker throughput"""
+        return []
+
+    def get_builtin_traffic(self) -> list[int]:
+        return []
+
+    def start_builtin_stress(self, num_workers: int, strategy: str | None = None):
+        self.client.send_command(
+            {
+                "mode": "s-tui stress",
+                "workers": num_workers,
+                "strategy": strategy,
+                "duty": self.duty,
+                "placement": self.placement,
+                "rotate_period": self.rotate_period,
+            }
+        )
+
+    def sync(self) -> dict[str, Any] | None:
+        """Returns the sampler's stress state if it changed since last call"""
+        state = self.client.state
+        if state is self.state:
+            return None
+        self.state = state
+        self.current_mode = state["mode"]
+        return state
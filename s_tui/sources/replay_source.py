@@ -0,0 +1,360 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Replays recorded samples through stand-in sources
+
+A Replayer walks through a recording (binary, CSV or synthetic) on a
+playback clock that can be paused, sought and sped up.  ReplaySource
+objects expose the current row to the regular graph and summary widgets
+as if it was read from the hardware.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+from s_tui.helper_functions import seconds_to_text
+from s_tui.sinks.csv_sink import CsvReader
+from s_tui.sinks.recording import MAGIC, RecordingReader
+from s_tui.sinks.sink import Sample, SampleReader
+from s_tui.sources.source import Source
+from s_tui.sources.temp_source import TempSource
+
+MAX_SPEED = 1000
+
+# Pallet and alert pallet of the sources that can be recorded
+PALLETS = {
+    "Temp": (
+        ("temp light", "temp dark", "temp light smooth", "temp dark smooth"),
+        (
+            "high temp light",
+            "high temp dark",
+            "high temp light smooth",
+            "high temp dark smooth",
+        ),
+    ),
+    "Frequency": (
+        ("freq light", "freq dark", "freq light smooth", "freq dark smooth"),
+        (
+            "freq throttle light",
+            "freq throttle dark",
+            "freq throttle light smooth",
+            "freq throttle dark smooth",
+        ),
+    ),
+    "Util": (
+        ("util light", "util dark", "util light smooth", "util dark smooth"),
+        None,
+    ),
+    "Power": (
+        ("power light", "power dark", "power light smooth", "power dark smooth"),
+        None,
+    ),
+    "Fan": (("fan light", "fan dark", "fan light smooth", "fan dark smooth"), None),
+    "Stress": (
+        ("stress light", "stress dark", "stress light smooth", "stress dark smooth"),
+        None,
+    ),
+    "Bandwidth": (
+        ("stress light", "stress dark", "stress light smooth", "stress dark smooth"),
+        None,
+    ),
+    "stress-ng": (
+        ("stress light", "stress dark", "stress light smooth", "stress dark smooth"),
+        None,
+    ),
+}
+
+TOPS = {"%": 100, "C": 100}
+
+
+class SyntheticRecording(SampleReader):
+    """A deterministic, endless looking recording
+
+    Every row is computed from its index, so any row is available in
+    constant time.  Replaying it gives the UI a reproducible load, which
+    is useful to measure rendering performance without real hardware.
+    """
+
+    START = 1700000000.0
+
+    def __init__(self, cores: int = 8, rows: int = 86400, interval: float = 1.0):
+        self.cores = cores
+        self.rows = rows
+        self.interval = interval
+        self.host = "synthetic"
+        self.start = self.START
+        sensors = ["Avg", *("Core " + str(core) for core in range(cores))]
+        self.sources: list[tuple[str, str, list[str]]] = [
+            ("Frequency", "MHz", sensors),
+            ("Util", "%", sensors),
+            ("Temp", "C", ["Package", *sensors[1:]]),
+            ("Power", "W", ["package-0"]),
+        ]
+        self.columns = [
+            name + ":" + sensor
+            for name, _, sensors in self.sources
+            for sensor in sensors
+        ]
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def timestamp(self, index: int) -> float:
+        return self.START + index * self.interval
+
+    def read(self, index: int) -> tuple[float, list[float | None], str]:
+        if not 0 <= index < self.rows:
+            raise IndexError("row out of range")
+        util = [
+            50 + 50 * math.sin(2 * math.pi * index / 300 + core * 0.7)
+            for core in range(self.cores)
+        ]
+        freq = [800 + 32 * value for value in util]
+        temp = [35 + 0.55 * value + 5 * math.sin(index / 37) for value in util]
+        avg_util = sum(util) / self.cores
+        values: list[float | None] = [
+            sum(freq) / self.cores,
+            *freq,
+            avg_util,
+            *util,
+            max(temp),
+            *temp,
+            5 + 0.6 * avg_util,
+        ]
+        return self.timestamp(index), values, "T" if max(temp) > 88 else ""
+
+    def find(self, timestamp: float) -> int:
+        index = math.ceil((timestamp - self.START) / self.interval)
+        return min(max(index, 0), self.rows)
+
+
+Recording = RecordingReader | CsvReader | SyntheticRecording
+
+
+def open_recording(path: str) -> Recording:
+    """Opens a binary recording, a CSV log or "synthetic[:CORES]" """
+    if path == "synthetic" or path.startswith("synthetic:"):
+        cores = path.partition(":")[2]
+        return SyntheticRecording(int(cores) if cores else 8)
+
+    with open(path, "rb") as recfile:
+        magic = recfile.read(len(MAGIC))
+    recording: Recording = RecordingReader(path) if magic == MAGIC else CsvReader(path)
+    if not len(recording):
+        recording.close()
+        raise ValueError(path + " has no samples")
+    return recording
+
+
+def row_at(recording: Recording, timestamp: float) -> int:
+    """Returns the last row at or before *timestamp*, -1 if there is none"""
+    index = recording.find(timestamp)
+    if index >= len(recording) or recording.timestamp(index) > timestamp:
+        index -= 1
+    return index
+
+
+def parse_temp_thresh(temp_thresh: int | str | None) -> int:
+    """Returns the temperature alert threshold, as TempSource does"""
+    if temp_thresh is not None and int(temp_thresh) > 0:
+        return int(temp_thresh)
+    return TempSource.THRESHOLD_TEMP
+
+
+class PlaybackClock:
+    """Pausable clock running between two times at 1x to 1000x speed
+
+    The clock moves by refresh interval times speed on every advance().
+    Subclasses implement _locate() to follow the clock, and build the
+    stand-in sources that display what is found there.
+    """
+
+    def __init__(
+        self, first: float, last: float, origin: float, speed: float = 1.0
+    ) -> None:
+        self.first = first
+        self.last = last
+        # Time shown as 00:00:00 in the status
+        self.origin = origin
+        self.clock = first
+        self.speed = min(max(speed, 1.0), MAX_SPEED)
+        self.paused = False
+
+    def _locate(self) -> None:
+        pass
+
+    def seek_to(self, timestamp: float) -> None:
+        """Moves the clock to *timestamp*, clamped to the playback range"""
+        self.clock = min(max(timestamp, self.first), self.last)
+        self._locate()
+
+    def seek(self, seconds: float) -> None:
+        """Moves the clock forward (or backward if negative)"""
+        self.seek_to(self.clock + seconds)
+
+    def restart(self) -> None:
+        self.seek_to(self.first)
+
+    def advance(self, seconds: float) -> None:
+        """Plays *seconds* of wall time at the current speed"""
+        if self.paused:
+            return
+        self.seek(seconds * self.speed)
+        if self.clock >= self.last:
+            self.paused = True
+
+    def toggle_pause(self) -> None:
+        if self.paused and self.clock >= self.last:
+            self.restart()
+        self.paused = not self.paused
+
+    def faster(self) -> None:
+        self.speed = min(self.speed * 2, MAX_SPEED)
+
+    def slower(self) -> None:
+        self.speed = max(self.speed / 2, 1.0)
+
+    def status(self) -> str:
+        """Playback time and state, e.g. 00:12:30 x10"""
+        state = "||" if self.paused else "x" + str(round(self.speed))
+        elapsed = self.clock - self.origin
+        sign = "-" if elapsed < 0 else ""
+        return sign + seconds_to_text(abs(elapsed)) + " " + state
+
+    def get_sources(self, temp_thresh: int | str | None = None) -> list[Source]:
+        """Returns the stand-in sources to display"""
+        raise NotImplementedError("get_sources is not implemented")
+
+    def default_graphs_conf(self) -> dict[str, dict[str, bool]]:
+        """Returns graphs hidden unless configured otherwise"""
+        return {}
+
+    def close(self) -> None:
+        pass
+
+
+class Replayer(PlaybackClock):
+    """Plays back a single recording
+
+    The current row is the last one at or before the clock and is looked
+    up through the recording index, so seeking never rescans the file.
+    """
+
+    def __init__(self, recording: Recording, speed: float = 1.0) -> None:
+        self.recording = recording
+        self.sources = recording.sources
+        self.index = 0
+        self.current = recording.sample(0)
+        first = recording.timestamp(0)
+        PlaybackClock.__init__(
+            self, first, recording.timestamp(len(recording) - 1), first, speed
+        )
+
+    def _locate(self) -> None:
+        index = max(row_at(self.recording, self.clock), 0)
+        if index != self.index:
+            self.index = index
+            self.current = self.recording.sample(index)
+
+    def sample(self) -> Sample:
+        """Returns the sample at the playback clock"""
+        return self.current
+
+    def get_sources(self, temp_thresh: int | str | None = None) -> list[Source]:
+        """Returns one stand-in source per recorded source"""
+        return [
+            ReplaySource(self, index, temp_thresh)
+            for index in range(len(self.recording.sources))
+        ]
+
+    def close(self) -> None:
+        self.recording.close()
+
+
+class ReplaySource(Source):
+    """Stands in for a real source, reading from a Replayer
+
+    Anything with the recorded *sources* and a sample() method, such as
+    a viewer attached to a shared sampler, can feed it instead.
+    """
+
+    def __init__(
+        self, replayer: Any, index: int, temp_thresh: int | str | None = None
+    ) -> None:
+        Source.__init__(self)
+        name, unit, sensors = replayer.sources[index]
+        self.replayer = replayer
+        self.index = index
+        self.name = name
+        self.measurement_unit = unit
+        if name in PALLETS:
+            self.pallet, self.alert_pallet = PALLETS[name]
+
+        self.available_sensors = list(sensors)
+        self.last_measurement = [0.0] * len(sensors)
+        self.last_thresholds = [None] * len(sensors)
+        self.sensor_available = [True] * len(sensors)
+
+        self.temp_thresh = parse_temp_thresh(temp_thresh)
+        self.throttle = ""
+        self.max_value = 0.0
+
+    def update(self) -> None:
+        sample = self.replayer.sample()
+        values = sample.readings[self.index].values
+        self.sensor_available = [value is not None for value in values]
+        self.last_measurement = [0.0 if value is None else value for value in values]
+        self.throttle = sample.throttle
+        self.max_value = max(self.max_value, *self.last_measurement)
+
+    def get_edge_triggered(self) -> bool:
+        if self.name == "Temp":
+            return max(self.last_measurement) > self.temp_thresh
+        if self.name == "Frequency":
+            return bool(self.throttle)
+        return False
+
+    def get_title_note(self) -> str:
+        # stress-ng rates are only known once its run ended
+        return "last run" if self.name == "stress-ng" else ""
+
+    def get_sensor_alerts(self) -> list[str | None]:
+        alerts: list[str | None] = [None] * len(self.available_sensors)
+        if self.name == "Temp":
+            for idx, value in enumerate(self.last_measurement):
+                if self.sensor_available[idx] and value > self.temp_thresh:
+                    alerts[idx] = "high temp txt"
+        elif self.name == "Frequency" and self.throttle:
+            alerts[0] = "throttle txt"
+        return alerts
+
+    def get_sensor_suffixes(self) -> list[str]:
+        suffixes = [""] * len(self.available_sensors)
+        if self.name == "Frequency":
+            suffixes[0] = self.throttle
+        return suffixes
+
+    def get_maximum(self) -> float:
+        return self.max_value
+
+    def get_top(self) -> float:
+        return TOPS.get(self.measurement_unit, 1)
+
+    def reset(self) -> None:
+        self.max_value = 0.0
@@ -25,8 +25,11 @@ import os
 from collections import OrderedDict
 from typing import TYPE_CHECKING
 
+from s_tui.sources.stats import SourceStats
+
 if TYPE_CHECKING:
     from s_tui.sources.hook import Hook
+    from s_tui.sources.hook_script import ScriptHook
 
 try:
     import psutil
@@ -38,7 +41,7 @@ class Source:
     """This is a basic source class for s-tui"""
 
     def __init__(self) -> None:
-        self.edge_hooks: list[Hook] = []
+        self.edge_hooks: list[Hook | ScriptHook] = []
         self.measurement_unit = ""
         self.last_measurement: list[float] = []
         self.last_thresholds: list[float | None] = []
@@ -53,11 +56,22 @@ class Source:
             "temp dark smooth",
         )
         self.alert_pallet = None
+        self.stats = SourceStats()
+        # Statistic shown in the summary, "last" or one of STAT_NAMES
+        self.summary_stat = "last"
 
     def update(self) -> None:
         """Updates the last measurement, invokes hooks if present"""
         self.eval_hooks()
 
+    def update_stats(self) -> None:
+        """Adds the last measurement to the statistics of every sensor"""
+        self.stats.update(self.last_measurement, self.sensor_available)
+
+    def reset_stats(self) -> None:
+        """Starts the statistics over, e.g. from the reset button"""
+        self.stats.reset()
+
     def get_maximum(self) -> float:
         """Returns the maximum measurement as measured so far"""
         raise NotImplementedError("Get maximum is not implemented")
@@ -82,7 +96,12 @@ class Source:
         """This returns a dict of sensor of the source and their values"""
         summary = OrderedDict()
         for idx, name in enumerate(self.get_sensor_list()):
-            if idx < len(self.sensor_available) and not self.sensor_available[idx]:
+            if self.summary_stat != "last":
+                value = self.stats.get(idx, self.summary_stat)
+                summary[name] = (
+                    "N/A" if value is None else self._format_measurement(value)
+                )
+            elif idx < len(self.sensor_available) and not self.sensor_available[idx]:
                 summary[name] = "N/A"
             elif idx < len(self.last_measurement):
                 summary[name] = self._format_measurement(self.last_measurement[idx])
@@ -93,7 +112,10 @@ class Source:
     def get_summary(self) -> OrderedDict[str, str]:
         """Returns a dict of source name and sensors with their values"""
         graph_vector_summary = OrderedDict()
-        graph_vector_summary[self.get_source_name()] = "[" + self.measurement_unit + "]"
+        title = "[" + self.measurement_unit + "]"
+        if self.get_title_note():
+            title += " " + self.get_title_note()
+        graph_vector_summary[self.get_source_name()] = title
         graph_vector_summary.update(self.get_sensors_summary())
         return graph_vector_summary
 
@@ -125,6 +147,10 @@ class Source:
         """Per-sensor TUI-only display suffixes (e.g. throttle labels)."""
         return [""] * len(self.available_sensors)
 
+    def get_title_note(self) -> str:
+        """TUI-only note shown after the title (e.g. values of the last run)."""
+        return ""
+
     def get_sensor_list(self) -> list[str]:
         """Returns list of a available sensors for source"""
         return self.available_sensors
@@ -137,7 +163,7 @@ class Source:
         """Returns a list of the last threshold values"""
         return self.last_thresholds
 
-    def add_edge_hook(self, hook: Hook | None) -> None:
+    def add_edge_hook(self, hook: Hook | ScriptHook | None) -> None:
         """
         Add hook to be triggered when the threshold of this Source is surpassed
         """
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Incremental statistics of sensor readings
+
+Every sensor keeps whole-run min/max/mean/stddev (Welford's online
+algorithm) and a p95 estimated by the P² algorithm (Jain & Chlamtac)
+over tumbling windows of samples.  Both use constant memory and time
+per reading, no matter how long s-tui runs.
+"""
+
+from __future__ import annotations
+
+import math
+
+STAT_NAMES = ("min", "max", "mean", "stddev", "p95")
+# What a summary can show for each sensor
+SUMMARY_STATS = ("last", *STAT_NAMES)
+# Samples per p95 window
+DEFAULT_WINDOW = 60
+
+
+def parse_stats(text: str) -> tuple[str, ...]:
+    """Parses a comma separated list of statistics, e.g. "max,p95" """
+    names = tuple(name.strip() for name in text.split(",") if name.strip())
+    for name in names:
+        if name not in STAT_NAMES:
+            raise ValueError(
+                "Unknown statistic " + name + ", use " + ",".join(STAT_NAMES)
+            )
+    return names
+
+
+class RunningStats:
+    """Count, min, max, mean and standard deviation of a stream"""
+
+    __slots__ = ("count", "m2", "maximum", "mean", "minimum")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    @property
+    def stddev(self) -> float:
+        """Sample standard deviation, 0 until there are two values"""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self.m2 / (self.count - 1))
+
+
+class P2Quantile:
+    """Streaming estimate of one quantile from five markers"""
+
+    __slots__ = ("count", "desired", "heights", "increments", "positions", "q")
+
+    def __init__(self, q: float) -> None:
+        self.q = q
+        self.reset()
+
+    def reset(self) -> None:
+        q = self.q
+        self.count = 0
+        self.heights: list[float] = []
+        self.positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.desired = [1.0, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5.0]
+        self.increments = [0.0, q / 2, q, (1 + q) / 2, 1.0]
+
+    def add(self, value: float) -> None:
+        heights = self.heights
+        self.count += 1
+        if self.count <= 5:
+            heights.append(value)
+            if self.count == 5:
+                heights.sort()
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+
+        positions = self.positions
+        for idx in range(cell + 1, 5):
+            positions[idx] += 1
+        for idx in range(5):
+            self.desired[idx] += self.increments[idx]
+
+        # Move the middle markers towards their desired positions
+        for idx in (1, 2, 3):
+            offset = self.desired[idx] - positions[idx]
+            if (offset >= 1 and positions[idx + 1] - positions[idx] > 1) or (
+                offset <= -1 and positions[idx - 1] - positions[idx] < -1
+            ):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(idx, step)
+                if not heights[idx - 1] < height < heights[idx + 1]:
+                    height = heights[idx] + step * (
+                        heights[idx + step] - heights[idx]
+                    ) / (positions[idx + step] - positions[idx])
+                heights[idx] = height
+                positions[idx] += step
+
+    def _parabolic(self, idx: int, step: int) -> float:
+        heights = self.heights
+        positions = self.positions
+        return heights[idx] + step / (positions[idx + 1] - positions[idx - 1]) * (
+            (positions[idx] - positions[idx - 1] + step)
+            * (heights[idx + 1] - heights[idx])
+            / (positions[idx + 1] - positions[idx])
+            + (positions[idx + 1] - positions[idx] - step)
+            * (heights[idx] - heights[idx - 1])
+            / (positions[idx] - positions[idx - 1])
+        )
+
+    def value(self) -> float | None:
+        if self.count == 0:
+            return None
+        if self.count < 5:
+            # Too few values for the markers, use the nearest rank
+            ordered = sorted(self.heights)
+            return ordered[min(int(self.q * len(ordered)), len(ordered) - 1)]
+        return self.heights[2]
+
+
+class WindowedQuantile:
+    """Quantile of the last completed window of *window* values
+
+    Until the first window completes, the running estimate is reported.
+    """
+
+    __slots__ = ("current", "last", "window")
+
+    def __init__(self, q: float, window: int = DEFAULT_WINDOW) -> None:
+        self.window = max(window, 1)
+        self.current = P2Quantile(q)
+        self.last: float | None = None
+
+    def reset(self) -> None:
+        self.current.reset()
+        self.last = None
+
+    def add(self, value: float) -> None:
+        self.current.add(value)
+        if self.current.count >= self.window:
+            self.last = self.current.value()
+            self.current.reset()
+
+    def value(self) -> float | None:
+        if self.last is not None:
+            return self.last
+        return self.current.value()
+
+
+class SensorStats:
+    """Run statistics and windowed p95 of one sensor"""
+
+    __slots__ = ("p95", "run")
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        self.run = RunningStats()
+        self.p95 = WindowedQuantile(0.95, window)
+
+    def add(self, value: float) -> None:
+        self.run.add(value)
+        self.p95.add(value)
+
+    def reset(self) -> None:
+        self.run.reset()
+        self.p95.reset()
+
+    def get(self, name: str) -> float | None:
+        if self.run.count == 0:
+            return None
+        if name == "min":
+            return self.run.minimum
+        if name == "max":
+            return self.run.maximum
+        if name == "mean":
+            return self.run.mean
+        if name == "stddev":
+            return self.run.stddev
+        if name == "p95":
+            return self.p95.value()
+        raise ValueError("Unknown statistic " + name)
+
+
+class SourceStats:
+    """Statistics of every sensor of a source"""
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        self.window = window
+        self.sensors: list[SensorStats] = []
+
+    def set_window(self, window: int) -> None:
+        """Changes the p95 window, applied from the next window on"""
+        self.window = window
+        for sensor in self.sensors:
+            sensor.p95.window = max(window, 1)
+
+    def update(self, values: list[float], available: list[bool]) -> None:
+        """Adds one reading per sensor, skipping unavailable sensors"""
+        while len(self.sensors) < len(values):
+            self.sensors.append(SensorStats(self.window))
+        for idx, value in enumerate(values):
+            if idx < len(available) and not available[idx]:
+                continue
+            self.sensors[idx].add(value)
+
+    def get(self, idx: int, name: str) -> float | None:
+        if idx >= len(self.sensors):
+            return None
+        return self.sensors[idx].get(name)
+
+    def maximum(self) -> float | None:
+        """Highest reading of any sensor so far"""
+        maxima = [sensor.get("max") for sensor in self.sensors]
+        return max((value for value in maxima if value is not None), default=None)
+
+    def reset(self) -> None:
+        for sensor in self.sensors:
+            sensor.reset()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Throughput and memory bandwidth of the stress workers"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from s_tui.sources.source import Source
+from s_tui.stress_ng import STRESSORS, is_stress_ng
+
+
+class StressSource(Source):
+    """Work steps per second of every built-in stress worker and in total
+
+    The workers count their steps in shared memory.  The rate is the
+    difference of two reads over the time between them, so a drop in
+    the graph while the load stays the same is throughput lost to
+    throttling.  Workers beyond *num_workers* only count in the total.
+    """
+
+    # Factor from counter units to measurement units
+    scale = 1.0
+
+    def __init__(self, controller: Any, num_workers: int | None = None) -> None:
+        Source.__init__(self)
+
+        self.name = "Stress"
+        self.measurement_unit = "ops/s"
+        self.pallet = (
+            "stress light",
+            "stress dark",
+            "stress light smooth",
+            "stress dark smooth",
+        )
+        self.controller = controller
+
+        if num_workers is None:
+            num_workers = self._get_total_core_count() or 1
+        self.available_sensors = ["Total"]
+        for worker in range(num_workers):
+            self.available_sensors.append("Worker " + str(worker))
+        self.last_measurement = [0.0] * len(self.available_sensors)
+        self.sensor_available = [True] * len(self.available_sensors)
+
+        self.last_ops: list[int] = []
+        self.last_time = time.monotonic()
+        self.max_rate = 0.0
+
+    def _read_counters(self) -> list[int]:
+        return self.controller.get_builtin_ops()
+
+    def update(self) -> None:
+        ops = self._read_counters()
+        now = time.monotonic()
+        elapsed = now - self.last_time
+        rates = []
+        for worker, count in enumerate(ops):
+            previous = self.last_ops[worker] if worker < len(self.last_ops) else 0
+            # A new pool starts counting from zero again
+            delta = max(count - previous, 0)
+            rates.append(delta * self.scale / elapsed if elapsed > 0 else 0.0)
+        self.last_ops = ops
+        self.last_time = now
+
+        self.last_measurement[0] = sum(rates)
+        for idx in range(1, len(self.last_measurement)):
+            worker = idx - 1
+            self.last_measurement[idx] = rates[worker] if worker < len(rates) else 0.0
+        self.max_rate = max(self.max_rate, self.last_measurement[0])
+        super().update()
+
+    def _format_measurement(self, value: float) -> str:
+        return str(round(value))
+
+    def get_maximum(self) -> float:
+        return self.max_rate
+
+    def get_top(self) -> int:
+        return 1
+
+    def get_edge_triggered(self) -> bool:
+        return False
+
+    def reset(self) -> None:
+        self.max_rate = 0.0
+
+    def default_graphs_conf(self) -> dict[str, dict[str, bool]]:
+        """Only the total is graphed unless configured otherwise"""
+        return {
+            self.name: {sensor.lower(): False for sensor in self.available_sensors[1:]}
+        }
+
+
+class BandwidthSource(StressSource):
+    """Memory bandwidth of the built-in stress workers in GB/s
+
+    Only the memory workloads move bytes, so it is not graphed unless
+    configured otherwise.
+    """
+
+    scale = 1e-9
+
+    def __init__(self, controller: Any, num_workers: int | None = None) -> None:
+        StressSource.__init__(self, controller, num_workers)
+        self.name = "Bandwidth"
+        self.measurement_unit = "GB/s"
+
+    def _read_counters(self) -> list[int]:
+        return self.controller.get_builtin_traffic()
+
+    def _format_measurement(self, value: float) -> str:
+        return str(round(value, 1))
+
+    def default_graphs_conf(self) -> dict[str, dict[str, bool]]:
+        return {self.name: {sensor.lower(): False for sensor in self.available_sensors}}
+
+
+class StressNgSource(Source):
+    """Bogo operations per second of every stress-ng stressor, a summary
+    of the last run
+
+    stress-ng only reports what its stressors achieved when a run ends, so
+    a stressor stays N/A while it runs and then shows the rate of the run.
+    The TUI titles say "last run" so this is not taken for a live reading.
+    """
+
+    def __init__(self, controller: Any, stress_exe: str | None) -> None:
+        Source.__init__(self)
+
+        self.name = "stress-ng"
+        self.measurement_unit = "bogo ops/s"
+        self.pallet = (
+            "stress light",
+            "stress dark",
+            "stress light smooth",
+            "stress dark smooth",
+        )
+        self.controller = controller
+        self.is_available = is_stress_ng(stress_exe)
+
+        self.available_sensors = list(STRESSORS)
+        self.last_measurement = [0.0] * len(self.available_sensors)
+        self.sensor_available = [False] * len(self.available_sensors)
+        self.max_rate = 0.0
+
+    def update(self) -> None:
+        metrics = self.controller.get_stress_ng_metrics()
+        for idx, stressor in enumerate(self.available_sensors):
+            stressor_metrics = metrics.get(stressor)
+            self.sensor_available[idx] = stressor_metrics is not None
+            rate = 0.0 if stressor_metrics is None else stressor_metrics.rate
+            self.last_measurement[idx] = rate
+            self.max_rate = max(self.max_rate, rate)
+        super().update()
+
+    def _format_measurement(self, value: float) -> str:
+        return str(round(value))
+
+    def get_title_note(self) -> str:
+        return "last run"
+
+    def get_maximum(self) -> float:
+        return self.max_rate
+
+    def get_top(self) -> int:
+        return 1
+
+    def get_edge_triggered(self) -> bool:
+        return False
+
+    def reset(self) -> None:
+        self.max_rate = 0.0
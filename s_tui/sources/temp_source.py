@@ -162,6 +162,7 @@ class TempSource(Source):
         ]
         if available_temps:
             self.max_last_temp = max(available_temps)
+            self.max_temp = max(self.max_temp, self.max_last_temp)
             # Call check for hooks
             Source.update(self)
 
@@ -190,7 +191,7 @@ class TempSource(Source):
         self.max_temp = 10
 
     def get_maximum(self) -> float:
-        raise NotImplementedError("Get maximum is not implemented")
+        return self.max_temp
 
     def get_top(self) -> int:
         # Cache the top temperature after first calculation
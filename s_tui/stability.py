@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Unattended stability tests
+
+A stability test stresses the CPU until the hottest temperature stops
+rising, holds that steady state for a soak time and then judges the run
+against temperature, throttle and power limits.  Steady state is found
+by a least squares fit over a sliding window of samples: the slope and
+the spread of the temperature must both stay below their limits.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from collections import deque
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+from s_tui.report import StressReport
+from s_tui.sinks.sink import Sample, Sink, summarize_sample
+
+DEFAULT_STEADY_WINDOW = 120.0
+# Degrees C per minute
+DEFAULT_SLOPE = 0.5
+DEFAULT_STDDEV = 1.0
+DEFAULT_SOAK = 600.0
+DEFAULT_TIMEOUT = 1800.0
+
+WARMUP = "warmup"
+SOAK = "soak"
+DONE = "done"
+
+
+class SteadyStateDetector:
+    """Sliding window linear regression of a value over time
+
+    Sums over the window are updated as samples enter and leave it, so
+    every sample costs O(1) regardless of the window length.
+    """
+
+    def __init__(
+        self,
+        window: float = DEFAULT_STEADY_WINDOW,
+        max_slope: float = DEFAULT_SLOPE,
+        max_stddev: float = DEFAULT_STDDEV,
+    ) -> None:
+        self.window = window
+        self.max_slope = max_slope
+        self.max_stddev = max_stddev
+        self.points: deque[tuple[float, float]] = deque()
+        self.origin: float | None = None
+        self.sum_x = self.sum_y = self.sum_xx = self.sum_xy = self.sum_yy = 0.0
+
+    def _account(self, x: float, y: float, sign: int) -> None:
+        self.sum_x += sign * x
+        self.sum_y += sign * y
+        self.sum_xx += sign * x * x
+        self.sum_xy += sign * x * y
+        self.sum_yy += sign * y * y
+
+    def add(self, timestamp: float, value: float) -> None:
+        if self.origin is None:
+            self.origin = timestamp
+        x = timestamp - self.origin
+        self.points.append((x, value))
+        self._account(x, value, 1)
+        while self.points[0][0] < x - self.window:
+            self._account(*self.points.popleft(), -1)
+
+    def covered(self) -> float:
+        """Seconds spanned by the samples in the window"""
+        if not self.points:
+            return 0.0
+        return self.points[-1][0] - self.points[0][0]
+
+    def slope(self) -> float:
+        """Trend of the value per minute"""
+        count = len(self.points)
+        denominator = count * self.sum_xx - self.sum_x**2
+        if count < 2 or denominator <= 0:
+            return 0.0
+        return (count * self.sum_xy - self.sum_x * self.sum_y) / denominator * 60
+
+    def stddev(self) -> float:
+        count = len(self.points)
+        if count < 2:
+            return 0.0
+        variance = (self.sum_yy - self.sum_y**2 / count) / (count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def is_steady(self) -> bool:
+        # Allow one refresh of slack, samples rarely land on the window edge
+        return (
+            len(self.points) > 2
+            and self.covered() >= self.window * 0.95
+            and abs(self.slope()) <= self.max_slope
+            and self.stddev() <= self.max_stddev
+        )
+
+    def reset(self) -> None:
+        self.points.clear()
+        self.origin = None
+        self.sum_x = self.sum_y = self.sum_xx = self.sum_xy = self.sum_yy = 0.0
+
+
+class StabilityCriteria(NamedTuple):
+    """Pass/fail limits, None skips a check"""
+
+    max_temp: float | None = None
+    # Seconds of throttling allowed over the whole run
+    max_throttle: float | None = None
+    # Bounds of the average package power during the soak
+    min_power: float | None = None
+    max_power: float | None = None
+
+
+class StabilityTest(Sink):
+    """Follows a stress run through warm-up and soak and judges it
+
+    The test is fed like any other sink.  When it is over, *on_done* is
+    called, e.g. to stop the collector.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        criteria: StabilityCriteria,
+        detector: SteadyStateDetector | None = None,
+        soak: float = DEFAULT_SOAK,
+        timeout: float = DEFAULT_TIMEOUT,
+        on_done: Callable[[], None] | None = None,
+    ) -> None:
+        self.mode = mode
+        self.criteria = criteria
+        self.detector = detector or SteadyStateDetector()
+        self.soak = soak
+        self.timeout = timeout
+        self.on_done = on_done
+        self.phase = WARMUP
+        self.report: StressReport | None = None
+        self.soak_report: StressReport | None = None
+        self.steady_after: float | None = None
+        self.throttled = 0.0
+        self.last_monotonic: float | None = None
+        self.reasons: list[str] = []
+
+    def _finish(self, reason: str | None = None) -> None:
+        self.phase = DONE
+        if reason is not None:
+            self.reasons.append(reason)
+        if self.on_done is not None:
+            self.on_done()
+
+    def write(self, sample: Sample) -> None:
+        if self.phase == DONE:
+            return
+        now = sample.monotonic
+        if self.report is None:
+            self.report = StressReport(self.mode, sample.time, now)
+        self.report.add(sample)
+        if sample.throttle and self.last_monotonic is not None:
+            self.throttled += now - self.last_monotonic
+        self.last_monotonic = now
+
+        elapsed = now - self.report.start_monotonic
+        if self.phase == WARMUP:
+            temp = summarize_sample(sample).max_temp
+            if temp is not None:
+                self.detector.add(now, temp)
+            if self.detector.is_steady():
+                self.phase = SOAK
+                self.steady_after = elapsed
+                self.soak_report = StressReport(self.mode, sample.time, now)
+                logging.info("Thermal steady state after %.0f s", elapsed)
+            elif elapsed >= self.timeout:
+                self._finish(
+                    "no thermal steady state within " + str(round(self.timeout)) + " s"
+                )
+        elif self.soak_report is not None:
+            self.soak_report.add(sample)
+            if now - self.soak_report.start_monotonic >= self.soak:
+                self._finish()
+
+    def verdict(self) -> tuple[bool, list[str]]:
+        """Returns whether the run passed, and the reasons if it did not"""
+        reasons = list(self.reasons)
+        if self.phase != DONE:
+            reasons.append("the test was interrupted")
+        criteria = self.criteria
+        result = self.report.finish(self.last_monotonic) if self.report else None
+        if result is None:
+            return False, [*reasons, "no samples"]
+
+        peak = max(
+            (temps["peak"] for temps in result["temperature"].values()), default=None
+        )
+        if (
+            criteria.max_temp is not None
+            and peak is not None
+            and peak > criteria.max_temp
+        ):
+            reasons.append(
+                "peak temperature " + str(peak) + " C above " + str(criteria.max_temp)
+            )
+        if criteria.max_throttle is not None and self.throttled > criteria.max_throttle:
+            reasons.append("throttled for " + str(round(self.throttled, 1)) + " s")
+        if self.soak_report is not None and (
+            criteria.min_power is not None or criteria.max_power is not None
+        ):
+            power = self.soak_report.finish(self.last_monotonic)["power"]
+            average = None if power is None else power["average"]
+            if average is None:
+                reasons.append("package power is not available")
+            elif criteria.min_power is not None and average < criteria.min_power:
+                reasons.append("soak power " + str(average) + " W too low")
+            elif criteria.max_power is not None and average > criteria.max_power:
+                reasons.append("soak power " + str(average) + " W too high")
+        return not reasons, reasons
+
+    def result(self) -> dict[str, Any]:
+        """The stress report of the run with the verdict added"""
+        assert self.report is not None
+        result = self.report.finish(self.last_monotonic)
+        passed, reasons = self.verdict()
+        result["stability"] = {
+            "passed": passed,
+            "reasons": reasons,
+            "steady_after": (
+                None if self.steady_after is None else round(self.steady_after, 1)
+            ),
+            "throttled": round(self.throttled, 1),
+        }
+        return result
@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Starts and stops the stress workload of the selected mode
+
+Kept free of urwid so a headless sampler can own the stress workers.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import signal
+import subprocess
+import tempfile
+import time
+
+import psutil
+
+from s_tui.builtin_stresser import STRATEGY_ROTATE, BuiltinStresser
+from s_tui.helper_functions import kill_child_processes
+from s_tui.stress_ng import StressNgOutput, is_stress_ng
+
+# Seconds stress-ng gets to stop its stressors and report the metrics
+STRESS_NG_STOP_TIMEOUT = 3.0
+
+
+class StressController:
+    """
+    Responsible for storing the data related to stress test options
+    and operation
+    """
+
+    def __init__(self, stress_installed):
+        self.stress_modes = ["Monitor"]
+        self.stress_modes.append("s-tui stress")
+
+        if stress_installed:
+            self.stress_modes.append("Stress (ext)")
+
+        self.current_mode = self.stress_modes[0]
+        self.stress_process = None
+        # Popen of the classic stress, polled to see it exit on its own
+        self._stress_popen = None
+        self._builtin_stresser = None
+        # stress-ng process and the output of the current or last run
+        self._stress_ng_proc = None
+        self._stress_ng = None
+        # (process, output, deadline) of interrupted stress-ng runs
+        self._stress_ng_stopping = []
+        self._stress_ng_last = {}
+
+    def get_modes(self):
+        """Returns all possible stress_modes for stress operations"""
+        return self.stress_modes
+
+    def get_current_mode(self):
+        """Returns the current stress test mode, monitor/stress/other"""
+        return self.current_mode
+
+    def set_mode(self, mode):
+        """Sets a stress test mode monitor/stress/other"""
+        self.current_mode = mode
+
+    def get_stress_process(self):
+        """Returns the current external stress process running"""
+        return self.stress_process
+
+    def set_stress_process(self, proc):
+        """Sets the current stress process running"""
+        self.stress_process = proc
+
+    @property
+    def builtin_stresser(self):
+        """Lazy-init BuiltinStresser on first use.
+
+        Avoids creating multiprocessing primitives at startup, which can
+        fail in restricted environments (e.g. containers without
+        /dev/shm).
+        """
+        if self._builtin_stresser is None:
+            self._builtin_stresser = BuiltinStresser()
+        return self._builtin_stresser
+
+    def kill_stress_process(self):
+        """Kills the current running stress process"""
+        if self._stress_ng_proc is not None:
+            self._stop_stress_ng()
+        try:
+            kill_child_processes(self.stress_process)
+        except psutil.NoSuchProcess:
+            logging.debug("Stress process no longer exists")
+        self.stress_process = None
+        if self._stress_popen is not None:
+            # Reaps the stopped process
+            self._stress_popen.poll()
+            self._stress_popen = None
+        if self._builtin_stresser is not None:
+            self._builtin_stresser.stop()
+
+    def close(self):
+        """Kills the stress and the parked built-in stress workers"""
+        self.kill_stress_process()
+        self.wait_stress_ng()
+        if self._builtin_stresser is not None:
+            self._builtin_stresser.close()
+
+    def prefork_builtin_stress(self, num_workers):
+        """Forks parked built-in stress workers ahead of their first start"""
+        try:
+            self.builtin_stresser.prefork(num_workers)
+        except OSError as err:
+            logging.error("Unable to fork built-in stress workers: %s", err)
+
+    def start_stress(self, stress_cmd):
+        """Starts a new stress process with a given cmd"""
+        self._stress_ng = None
+        if is_stress_ng(stress_cmd[0]):
+            self._start_stress_ng(stress_cmd)
+            return
+        with open(os.devnull, "w") as dev_null:
+            try:
+                stress_proc = subprocess.Popen(
+                    stress_cmd,
+                    stdout=dev_null,
+                    stderr=dev_null,
+                    start_new_session=True,
+                )
+                self._stress_popen = stress_proc
+                self.set_stress_process(psutil.Process(stress_proc.pid))
+            except OSError:
+                logging.debug("Unable to start stress")
+
+    def _start_stress_ng(self, stress_cmd):
+        """Starts stress-ng, its metrics are read from a pipe"""
+        yaml_fd, yaml_path = tempfile.mkstemp(prefix="s-tui-stress-ng-", suffix=".yaml")
+        os.close(yaml_fd)
+        try:
+            proc = subprocess.Popen(
+                [*stress_cmd, "--metrics-brief", "--yaml", yaml_path],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+        except OSError:
+            logging.debug("Unable to start stress-ng")
+            os.unlink(yaml_path)
+            return
+        assert proc.stdout is not None
+        self._stress_ng_proc = proc
+        self._stress_ng = StressNgOutput(proc.stdout, yaml_path)
+        self.set_stress_process(psutil.Process(proc.pid))
+
+    def _stop_stress_ng(self):
+        """Interrupts stress-ng, which then stops its stressors and reports
+        the metrics.  Returns at once, poll_stress_ng() collects them."""
+        proc = self._stress_ng_proc
+        output = self._stress_ng
+        assert proc is not None and output is not None
+        self._stress_ng_proc = None
+        # stress-ng stops its own stressors
+        self.stress_process = None
+        if proc.poll() is None:
+            with contextlib.suppress(ProcessLookupError):
+                proc.send_signal(signal.SIGINT)
+        deadline = time.monotonic() + STRESS_NG_STOP_TIMEOUT
+        self._stress_ng_stopping.append((proc, output, deadline))
+        self.poll_stress_ng()
+
+    def poll_stress_ng(self):
+        """Reads the output of the interrupted stress-ng runs and kills
+        those that do not stop in time.  Returns whether any is still
+        stopping."""
+        stopping = []
+        for proc, output, deadline in self._stress_ng_stopping:
+            # Keep draining the pipe, a full pipe would block stress-ng
+            output.poll()
+            if proc.poll() is None and time.monotonic() >= deadline:
+                logging.warning("stress-ng did not stop in time, killing it")
+                with contextlib.suppress(ProcessLookupError):
+                    os.killpg(proc.pid, signal.SIGKILL)
+                proc.wait()
+            if proc.poll() is None:
+                stopping.append((proc, output, deadline))
+            else:
+                output.finish()
+                self._stress_ng_last = dict(output.metrics)
+        self._stress_ng_stopping = stopping
+        return bool(stopping)
+
+    def wait_stress_ng(self):
+        """Blocks until the interrupted stress-ng runs have stopped"""
+        while self.poll_stress_ng():
+            time.sleep(0.02)
+
+    def stress_exited(self):
+        """Whether the external stress ended on its own, e.g. at the end of
+        its -t timeout"""
+        proc = self._stress_ng_proc or self._stress_popen
+        return proc is not None and proc.poll() is not None
+
+    def runs_stress_ng(self):
+        """Whether the last external stress started is stress-ng"""
+        return self._stress_ng is not None
+
+    def get_stress_ng_metrics(self):
+        """Returns the metrics of the running stress-ng by stressor, or of
+        the last one that stopped.  stress-ng reports them when it stops."""
+        self.poll_stress_ng()
+        output = self._stress_ng
+        if self._stress_ng_proc is None or output is None:
+            return dict(self._stress_ng_last)
+        output.poll()
+        return dict(output.metrics)
+
+    def get_last_stress_ng_metrics(self):
+        """Returns the metrics of the last stress-ng run that stopped"""
+        self.poll_stress_ng()
+        return dict(self._stress_ng_last)
+
+    def set_builtin_duty(self, duty):
+        """Sets the load of the built-in stress workers, from 0.0 to 1.0"""
+        self.builtin_stresser.set_duty(duty)
+
+    def set_builtin_rotate_period(self, period):
+        """Sets the seconds each workload of the rotate strategy runs"""
+        self.builtin_stresser.set_rotate_period(period)
+
+    def get_builtin_rotation(self):
+        """Returns the workload the rotate strategy runs now, None when
+        the built-in stress is not rotating"""
+        stresser = self._builtin_stresser
+        if stresser is None or stresser.strategy != STRATEGY_ROTATE:
+            return None
+        return stresser.current_workload()
+
+    def set_builtin_placement(self, policy):
+        """Sets the CPU placement policy of the built-in stress workers"""
+        self.builtin_stresser.set_placement(policy)
+
+    def get_builtin_cpus(self):
+        """Returns the CPUs the built-in stress workers are pinned to"""
+        if self._builtin_stresser is None:
+            return []
+        return [cpu for cpu in self._builtin_stresser.worker_cpus if cpu is not None]
+
+    def get_builtin_ops(self):
+        """Returns the work steps each built-in stress worker completed"""
+        if self._builtin_stresser is None:
+            return []
+        return self._builtin_stresser.get_ops()
+
+    def get_builtin_traffic(self):
+        """Returns the bytes each built-in stress worker moved in memory"""
+        if self._builtin_stresser is None:
+            return []
+        return self._builtin_stresser.get_traffic()
+
+    def start_builtin_stress(self, num_workers, strategy=None):
+        """Starts the built-in Python CPU stresser."""
+        try:
+            self.builtin_stresser.start(num_workers, strategy=strategy)
+        except OSError as err:
+            logging.error("Unable to start built-in stresser: %s", err)
+            self.current_mode = "Monitor"
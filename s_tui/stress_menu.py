@@ -27,6 +27,8 @@ from collections.abc import Callable
 import psutil
 import urwid
 
+from s_tui.stress_ng import CPU_METHOD_HELP, is_stress_ng
+
 
 class StressMenu:
     MAX_TITLE_LEN = 50
@@ -35,6 +37,7 @@ class StressMenu:
         self.return_fn = return_fn
 
         self.stress_exe = stress_exe
+        self.stress_ng = is_stress_ng(stress_exe)
 
         self.time_out = "none"
         self.sqrt_workers = "1"
@@ -52,6 +55,10 @@ class StressMenu:
         self.no_malloc = False
         self.write_workers = "0"
         self.write_bytes = "1G"
+        # Only stress-ng has these stressors
+        self.cpu_method = "all"
+        self.matrix_workers = "0"
+        self.cache_workers = "0"
 
         self.time_out_ctrl = urwid.Edit("Time out [sec]: ", self.time_out)
         self.sqrt_workers_ctrl = urwid.Edit("Sqrt() worker count: ", self.sqrt_workers)
@@ -73,6 +80,11 @@ class StressMenu:
             "Write() / Unlink() worker count: ", self.write_workers
         )
         self.write_bytes_ctrl = urwid.Edit("   Byte per Write(): ", self.write_bytes)
+        self.cpu_method_ctrl = urwid.Edit("   CPU method: ", self.cpu_method)
+        self.matrix_workers_ctrl = urwid.Edit(
+            "Matrix worker count: ", self.matrix_workers
+        )
+        self.cache_workers_ctrl = urwid.Edit("Cache worker count: ", self.cache_workers)
 
         default_button = urwid.Button("Default", on_press=self.on_default)
         default_button._label.align = "center"
@@ -87,12 +99,25 @@ class StressMenu:
 
         title = urwid.Text(("bold text", "  Stress Options  \n"), "center")
 
+        cpu_titles = [self.sqrt_workers_ctrl, urwid.Divider("-")]
+        if self.stress_ng:
+            cpu_titles = [
+                self.sqrt_workers_ctrl,
+                urwid.Divider(),
+                self.cpu_method_ctrl,
+                urwid.Text("   (" + CPU_METHOD_HELP + ")"),
+                urwid.Divider("-"),
+                self.matrix_workers_ctrl,
+                urwid.Divider("-"),
+                self.cache_workers_ctrl,
+                urwid.Divider("-"),
+            ]
+
         self.titles = [
             title,
             self.time_out_ctrl,
             urwid.Divider("-"),
-            self.sqrt_workers_ctrl,
-            urwid.Divider("-"),
+            *cpu_titles,
             self.sync_workers_ctrl,
             urwid.Divider("-"),
             self.memory_workers_ctrl,
@@ -125,6 +150,9 @@ class StressMenu:
         self.no_malloc_ctrl.set_state(bool(self.no_malloc))
         self.write_workers_ctrl.set_edit_text(self.write_workers)
         self.write_bytes_ctrl.set_edit_text(self.write_bytes)
+        self.cpu_method_ctrl.set_edit_text(self.cpu_method)
+        self.matrix_workers_ctrl.set_edit_text(self.matrix_workers)
+        self.cache_workers_ctrl.set_edit_text(self.cache_workers)
 
     def on_default(self, _):
         self.time_out = "none"
@@ -137,6 +165,9 @@ class StressMenu:
         self.no_malloc = False
         self.write_workers = "0"
         self.write_bytes = "1G"
+        self.cpu_method = "all"
+        self.matrix_workers = "0"
+        self.cache_workers = "0"
 
         self.set_edit_texts()
         self.return_fn()
@@ -171,6 +202,15 @@ class StressMenu:
         self.write_bytes = self.get_valid_byte(
             self.write_bytes_ctrl.get_edit_text(), "1G"
         )
+        self.cpu_method = self.get_valid_method(
+            self.cpu_method_ctrl.get_edit_text(), "all"
+        )
+        self.matrix_workers = self.get_pos_num(
+            self.matrix_workers_ctrl.get_edit_text(), "0"
+        )
+        self.cache_workers = self.get_pos_num(
+            self.cache_workers_ctrl.get_edit_text(), "0"
+        )
 
         self.set_edit_texts()
         self.return_fn()
@@ -181,6 +221,8 @@ class StressMenu:
 
     def get_stress_cmd(self) -> list[str]:
         assert self.stress_exe is not None
+        if self.stress_ng:
+            return self.get_stress_ng_cmd()
         stress_cmd = [self.stress_exe]
         if int(self.sqrt_workers) > 0:
             stress_cmd.append("-c")
@@ -213,6 +255,43 @@ class StressMenu:
 
         return stress_cmd
 
+    def get_stress_ng_cmd(self) -> list[str]:
+        """The stress-ng command, with the stressors it has beyond stress"""
+        assert self.stress_exe is not None
+        stress_cmd = [self.stress_exe]
+        if int(self.sqrt_workers) > 0:
+            stress_cmd += ["--cpu", self.sqrt_workers, "--cpu-method", self.cpu_method]
+
+        if int(self.matrix_workers) > 0:
+            stress_cmd += ["--matrix", self.matrix_workers]
+
+        if int(self.cache_workers) > 0:
+            stress_cmd += ["--cache", self.cache_workers]
+
+        if int(self.sync_workers) > 0:
+            stress_cmd += ["--io", self.sync_workers]
+
+        # stress-ng ignores --vm-stride, the vm stressor touches every page
+        if int(self.memory_workers) > 0:
+            stress_cmd += ["--vm", self.memory_workers, "--vm-bytes", self.malloc_byte]
+            if self.no_malloc:
+                stress_cmd.append("--vm-keep")
+
+        if int(self.write_workers) > 0:
+            stress_cmd += ["--hdd", self.write_workers, "--hdd-bytes", self.write_bytes]
+
+        if self.time_out != "none":
+            stress_cmd += ["-t", self.time_out]
+
+        return stress_cmd
+
+    @staticmethod
+    def get_valid_method(method: str, default: str) -> str:
+        """check that a stressor method is a single name, e.g. fft"""
+        if re.match(r"\A[a-z0-9_]+\Z", method):
+            return method
+        return default
+
     @staticmethod
     def get_pos_num(num: str, default: str) -> str:
         num_valid = re.match(r"\A([0-9]+)\Z", num, re.I)
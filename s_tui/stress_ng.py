@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""stress-ng options and metrics
+
+stress-ng measures what its stressors achieve in "bogo operations".
+s-tui runs it with --metrics-brief, which logs a line per stressor when
+the run ends, and --yaml, which writes the same metrics to a file.  The
+log is read through a non-blocking pipe, so reading it never stalls the
+caller, and the YAML file is read once stress-ng has exited.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import re
+from typing import IO, NamedTuple
+
+# Stressor classes s-tui starts and graphs, the classic stress options
+# (-c, -i, --vm, --hdd) map to cpu, io, vm and hdd
+STRESSORS = ["cpu", "matrix", "cache", "vm", "io", "hdd"]
+CPU_METHOD_HELP = "all, int64, double, fft, matrixprod, trig..."
+
+# e.g. "stress-ng: metrc: [1234] cpu  40123  10.00  39.98  0.01  4012.10  1003.32",
+# older versions log the metrics as "info"
+_METRICS_LINE = re.compile(
+    r"stress-ng: (?:info|metrc): +\[[0-9]+\] +([a-z][a-z0-9_-]*) +([0-9]+)"
+    r" +([0-9.]+) +[0-9.]+ +[0-9.]+ +([0-9.]+)"
+)
+
+
+class StressorMetrics(NamedTuple):
+    """What one stressor of a stress-ng run achieved"""
+
+    stressor: str
+    bogo_ops: int
+    # Wall clock seconds the stressor ran
+    real_time: float
+    # Bogo operations per second of wall clock time
+    rate: float
+
+
+def is_stress_ng(exe: str | None) -> bool:
+    """Whether *exe* is stress-ng rather than the classic stress"""
+    return exe is not None and os.path.basename(exe).startswith("stress-ng")
+
+
+def parse_metrics_line(line: str) -> StressorMetrics | None:
+    """Parses a --metrics-brief line, None for any other output"""
+    match = _METRICS_LINE.search(line)
+    if match is None:
+        return None
+    return StressorMetrics(
+        match.group(1),
+        int(match.group(2)),
+        float(match.group(3)),
+        float(match.group(4)),
+    )
+
+
+def parse_yaml_metrics(text: str) -> list[StressorMetrics]:
+    """Reads the metrics section of a stress-ng --yaml file
+
+    Only the flat subset of YAML stress-ng writes is understood::
+
+        metrics:
+            - stressor: cpu
+              bogo-ops: 40123
+              bogo-ops-per-second-real-time: 4012.10
+              wall-clock-time: 10.00
+    """
+    records: list[dict[str, str]] = []
+    in_metrics = False
+    for line in text.splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        if not line[0].isspace():
+            in_metrics = line.rstrip() == "metrics:"
+            continue
+        if not in_metrics:
+            continue
+        item = line.strip()
+        if item.startswith("- "):
+            records.append({})
+            item = item[2:]
+        key, _, value = item.partition(":")
+        if records:
+            records[-1][key.strip()] = value.strip()
+    metrics = []
+    for record in records:
+        try:
+            metrics.append(
+                StressorMetrics(
+                    record["stressor"],
+                    int(float(record["bogo-ops"])),
+                    float(record.get("wall-clock-time", 0.0)),
+                    float(record["bogo-ops-per-second-real-time"]),
+                )
+            )
+        except (KeyError, ValueError):
+            logging.debug("Skipping stress-ng metrics %s", record)
+    return metrics
+
+
+class StressNgOutput:
+    """Collects the metrics of a running stress-ng without blocking
+
+    *stream* is the read end of the pipe stress-ng writes its log to.
+    poll() reads whatever is available; at the end of the output it also
+    reads the YAML file at *yaml_path*, whose values are more precise.
+    """
+
+    def __init__(self, stream: IO[bytes], yaml_path: str | None = None) -> None:
+        self.stream: IO[bytes] | None = stream
+        self.yaml_path = yaml_path
+        os.set_blocking(stream.fileno(), False)
+        self.partial = b""
+        self.metrics: dict[str, StressorMetrics] = {}
+
+    def poll(self) -> None:
+        """Parses the output written since the last poll"""
+        if self.stream is None:
+            return
+        chunks = []
+        ended = False
+        while True:
+            try:
+                chunk = os.read(self.stream.fileno(), 65536)
+            except BlockingIOError:
+                break
+            except OSError as err:
+                logging.debug("Reading stress-ng output failed: %s", err)
+                ended = True
+                break
+            if not chunk:
+                ended = True
+                break
+            chunks.append(chunk)
+        *lines, self.partial = (self.partial + b"".join(chunks)).split(b"\n")
+        if ended:
+            lines.append(self.partial)
+            self.partial = b""
+        for line in lines:
+            self._parse(line.decode(errors="replace"))
+        if ended:
+            self._read_yaml()
+            self.close()
+
+    def _parse(self, line: str) -> None:
+        if not line.strip():
+            return
+        logging.debug("%s", line)
+        metrics = parse_metrics_line(line)
+        if metrics is not None:
+            self.metrics[metrics.stressor] = metrics
+
+    def _read_yaml(self) -> None:
+        if self.yaml_path is None:
+            return
+        try:
+            with open(self.yaml_path) as yaml_file:
+                text = yaml_file.read()
+        except OSError as err:
+            logging.debug("No stress-ng metrics file: %s", err)
+            return
+        for metrics in parse_yaml_metrics(text):
+            self.metrics[metrics.stressor] = metrics
+
+    def finish(self) -> None:
+        """Reads the rest of the output and the YAML file once stress-ng
+        exited, then closes"""
+        self.poll()
+        if self.stream is not None:
+            self._read_yaml()
+        self.close()
+
+    def close(self) -> None:
+        """Stops reading and removes the YAML file"""
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        if self.yaml_path is not None:
+            with contextlib.suppress(OSError):
+                os.unlink(self.yaml_path)
+            self.yaml_path = None
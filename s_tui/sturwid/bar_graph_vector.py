@@ -75,6 +75,9 @@ class BarGraphVector(LabeledBarGraphVector):
         y_label = []
 
         graph_title = self.graph_name + " [" + self.measurement_unit + "]"
+        if self.source.get_title_note():
+            graph_title += " " + self.source.get_title_note()
+        self.graph_title = graph_title
         sub_title_list = self.source.get_sensor_list()
 
         # create several different instances of scalable bar graph
@@ -101,6 +104,10 @@ class BarGraphVector(LabeledBarGraphVector):
             ["bg background", self.color_a, self.color_b], satt=self.satt
         )
 
+    def set_annotation(self, text):
+        """Shows *text*, e.g. the schedule phase, next to the title"""
+        self.set_title(self.graph_title + ("  " + text if text else ""))
+
     def get_graph_name(self):
         return self.graph_name
 
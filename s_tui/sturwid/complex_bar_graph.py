@@ -107,6 +107,8 @@ class LabeledBarGraphVector(urwid.WidgetPlaceholder):
         self.set_title(title)
 
         self.sensor_available = [True] * len(bar_graph_vector)
+        # Sub graphs marked in their title, e.g. cores running stress
+        self.highlighted = set()
 
         super().__init__(urwid.Pile([]))  # type: ignore[arg-type]
         self.set_visible_graphs(visible_graph_list)
@@ -118,6 +120,14 @@ class LabeledBarGraphVector(urwid.WidgetPlaceholder):
         list_w = urwid.SimpleFocusListWalker([title_text_w])
         self.title.original_widget = urwid.ListBox(list_w)
 
+    def set_highlighted(self, indices):
+        """Marks the titles of the sub graphs at *indices*"""
+        indices = set(indices)
+        if indices == self.highlighted:
+            return
+        self.highlighted = indices
+        self.set_visible_graphs()
+
     def set_y_label(self, y_label):
         if not y_label:
             text = urwid.Text("1")
@@ -150,7 +160,12 @@ class LabeledBarGraphVector(urwid.WidgetPlaceholder):
             zip(visible_graph_list, self.bar_graph_vector, self.sub_title_list)
         ):
             if state:
-                text_w = urwid.Text(sub_title, align="center")
+                if idx in self.highlighted:
+                    text_w = urwid.Text(
+                        ("bold text", "[" + sub_title + "]"), align="center"
+                    )
+                else:
+                    text_w = urwid.Text(sub_title, align="center")
                 sub_title_widget = urwid.ListBox([text_w])
 
                 # Use placeholder if sensor is unavailable
@@ -57,6 +57,10 @@ DEFAULT_PALETTE = [
     ("fan dark smooth", "dark blue", "default"),
     ("fan light", "default", "light blue", "standout"),
     ("fan light smooth", "light blue", "default"),
+    ("stress dark", "default", "brown", "standout"),
+    ("stress dark smooth", "brown", "default"),
+    ("stress light", "default", "yellow", "standout"),
+    ("stress light smooth", "yellow", "default"),
     ("button normal", "dark green", "default", "standout"),
     ("button select", "white", "dark green"),
     ("line", "default", "default", "standout"),
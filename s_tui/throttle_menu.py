@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2017-2026 Alex Manuskin, Gil Tsuker
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA
+"""Displays the throttle episodes recorded in this run"""
+
+import time
+
+import urwid
+
+from s_tui.sturwid.ui_elements import ViListBox
+
+# Newest episodes listed
+MAX_ROWS = 200
+MESSAGE_LEN = 20
+
+
+def _row(start, core, reason, duration, temp, power):
+    return f"{start:<8} {core:<8} {reason:<3} {duration:>9} {temp:>5} {power:>5}"
+
+
+HEADER = _row("Start", "Core", "Why", "Duration", "Temp", "Power")
+
+
+def format_episode(episode, now):
+    """One line per episode, open episodes are marked with a +"""
+    return _row(
+        time.strftime("%H:%M:%S", time.localtime(episode.start_time)),
+        episode.core,
+        episode.reason,
+        f"{episode.duration(now):.1f}s" + ("+" if episode.end is None else ""),
+        "" if episode.temp is None else f"{episode.temp:.0f}C",
+        "" if episode.power is None else f"{episode.power:.0f}W",
+    )
+
+
+class ThrottleMenu:
+    """Lists the throttle episodes of the journal, newest first"""
+
+    MAX_TITLE_LEN = 50
+
+    def __init__(self, return_fn, journal):
+        self.return_fn = return_fn
+        self.journal = journal
+
+        cancel_button = urwid.Button("Exit", on_press=self.on_cancel)
+        cancel_button._label.align = "center"
+
+        title = urwid.Text(("bold text", "  Throttle Log  \n"), "center")
+        self.summary = urwid.Text("", "center")
+        header = urwid.Text(("bold text", HEADER))
+
+        self.walker = urwid.SimpleFocusListWalker([])
+        buttons = urwid.Columns([cancel_button])  # type: ignore[arg-type]
+        self.titles = [title, buttons, self.summary, header]
+        self.walker.extend(self.titles)
+
+        self.main_window = urwid.LineBox(ViListBox(self.walker))
+
+    def refresh(self):
+        """Lists the current episodes, call before the menu is shown"""
+        episodes = self.journal.episodes()
+        now = self.journal.last_monotonic
+        self.summary.set_text(
+            str(self.journal.count)
+            + " episodes, "
+            + str(len(self.journal.open))
+            + " ongoing\n"
+        )
+        rows = [
+            urwid.Text(format_episode(episode, now))
+            for episode in reversed(episodes[-MAX_ROWS:])
+        ]
+        if not rows:
+            rows = [urwid.Text("No throttling so far", "center")]
+        self.walker[len(self.titles) :] = rows
+
+    def get_size(self):
+        return MESSAGE_LEN + 3, self.MAX_TITLE_LEN
+
+    def on_cancel(self, w):
+        self.return_fn()
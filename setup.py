@@ -21,7 +21,7 @@ import s_tui.helper_functions as AUX
 
 setup(
     name="s-tui",
-    packages=["s_tui", "s_tui.sources", "s_tui.sturwid"],
+    packages=["s_tui", "s_tui.sinks", "s_tui.sources", "s_tui.sturwid"],
     version=AUX.__version__,
     author="Alex Manuskin",
     author_email="amanusk@pm.me",
@@ -31,7 +31,12 @@ setup(
     license="GPLv2",
     url="https://github.com/amanusk/s-tui",
     keywords=["stress", "monitoring", "TUI"],  # arbitrary keywords
-    entry_points={"console_scripts": ["s-tui=s_tui.s_tui:main"]},
+    entry_points={
+        "console_scripts": [
+            "s-tui=s_tui.cli:main",
+            "s-tui-collect=s_tui.collector:main",
+        ]
+    },
     classifiers=[
         "License :: OSI Approved :: GNU General Public License v2 (GPLv2)",
         "Operating System :: POSIX :: Linux",
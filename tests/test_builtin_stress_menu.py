@@ -54,3 +54,48 @@ class TestBuiltinStressMenu:
         menu._pending_strategy = STRATEGY_HASHLIB
         menu.on_save(None)
         assert menu.get_strategy() == STRATEGY_HASHLIB
+
+    def test_save_commits_placement(self, monkeypatch):
+        """Save keeps the last valid placement policy."""
+        monkeypatch.setattr(
+            "s_tui.builtin_stress_menu.placement_cpus", lambda policy: [0, 1]
+        )
+        menu = BuiltinStressMenu(return_fn=lambda: None)
+        assert menu.get_placement() == "none"
+        menu.placement_ctrl.set_edit_text("Physical")
+        menu.on_save(None)
+        assert menu.get_placement() == "physical"
+        menu.placement_ctrl.set_edit_text("bogus")
+        menu.on_save(None)
+        assert menu.get_placement() == "physical"
+
+    def test_placement_preview(self, monkeypatch):
+        """The menu previews the CPUs of the workers."""
+        monkeypatch.setattr(
+            "s_tui.builtin_stress_menu.placement_cpus", lambda policy: [0, 2]
+        )
+        menu = BuiltinStressMenu(return_fn=lambda: None)
+        menu.num_workers_ctrl.set_edit_text("3")
+        menu.placement_ctrl.set_edit_text("physical")
+        assert menu.placement_view.text == "Workers on CPUs 0,2"
+
+    def test_save_commits_load(self):
+        """Save commits the load, out of range values fall back to 100%."""
+        menu = BuiltinStressMenu(return_fn=lambda: None)
+        assert menu.get_duty() == 1.0
+        menu.load_ctrl.set_edit_text("37")
+        menu.on_save(None)
+        assert menu.get_duty() == 0.37
+        menu.load_ctrl.set_edit_text("0")
+        menu.on_save(None)
+        assert menu.get_duty() == 1.0
+
+    def test_save_commits_rotate_period(self):
+        menu = BuiltinStressMenu(return_fn=lambda: None)
+        assert menu.get_rotate_period() == 30
+        menu.rotate_ctrl.set_edit_text("45")
+        menu.on_save(None)
+        assert menu.get_rotate_period() == 45
+        menu.rotate_ctrl.set_edit_text("-")
+        menu.on_save(None)
+        assert menu.get_rotate_period() == 30
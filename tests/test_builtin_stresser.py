@@ -1,15 +1,35 @@
 """Tests for BuiltinStresser: worker lifecycle and strategy selection."""
 
+import os
 import time
 
+import pytest
+
+from s_tui import builtin_stresser
 from s_tui.builtin_stresser import (
     _HAS_NUMPY,
+    _STEP_FACTORIES,
+    DUTY_PERIOD,
     STRATEGIES,
+    STRATEGY_BRANCH,
+    STRATEGY_DRAM,
     STRATEGY_HASHLIB,
+    STRATEGY_INT,
+    STRATEGY_L1,
+    STRATEGY_L3,
     STRATEGY_LABELS,
     STRATEGY_NUMPY,
+    STRATEGY_ROTATE,
+    STRATEGY_SIMD,
     BuiltinStresser,
+    _run_duty_cycle,
+    _stream_step,
+    clamp_duty,
     get_default_strategy,
+    parse_cache_size,
+    read_cache_sizes,
+    rotation_slot,
+    rotation_workloads,
     strategy_available,
 )
 
@@ -101,3 +121,267 @@ class TestStrategySelection:
         mock_warn.assert_called_once()
         assert "falling back to hashlib" in mock_warn.call_args[0][0]
         stresser.stop(timeout=3)
+
+
+class TestWorkerPool:
+    def test_workers_persist_across_runs(self):
+        """Stop parks the workers, the next start reuses them."""
+        stresser = BuiltinStresser()
+        stresser.start(2, strategy=STRATEGY_HASHLIB)
+        pids = [p.pid for p in stresser._workers]
+        stresser.stop()
+        assert not stresser.is_running()
+        assert all(p.is_alive() for p in stresser._workers)
+        stresser.start(1, strategy=STRATEGY_NUMPY)
+        assert [p.pid for p in stresser._workers] == pids
+        assert stresser._go[0].is_set()
+        assert not stresser._go[1].is_set()
+        stresser.close(timeout=3)
+
+    def test_pool_grows_on_demand(self):
+        stresser = BuiltinStresser()
+        stresser.prefork(1)
+        assert not stresser.is_running()
+        stresser.start(2, strategy=STRATEGY_HASHLIB)
+        assert len(stresser._workers) == 2
+        stresser.close(timeout=3)
+
+    def test_start_is_fast_after_prefork(self):
+        """Starting parked workers only flips shared flags."""
+        stresser = BuiltinStresser()
+        stresser.prefork(2)
+        begin = time.monotonic()
+        stresser.start(2, strategy=STRATEGY_HASHLIB)
+        assert time.monotonic() - begin < 0.1
+        stresser.close(timeout=3)
+
+    def test_close_ends_workers(self):
+        stresser = BuiltinStresser()
+        stresser.start(1, strategy=STRATEGY_HASHLIB)
+        workers = list(stresser._workers)
+        stresser.close(timeout=3)
+        assert not any(p.is_alive() for p in workers)
+        assert stresser._workers == []
+
+
+class TestOpsCounters:
+    def test_running_workers_count_steps(self):
+        stresser = BuiltinStresser()
+        stresser.start(2, strategy=STRATEGY_HASHLIB)
+        deadline = time.monotonic() + 5
+        while min(stresser.get_ops()) == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert min(stresser.get_ops()) > 0
+        stresser.close(timeout=3)
+        assert stresser.get_ops() == []
+
+    def test_parked_workers_keep_their_count(self):
+        stresser = BuiltinStresser()
+        stresser.prefork(1)
+        assert stresser.get_ops() == [0]
+        stresser.start(1, strategy=STRATEGY_HASHLIB)
+        time.sleep(0.05)
+        stresser.stop()
+        time.sleep(0.05)
+        parked = stresser.get_ops()
+        time.sleep(0.05)
+        assert stresser.get_ops() == parked
+        stresser.close(timeout=3)
+
+
+class TestMemoryWorkloads:
+    def test_parse_cache_size(self):
+        assert parse_cache_size("48K") == 48 << 10
+        assert parse_cache_size("32M\n") == 32 << 20
+        assert parse_cache_size("512") == 512
+        with pytest.raises(ValueError):
+            parse_cache_size("lots")
+
+    def test_read_cache_sizes(self, tmp_path, monkeypatch):
+        caches = [
+            ("1", "Data", "48K", "0-1"),
+            ("1", "Instruction", "32K", "0-1"),
+            ("3", "Unified", "32M", "0-7"),
+        ]
+        for index, (level, kind, size, shared) in enumerate(caches):
+            path = tmp_path / ("index" + str(index))
+            path.mkdir()
+            (path / "level").write_text(level + "\n")
+            (path / "type").write_text(kind + "\n")
+            (path / "size").write_text(size + "\n")
+            (path / "shared_cpu_list").write_text(shared + "\n")
+        monkeypatch.setattr(
+            builtin_stresser, "SYSFS_CACHES", str(tmp_path / "index[0-9]*") + "/"
+        )
+        # Shared caches are split between their CPUs, L2 is missing
+        assert read_cache_sizes() == {1: 24 << 10, 2: 1 << 20, 3: 4 << 20}
+
+    @pytest.mark.parametrize("strategy", [STRATEGY_L1, STRATEGY_L3, STRATEGY_DRAM])
+    def test_steps_report_traffic(self, mocker, strategy):
+        mocker.patch(
+            "s_tui.builtin_stresser.read_cache_sizes",
+            return_value={1: 16 << 10, 2: 256 << 10, 3: 1 << 20},
+        )
+        mocker.patch("s_tui.builtin_stresser.DRAM_MIN", 4 << 20)
+        step = _STEP_FACTORIES[strategy]()
+        assert step() > 0
+
+    def test_stream_walks_the_working_set(self, mocker):
+        """Chunks cover the whole working set, then start over."""
+        mocker.patch("s_tui.builtin_stresser.STREAM_CHUNK", 48 << 10)
+        step = _stream_step(120 << 10)
+        moved = [step() for _ in range(6)]
+        assert moved[:3] == moved[3:]
+        assert moved[2] < moved[0]
+
+    def test_memory_strategies_always_available(self):
+        for strategy in (STRATEGY_L1, STRATEGY_L3, STRATEGY_DRAM):
+            assert strategy_available(strategy)
+
+    def test_workers_count_traffic(self):
+        stresser = BuiltinStresser()
+        stresser.start(1, strategy=STRATEGY_L1)
+        deadline = time.monotonic() + 5
+        while stresser.get_traffic() == [0] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert stresser.get_traffic()[0] > 0
+        stresser.close(timeout=3)
+
+
+class TestInstructionMixes:
+    @pytest.mark.parametrize("strategy", [STRATEGY_INT, STRATEGY_BRANCH])
+    def test_scalar_steps_run(self, strategy):
+        step = _STEP_FACTORIES[strategy]()
+        step()
+        step()
+
+    @pytest.mark.skipif(not _HAS_NUMPY, reason="requires numpy")
+    def test_simd_step_runs(self):
+        _STEP_FACTORIES[STRATEGY_SIMD]()()
+
+    def test_simd_needs_numpy(self):
+        assert strategy_available(STRATEGY_SIMD) == _HAS_NUMPY
+
+    def test_unknown_strategy_unavailable(self):
+        assert not strategy_available("quantum")
+
+    def test_rotation_skips_unavailable(self):
+        workloads = rotation_workloads()
+        assert workloads[:2] == [STRATEGY_INT, STRATEGY_BRANCH]
+        assert (STRATEGY_SIMD in workloads) == _HAS_NUMPY
+        assert STRATEGY_HASHLIB in workloads
+
+    def test_rotation_slot(self):
+        workloads = rotation_workloads()
+        assert rotation_slot(0.0, 10.0) == (workloads[0], 10.0)
+        assert rotation_slot(15.0, 10.0) == (workloads[1], 20.0)
+        # Wraps around after the last workload
+        elapsed = 10.0 * len(workloads) + 1
+        assert rotation_slot(elapsed, 10.0)[0] == workloads[0]
+
+    def test_rotate_period_must_be_positive(self):
+        stresser = BuiltinStresser()
+        with pytest.raises(ValueError):
+            stresser.set_rotate_period(0)
+
+    def test_workers_follow_the_rotation(self):
+        """Every worker switches workload when its slot ends."""
+        stresser = BuiltinStresser()
+        stresser.set_rotate_period(0.2)
+        stresser.start(1, strategy=STRATEGY_ROTATE)
+        assert stresser.current_workload() == STRATEGY_INT
+        time.sleep(0.25)
+        assert stresser.current_workload() == STRATEGY_BRANCH
+        before = stresser.get_ops()
+        time.sleep(0.1)
+        assert stresser.get_ops() > before
+        stresser.stop()
+        assert stresser.current_workload() is None
+        stresser.close(timeout=3)
+
+
+class TestPlacement:
+    def test_workers_are_pinned(self):
+        """Workers run only on the CPUs of the placement policy."""
+        cpu = min(os.sched_getaffinity(0))
+        stresser = BuiltinStresser()
+        stresser.set_placement(str(cpu))
+        stresser.start(2, strategy=STRATEGY_HASHLIB)
+        assert stresser.worker_cpus == [cpu, cpu]
+        for p in stresser._workers:
+            assert os.sched_getaffinity(p.pid) == {cpu}
+        stresser.stop(timeout=3)
+        assert stresser.worker_cpus == []
+
+    def test_unpinned_by_default(self):
+        stresser = BuiltinStresser()
+        stresser.start(1, strategy=STRATEGY_HASHLIB)
+        assert stresser.worker_cpus == [None]
+        stresser.stop(timeout=3)
+
+    def test_pin_failure_leaves_worker_unpinned(self, mocker):
+        mocker.patch("os.sched_setaffinity", side_effect=OSError("EINVAL"))
+        stresser = BuiltinStresser()
+        stresser.set_placement("0")
+        stresser.start(1, strategy=STRATEGY_HASHLIB)
+        assert stresser.worker_cpus == [None]
+        stresser.stop(timeout=3)
+
+
+class TestDutyCycle:
+    def test_clamp_duty(self):
+        assert clamp_duty(1.5) == 1.0
+        assert clamp_duty(-0.2) == 0.0
+        assert clamp_duty(0.37) == 0.37
+
+    @pytest.mark.parametrize("level", [0.25, 0.75])
+    def test_busy_share_follows_duty(self, mocker, level):
+        """The step runs for the duty share of every period."""
+        clock = [0.0]
+        busy = []
+        mocker.patch("s_tui.builtin_stresser.time.monotonic", lambda: clock[0])
+
+        def step():
+            busy.append(0.001)
+            clock[0] += 0.001
+
+        def sleep(idle):
+            clock[0] += idle
+
+        mocker.patch("s_tui.builtin_stresser.time.sleep", sleep)
+        duty = mocker.Mock(value=level)
+        _run_duty_cycle(lambda: clock[0] < 10 * DUTY_PERIOD, duty, step)
+        assert sum(busy) / clock[0] == pytest.approx(level, abs=0.02)
+
+    def test_steps_are_counted(self, mocker):
+        steps = []
+        counters = mocker.Mock()
+        counters.ops.value = 0
+        counters.traffic.value = 0
+
+        def step():
+            steps.append(1)
+            return 100
+
+        _run_duty_cycle(lambda: len(steps) < 3, None, step, counters)
+        assert counters.ops.value == 3
+        assert counters.traffic.value == 300
+
+    def test_stops_within_a_step(self):
+        """The cycle returns right after the step that saw the stop."""
+        steps = []
+        _run_duty_cycle(lambda: len(steps) < 3, None, lambda: steps.append(1))
+        assert len(steps) == 3
+
+    def test_set_duty_reaches_running_workers(self):
+        """The duty level changes without restarting the workers."""
+        stresser = BuiltinStresser()
+        stresser.set_duty(0.5)
+        stresser.start(1, strategy=STRATEGY_HASHLIB)
+        pids = [p.pid for p in stresser._workers]
+        assert stresser._control.duty.value == 0.5
+        stresser.set_duty(0.2)
+        assert stresser._control.duty.value == 0.2
+        assert [p.pid for p in stresser._workers] == pids
+        stresser.close(timeout=3)
+        assert stresser.duty == 0.2
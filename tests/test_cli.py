@@ -1,16 +1,24 @@
 """Tests for CLI argument parsing (get_args) and main() entry paths."""
 
+import subprocess
 import sys
 from unittest.mock import patch
 
-from s_tui.s_tui import get_args
+import pytest
+
+from s_tui import collector
+from s_tui.cli import get_args
+
+
+def get_args_for(argv):
+    with patch.object(sys, "argv", ["s-tui", *argv]):
+        return get_args()
 
 
 class TestGetArgs:
     def _parse(self, argv):
         """Helper: parse argv through get_args by patching sys.argv."""
-        with patch.object(sys, "argv", ["s-tui", *argv]):
-            return get_args()
+        return get_args_for(argv)
 
     def test_default_args(self):
         """Default args with no flags."""
@@ -80,3 +88,39 @@ class TestGetArgs:
         assert args.no_mouse is True
         assert args.t_thresh == "75"
         assert args.refresh_rate == "0.5"
+
+
+class TestGraphControllerMain:
+    def test_bad_output_exits_before_the_loop(self, mocker, capsys):
+        from s_tui.s_tui import GraphController
+
+        controller = GraphController.__new__(GraphController)
+        controller.args = get_args_for(["--csv-file", "/nonexistent/dir/a.csv"])
+        controller.replayer = None
+        controller.throttle_journal = None
+        main_loop = mocker.patch("s_tui.s_tui.MainLoop")
+        with pytest.raises(SystemExit) as exc:
+            controller.main()
+        assert exc.value.code == 2
+        assert capsys.readouterr().err.startswith("s-tui: ")
+        main_loop.assert_not_called()
+
+
+def test_json_stream_does_not_import_urwid():
+    code = (
+        "import contextlib, sys\n"
+        "from s_tui import cli, collector\n"
+        "collector.run = lambda args: 0\n"
+        "sys.argv = ['s-tui', '--json-stream']\n"
+        "with contextlib.suppress(SystemExit):\n"
+        "    cli.main()\n"
+        "sys.exit('urwid' in sys.modules)\n"
+    )
+    assert subprocess.run([sys.executable, "-c", code], check=False).returncode == 0
+
+
+def test_json_stream_runs_with_tui_args(tmp_path):
+    path = tmp_path / "stream.ndjson"
+    args = get_args_for(["--json-stream", str(path), "-r", "0.01"])
+    assert collector.run(args, count=1) == 0
+    assert len(path.read_text().splitlines()) == 1
@@ -0,0 +1,314 @@
+"""Tests for the headless Collector loop."""
+
+import json
+import signal
+import subprocess
+import sys
+
+import pytest
+
+from s_tui.collector import (
+    Collector,
+    add_collector_args,
+    attach_script_hooks,
+    build_sinks,
+    get_args,
+    load_t_thresh,
+    main,
+    run,
+)
+from s_tui.sinks.csv_sink import CsvSink
+from s_tui.sinks.json_stream_sink import JsonStreamSink
+from s_tui.sinks.prometheus import ExporterSink
+from s_tui.sinks.push import InfluxSink, StatsdSink
+from s_tui.sinks.sampler import AgentServer, SamplerServer
+from s_tui.sinks.sink import Sink
+from s_tui.sinks.sqlite_sink import SqliteSink
+from s_tui.sinks.throttle_journal import ThrottleJournalSink
+from s_tui.sources.source import Source
+
+
+class _CountingSource(Source):
+    def __init__(self):
+        super().__init__()
+        self.name = "Count"
+        self.available_sensors = ["Value"]
+        self.last_measurement = [0.0]
+        self.sensor_available = [True]
+        self.updates = 0
+
+    def update(self):
+        self.updates += 1
+        self.last_measurement[0] = float(self.updates)
+
+
+class _FailingSource(_CountingSource):
+    def __init__(self):
+        super().__init__()
+        self.name = "Failing"
+
+    def update(self):
+        raise OSError("sensor gone")
+
+
+class _ListSink(Sink):
+    def __init__(self):
+        self.samples = []
+        self.closed = False
+
+    def write(self, sample):
+        self.samples.append(sample)
+
+    def close(self):
+        self.closed = True
+
+
+class _FullDiskSink(_ListSink):
+    def write(self, sample):
+        raise OSError("No space left on device")
+
+
+class TestCollector:
+    def test_run_count_samples(self):
+        sink = _ListSink()
+        collector = Collector([_CountingSource()], [sink], 0.001)
+        collector.run(count=3)
+        assert len(sink.samples) == 3
+
+    def test_primes_before_first_sample(self):
+        """The first emitted sample is already the second update."""
+        sink = _ListSink()
+        collector = Collector([_CountingSource()], [sink], 0.001)
+        collector.run(count=1)
+        assert sink.samples[0].values() == [2.0]
+
+    def test_failing_source_does_not_stop_loop(self):
+        sink = _ListSink()
+        collector = Collector([_FailingSource(), _CountingSource()], [sink], 0.001)
+        collector.run(count=2)
+        assert len(sink.samples) == 2
+        assert "Failing" in collector.source_update_errors
+
+    def test_failing_sink_does_not_stop_others(self, caplog):
+        sink = _ListSink()
+        collector = Collector([_CountingSource()], [_FullDiskSink(), sink], 0.001)
+        collector.run(count=3)
+        assert len(sink.samples) == 3
+        errors = [r for r in caplog.records if "failed to write" in r.getMessage()]
+        assert len(errors) == 1
+
+    def test_broken_pipe_stops_run(self):
+        class _ClosedPipeSink(_ListSink):
+            def write(self, sample):
+                raise BrokenPipeError
+
+        collector = Collector([_CountingSource()], [_ClosedPipeSink()], 0.001)
+        with pytest.raises(BrokenPipeError):
+            collector.run(count=3)
+
+    def test_stop_ends_run(self):
+        sink = _ListSink()
+        collector = Collector([_CountingSource()], [sink], 10.0)
+        collector.stop()
+        collector.run()
+        assert sink.samples == []
+
+    def test_close_closes_sinks(self):
+        sink = _ListSink()
+        Collector([], [sink], 1.0).close()
+        assert sink.closed
+
+    def test_json_stream_end_to_end(self, tmp_path):
+        path = tmp_path / "stream.ndjson"
+        sink = JsonStreamSink(str(path))
+        collector = Collector([_CountingSource()], [sink], 0.001)
+        collector.run(count=2)
+        collector.close()
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["Count"]["Value"] for line in lines] == [2.0, 3.0]
+
+    def test_stats_skip_baseline_reading(self):
+        sink = _ListSink()
+        collector = Collector([_CountingSource()], [sink], 0.001, ("min", "mean"))
+        collector.run(count=3)
+        assert sink.samples[-1].stat_values() == [2.0, 3.0]
+
+
+class TestBuildSinks:
+    def _parse(self, argv):
+        import argparse
+
+        parser = argparse.ArgumentParser()
+        add_collector_args(parser)
+        return parser.parse_args(argv)
+
+    def test_no_sinks_by_default(self):
+        assert build_sinks(self._parse([])) == []
+
+    def test_json_stream_stdout(self):
+        sinks = build_sinks(self._parse(["--json-stream"]))
+        assert isinstance(sinks[0], JsonStreamSink)
+        assert sinks[0].path == "-"
+
+    def test_push_targets(self, tmp_path):
+        sinks = build_sinks(
+            self._parse(
+                ["--influx", str(tmp_path / "a.lp"), "--statsd", "udp://127.0.0.1:8125"]
+            )
+        )
+        assert [type(sink) for sink in sinks] == [InfluxSink, StatsdSink]
+        for sink in sinks:
+            sink.close()
+
+    def test_exporter(self):
+        sinks = build_sinks(self._parse(["--exporter", "127.0.0.1:0"]))
+        assert isinstance(sinks[0], ExporterSink)
+        sinks[0].close()
+
+    def test_serve(self, tmp_path):
+        sinks = build_sinks(get_args(["--serve", str(tmp_path / "s.sock")]))
+        assert isinstance(sinks[0], SamplerServer)
+        assert sinks[0].stress_controller.get_current_mode() == "Monitor"
+        sinks[0].close()
+
+    def test_throttle_log(self, tmp_path):
+        sinks = build_sinks(get_args(["--throttle-log", str(tmp_path / "t.csv")]))
+        assert isinstance(sinks[0], ThrottleJournalSink)
+        sinks[0].close()
+
+    def test_agent(self):
+        sinks = build_sinks(get_args(["--agent", "127.0.0.1:0"]))
+        assert isinstance(sinks[0], AgentServer)
+        sinks[0].close()
+
+    def test_failure_closes_created_sinks(self, tmp_path, mocker):
+        close = mocker.patch.object(JsonStreamSink, "close")
+        args = self._parse(
+            ["--json-stream", str(tmp_path / "a.ndjson"), "--sqlite", str(tmp_path)]
+        )
+        with pytest.raises(OSError):
+            build_sinks(args)
+        close.assert_called_once()
+
+    def test_sqlite(self, tmp_path):
+        path = str(tmp_path / "runs.db")
+        sinks = build_sinks(self._parse(["--sqlite", path, "--sqlite-commit", "1"]))
+        assert isinstance(sinks[0], SqliteSink)
+        assert sinks[0].commit_interval == 1.0
+        sinks[0].close()
+
+
+def test_collector_does_not_import_urwid():
+    code = "import sys, s_tui.collector; sys.exit('urwid' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], check=False).returncode == 0
+
+
+class TestSignals:
+    def test_sighup_reopens_sinks_between_ticks(self, mocker):
+        sink = _ListSink()
+        sink.reopen = mocker.MagicMock()
+        collector = Collector([_CountingSource()], [sink], 0.001)
+        collector._on_reopen_signal(signal.SIGHUP, None)
+        sink.reopen.assert_not_called()
+        collector.run(count=1)
+        sink.reopen.assert_called_once()
+
+    def test_sigterm_stops(self):
+        sink = _ListSink()
+        collector = Collector([_CountingSource()], [sink], 10.0)
+        collector._on_stop_signal(signal.SIGTERM, None)
+        collector.run()
+        assert sink.samples == []
+
+    def test_install_signal_handlers(self):
+        collector = Collector([], [], 1.0)
+        previous = {
+            sig: signal.getsignal(sig)
+            for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP)
+        }
+        try:
+            collector.install_signal_handlers()
+            assert signal.getsignal(signal.SIGHUP) == collector._on_reopen_signal
+            assert signal.getsignal(signal.SIGTERM) == collector._on_stop_signal
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+
+class TestScriptHooks:
+    def test_hooks_attached_from_config_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+        hooks_dir = tmp_path / "s-tui" / "hooks.d"
+        hooks_dir.mkdir(parents=True)
+        (hooks_dir / "_countingsource.sh").write_text("true\n")
+        source = _CountingSource()
+        assert attach_script_hooks([source])
+        assert len(source.edge_hooks) == 1
+
+    def test_stability_exit_code(self, mocker, capsys):
+        mocker.patch("s_tui.collector.get_sources", return_value=[_CountingSource()])
+        stress = mocker.patch("s_tui.collector.start_stability_stress")
+        args = get_args(
+            ["--stability", "builtin", "--steady-timeout", "0", "-r", "0.01"]
+        )
+        assert run(args) == 1
+        stress.return_value.close.assert_called_once()
+        assert "no thermal steady state" in capsys.readouterr().out
+
+    def test_schedule_stops_collector(self, mocker, tmp_path):
+        mocker.patch("s_tui.collector.get_sources", return_value=[_CountingSource()])
+        controller = mocker.patch("s_tui.collector.StressController").return_value
+        controller.get_builtin_ops.return_value = [0]
+        schedule = tmp_path / "schedule"
+        schedule.write_text("50% 0.02s\n")
+        path = tmp_path / "out.json"
+        args = get_args(
+            ["--schedule", str(schedule), "--json-stream", str(path), "-r", "0.01"]
+        )
+        assert run(args, count=100) == 0
+        controller.start_builtin_stress.assert_called_once()
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert len(lines) < 100
+        assert lines[0]["Phase"] == "1/1 50% 0.02s"
+        assert "Stress" in lines[0]
+        assert lines[-1]["Phase"] == ""
+
+    def test_schedule_errors(self, tmp_path, capsys):
+        schedule = tmp_path / "schedule"
+        schedule.write_text("50%\n")
+        assert run(get_args(["--schedule", str(schedule)])) == 2
+        assert "Invalid schedule phase" in capsys.readouterr().err
+
+    def test_load_t_thresh(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+        assert load_t_thresh() is None
+        (tmp_path / "s-tui").mkdir()
+        (tmp_path / "s-tui" / "s-tui.conf").write_text("[GraphControl]\nTTHRESH = 70\n")
+        assert load_t_thresh() == "70"
+
+
+class TestMain:
+    def test_daemon_requires_output_file(self, capsys):
+        with pytest.raises(SystemExit) as exc:
+            main(["--daemon"])
+        assert exc.value.code == 2
+
+    def test_daemon_rejects_stdout(self, capsys):
+        with pytest.raises(SystemExit) as exc:
+            main(["--daemon", "--json-stream"])
+        assert exc.value.code == 2
+
+    def test_schedule_error_builds_no_sinks(self, tmp_path, mocker):
+        build = mocker.patch("s_tui.collector.build_sinks")
+        args = get_args(
+            ["--exporter", "127.0.0.1:0", "--schedule", str(tmp_path / "missing")]
+        )
+        assert run(args) == 2
+        build.assert_not_called()
+
+    def test_csv_file_sink(self, tmp_path):
+        args = get_args(["--csv-file", str(tmp_path / "a.csv")])
+        sinks = build_sinks(args)
+        assert isinstance(sinks[0], CsvSink)
+        for sink in sinks:
+            sink.close()
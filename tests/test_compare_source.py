@@ -0,0 +1,148 @@
+"""Tests for comparing two recorded runs."""
+
+import pytest
+
+from s_tui.sinks.recording import RecordingReader, RecordingSink
+from s_tui.sinks.sink import Sample, SourceReading
+from s_tui.sources.compare_source import (
+    DELTA,
+    CompareSource,
+    Comparison,
+    RunSummarySource,
+    find_stress_start,
+    summarize,
+)
+
+
+def _record(path, start, idle, rise, throttle_after=None, rows=60):
+    sink = RecordingSink(path)
+    for i in range(rows):
+        stressed = i >= idle
+        throttled = throttle_after is not None and i >= idle + throttle_after
+        sink.write(
+            Sample(
+                [
+                    SourceReading(
+                        "Util", "%", ["Avg"], [100.0 if stressed else 1.0], [""]
+                    ),
+                    SourceReading(
+                        "Frequency",
+                        "MHz",
+                        ["Avg"],
+                        [3000.0 if stressed else 800.0],
+                        [""],
+                    ),
+                    SourceReading(
+                        "Temp", "C", ["Pkg"], [40.0 + rise * max(i - idle, 0)], [""]
+                    ),
+                ],
+                throttle="T" if throttled else "",
+                timestamp=start + i,
+            )
+        )
+    sink.close()
+    return RecordingReader(path)
+
+
+@pytest.fixture
+def comparison(tmp_path):
+    run_a = _record(str(tmp_path / "a.strec"), 1000.0, idle=10, rise=1.0)
+    run_b = _record(
+        str(tmp_path / "b.strec"), 5000.0, idle=20, rise=0.5, throttle_after=5
+    )
+    comparison = Comparison(run_a, run_b)
+    yield comparison
+    comparison.close()
+
+
+class TestStressStart:
+    def test_first_row_over_threshold(self, tmp_path):
+        run = _record(str(tmp_path / "a.strec"), 1000.0, idle=10, rise=1.0)
+        assert find_stress_start(run) == 1010.0
+        run.close()
+
+    def test_never_stressed_uses_first_row(self, tmp_path):
+        run = _record(str(tmp_path / "a.strec"), 1000.0, idle=100, rise=1.0)
+        assert find_stress_start(run) == 1000.0
+        run.close()
+
+    def test_summary(self, tmp_path):
+        run = _record(
+            str(tmp_path / "a.strec"), 1000.0, idle=10, rise=1.0, throttle_after=7
+        )
+        time_to_throttle, sustained_freq, max_temp = summarize(run, 1010.0)
+        assert time_to_throttle == 7.0
+        assert sustained_freq == 3000.0
+        assert max_temp == 89.0
+        run.close()
+
+
+class TestComparison:
+    def test_clock_is_relative_to_stress_start(self, comparison):
+        assert comparison.first == -20.0
+        assert comparison.last == 49.0
+        comparison.seek_to(0.0)
+        run_a, run_b = comparison.samples()
+        assert run_a.time == 1010.0
+        assert run_b.time == 5020.0
+        assert comparison.status() == "00:00:00 x1"
+
+    def test_run_without_data_is_none(self, comparison):
+        comparison.restart()
+        run_a, run_b = comparison.samples()
+        assert run_a is None
+        assert run_b.time == 5000.0
+        assert comparison.status().startswith("-00:00:20")
+        comparison.seek_to(45.0)
+        assert comparison.samples()[1] is None
+
+    def test_deltas_hidden_from_graphs(self, comparison):
+        conf = comparison.default_graphs_conf()
+        assert conf["Temp"] == {(DELTA + " Pkg").lower(): False}
+        assert not any(conf[RunSummarySource.NAME].values())
+        assert len(conf[RunSummarySource.NAME]) == 6
+
+
+class TestCompareSource:
+    def test_sensors_split_per_run(self, comparison):
+        temp = CompareSource(comparison, "Temp")
+        assert temp.get_sensor_list() == ["A Pkg", "B Pkg", DELTA + " Pkg"]
+        assert temp.get_measurement_unit() == "C"
+
+    def test_values_and_delta(self, comparison):
+        temp = CompareSource(comparison, "Temp", temp_thresh=60)
+        comparison.seek_to(30.0)
+        temp.update()
+        assert temp.get_reading_list() == [70.0, 55.0, -15.0]
+        summary = temp.get_sensors_summary()
+        assert summary[DELTA + " Pkg"] == "-15.0"
+        assert temp.get_sensor_alerts() == ["high temp txt", None, None]
+
+    def test_positive_delta_has_sign(self, comparison):
+        freq = CompareSource(comparison, "Frequency")
+        comparison.seek_to(-5.0)
+        freq.update()
+        assert freq.get_sensors_summary()[DELTA + " Avg"] == "+0.0"
+
+    def test_missing_run_is_na(self, comparison):
+        temp = CompareSource(comparison, "Temp")
+        comparison.restart()
+        temp.update()
+        assert temp.sensor_available == [False, True, False]
+
+    def test_throttle_per_run(self, comparison):
+        freq = CompareSource(comparison, "Frequency")
+        comparison.seek_to(6.0)
+        freq.update()
+        assert freq.get_sensor_suffixes() == ["", "T", ""]
+        assert freq.get_sensor_alerts() == [None, "throttle txt", None]
+
+
+class TestRunSummarySource:
+    def test_values(self, comparison):
+        runs = RunSummarySource(comparison)
+        summary = runs.get_sensors_summary()
+        assert summary["A throttle s"] == "N/A"
+        assert summary["B throttle s"] == "5.0"
+        assert summary["A sust. MHz"] == "3000.0"
+        assert summary["B max C"] == "59.5"
@@ -0,0 +1,213 @@
+"""Tests for CsvSink: persistent CSV writer."""
+
+import csv
+
+import pytest
+
+from s_tui.sinks.csv_sink import CsvReader, CsvSink, format_time, parse_time
+from s_tui.sinks.sink import FlushPolicy, Sample, SourceReading
+
+
+def _sample(values, throttle=""):
+    return Sample(
+        [SourceReading("Util", "%", ["Avg", "Core 0"], values, ["", ""])],
+        throttle=throttle,
+    )
+
+
+def _read(path):
+    with open(path) as f:
+        return list(csv.reader(f))
+
+
+class TestCsvSink:
+    def test_header_written_once(self, tmp_path):
+        path = str(tmp_path / "log.csv")
+        sink = CsvSink(path)
+        sink.write(_sample([1.0, 2.0]))
+        sink.write(_sample([3.0, 4.0]))
+        sink.close()
+        rows = _read(path)
+        assert rows[0] == ["Time", "Util:Avg", "Util:Core 0", "Throttle"]
+        assert len(rows) == 3
+
+    def test_throttle_is_last_column(self, tmp_path):
+        path = str(tmp_path / "log.csv")
+        sink = CsvSink(path)
+        sink.write(_sample([1.0, 2.0], throttle="Tc"))
+        sink.close()
+        assert _read(path)[1][-1] == "Tc"
+
+    def test_appends_without_second_header(self, tmp_path):
+        path = str(tmp_path / "log.csv")
+        sink = CsvSink(path)
+        sink.write(_sample([1.0, 2.0]))
+        sink.close()
+        sink = CsvSink(path)
+        sink.write(_sample([1.0, 2.0]))
+        sink.close()
+        rows = _read(path)
+        assert len(rows) == 3
+        assert rows[2][0] != "Time"
+
+    def test_reopen_writes_header_to_new_file(self, tmp_path):
+        path = tmp_path / "log.csv"
+        sink = CsvSink(str(path))
+        sink.write(_sample([1.0, 2.0]))
+        path.rename(tmp_path / "log.csv.1")
+        sink.reopen()
+        sink.write(_sample([1.0, 2.0]))
+        sink.close()
+        assert _read(path)[0][0] == "Time"
+
+    def test_throttle_empty_when_no_throttling(self, tmp_path):
+        path = str(tmp_path / "log.csv")
+        sink = CsvSink(path)
+        sink.write(_sample([1.0, 2.0]))
+        sink.close()
+        with open(path) as f:
+            row = next(csv.DictReader(f))
+        assert row["Throttle"] == ""
+        assert row["Util:Avg"] == "1.0"
+
+    def test_unavailable_is_empty(self, tmp_path):
+        path = str(tmp_path / "log.csv")
+        sink = CsvSink(path)
+        sink.write(_sample([1.0, None]))
+        sink.close()
+        assert _read(path)[1][2] == ""
+
+    def test_rows_buffered_until_flush(self, tmp_path):
+        path = str(tmp_path / "log.csv")
+        sink = CsvSink(path, FlushPolicy.parse("3"))
+        sink.write(_sample([1.0, 2.0]))
+        sink.write(_sample([1.0, 2.0]))
+        assert _read(path) == []
+        sink.write(_sample([1.0, 2.0]))
+        assert len(_read(path)) == 4
+        sink.close()
+
+    def test_close_flushes_pending_rows(self, tmp_path):
+        path = str(tmp_path / "log.csv")
+        sink = CsvSink(path, FlushPolicy.parse("100"))
+        sink.write(_sample([1.0, 2.0]))
+        sink.close()
+        assert len(_read(path)) == 2
+
+    def test_fsync(self, tmp_path, mocker):
+        mock_fsync = mocker.patch("s_tui.sinks.csv_sink.os.fsync")
+        sink = CsvSink(str(tmp_path / "log.csv"), fsync=True)
+        sink.write(_sample([1.0, 2.0]))
+        mock_fsync.assert_called_once()
+        sink.close()
+
+    def test_new_sensor_rotates_file(self, tmp_path):
+        path = tmp_path / "log.csv"
+        sink = CsvSink(str(path))
+        sink.write(_sample([1.0, 2.0]))
+        grown = Sample(
+            [SourceReading("Util", "%", ["Avg", "Core 0", "Core 1"], [1, 2, 3], [])]
+        )
+        sink.write(grown)
+        sink.close()
+        assert len(_read(path)) == 2
+        rotated = _read(tmp_path / "log.1.csv")
+        assert rotated[0] == [
+            "Time",
+            "Util:Avg",
+            "Util:Core 0",
+            "Util:Core 1",
+            "Throttle",
+        ]
+        assert len(rotated) == 2
+
+    def test_existing_file_with_other_columns_is_not_appended(self, tmp_path):
+        path = tmp_path / "log.csv"
+        path.write_text("Time,Other:Sensor,Throttle\n")
+        sink = CsvSink(str(path))
+        sink.write(_sample([1.0, 2.0]))
+        sink.close()
+        assert len(_read(path)) == 1
+        assert _read(tmp_path / "log.1.csv")[0][1] == "Util:Avg"
+
+    def test_time_has_milliseconds(self):
+        assert format_time(0.25).endswith(".250")
+
+
+class TestCsvReader:
+    @pytest.fixture
+    def log(self, tmp_path):
+        path = str(tmp_path / "log.csv")
+        sink = CsvSink(path)
+        for i in range(20):
+            sample = _sample([float(i), None], throttle="T" * (i % 2))
+            sample.time = 1700000000.0 + i * 2
+            sink.write(sample)
+        sink.close()
+        return path
+
+    def test_parse_time_round_trip(self):
+        assert parse_time(format_time(1700000000.25)) == 1700000000.25
+
+    def test_schema_and_units(self, log):
+        reader = CsvReader(log)
+        assert reader.columns == ["Util:Avg", "Util:Core 0"]
+        assert reader.sources == [("Util", "%", ["Avg", "Core 0"])]
+        assert len(reader) == 20
+        reader.close()
+
+    def test_read_row(self, log):
+        reader = CsvReader(log)
+        timestamp, values, throttle = reader.read(3)
+        assert timestamp == 1700000006.0
+        assert values == [3.0, None]
+        assert throttle == "T"
+        assert reader.sample(4).as_dict()["Util"]["Avg"] == 4.0
+        reader.close()
+
+    def test_find_by_time(self, log):
+        reader = CsvReader(log)
+        assert reader.find(1700000010.0) == 5
+        assert reader.find(1700000011.0) == 6
+        assert reader.find(0) == 0
+        assert reader.find(1800000000.0) == 20
+        reader.close()
+
+    def test_partial_last_row_ignored(self, log):
+        with open(log, "a") as f:
+            f.write("2024-01-01_00:00:00.000,1.0")
+        reader = CsvReader(log)
+        assert len(reader) == 20
+        reader.close()
+
+    def test_stats_columns_after_throttle(self, tmp_path):
+        path = str(tmp_path / "log.csv")
+        sink = CsvSink(path)
+        reading = SourceReading("Util", "%", ["Avg"], [5.0], [""], [{"max": 9.0}])
+        sink.write(Sample([reading], throttle="T"))
+        sink.close()
+        assert _read(path)[0] == ["Time", "Util:Avg", "Throttle", "Util:Avg:max"]
+        reader = CsvReader(path)
+        assert reader.columns == ["Util:Avg"]
+        assert reader.read(0)[1:] == ([5.0], "T")
+        reader.close()
+
+    def test_annotation_columns_last(self, tmp_path):
+        path = str(tmp_path / "log.csv")
+        sink = CsvSink(path)
+        sample = _sample([1.0, 2.0])
+        sample.annotations = {"Phase": "2/3 50% 2m", "Load": 50.0}
+        sink.write(sample)
+        sink.close()
+        rows = _read(path)
+        assert rows[0][-3:] == ["Throttle", "Phase", "Load"]
+        assert rows[1][-2:] == ["2/3 50% 2m", "50.0"]
+        reader = CsvReader(path)
+        assert reader.columns == ["Util:Avg", "Util:Core 0"]
+        reader.close()
+
+    def test_not_a_log(self, tmp_path):
+        path = tmp_path / "other.csv"
+        path.write_text("a,b\n1,2\n")
+        with pytest.raises(ValueError):
+            CsvReader(str(path))
@@ -0,0 +1,121 @@
+"""Tests for fleet nodes following localhost agents."""
+
+import asyncio
+import time
+
+import pytest
+
+from s_tui.sinks.sampler import AgentServer
+from s_tui.sinks.sink import Sample, SampleSummary, SourceReading, summarize_sample
+from s_tui.sources import fleet_source
+from s_tui.sources.fleet_source import Fleet, Node
+
+
+def _sample(freq=2400.0, throttle=""):
+    return Sample(
+        [
+            SourceReading(
+                "Frequency", "MHz", ["Avg", "Core 0"], [freq, freq], ["", ""]
+            ),
+            SourceReading("Temp", "C", ["Core 0", "Core 1"], [60.0, 75.0], ["", ""]),
+            SourceReading(
+                "Power", "W", ["package-0,0", "dram,0", "package-1,0"], [40, 5, 35], []
+            ),
+        ],
+        throttle=throttle,
+    )
+
+
+async def _until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def agent():
+    agent = AgentServer("127.0.0.1:0")
+    agent.write(_sample())
+    yield agent
+    agent.close()
+
+
+class TestSummarizeSample:
+    def test_key_metrics(self):
+        assert summarize_sample(_sample(throttle="T")) == SampleSummary(
+            75.0, 75.0, 2400.0, "T"
+        )
+
+    def test_missing_sources(self):
+        sample = Sample([SourceReading("Util", "%", ["Avg"], [5.0], [""])])
+        assert summarize_sample(sample) == SampleSummary(None, None, None, "")
+
+    def test_power_without_package(self):
+        sample = Sample([SourceReading("Power", "W", ["Cpu"], [12.0], [""])])
+        assert summarize_sample(sample).package_power == 12.0
+
+
+class TestNode:
+    def test_follows_agent(self, agent):
+        async def follow():
+            fleet = Fleet(["127.0.0.1:" + str(agent.port)], history=3)
+            fleet.start(asyncio.get_running_loop())
+            node = fleet.nodes[0]
+            await _until(lambda: node.current is not None)
+            for freq in (1000.0, 1100.0, 1200.0, 1300.0):
+                agent.write(_sample(freq, "T"))
+            await _until(lambda: node.summary().avg_freq == 1300.0)
+            await fleet.close()
+            return node
+
+        node = asyncio.run(follow())
+        assert node.connected
+        assert node.summary().throttle == "T"
+        assert node.sources[0] == ("Frequency", "MHz", ["Avg", "Core 0"])
+        # The history is bounded
+        assert [s.values()[0] for s in node.history] == [1100.0, 1200.0, 1300.0]
+
+    def test_unreachable_agent(self, agent, monkeypatch):
+        monkeypatch.setattr(fleet_source, "RECONNECT_DELAY", 0.01)
+        port = agent.port
+        agent.close()
+
+        async def follow():
+            node = Node("127.0.0.1:" + str(port))
+            task = asyncio.get_running_loop().create_task(node.run())
+            await _until(lambda: node.error)
+            task.cancel()
+            return node
+
+        node = asyncio.run(follow())
+        assert not node.connected
+        assert node.summary() is None
+
+    def test_reconnects(self, monkeypatch):
+        monkeypatch.setattr(fleet_source, "RECONNECT_DELAY", 0.01)
+        agent = AgentServer("127.0.0.1:0")
+        address = "127.0.0.1:" + str(agent.port)
+        agent.write(_sample())
+
+        async def follow():
+            nonlocal agent
+            node = Node(address)
+            task = asyncio.get_running_loop().create_task(node.run())
+            await _until(lambda: node.connected and node.current is not None)
+            agent.close()
+            await _until(lambda: not node.connected)
+            assert node.sample().values()[0] is None
+            agent = AgentServer(address)
+            agent.write(_sample(1500.0))
+            await _until(lambda: node.connected and node.summary().avg_freq == 1500.0)
+            task.cancel()
+
+        try:
+            asyncio.run(follow())
+        finally:
+            agent.close()
+
+    def test_invalid_address(self):
+        with pytest.raises(ValueError):
+            Node("no-port")
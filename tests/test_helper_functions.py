@@ -1,6 +1,5 @@
 """Tests for s_tui.helper_functions module."""
 
-import csv
 import json
 import os
 import signal
@@ -19,7 +18,6 @@ from s_tui.helper_functions import (
     get_user_config_file,
     kill_child_processes,
     make_user_config_dir,
-    output_to_csv,
     output_to_json,
     output_to_terminal,
     seconds_to_text,
@@ -269,13 +267,6 @@ class TestKillChildProcesses:
 # ---------------------------------------------------------------------------
 
 
-class _Summary:
-    """Minimal wrapper matching the dict-of-summary objects used by output_to_csv."""
-
-    def __init__(self, source):
-        self.source = source
-
-
 class TestOutputFunctions:
     def _make_mock_source(self, name, sensors_summary, suffixes=None):
         """Create a minimal mock source object."""
@@ -362,37 +353,6 @@ class TestOutputFunctions:
         assert "Throttle" in out
         assert "W" in out
 
-    def test_csv_throttle_is_last_column(self, tmp_path):
-        csv_file = str(tmp_path / "test.csv")
-
-        src = self._make_mock_source(
-            "Frequency",
-            {"Avg": "2400", "Core 0": "2400"},
-            suffixes=["T/W", ""],
-        )
-        sources = {"Frequency": _Summary(src)}
-        output_to_csv(sources, csv_file)
-
-        with open(csv_file) as f:
-            reader = csv.DictReader(f)
-            fieldnames = reader.fieldnames
-            row = next(reader)
-        assert fieldnames[-1] == "Throttle"
-        assert row["Throttle"] == "T/W"
-        assert row["Frequency:Avg"] == "2400"
-
-    def test_csv_throttle_empty_when_no_throttling(self, tmp_path):
-        csv_file = str(tmp_path / "test.csv")
-
-        src = self._make_mock_source("Frequency", {"Avg": "2400"})
-        sources = {"Frequency": _Summary(src)}
-        output_to_csv(sources, csv_file)
-
-        with open(csv_file) as f:
-            reader = csv.DictReader(f)
-            row = next(reader)
-        assert row["Throttle"] == ""
-
 
 # ---------------------------------------------------------------------------
 # __version__
@@ -0,0 +1,63 @@
+"""Tests for JsonStreamSink: one compact JSON object per line."""
+
+import json
+
+from s_tui.sinks.json_stream_sink import JsonStreamSink
+from s_tui.sinks.sink import FlushPolicy, Sample, SourceReading
+
+
+def _sample(value):
+    return Sample(
+        [SourceReading("Util", "%", ["Avg"], [value], [""])], timestamp=1000.0
+    )
+
+
+class TestJsonStreamSink:
+    def test_writes_one_line_per_sample(self, tmp_path):
+        path = tmp_path / "out.ndjson"
+        sink = JsonStreamSink(str(path))
+        sink.write(_sample(1.0))
+        sink.write(_sample(2.0))
+        sink.close()
+        lines = path.read_text().splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[1])["Util"]["Avg"] == 2.0
+
+    def test_lines_are_compact(self, tmp_path):
+        path = tmp_path / "out.ndjson"
+        sink = JsonStreamSink(str(path))
+        sink.write(_sample(1.0))
+        sink.close()
+        assert " " not in path.read_text()
+
+    def test_unavailable_is_null(self, tmp_path):
+        path = tmp_path / "out.ndjson"
+        sink = JsonStreamSink(str(path))
+        sink.write(_sample(None))
+        sink.close()
+        assert json.loads(path.read_text())["Util"]["Avg"] is None
+
+    def test_buffered_until_policy_flushes(self, tmp_path):
+        path = tmp_path / "out.ndjson"
+        sink = JsonStreamSink(str(path), FlushPolicy.parse("2"))
+        sink.write(_sample(1.0))
+        assert path.read_text() == ""
+        sink.write(_sample(2.0))
+        assert len(path.read_text().splitlines()) == 2
+        sink.close()
+
+    def test_stdout(self, capsys):
+        sink = JsonStreamSink("-")
+        sink.write(_sample(3.0))
+        sink.close()
+        assert json.loads(capsys.readouterr().out)["Util"]["Avg"] == 3.0
+
+    def test_reopen_appends(self, tmp_path):
+        path = tmp_path / "out.ndjson"
+        sink = JsonStreamSink(str(path))
+        sink.write(_sample(1.0))
+        path.rename(tmp_path / "rotated.ndjson")
+        sink.reopen()
+        sink.write(_sample(2.0))
+        sink.close()
+        assert len(path.read_text().splitlines()) == 1
@@ -0,0 +1,119 @@
+"""Tests for the CPU placement policies of the built-in stress."""
+
+import pytest
+
+from s_tui import placement
+from s_tui.placement import (
+    CpuInfo,
+    assign_cpus,
+    format_cpu_list,
+    parse_cpu_list,
+    parse_placement,
+    placement_cpus,
+    read_topology,
+)
+
+
+def _topology(packages=2, cores=4, threads=2):
+    """CPUs numbered like Linux does: first threads, then the siblings"""
+    per_thread = packages * cores
+    return [
+        CpuInfo(
+            thread * per_thread + package * cores + core,
+            package,
+            core,
+            package,
+        )
+        for thread in range(threads)
+        for package in range(packages)
+        for core in range(cores)
+    ]
+
+
+class TestCpuList:
+    def test_parse(self):
+        assert parse_cpu_list("0-3,8") == [0, 1, 2, 3, 8]
+        assert parse_cpu_list("2, 2, 5") == [2, 5]
+
+    @pytest.mark.parametrize("text", ["", "a", "3-1", "1,,2"])
+    def test_parse_invalid(self, text):
+        with pytest.raises(ValueError):
+            parse_cpu_list(text)
+
+    def test_format(self):
+        assert format_cpu_list([8, 0, 1, 2, 3, 10, 11]) == "0-3,8,10-11"
+
+
+class TestParsePlacement:
+    @pytest.mark.parametrize(
+        ("text", "policy"),
+        [
+            ("none", "none"),
+            ("Physical", "physical"),
+            ("socket:1", "socket:1"),
+            ("node: 0", "node:0"),
+            ("3,1-2", "1-3"),
+        ],
+    )
+    def test_valid(self, text, policy):
+        assert parse_placement(text) == policy
+
+    @pytest.mark.parametrize("text", ["socket", "node:x", "all"])
+    def test_invalid(self, text):
+        with pytest.raises(ValueError):
+            parse_placement(text)
+
+
+class TestPlacementCpus:
+    def test_none_is_unpinned(self):
+        assert placement_cpus("none", _topology()) == []
+
+    def test_physical(self):
+        assert placement_cpus("physical", _topology()) == list(range(8))
+
+    def test_smt_pairs_siblings(self):
+        assert placement_cpus("smt", _topology())[:4] == [0, 8, 1, 9]
+
+    def test_smt_without_siblings(self):
+        with pytest.raises(ValueError):
+            placement_cpus("smt", _topology(threads=1))
+
+    def test_socket_spreads_over_cores(self):
+        assert placement_cpus("socket:1", _topology()) == [4, 5, 6, 7, 12, 13, 14, 15]
+
+    def test_node(self):
+        assert placement_cpus("node:0", _topology())[:4] == [0, 1, 2, 3]
+        with pytest.raises(ValueError):
+            placement_cpus("node:3", _topology())
+
+    def test_list_must_be_available(self):
+        assert placement_cpus("1,3", _topology()) == [1, 3]
+        with pytest.raises(ValueError):
+            placement_cpus("0-99", _topology())
+
+    def test_assign_wraps_around(self):
+        assert assign_cpus("socket:0", 3, _topology(cores=2, threads=1)) == [0, 1, 0]
+
+    def test_assign_invalid_is_unpinned(self):
+        assert assign_cpus("node:9", 2, _topology()) == [None, None]
+
+
+class TestReadTopology:
+    def test_sysfs(self, tmp_path, monkeypatch):
+        for cpu, core in ((0, 0), (1, 0)):
+            topo = tmp_path / "cpu" / ("cpu" + str(cpu)) / "topology"
+            topo.mkdir(parents=True)
+            (topo / "physical_package_id").write_text("0\n")
+            (topo / "core_id").write_text(str(core) + "\n")
+        node = tmp_path / "node" / "node1"
+        node.mkdir(parents=True)
+        (node / "cpulist").write_text("0-1\n")
+        monkeypatch.setattr(
+            placement,
+            "SYSFS_CPU_TOPOLOGY",
+            str(tmp_path / "cpu" / "cpu{}" / "topology") + "/",
+        )
+        monkeypatch.setattr(placement, "SYSFS_NODES", str(tmp_path / "node" / "node*"))
+        monkeypatch.setattr("os.sched_getaffinity", lambda pid: {0, 1})
+        assert read_topology() == [CpuInfo(0, 0, 0, 1), CpuInfo(1, 0, 0, 1)]
+        assert placement_cpus("smt") == [0, 1]
@@ -0,0 +1,175 @@
+"""Tests for the OpenMetrics serializer and the HTTP exporter."""
+
+import os
+import urllib.error
+import urllib.request
+
+import pytest
+
+from s_tui.sinks.prometheus import (
+    OPENMETRICS_TYPE,
+    ExporterSink,
+    TextfileSink,
+    format_metrics,
+    parse_address,
+)
+from s_tui.sinks.sink import Sample, SourceReading
+
+
+def _sample(throttle=""):
+    return Sample(
+        [
+            SourceReading(
+                "Frequency", "MHz", ["Avg", "Core 0"], [2400.0, None], [throttle, ""]
+            ),
+            SourceReading("Util", "%", ["Avg"], [50.0], [""]),
+            SourceReading("Custom Thing", "", ['a "b"'], [1.5], [""]),
+        ],
+        throttle=throttle,
+        timestamp=1700000000.5,
+    )
+
+
+class TestFormatMetrics:
+    def test_scaled_to_base_units(self):
+        text = format_metrics(_sample())
+        assert (
+            's_tui_frequency_hertz{source="Frequency",sensor="Avg"} 2400000000.0'
+            in text
+        )
+        assert 's_tui_utilization_ratio{source="Util",sensor="Avg"} 0.5' in text
+        assert "# TYPE s_tui_frequency_hertz gauge" in text
+
+    def test_unavailable_sensor_skipped(self):
+        assert 'sensor="Core 0"' not in format_metrics(_sample())
+
+    def test_core_label(self):
+        sample = Sample(
+            [SourceReading("Temp", "C", ["Core 3"], [60.0], [""])], timestamp=1.0
+        )
+        assert 'sensor="Core 3",core="3"} 60.0' in format_metrics(sample)
+
+    def test_unknown_source_and_escaping(self):
+        text = format_metrics(_sample())
+        assert (
+            's_tui_custom_thing{source="Custom Thing",sensor="a \\"b\\""} 1.5' in text
+        )
+
+    def test_throttle_reasons(self):
+        text = format_metrics(_sample("T/W"))
+        assert 's_tui_throttle{reason="T"} 1' in text
+        assert 's_tui_throttle{reason="W"} 1' in text
+        assert 's_tui_throttle{reason="H"} 0' in text
+
+    def test_timestamp_optional(self):
+        assert "s_tui_sample_timestamp_seconds 1700000000.5" in format_metrics(
+            _sample()
+        )
+        assert "timestamp" not in format_metrics(_sample(), timestamp=False)
+
+
+class TestParseAddress:
+    @pytest.mark.parametrize(
+        "address, expected",
+        [
+            (":9101", ("", 9101)),
+            ("127.0.0.1:9101", ("127.0.0.1", 9101)),
+            ("[::1]:9101", ("::1", 9101)),
+        ],
+    )
+    def test_valid(self, address, expected):
+        assert parse_address(address) == expected
+
+    @pytest.mark.parametrize("address", ["9101", "host:", "host:port"])
+    def test_invalid(self, address):
+        with pytest.raises(ValueError):
+            parse_address(address)
+
+
+class TestExporterSink:
+    @pytest.fixture
+    def exporter(self):
+        sink = ExporterSink("127.0.0.1:0")
+        yield sink
+        sink.close()
+
+    def _get(self, exporter, path="/metrics", accept=None):
+        port = exporter.server.server_address[1]
+        request = urllib.request.Request("http://127.0.0.1:" + str(port) + path)
+        if accept is not None:
+            request.add_header("Accept", accept)
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.headers["Content-Type"], response.read().decode()
+
+    def test_serves_last_sample(self, exporter):
+        exporter.write(_sample())
+        content_type, body = self._get(exporter)
+        assert content_type.startswith("text/plain")
+        assert 's_tui_utilization_ratio{source="Util",sensor="Avg"} 0.5' in body
+        assert "# EOF" not in body
+
+    def test_openmetrics_negotiation(self, exporter):
+        exporter.write(_sample())
+        content_type, body = self._get(
+            exporter, accept="application/openmetrics-text; version=1.0.0"
+        )
+        assert content_type == OPENMETRICS_TYPE
+        assert body.endswith("# EOF\n")
+
+    def test_snapshot_serialized_per_tick(self, exporter, mocker):
+        exporter.write(_sample())
+        spy = mocker.patch("s_tui.sinks.prometheus.format_metrics")
+        self._get(exporter)
+        self._get(exporter)
+        spy.assert_not_called()
+
+    def test_unknown_path(self, exporter):
+        with pytest.raises(urllib.error.HTTPError) as err:
+            self._get(exporter, "/other")
+        assert err.value.code == 404
+
+    def test_close_twice(self, exporter):
+        exporter.close()
+        exporter.close()
+
+
+class TestTextfileSink:
+    def test_directory_gets_default_name(self, tmp_path):
+        sink = TextfileSink(str(tmp_path))
+        assert sink.path == str(tmp_path / "s-tui.prom")
+
+    def test_writes_atomically(self, tmp_path, mocker):
+        replace = mocker.spy(os, "replace")
+        path = tmp_path / "s-tui.prom"
+        sink = TextfileSink(str(path))
+        sink.write(_sample("T"))
+        replace.assert_called_once_with(str(path) + ".tmp", str(path))
+        assert 's_tui_throttle{reason="T"} 1' in path.read_text()
+        assert "timestamp" not in path.read_text()
+        assert not (tmp_path / "s-tui.prom.tmp").exists()
+
+    def test_interval(self, tmp_path, mocker):
+        clock = mocker.patch("s_tui.sinks.prometheus.time.monotonic", return_value=0.0)
+        path = tmp_path / "s-tui.prom"
+        sink = TextfileSink(str(path), interval=10)
+        sink.write(_sample())
+        sink.write(_sample("T"))
+        assert 'reason="T"} 0' in path.read_text()
+        clock.return_value = 10.0
+        sink.write(_sample("T"))
+        assert 'reason="T"} 1' in path.read_text()
+
+    def test_unchanged_metrics_not_rewritten(self, tmp_path, mocker):
+        sink = TextfileSink(str(tmp_path), interval=0)
+        sink.write(_sample())
+        replace = mocker.spy(os, "replace")
+        sink.write(_sample())
+        replace.assert_not_called()
+
+    def test_close_writes_pending(self, tmp_path):
+        path = tmp_path / "s-tui.prom"
+        sink = TextfileSink(str(path), interval=60)
+        sink.write(_sample())
+        sink.write(_sample("W"))
+        sink.close()
+        assert 'reason="W"} 1' in path.read_text()
@@ -0,0 +1,133 @@
+"""Tests for the InfluxDB line protocol and StatsD push sinks."""
+
+import socket
+
+import pytest
+
+from s_tui.sinks.push import (
+    InfluxSink,
+    PushTarget,
+    StatsdSink,
+    _split,
+    format_line_protocol,
+    format_statsd,
+)
+from s_tui.sinks.sink import Sample, SourceReading
+
+
+def _sample(throttle=""):
+    return Sample(
+        [
+            SourceReading("Temp", "C", ["Package id 0", "Core 1"], [60.5, None], []),
+            SourceReading("Power", "W", ["package-0"], [35.0], []),
+        ],
+        throttle=throttle,
+        timestamp=1700000000.25,
+    )
+
+
+@pytest.fixture
+def listener():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(5)
+    yield sock
+    sock.close()
+
+
+def _url(listener):
+    return "udp://127.0.0.1:" + str(listener.getsockname()[1])
+
+
+class TestLineProtocol:
+    def test_one_line_per_sensor(self):
+        lines = format_line_protocol(_sample(), "box").splitlines()
+        assert lines[0] == (
+            r"temp,host=box,sensor=Package\ id\ 0 value=60.5 1700000000250000000"
+        )
+        assert (
+            lines[1] == "power,host=box,sensor=package-0 value=35.0 1700000000250000000"
+        )
+
+    def test_core_tag(self):
+        sample = Sample(
+            [SourceReading("Util", "%", ["Core 3"], [10.0], [])], timestamp=1.0
+        )
+        assert ",sensor=Core\\ 3,core=3 " in format_line_protocol(sample, "box")
+
+    def test_throttle(self):
+        last = format_line_protocol(_sample("T/W"), "box").splitlines()[-1]
+        assert last == 'throttle,host=box reasons="T/W",active=1i 1700000000250000000'
+
+
+class TestStatsd:
+    def test_gauges(self):
+        lines = format_statsd(_sample("Tc")).splitlines()
+        assert "s_tui.temp.package_id_0:60.5|g" in lines
+        assert "s_tui.power.package_0:35.0|g" in lines
+        assert "s_tui.throttle.Tc:1|g" in lines
+        assert "s_tui.throttle.T:0|g" in lines
+        assert not any("core_1" in line for line in lines)
+
+    def test_prefix(self):
+        assert format_statsd(_sample(), "node1").startswith("node1.temp.")
+
+
+class TestPushTarget:
+    def test_udp_one_datagram_per_tick(self, listener):
+        sink = InfluxSink(_url(listener))
+        sink.write(_sample())
+        data = listener.recv(65535).decode()
+        assert data == format_line_protocol(_sample(), sink.host)
+        sink.close()
+
+    def test_statsd_over_udp(self, listener):
+        sink = StatsdSink(_url(listener))
+        sink.write(_sample())
+        assert listener.recv(65535).decode() == format_statsd(_sample())
+        sink.close()
+
+    def test_unix_datagram(self, tmp_path):
+        path = str(tmp_path / "telegraf.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        server.bind(path)
+        server.settimeout(5)
+        target = PushTarget("unix://" + path)
+        target.send(b"a value=1\n")
+        assert server.recv(1024) == b"a value=1\n"
+        target.close()
+        server.close()
+
+    def test_missing_listener_does_not_raise(self, tmp_path, caplog):
+        target = PushTarget("unix://" + str(tmp_path / "missing.sock"))
+        target.send(b"a value=1\n")
+        target.send(b"a value=2\n")
+        assert target.failing
+        assert len([r for r in caplog.records if r.levelname == "WARNING"]) == 1
+        target.close()
+
+    def test_file(self, tmp_path):
+        path = tmp_path / "metrics.lp"
+        sink = InfluxSink(str(path))
+        sink.write(_sample())
+        sink.write(_sample())
+        assert len(path.read_text().splitlines()) == 6
+        sink.close()
+
+    def test_file_reopen(self, tmp_path):
+        path = tmp_path / "metrics.lp"
+        sink = InfluxSink(str(path))
+        path.rename(tmp_path / "metrics.lp.1")
+        sink.reopen()
+        sink.write(_sample())
+        assert path.exists()
+        sink.close()
+
+    @pytest.mark.parametrize("target", ["udp://host", "udp://host:port"])
+    def test_invalid_udp(self, target):
+        with pytest.raises(ValueError):
+            PushTarget(target)
+
+    def test_split_on_lines(self):
+        assert _split(b"aaa\nbbb\nccc\n", 8) == [b"aaa\nbbb\n", b"ccc\n"]
+        assert _split(b"aaa\n", 8) == [b"aaa\n"]
@@ -0,0 +1,162 @@
+"""Tests for the binary recording sink, mmap reader and converter."""
+
+import csv
+import io
+import json
+import os
+
+import pytest
+
+from s_tui.sinks.recording import (
+    RecordingReader,
+    RecordingSink,
+    convert,
+    main,
+    mask_to_throttle,
+    throttle_to_mask,
+)
+from s_tui.sinks.sink import Sample, SourceReading
+
+
+def _sample(t, values, throttle="", sensors=("Avg", "Core 0")):
+    return Sample(
+        [
+            SourceReading("Util", "%", list(sensors), values[: len(sensors)], []),
+            SourceReading("Temp", "C", ["Pkg"], values[len(sensors) :], []),
+        ],
+        throttle=throttle,
+        timestamp=t,
+    )
+
+
+@pytest.fixture
+def recording(tmp_path):
+    path = str(tmp_path / "run.strec")
+    sink = RecordingSink(path)
+    for i in range(100):
+        sink.write(_sample(1000.0 + i, [float(i), None, 40.0 + i / 2], "T/W" * (i % 2)))
+    sink.close()
+    return path
+
+
+class TestThrottleMask:
+    @pytest.mark.parametrize("label", ["", "T", "T/W", "Tc", "Tp", "H/C/A/X"])
+    def test_round_trip(self, label):
+        assert mask_to_throttle(throttle_to_mask(label)) == label
+
+
+class TestRecordingReader:
+    def test_schema(self, recording):
+        reader = RecordingReader(recording)
+        assert reader.columns == ["Util:Avg", "Util:Core 0", "Temp:Pkg"]
+        assert reader.sources[1] == ("Temp", "C", ["Pkg"])
+        assert len(reader) == 100
+        reader.close()
+
+    def test_values_are_float32_with_none(self, recording):
+        reader = RecordingReader(recording)
+        timestamp, values, throttle = reader.read(3)
+        assert timestamp == 1003.0
+        assert values == [3.0, None, 41.5]
+        assert throttle == "T/W"
+        reader.close()
+
+    def test_sample_round_trip(self, recording):
+        reader = RecordingReader(recording)
+        sample = reader.sample(10)
+        assert sample.columns() == reader.columns
+        assert sample.as_dict()["Temp"]["Pkg"] == 45.0
+        reader.close()
+
+    def test_find_by_time(self, recording):
+        reader = RecordingReader(recording)
+        assert reader.find(1050.0) == 50
+        assert reader.find(1050.5) == 51
+        assert reader.find(0) == 0
+        assert reader.find(9999) == 100
+        reader.close()
+
+    def test_samples_time_range(self, recording):
+        reader = RecordingReader(recording)
+        times = [s.time for s in reader.samples(1010.0, 1013.0)]
+        assert times == [1010.0, 1011.0, 1012.0]
+        reader.close()
+
+    def test_partial_trailing_row_ignored(self, recording):
+        with open(recording, "ab") as f:
+            f.write(b"\x00" * 5)
+        reader = RecordingReader(recording)
+        assert len(reader) == 100
+        reader.close()
+
+    def test_not_a_recording(self, tmp_path):
+        path = tmp_path / "x.csv"
+        path.write_text("Time,a\n1,2\n")
+        with pytest.raises(ValueError):
+            RecordingReader(str(path))
+
+    def test_out_of_range(self, recording):
+        reader = RecordingReader(recording)
+        with pytest.raises(IndexError):
+            reader.read(100)
+        reader.close()
+
+
+class TestRecordingSink:
+    def test_fixed_row_size(self, tmp_path):
+        path = str(tmp_path / "run.strec")
+        sink = RecordingSink(path)
+        sink.write(_sample(1.0, [1.0, 2.0, 3.0]))
+        sink.flush()
+        size_one = os.path.getsize(path)
+        sink.write(_sample(2.0, [1.0, 2.0, 3.0]))
+        sink.close()
+        # float64 time + 3 float32 + uint32 throttle mask
+        assert os.path.getsize(path) - size_one == 8 + 3 * 4 + 4
+
+    def test_schema_change_starts_new_file(self, tmp_path):
+        path = str(tmp_path / "run.strec")
+        sink = RecordingSink(path)
+        sink.write(_sample(1.0, [1.0, 2.0, 3.0]))
+        sink.write(
+            _sample(2.0, [1.0, 2.0, 3.0, 4.0], sensors=("Avg", "Core 0", "Core 1"))
+        )
+        sink.close()
+        assert len(RecordingReader(path)) == 1
+        assert (
+            RecordingReader(str(tmp_path / "run.1.strec")).columns[2] == "Util:Core 1"
+        )
+
+    def test_does_not_overwrite_existing(self, tmp_path):
+        path = tmp_path / "run.strec"
+        path.write_bytes(b"keep")
+        sink = RecordingSink(str(path))
+        sink.write(_sample(1.0, [1.0, 2.0, 3.0]))
+        sink.close()
+        assert path.read_bytes() == b"keep"
+        assert len(RecordingReader(str(tmp_path / "run.1.strec"))) == 1
+
+
+class TestConvert:
+    def test_csv(self, recording):
+        reader = RecordingReader(recording)
+        out = io.StringIO()
+        assert convert(reader, out, "csv", 1000.0, 1002.0) == 2
+        rows = list(csv.reader(io.StringIO(out.getvalue())))
+        assert rows[0] == ["Time", "Util:Avg", "Util:Core 0", "Temp:Pkg", "Throttle"]
+        assert rows[2][1:] == ["1.0", "", "40.5", "T/W"]
+        reader.close()
+
+    def test_json(self, recording):
+        reader = RecordingReader(recording)
+        out = io.StringIO()
+        convert(reader, out, "json")
+        lines = out.getvalue().splitlines()
+        assert len(lines) == 100
+        assert json.loads(lines[1])["Throttle"] == "T/W"
+        reader.close()
+
+    def test_main_format_from_extension(self, recording, tmp_path):
+        out = tmp_path / "out.ndjson"
+        main([recording, str(out)])
+        assert len(out.read_text().splitlines()) == 100
@@ -0,0 +1,137 @@
+"""Tests for viewers attached to a shared sampler."""
+
+import time
+
+import pytest
+
+from s_tui.sinks.sampler import SamplerServer
+from s_tui.sinks.sink import Sample, SourceReading
+from s_tui.sources import remote_source
+from s_tui.sources.remote_source import RemoteStressController, SamplerClient
+
+
+def _sample(freq=2400.0, throttle="", util=None):
+    readings = [
+        SourceReading("Frequency", "MHz", ["Avg"], [freq], [throttle]),
+        SourceReading("Temp", "C", ["Max"], [70.0], [""]),
+    ]
+    if util is not None:
+        readings.insert(0, SourceReading("Util", "%", ["Avg"], [util], [""]))
+    return Sample(readings, throttle=throttle, timestamp=1700000000.0)
+
+
+def _wait_for(condition):
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = SamplerServer(str(tmp_path / "s.sock"))
+    server.write(_sample())
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def client(server):
+    client = SamplerClient(server.path)
+    client.connect()
+    yield client
+    client.close()
+
+
+class TestSamplerClient:
+    def test_connect_gets_first_sample(self, client):
+        assert client.sources == [("Frequency", "MHz", ["Avg"]), ("Temp", "C", ["Max"])]
+        assert client.sample().values() == [2400.0, 70.0]
+        assert client.state["mode"] == "Monitor"
+        assert client.connected
+
+    def test_follows_samples(self, server, client):
+        server.write(_sample(1200.0, "T"))
+        _wait_for(lambda: client.sample().values()[0] == 1200.0)
+        assert client.sample().throttle == "T"
+
+    def test_new_sensors_mapped_to_known_ones(self, server, client):
+        server.write(_sample(1800.0, util=50.0))
+        _wait_for(lambda: client.sample().values()[0] == 1800.0)
+        assert client.sample().columns() == ["Frequency:Avg", "Temp:Max"]
+
+    def test_sources(self, server, client):
+        sources = client.get_sources(60)
+        assert [s.get_source_name() for s in sources] == ["Frequency", "Temp"]
+        server.write(_sample(1200.0, "T"))
+        _wait_for(lambda: client.sample().throttle == "T")
+        for source in sources:
+            source.update()
+        assert sources[0].get_sensor_suffixes() == ["T"]
+        assert sources[1].get_edge_triggered()
+
+    def test_connect_refused(self, tmp_path):
+        with pytest.raises(OSError):
+            SamplerClient(str(tmp_path / "missing.sock")).connect()
+
+    def test_reconnects(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(remote_source, "RECONNECT_DELAY", 0.01)
+        path = str(tmp_path / "s.sock")
+        server = SamplerServer(path)
+        server.write(_sample())
+        client = SamplerClient(path)
+        client.connect()
+        try:
+            server.close()
+            _wait_for(lambda: not client.connected)
+            assert client.sample().values() == [None, None]
+            server = SamplerServer(path)
+            server.write(_sample(1000.0))
+            _wait_for(lambda: client.sample().values()[0] == 1000.0)
+        finally:
+            client.close()
+            server.close()
+
+
+class TestRemoteStressController:
+    def test_modes_from_sampler(self, client):
+        controller = RemoteStressController(client)
+        assert controller.get_modes() == ["Monitor"]
+        assert controller.get_current_mode() == "Monitor"
+
+    def test_commands(self, mocker):
+        client = mocker.MagicMock()
+        client.state = {"mode": "Monitor", "modes": ["Monitor"], "started": None}
+        controller = RemoteStressController(client)
+        controller.set_mode("s-tui stress")
+        assert controller.get_current_mode() == "s-tui stress"
+        controller.kill_stress_process()
+        controller.set_builtin_rotate_period(10)
+        controller.start_builtin_stress(4, "hashlib")
+        client.send_command.assert_called_once_with(
+            {
+                "mode": "s-tui stress",
+                "workers": 4,
+                "strategy": "hashlib",
+                "duty": 1.0,
+                "placement": "none",
+                "rotate_period": 10,
+            }
+        )
+        controller.start_stress(["stress", "-c", "4"])
+        client.send_command.assert_called_with(
+            {"mode": "Stress (ext)", "args": ["-c", "4"]}
+        )
+        controller.set_mode("Monitor")
+        client.send_command.assert_called_with({"mode": "Monitor"})
+        assert controller.get_builtin_rotation() is None
+
+    def test_sync(self, mocker):
+        client = mocker.MagicMock()
+        client.state = {"mode": "Monitor", "modes": ["Monitor"], "started": None}
+        controller = RemoteStressController(client)
+        assert controller.sync() is client.state
+        assert controller.sync() is None
+        client.state = {"mode": "s-tui stress", "modes": [], "started": 1.0}
+        assert controller.sync()["started"] == 1.0
+        assert controller.get_current_mode() == "s-tui stress"
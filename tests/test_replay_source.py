@@ -0,0 +1,171 @@
+"""Tests for replaying recordings through stand-in sources."""
+
+import pytest
+
+from s_tui.sinks.csv_sink import CsvReader, CsvSink
+from s_tui.sinks.recording import RecordingReader, RecordingSink
+from s_tui.sinks.sink import Sample, SourceReading
+from s_tui.sources.replay_source import (
+    MAX_SPEED,
+    Replayer,
+    ReplaySource,
+    SyntheticRecording,
+    open_recording,
+)
+
+
+def _sample(t, temp, throttle=""):
+    return Sample(
+        [
+            SourceReading("Frequency", "MHz", ["Avg"], [2000.0], [throttle]),
+            SourceReading("Temp", "C", ["Pkg", "Core 0"], [temp, None], ["", ""]),
+        ],
+        throttle=throttle,
+        timestamp=t,
+    )
+
+
+def _write(sink):
+    for i in range(60):
+        sink.write(_sample(1000.0 + i, 40.0 + i, "T" if i >= 50 else ""))
+    sink.close()
+
+
+class TestOpenRecording:
+    def test_binary(self, tmp_path):
+        path = str(tmp_path / "run.strec")
+        _write(RecordingSink(path))
+        recording = open_recording(path)
+        assert isinstance(recording, RecordingReader)
+        assert len(recording) == 60
+        recording.close()
+
+    def test_csv(self, tmp_path):
+        path = str(tmp_path / "run.csv")
+        _write(CsvSink(path))
+        recording = open_recording(path)
+        assert isinstance(recording, CsvReader)
+        assert recording.sources[1] == ("Temp", "C", ["Pkg", "Core 0"])
+        recording.close()
+
+    def test_synthetic(self):
+        recording = open_recording("synthetic:4")
+        assert isinstance(recording, SyntheticRecording)
+        assert len(recording.sources[0][2]) == 5
+
+    def test_empty_recording(self, tmp_path):
+        path = tmp_path / "empty.csv"
+        path.write_text("Time,Util:Avg,Throttle\n")
+        with pytest.raises(ValueError):
+            open_recording(str(path))
+
+
+class TestSyntheticRecording:
+    def test_deterministic(self):
+        assert SyntheticRecording().read(1234) == SyntheticRecording().read(1234)
+
+    def test_row_matches_columns(self):
+        recording = SyntheticRecording(cores=2)
+        _, values, _ = recording.read(0)
+        assert len(values) == len(recording.columns)
+        assert recording.sample(0).columns() == recording.columns
+
+    def test_find(self):
+        recording = SyntheticRecording(rows=10)
+        assert recording.find(recording.timestamp(3)) == 3
+        assert recording.find(recording.timestamp(3) + 0.5) == 4
+        assert recording.find(0) == 0
+        assert recording.find(recording.timestamp(100)) == 10
+
+
+class TestReplayer:
+    @pytest.fixture
+    def replayer(self):
+        return Replayer(SyntheticRecording(cores=1, rows=1000))
+
+    def test_advance_uses_speed(self, replayer):
+        replayer.advance(2.0)
+        assert replayer.index == 2
+        replayer.faster()
+        replayer.advance(2.0)
+        assert replayer.index == 6
+
+    def test_pause(self, replayer):
+        replayer.toggle_pause()
+        replayer.advance(10.0)
+        assert replayer.index == 0
+        assert replayer.status() == "00:00:00 ||"
+
+    def test_speed_limits(self, replayer):
+        replayer.slower()
+        assert replayer.speed == 1.0
+        for _ in range(20):
+            replayer.faster()
+        assert replayer.speed == MAX_SPEED
+
+    def test_seek_is_clamped(self, replayer):
+        replayer.seek(500.5)
+        assert replayer.index == 500
+        assert replayer.sample().time == replayer.recording.timestamp(500)
+        replayer.seek(-10000)
+        assert replayer.index == 0
+        replayer.seek(10000)
+        assert replayer.index == 999
+
+    def test_stops_at_end(self, replayer):
+        replayer.advance(5000.0)
+        assert replayer.paused
+        assert replayer.index == 999
+        replayer.toggle_pause()
+        assert replayer.index == 0
+        assert not replayer.paused
+
+    def test_status(self, replayer):
+        replayer.seek(723)
+        assert replayer.status() == "00:12:03 x1"
+        replayer.origin += 1000
+        assert replayer.status() == "-00:04:37 x1"
+
+
+class TestReplaySource:
+    @pytest.fixture
+    def replayer(self, tmp_path):
+        path = str(tmp_path / "run.strec")
+        _write(RecordingSink(path))
+        replayer = Replayer(open_recording(path))
+        yield replayer
+        replayer.close()
+
+    def test_sources_follow_schema(self, replayer):
+        freq, temp = replayer.get_sources()
+        assert freq.get_source_name() == "Frequency"
+        assert temp.get_measurement_unit() == "C"
+        assert temp.get_sensor_list() == ["Pkg", "Core 0"]
+        assert temp.get_alert_pallet() is not None
+        assert temp.get_top() == 100
+
+    def test_update_reads_current_row(self, replayer):
+        temp = ReplaySource(replayer, 1)
+        replayer.seek(10)
+        temp.update()
+        assert temp.get_reading_list() == [50.0, 0.0]
+        assert temp.sensor_available == [True, False]
+        assert temp.get_sensors_summary()["Core 0"] == "N/A"
+
+    def test_temp_threshold(self, replayer):
+        temp = ReplaySource(replayer, 1, temp_thresh=60)
+        replayer.seek(30)
+        temp.update()
+        assert temp.get_edge_triggered()
+        assert temp.get_sensor_alerts() == ["high temp txt", None]
+        assert temp.get_maximum() == 70.0
+        temp.reset()
+        assert temp.get_maximum() == 0.0
+
+    def test_throttle_label(self, replayer):
+        freq = ReplaySource(replayer, 0)
+        replayer.seek(55)
+        freq.update()
+        assert freq.get_edge_triggered()
+        assert freq.get_sensor_suffixes() == ["T"]
+        assert freq.get_sensor_alerts() == ["throttle txt"]
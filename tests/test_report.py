@@ -0,0 +1,164 @@
+"""Tests for the end-of-run stress report."""
+
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from s_tui.report import ReportWriter, StressReport, describe_throttle, render_markdown
+from s_tui.sinks.sink import Sample, SourceReading
+
+
+def _sample(t, temps, power, freq, throttle=""):
+    return Sample(
+        [
+            SourceReading("Temp", "C", ["Core 0", "Core 1"], temps, ["", ""]),
+            SourceReading("Frequency", "MHz", ["Avg"], [freq], [throttle]),
+            SourceReading(
+                "Power", "W", ["package-0,0", "core,0"], [power, 5.0], ["", ""]
+            ),
+        ],
+        throttle=throttle,
+        timestamp=1700000000.0 + t,
+        monotonic=t,
+    )
+
+
+@pytest.fixture
+def report():
+    report = StressReport("s-tui stress", start=1700000000.0, monotonic=0.0)
+    for t in range(1, 101):
+        throttle = "T/W" if t >= 40 else ""
+        freq = 4000.0 if t < 40 else 3000.0
+        report.add(_sample(float(t), [50.0 + t / 10, None], 20.0, freq, throttle))
+    return report
+
+
+class TestStressReport:
+    def test_summary(self, report):
+        result = report.finish(monotonic=100.0)
+        assert result["duration"] == 100.0
+        assert result["samples"] == 100
+        assert result["first_throttle"] == {
+            "after": 40.0,
+            "label": "T/W",
+            "reason": "thermal, power limit",
+        }
+        assert result["power"] == {"average": 20.0, "peak": 20.0, "energy": 2000}
+        assert result["frequency"] == {"peak": 4000, "sustained": 3000}
+
+    def test_temperatures(self, report):
+        temps = report.finish(monotonic=100.0)["temperature"]
+        assert list(temps) == ["Core 0"]
+        assert temps["Core 0"]["peak"] == 60.0
+        # Mean of the last minute, 40.1..60.0 s in
+        assert temps["Core 0"]["steady"] == pytest.approx(57.0, abs=0.1)
+
+    def test_window_is_bounded(self, report):
+        assert len(report.recent) <= 61
+
+    def test_no_throttle_or_power(self):
+        report = StressReport("Stress (ext)", monotonic=0.0)
+        report.add(
+            Sample(
+                [SourceReading("Util", "%", ["Avg"], [100.0], [""])],
+                monotonic=1.0,
+            )
+        )
+        result = report.finish(monotonic=1.0)
+        assert result["first_throttle"] is None
+        assert result["power"] is None
+        assert result["frequency"] is None
+        assert result["throughput"] is None
+
+    def test_throughput(self):
+        report = StressReport("s-tui stress", monotonic=0.0)
+        for t in range(1, 101):
+            ops = 1000.0 if t < 40 else 800.0
+            report.add(
+                Sample(
+                    [SourceReading("Stress", "ops/s", ["Total"], [ops], [""])],
+                    monotonic=float(t),
+                )
+            )
+        result = report.finish(monotonic=100.0)
+        assert result["throughput"] == {
+            "peak": 1000,
+            "sustained": 800,
+            "retained": 80.0,
+        }
+        assert (
+            "- Stress throughput: 800 ops/s sustained, 1000 ops/s peak "
+            "(80.0% retained)" in render_markdown(result)
+        )
+
+
+class TestRendering:
+    def test_describe_throttle(self):
+        assert describe_throttle("Tp") == "package thermal"
+
+    def test_markdown(self, report):
+        text = render_markdown(report.finish(monotonic=100.0))
+        assert text.startswith("## Stress report: s-tui stress")
+        assert "- First throttle: after 40.0 s (T/W: thermal, power limit)" in text
+        assert "| Core 0 | 60.0 | 57.0 |" in text
+
+    def test_writer_appends_json_lines(self, tmp_path, report):
+        writer = ReportWriter(str(tmp_path / "runs.json"))
+        writer.write(report.finish(monotonic=100.0))
+        writer.write(report.finish(monotonic=100.0))
+        lines = (tmp_path / "runs.json").read_text().splitlines()
+        assert [json.loads(line)["mode"] for line in lines] == ["s-tui stress"] * 2
+
+    def test_writer_markdown(self, tmp_path, report):
+        path = tmp_path / "runs.md"
+        ReportWriter(str(path)).write(report.finish(monotonic=100.0))
+        assert path.read_text().startswith("## Stress report")
+
+
+class TestStressRunEnd:
+    """The TUI ends the report when the external stress exits on its own"""
+
+    @pytest.fixture
+    def graph_controller(self):
+        from s_tui.s_tui import GraphController
+        from s_tui.stress_controller import StressController
+
+        controller = GraphController.__new__(GraphController)
+        controller.stress_controller = StressController(stress_installed=True)
+        controller.schedule = None
+        controller.report_writer = MagicMock()
+        controller.stopping_report = None
+        controller.view = MagicMock()
+        monitor = MagicMock()
+        monitor.original_widget.get_label.return_value = "Monitor"
+        controller.view.mode_buttons = [monitor]
+        return controller
+
+    def test_timeout_finishes_report(self, graph_controller):
+        stress = graph_controller.stress_controller
+        stress.set_mode("Stress (ext)")
+        # Stands in for stress -t, which exits once its time is up
+        stress.start_stress(["sh", "-c", "exit 0"])
+        graph_controller.stress_report = StressReport("Stress (ext)")
+        deadline = time.monotonic() + 5
+        while not stress.stress_exited():
+            assert time.monotonic() < deadline, "timed out"
+            time.sleep(0.01)
+        graph_controller._check_stress_exited()
+        assert graph_controller.stress_report is None
+        written = graph_controller.report_writer.write.call_args[0][0]
+        assert written["mode"] == "Stress (ext)"
+        assert stress.get_current_mode() == "Monitor"
+        radio = graph_controller.view.mode_buttons[0].original_widget
+        radio.set_state.assert_called_once_with(True, do_callback=False)
+
+    def test_running_stress_keeps_report(self, graph_controller, mocker):
+        stress = graph_controller.stress_controller
+        stress.set_mode("Stress (ext)")
+        mocker.patch.object(stress, "stress_exited", return_value=False)
+        graph_controller.stress_report = StressReport("Stress (ext)")
+        graph_controller._check_stress_exited()
+        assert graph_controller.stress_report is not None
+        graph_controller.report_writer.write.assert_not_called()
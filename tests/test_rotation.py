@@ -0,0 +1,178 @@
+"""Tests for LogRotator: size/time rotation, compression and retention."""
+
+import gzip
+import lzma
+import os
+
+import pytest
+
+from s_tui.sinks.csv_sink import CsvSink
+from s_tui.sinks.json_stream_sink import JsonStreamSink
+from s_tui.sinks.rotation import (
+    LogRotator,
+    compress_file,
+    parse_duration,
+    parse_size,
+)
+from s_tui.sinks.sink import Sample, SourceReading
+
+
+def _sample(value=1.0):
+    return Sample([SourceReading("Util", "%", ["Avg"], [value], [""])])
+
+
+class TestParsing:
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("100", 100),
+            ("4K", 4096),
+            ("2M", 2 * 1024**2),
+            ("1G", 1024**3),
+            ("1mb", 1024**2),
+        ],
+    )
+    def test_parse_size(self, text, expected):
+        assert parse_size(text) == expected
+
+    @pytest.mark.parametrize("text", ["", "0", "abc", "5T"])
+    def test_parse_size_invalid(self, text):
+        with pytest.raises(ValueError):
+            parse_size(text)
+
+    @pytest.mark.parametrize(
+        ("text", "expected"), [("90", 90), ("30m", 1800), ("1h", 3600), ("1d", 86400)]
+    )
+    def test_parse_duration(self, text, expected):
+        assert parse_duration(text) == expected
+
+    def test_parse_duration_invalid(self):
+        with pytest.raises(ValueError):
+            parse_duration("1w")
+
+
+class TestCompressFile:
+    def test_gzip(self, tmp_path):
+        path = tmp_path / "seg"
+        path.write_text("hello\n")
+        target = compress_file(str(path), "gzip")
+        assert not path.exists()
+        with gzip.open(target, "rt") as f:
+            assert f.read() == "hello\n"
+
+    def test_xz(self, tmp_path):
+        path = tmp_path / "seg"
+        path.write_text("hello\n")
+        target = compress_file(str(path), "xz")
+        with lzma.open(target, "rt") as f:
+            assert f.read() == "hello\n"
+
+    def test_unknown_method_rejected(self):
+        with pytest.raises(ValueError):
+            LogRotator(max_bytes=1, compress="rar")
+
+
+class TestLogRotator:
+    def test_due_by_size(self):
+        rotator = LogRotator(max_bytes=100)
+        assert not rotator.due(99)
+        assert rotator.due(100)
+
+    def test_due_by_interval_aligned(self, mocker):
+        clock = mocker.patch("s_tui.sinks.rotation.time.time", return_value=3599.0)
+        rotator = LogRotator(interval=3600)
+        assert rotator.next_rotation == 3600
+        assert not rotator.due(0)
+        clock.return_value = 3600.0
+        assert rotator.due(0)
+
+    def test_rotate_renames(self, tmp_path):
+        path = tmp_path / "log.csv"
+        path.write_text("x")
+        rotator = LogRotator(max_bytes=1)
+        rotated = rotator.rotate(str(path))
+        rotator.close()
+        assert not path.exists()
+        assert os.path.exists(rotated)
+
+    def test_rotate_compresses_in_background(self, tmp_path):
+        path = tmp_path / "log.csv"
+        path.write_text("x")
+        rotator = LogRotator(max_bytes=1, compress="gzip")
+        rotated = rotator.rotate(str(path))
+        rotator.close()
+        assert not os.path.exists(rotated)
+        assert os.path.exists(rotated + ".gz")
+
+    def test_retention(self, tmp_path):
+        path = tmp_path / "log.csv"
+        rotator = LogRotator(max_bytes=1, keep=2)
+        for _ in range(4):
+            path.write_text("x")
+            rotator.rotate(str(path))
+        rotator.close()
+        assert len(rotator.segments(str(path))) == 2
+
+    def test_retention_covers_parts(self, tmp_path):
+        path = tmp_path / "log.csv"
+        part = tmp_path / "log.1.csv"
+        rotator = LogRotator(max_bytes=1, keep=2, compress="gzip")
+        for rotated in (path, path, part, part):
+            rotated.write_text("x")
+            rotator.rotate(str(rotated), str(path))
+        rotator.close()
+        segments = [os.path.basename(p) for p in rotator.segments(str(path))]
+        assert len(segments) == 2
+        assert all(s.startswith("log.1.csv.") and s.endswith(".gz") for s in segments)
+
+    def test_segments_ignore_other_files(self, tmp_path):
+        path = tmp_path / "log.csv"
+        (tmp_path / "log.1.csv").write_text("x")
+        (tmp_path / "log.csv.20260101-000000.gz").write_text("x")
+        (tmp_path / "log.csv.20260101-000000-1").write_text("x")
+        rotator = LogRotator(max_bytes=1)
+        assert [os.path.basename(p) for p in rotator.segments(str(path))] == [
+            "log.csv.20260101-000000.gz",
+            "log.csv.20260101-000000-1",
+        ]
+
+
+class TestSinkRotation:
+    def test_csv_rotates_with_fresh_header(self, tmp_path):
+        path = tmp_path / "log.csv"
+        sink = CsvSink(str(path), rotator=LogRotator(max_bytes=10))
+        sink.write(_sample(1.0))
+        sink.write(_sample(2.0))
+        sink.close()
+        segments = sink.rotator.segments(str(path))
+        assert len(segments) == 2
+        for segment in segments:
+            with open(segment) as f:
+                assert f.readline().startswith("Time,")
+
+    def test_csv_parts_share_retention(self, tmp_path):
+        path = tmp_path / "log.csv"
+        sink = CsvSink(str(path), rotator=LogRotator(max_bytes=10, keep=1))
+        sink.write(_sample(1.0))
+        sink.write(_sample(2.0))
+        # New sensors continue in log.1.csv
+        sink.write(Sample([SourceReading("Temp", "C", ["Avg"], [50.0], [""])]))
+        sink.close()
+        segments = [os.path.basename(p) for p in sink.rotator.segments(str(path))]
+        assert len(segments) == 1
+        assert segments[0].startswith("log.1.csv.")
+
+    def test_json_stream_rotates(self, tmp_path):
+        path = tmp_path / "log.ndjson"
+        rotator = LogRotator(max_bytes=10, compress="gzip")
+        sink = JsonStreamSink(str(path), rotator=rotator)
+        sink.write(_sample(1.0))
+        sink.write(_sample(2.0))
+        sink.close()
+        segments = rotator.segments(str(path))
+        assert len(segments) == 2
+        assert all(s.endswith(".gz") for s in segments)
+
+    def test_stdout_stream_never_rotates(self):
+        sink = JsonStreamSink("-", rotator=LogRotator(max_bytes=1))
+        assert sink.rotator is None
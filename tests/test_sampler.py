@@ -0,0 +1,310 @@
+"""Tests for the shared sampler socket server."""
+
+import json
+import socket
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from s_tui.sinks import sampler
+from s_tui.sinks.sampler import (
+    COMMAND,
+    SAMPLE,
+    SCHEMA,
+    STATE,
+    AgentServer,
+    FrameDecoder,
+    SamplerServer,
+    encode_frame,
+    encode_json,
+    listen_unix,
+)
+from s_tui.sinks.sink import Sample, SourceReading
+
+
+def _sample(value=2400.0, throttle=""):
+    return Sample(
+        [
+            SourceReading("Frequency", "MHz", ["Avg"], [value], [throttle]),
+            SourceReading("Util", "%", ["Avg", "Core 0"], [50.0, None], ["", ""]),
+        ],
+        throttle=throttle,
+        timestamp=1700000000.5,
+    )
+
+
+def _attach(path):
+    viewer = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    viewer.settimeout(5)
+    viewer.connect(str(path))
+    return viewer
+
+
+def _frames(viewer, count):
+    decoder = FrameDecoder()
+    frames = []
+    while len(frames) < count:
+        frames += decoder.feed(viewer.recv(65536))
+    return frames
+
+
+def _wait_for(condition):
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+class TestFrameDecoder:
+    def test_split_frames(self):
+        data = encode_frame(SAMPLE, b"abc") + encode_json(STATE, {"mode": "x"})
+        decoder = FrameDecoder()
+        assert decoder.feed(data[:2]) == []
+        assert decoder.feed(data[2:5]) == []
+        frames = decoder.feed(data[5:])
+        assert frames[0] == (SAMPLE, b"abc")
+        assert frames[1][0] == STATE
+        assert json.loads(frames[1][1]) == {"mode": "x"}
+        assert decoder.buffer == bytearray()
+
+    def test_oversized_frame(self):
+        with pytest.raises(ValueError):
+            FrameDecoder().feed(sampler.FRAME.pack(SAMPLE, sampler.MAX_FRAME + 1))
+
+
+class TestListenUnix:
+    def test_stale_socket_replaced(self, tmp_path):
+        path = str(tmp_path / "s.sock")
+        listen_unix(path).close()
+        listen_unix(path).close()
+
+    def test_live_socket_kept(self, tmp_path):
+        path = str(tmp_path / "s.sock")
+        listener = listen_unix(path)
+        try:
+            with pytest.raises(OSError, match="Another sampler"):
+                listen_unix(path)
+        finally:
+            listener.close()
+
+    def test_regular_file_kept(self, tmp_path):
+        path = tmp_path / "s.sock"
+        path.write_text("data")
+        with pytest.raises(FileExistsError):
+            listen_unix(str(path))
+        assert path.read_text() == "data"
+
+
+class TestSamplerServer:
+    def test_schema_state_and_samples(self, tmp_path):
+        path = tmp_path / "s.sock"
+        server = SamplerServer(str(path))
+        try:
+            server.write(_sample())
+            viewer = _attach(path)
+            schema, state, first = _frames(viewer, 3)
+            assert schema[0] == SCHEMA
+            assert json.loads(schema[1])["sources"][1] == [
+                "Util",
+                "%",
+                ["Avg", "Core 0"],
+            ]
+            assert state[0] == STATE
+            assert json.loads(state[1])["mode"] == "Monitor"
+            assert first[0] == SAMPLE
+            assert len(first[1]) == server.row.size
+
+            server.write(_sample(1800.0))
+            assert [kind for kind, _ in _frames(viewer, 1)] == [SAMPLE]
+            viewer.close()
+        finally:
+            server.close()
+        assert not path.exists()
+
+    def test_schema_resent_on_change(self, tmp_path):
+        path = tmp_path / "s.sock"
+        server = SamplerServer(str(path))
+        try:
+            server.write(_sample())
+            viewer = _attach(path)
+            _frames(viewer, 3)
+            server.write(Sample([SourceReading("Temp", "C", ["Max"], [60.0], [""])]))
+            kinds = [kind for kind, _ in _frames(viewer, 2)]
+            assert kinds == [SCHEMA, SAMPLE]
+            viewer.close()
+        finally:
+            server.close()
+
+    def test_slow_viewer_dropped(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(sampler, "MAX_BUFFER", 10)
+        path = tmp_path / "s.sock"
+        server = SamplerServer(str(path))
+        try:
+            viewer = _attach(path)
+            _wait_for(lambda: server.viewers)
+            server.write(_sample())
+            _wait_for(lambda: not server.viewers)
+            viewer.close()
+        finally:
+            server.close()
+
+    def test_builtin_stress_command(self, tmp_path):
+        controller = MagicMock()
+        controller.get_modes.return_value = ["Monitor", "s-tui stress"]
+        controller.get_current_mode.return_value = "s-tui stress"
+        path = tmp_path / "s.sock"
+        server = SamplerServer(str(path), controller)
+        try:
+            viewer = _attach(path)
+            _frames(viewer, 1)
+            viewer.sendall(
+                encode_json(
+                    COMMAND, {"mode": "s-tui stress", "workers": 1, "strategy": None}
+                )
+            )
+            ((kind, payload),) = _frames(viewer, 1)
+            assert kind == STATE
+            assert json.loads(payload)["started"] is not None
+            controller.kill_stress_process.assert_called_once()
+            controller.set_mode.assert_called_once_with("s-tui stress")
+            controller.set_builtin_duty.assert_called_once_with(1.0)
+            controller.set_builtin_rotate_period.assert_called_once_with(30.0)
+            controller.start_builtin_stress.assert_called_once_with(1, None)
+            viewer.close()
+        finally:
+            server.close()
+        controller.close.assert_called_once()
+
+    def test_external_stress_keeps_server_program(self, tmp_path):
+        controller = MagicMock()
+        controller.get_modes.return_value = ["Monitor", "Stress (ext)"]
+        controller.get_current_mode.return_value = "Stress (ext)"
+        path = tmp_path / "s.sock"
+        server = SamplerServer(str(path), controller, "/usr/bin/stress")
+        try:
+            viewer = _attach(path)
+            _frames(viewer, 1)
+            viewer.sendall(
+                encode_json(COMMAND, {"mode": "Stress (ext)", "args": ["-c", 2]})
+            )
+            _frames(viewer, 1)
+            controller.start_stress.assert_called_once_with(
+                ["/usr/bin/stress", "-c", "2"]
+            )
+            viewer.close()
+        finally:
+            server.close()
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            ["--yaml", "/etc/passwd"],
+            ["--log-file", "/tmp/x"],
+            ["-c", "2; rm -rf /"],
+            ["--cpu-method", "../x"],
+            ["-c"],
+        ],
+    )
+    def test_external_stress_options_checked(self, tmp_path, args):
+        controller = MagicMock()
+        controller.get_modes.return_value = ["Monitor", "Stress (ext)"]
+        controller.get_current_mode.return_value = "Monitor"
+        path = tmp_path / "s.sock"
+        server = SamplerServer(str(path), controller, "/usr/bin/stress-ng")
+        try:
+            viewer = _attach(path)
+            _frames(viewer, 1)
+            viewer.sendall(encode_json(COMMAND, {"mode": "Stress (ext)", "args": args}))
+            viewer.sendall(encode_json(COMMAND, {"mode": "Monitor"}))
+            _frames(viewer, 1)
+            controller.start_stress.assert_not_called()
+            controller.set_mode.assert_called_once_with("Monitor")
+            viewer.close()
+        finally:
+            server.close()
+
+    def test_check_stress_args(self):
+        args = ["--cpu", 4, "--cpu-method", "fft", "--vm", "1", "--vm-bytes", "256M"]
+        assert sampler.check_stress_args([*args, "--vm-keep", "-t", "60"]) == [
+            "--cpu",
+            "4",
+            "--cpu-method",
+            "fft",
+            "--vm",
+            "1",
+            "--vm-bytes",
+            "256M",
+            "--vm-keep",
+            "-t",
+            "60",
+        ]
+
+    def test_slow_command_does_not_stall_samples(self, tmp_path):
+        controller = MagicMock()
+        controller.get_modes.return_value = ["Monitor", "Stress (ext)"]
+        controller.get_current_mode.return_value = "Monitor"
+        stopping = threading.Event()
+        controller.kill_stress_process.side_effect = lambda: stopping.wait(5)
+        path = tmp_path / "s.sock"
+        server = SamplerServer(str(path), controller)
+        try:
+            viewer = _attach(path)
+            _frames(viewer, 1)
+            viewer.sendall(encode_json(COMMAND, {"mode": "Monitor"}))
+            _wait_for(lambda: controller.kill_stress_process.called)
+            server.write(_sample())
+            assert [kind for kind, _ in _frames(viewer, 2)] == [SCHEMA, SAMPLE]
+            stopping.set()
+            viewer.close()
+        finally:
+            server.close()
+
+    def test_invalid_commands_ignored(self, tmp_path):
+        controller = MagicMock()
+        controller.get_modes.return_value = ["Monitor"]
+        controller.get_current_mode.return_value = "Monitor"
+        path = tmp_path / "s.sock"
+        server = SamplerServer(str(path), controller)
+        try:
+            viewer = _attach(path)
+            _frames(viewer, 1)
+            viewer.sendall(encode_json(COMMAND, {"mode": "rm -rf"}))
+            viewer.sendall(encode_frame(COMMAND, b"not json"))
+            viewer.sendall(encode_json(COMMAND, {"mode": "Monitor"}))
+            _frames(viewer, 1)
+            controller.set_mode.assert_called_once_with("Monitor")
+            viewer.close()
+        finally:
+            server.close()
+
+    def test_close_idempotent(self, tmp_path):
+        server = SamplerServer(str(tmp_path / "s.sock"))
+        server.close()
+        server.close()
+
+
+class TestAgentServer:
+    def test_streams_over_tcp(self):
+        agent = AgentServer("127.0.0.1:0")
+        try:
+            agent.write(_sample())
+            viewer = socket.create_connection(("127.0.0.1", agent.port), timeout=5)
+            kinds = [kind for kind, _ in _frames(viewer, 3)]
+            assert kinds == [SCHEMA, STATE, SAMPLE]
+            viewer.close()
+        finally:
+            agent.close()
+
+    def test_commands_ignored(self):
+        agent = AgentServer("127.0.0.1:0")
+        try:
+            viewer = socket.create_connection(("127.0.0.1", agent.port), timeout=5)
+            _frames(viewer, 1)
+            viewer.sendall(encode_json(COMMAND, {"mode": "s-tui stress"}))
+            agent.write(_sample())
+            assert [kind for kind, _ in _frames(viewer, 2)] == [SCHEMA, SAMPLE]
+            viewer.close()
+        finally:
+            agent.close()
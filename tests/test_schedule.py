@@ -0,0 +1,136 @@
+"""Tests for scripted stress schedules."""
+
+import pytest
+
+from s_tui.schedule import (
+    Phase,
+    ScheduleRunner,
+    load_schedule,
+    parse_load,
+    parse_schedule,
+)
+
+
+class TestParseSchedule:
+    def test_steps(self):
+        phases = parse_schedule("idle 60s, 25% load 120s, 50% 2m; 100% 10m")
+        assert [(p.start, p.duration) for p in phases] == [
+            (0.0, 60.0),
+            (25.0, 120.0),
+            (50.0, 120.0),
+            (100.0, 600.0),
+        ]
+        assert phases[1].label == "25% 120s"
+
+    def test_ramp(self):
+        ramp, short = parse_schedule("ramp 0%-100% 5m\n20%-idle 1m")
+        assert ramp == Phase("ramp 0%-100% 5m", 0.0, 100.0, 300.0)
+        assert (short.start, short.end) == (20.0, 0.0)
+
+    def test_cycle(self):
+        (cycle,) = parse_schedule("cycle 100%/idle 20s 10m")
+        assert cycle.period == 20.0
+        assert cycle.duration == 600.0
+
+    def test_comments_and_blank_lines(self):
+        text = "# warm up\n\nidle 1m  # settle\n100% 1m\n"
+        assert len(parse_schedule(text)) == 2
+
+    @pytest.mark.parametrize(
+        "text", ["", "# only a comment", "50%", "150% 1m", "ramp 0% 1m", "fast 1m"]
+    )
+    def test_invalid(self, text):
+        with pytest.raises(ValueError):
+            parse_schedule(text)
+
+    def test_parse_load(self):
+        assert parse_load("idle") == 0.0
+        assert parse_load("12.5%") == 12.5
+        with pytest.raises(ValueError):
+            parse_load("50")
+
+    def test_load_schedule(self, tmp_path):
+        path = tmp_path / "schedule"
+        path.write_text("idle 1s, 100% 2s\n")
+        assert len(load_schedule(str(path))) == 2
+
+
+class TestPhase:
+    def test_ramp_interpolates(self):
+        phase = Phase("ramp", 0.0, 100.0, 100.0)
+        assert phase.load_at(25.0) == 25.0
+        assert phase.load_at(200.0) == 100.0
+
+    def test_cycle_alternates(self):
+        phase = Phase("cycle", 100.0, 0.0, 60.0, 20.0)
+        assert phase.load_at(5.0) == 100.0
+        assert phase.load_at(15.0) == 0.0
+        assert phase.load_at(25.0) == 100.0
+
+
+class TestScheduleRunner:
+    @pytest.fixture
+    def controller(self, mocker):
+        return mocker.MagicMock()
+
+    def test_follows_phases(self, controller):
+        runner = ScheduleRunner(
+            parse_schedule("idle 10s, 50% 10s, 100% 10s"), controller, cpus=4
+        )
+        runner.start(0.0)
+        controller.start_builtin_stress.assert_not_called()
+        assert runner.tick(15.0) == {"Phase": "2/3 50% 10s", "Load": 50.0}
+        controller.set_mode.assert_called_with("s-tui stress")
+        controller.set_builtin_duty.assert_called_with(0.5)
+        controller.start_builtin_stress.assert_called_with(4, None)
+        runner.tick(25.0)
+        controller.set_builtin_duty.assert_called_with(1.0)
+        assert runner.status() == "3/3 100% 10s"
+
+    def test_ramp_changes_duty_live(self, controller):
+        runner = ScheduleRunner(parse_schedule("ramp 0%-100% 100s"), controller, cpus=2)
+        runner.start(0.0)
+        for now in range(0, 100, 5):
+            runner.tick(float(now))
+        controller.start_builtin_stress.assert_called_once_with(2, None)
+        controller.set_builtin_duty.assert_called_with(0.95)
+
+    def test_external_stress(self, controller):
+        runner = ScheduleRunner(
+            parse_schedule("50% 10s"), controller, "/usr/bin/stress", cpus=4
+        )
+        runner.start(0.0)
+        controller.set_mode.assert_called_with("Stress (ext)")
+        controller.start_stress.assert_called_once_with(["/usr/bin/stress", "-c", "2"])
+
+    def test_external_restarts_on_worker_change(self, controller):
+        runner = ScheduleRunner(
+            parse_schedule("ramp 5%-100% 100s"), controller, "stress", cpus=2
+        )
+        runner.start(0.0)
+        for now in range(0, 100, 5):
+            runner.tick(float(now))
+        assert controller.start_stress.call_count == 2
+        assert controller.start_stress.call_args_list[0].args == (
+            ["stress", "-c", "1"],
+        )
+
+    def test_finishes_in_monitor(self, controller):
+        runner = ScheduleRunner(parse_schedule("100% 10s"), controller, cpus=1)
+        runner.start(0.0)
+        assert runner.tick(10.0) == {"Phase": "", "Load": 0.0}
+        assert runner.finished
+        controller.set_mode.assert_called_with("Monitor")
+        assert runner.status() == ""
+
+    def test_cancel_keeps_stress(self, controller):
+        runner = ScheduleRunner(parse_schedule("100% 10s"), controller, cpus=1)
+        runner.start(0.0)
+        controller.reset_mock()
+        runner.cancel()
+        runner.tick(20.0)
+        controller.kill_stress_process.assert_not_called()
+
+    def test_duration(self, controller):
+        runner = ScheduleRunner(parse_schedule("idle 1m, 50% 2m"), controller)
+        assert runner.duration == 180.0
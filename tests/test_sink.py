@@ -0,0 +1,118 @@
+"""Tests for Sample construction and FlushPolicy parsing."""
+
+import pytest
+
+from s_tui.sinks.sink import FlushPolicy, Sample, Sink, SourceReading, take_sample
+from s_tui.sources.source import Source
+
+
+def make_source(name, sensors, values, available=None, suffixes=None, unit="X"):
+    src = Source()
+    src.name = name
+    src.measurement_unit = unit
+    src.available_sensors = list(sensors)
+    src.last_measurement = list(values)
+    src.sensor_available = (
+        list(available) if available is not None else [True] * len(sensors)
+    )
+    if suffixes is not None:
+        src.get_sensor_suffixes = lambda: suffixes
+    return src
+
+
+class TestTakeSample:
+    def test_flat_columns_and_values(self):
+        src = make_source("Util", ["Avg", "Core 0"], [25.0, 30.0])
+        sample = take_sample([src])
+        assert sample.columns() == ["Util:Avg", "Util:Core 0"]
+        assert sample.values() == [25.0, 30.0]
+
+    def test_unavailable_sensor_is_none(self):
+        src = make_source("Temp", ["A", "B"], [40.0, 50.0], available=[True, False])
+        assert take_sample([src]).values() == [40.0, None]
+
+    def test_skips_unavailable_sources(self):
+        src = make_source("Fan", ["fan0"], [1200])
+        src.is_available = False
+        assert take_sample([src]).readings == []
+
+    def test_throttle_from_first_suffix(self):
+        src = make_source(
+            "Frequency", ["Avg", "Core 0"], [2400, 2400], suffixes=["T/W", "T/W"]
+        )
+        assert take_sample([src]).throttle == "T/W"
+
+    def test_values_are_raw_floats(self):
+        src = make_source("Fan", ["fan0"], [1200])
+        value = take_sample([src]).values()[0]
+        assert isinstance(value, float)
+        assert value == 1200.0
+
+
+class TestSampleAsDict:
+    def test_nested_layout(self):
+        sample = Sample(
+            [SourceReading("Util", "%", ["Avg"], [10.0], [""])],
+            throttle="",
+            timestamp=100.0,
+        )
+        data = sample.as_dict()
+        assert list(data.keys()) == ["Time", "Util", "Throttle"]
+        assert data["Util"] == {"Avg": 10.0}
+
+    def test_annotations_are_appended(self):
+        sample = Sample([], annotations={"Phase": "idle"})
+        assert sample.as_dict()["Phase"] == "idle"
+
+
+class TestFlushPolicy:
+    def test_line_flushes_every_row(self):
+        policy = FlushPolicy.parse("line")
+        assert policy.row_written()
+
+    def test_rows(self):
+        policy = FlushPolicy.parse("3")
+        assert not policy.row_written()
+        assert not policy.row_written()
+        assert policy.row_written()
+        policy.flushed()
+        assert not policy.row_written()
+
+    def test_seconds(self, mocker):
+        clock = mocker.patch("s_tui.sinks.sink.time.monotonic", return_value=0.0)
+        policy = FlushPolicy.parse("5s")
+        assert not policy.row_written()
+        clock.return_value = 6.0
+        assert policy.row_written()
+
+    @pytest.mark.parametrize("policy", ["0", "abc", "s", "-1"])
+    def test_invalid(self, policy):
+        with pytest.raises(ValueError):
+            FlushPolicy.parse(policy)
+
+
+def test_base_sink_write_not_implemented():
+    with pytest.raises(NotImplementedError):
+        Sink().write(Sample([]))
+
+
+class TestSampleStats:
+    def test_stats_attached_when_requested(self):
+        src = make_source("Util", ["Avg", "Core 0"], [25.0, 30.0])
+        src.update_stats()
+        src.last_measurement = [35.0, 40.0]
+        src.update_stats()
+        sample = take_sample([src], stats=("min", "max"))
+        assert sample.stat_columns() == [
+            "Util:Avg:min",
+            "Util:Avg:max",
+            "Util:Core 0:min",
+            "Util:Core 0:max",
+        ]
+        assert sample.stat_values() == [25.0, 35.0, 30.0, 40.0]
+        assert sample.as_dict()["Stats"]["Util"]["Avg"] == {"min": 25.0, "max": 35.0}
+
+    def test_no_stats_by_default(self):
+        sample = take_sample([make_source("Util", ["Avg"], [25.0])])
+        assert sample.stat_columns() == []
+        assert "Stats" not in sample.as_dict()
@@ -86,6 +86,22 @@ class TestSourceSummary:
         summary = src.get_sensors_summary()
         assert summary["S1"] == "33.3"
 
+    def test_summary_shows_selected_statistic(self):
+        src = Source()
+        src.name = "Util"
+        src.measurement_unit = "%"
+        src.available_sensors = ["Avg", "Core 0"]
+        src.sensor_available = [True, False]
+        for value in (10.0, 30.0, 20.0):
+            src.last_measurement = [value, value]
+            src.update_stats()
+        src.summary_stat = "max"
+        summary = src.get_sensors_summary()
+        assert summary["Avg"] == "30.0"
+        assert summary["Core 0"] == "N/A"
+        src.reset_stats()
+        assert src.get_sensors_summary()["Avg"] == "N/A"
+
 
 class TestSourceNotImplemented:
     def test_get_maximum_raises(self):
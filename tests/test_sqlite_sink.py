@@ -0,0 +1,111 @@
+"""Tests for SqliteSink: batched writes from a background thread."""
+
+import sqlite3
+import time
+
+import pytest
+
+from s_tui.sinks.sink import Sample, SourceReading
+from s_tui.sinks.sqlite_sink import SqliteSink, quote
+
+
+def _sample(t, values, sensors=("Avg", "Core 0"), throttle=""):
+    return Sample(
+        [SourceReading("Temp", "C", list(sensors), values, [""] * len(values))],
+        throttle=throttle,
+        timestamp=t,
+    )
+
+
+def _query(path, sql):
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute(sql).fetchall()
+    finally:
+        connection.close()
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "runs.db")
+
+
+class TestSqliteSink:
+    def test_rows_stored_on_close(self, path):
+        sink = SqliteSink(path, commit_interval=60)
+        sink.write(_sample(1000.0, [50.0, None], throttle="T"))
+        sink.write(_sample(1001.0, [51.0, 49.0]))
+        sink.close()
+        rows = _query(
+            path, 'SELECT ts, throttle, "Temp:Avg", "Temp:Core 0" FROM samples'
+        )
+        assert rows == [(1000.0, "T", 50.0, None), (1001.0, "", 51.0, 49.0)]
+
+    def test_run_recorded(self, path):
+        sink = SqliteSink(path)
+        sink.close()
+        ((run_id, host, started, ended),) = _query(path, "SELECT * FROM runs")
+        assert run_id == sink.run_id
+        assert host
+        assert ended >= started
+
+    def test_each_sink_is_a_run(self, path):
+        for _ in range(2):
+            sink = SqliteSink(path)
+            sink.write(_sample(1000.0, [50.0, 40.0]))
+            sink.close()
+        assert _query(path, "SELECT run_id, COUNT(*) FROM samples GROUP BY run_id") == [
+            (1, 1),
+            (2, 1),
+        ]
+
+    def test_wal_and_indexes(self, path):
+        SqliteSink(path).close()
+        assert _query(path, "PRAGMA journal_mode") == [("wal",)]
+        indexes = {row[0] for row in _query(path, "SELECT name FROM sqlite_master")}
+        assert {"runs_host_started", "samples_run_ts"} <= indexes
+
+    def test_new_sensor_adds_column(self, path):
+        sink = SqliteSink(path, commit_interval=60)
+        sink.write(_sample(1000.0, [50.0], sensors=("Avg",)))
+        sink.write(_sample(1001.0, [51.0, 49.0]))
+        sink.close()
+        rows = _query(path, 'SELECT "Temp:Core 0" FROM samples ORDER BY ts')
+        assert rows == [(None,), (49.0,)]
+
+    def test_failed_batch_does_not_lose_columns(self, path):
+        sink = SqliteSink(path, commit_interval=60)
+        # The batch adds a column, then fails and is rolled back
+        sink._commit([(1000.0, "", ["Temp:New"], [50.0, 51.0])])
+        sink._commit([(1001.0, "", ["Temp:New"], [52.0])])
+        sink.close()
+        assert _query(path, 'SELECT ts, "Temp:New" FROM samples') == [(1001.0, 52.0)]
+
+    def test_commits_in_batches(self, path):
+        sink = SqliteSink(path, commit_interval=0.05)
+        sink.write(_sample(1000.0, [50.0, 40.0]))
+        deadline = time.monotonic() + 5
+        while not _query(path, "SELECT COUNT(*) FROM samples")[0][0]:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        sink.close()
+
+    def test_write_does_not_touch_database(self, path, mocker):
+        sink = SqliteSink(path, commit_interval=60)
+        commit = mocker.spy(sink, "_commit")
+        sink.write(_sample(1000.0, [50.0, 40.0]))
+        commit.assert_not_called()
+        sink.close()
+        commit.assert_called_once()
+
+    def test_close_twice(self, path):
+        sink = SqliteSink(path)
+        sink.close()
+        sink.close()
+
+    def test_unusable_path(self, tmp_path):
+        with pytest.raises(OSError):
+            SqliteSink(str(tmp_path / "missing" / "runs.db"))
+
+    def test_quote(self):
+        assert quote('a"b') == '"a""b"'
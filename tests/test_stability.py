@@ -0,0 +1,125 @@
+"""Tests for steady state detection and stability tests."""
+
+import math
+
+import pytest
+
+from s_tui.sinks.sink import Sample, SourceReading
+from s_tui.stability import (
+    DONE,
+    SOAK,
+    WARMUP,
+    StabilityCriteria,
+    StabilityTest,
+    SteadyStateDetector,
+)
+
+
+def _sample(t, temp, power=50.0, throttle=""):
+    return Sample(
+        [
+            SourceReading("Temp", "C", ["Package"], [temp], [""]),
+            SourceReading("Power", "W", ["package-0,0"], [power], [""]),
+        ],
+        throttle=throttle,
+        timestamp=1700000000.0 + t,
+        monotonic=t,
+    )
+
+
+def _warming(t):
+    """Approaches 80 C with a time constant of 20 s"""
+    return 80.0 - 40.0 * math.exp(-t / 20.0)
+
+
+class TestSteadyStateDetector:
+    def test_rising_is_not_steady(self):
+        detector = SteadyStateDetector(window=10, max_slope=0.5, max_stddev=1.0)
+        for t in range(20):
+            detector.add(float(t), 40.0 + t)
+        assert detector.slope() == pytest.approx(60.0)
+        assert not detector.is_steady()
+
+    def test_plateau_is_steady(self):
+        detector = SteadyStateDetector(window=10, max_slope=0.5, max_stddev=1.0)
+        for t in range(30):
+            detector.add(float(t), 70.0 + (t % 2) * 0.5)
+        assert detector.is_steady()
+        assert detector.stddev() == pytest.approx(0.26, abs=0.01)
+
+    def test_needs_a_full_window(self):
+        detector = SteadyStateDetector(window=10)
+        for t in range(5):
+            detector.add(float(t), 70.0)
+        assert not detector.is_steady()
+
+    def test_window_slides(self):
+        detector = SteadyStateDetector(window=10)
+        for t in range(100):
+            detector.add(float(t), 40.0 + t if t < 50 else 90.0)
+        assert len(detector.points) == 11
+        assert detector.is_steady()
+
+
+class TestStabilityTest:
+    def _run(self, test, seconds, temp=_warming, **kwargs):
+        t = 0.0
+        while test.phase != DONE and t <= seconds:
+            test.write(_sample(t, temp(t), **kwargs))
+            t += 1.0
+        return t
+
+    def test_pass(self):
+        done = []
+        test = StabilityTest(
+            "s-tui stress",
+            StabilityCriteria(max_temp=85.0, max_throttle=0.0, min_power=40.0),
+            SteadyStateDetector(window=30, max_slope=0.5, max_stddev=1.0),
+            soak=60.0,
+            on_done=lambda: done.append(True),
+        )
+        self._run(test, 1000)
+        assert done == [True]
+        assert test.steady_after is not None
+        assert test.verdict() == (True, [])
+        result = test.result()
+        assert result["stability"]["passed"] is True
+        assert result["duration"] == pytest.approx(test.steady_after + 60.0)
+
+    def test_soak_phase(self):
+        test = StabilityTest(
+            "s-tui stress",
+            StabilityCriteria(),
+            SteadyStateDetector(window=5),
+            soak=100.0,
+        )
+        self._run(test, 50, temp=lambda t: 60.0)
+        assert test.phase == SOAK
+
+    def test_limits_fail(self):
+        test = StabilityTest(
+            "s-tui stress",
+            StabilityCriteria(max_temp=70.0, max_throttle=5.0, max_power=40.0),
+            SteadyStateDetector(window=30),
+            soak=60.0,
+        )
+        self._run(test, 1000, throttle="T")
+        passed, reasons = test.verdict()
+        assert not passed
+        assert reasons[0].startswith("peak temperature 80.0 C")
+        assert reasons[1].startswith("throttled for")
+        assert reasons[2] == "soak power 50.0 W too high"
+
+    def test_timeout_without_steady_state(self):
+        test = StabilityTest(
+            "s-tui stress", StabilityCriteria(), timeout=30.0, on_done=lambda: None
+        )
+        self._run(test, 100, temp=lambda t: 40.0 + t)
+        assert test.phase == DONE
+        assert test.verdict() == (False, ["no thermal steady state within 30 s"])
+
+    def test_interrupted(self):
+        test = StabilityTest("s-tui stress", StabilityCriteria())
+        self._run(test, 5)
+        assert test.phase == WARMUP
+        assert test.verdict()[1] == ["the test was interrupted"]
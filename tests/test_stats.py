@@ -0,0 +1,112 @@
+"""Tests for the incremental sensor statistics."""
+
+import random
+import statistics
+
+import pytest
+
+from s_tui.sources.stats import (
+    P2Quantile,
+    RunningStats,
+    SensorStats,
+    SourceStats,
+    WindowedQuantile,
+    parse_stats,
+)
+
+
+class TestRunningStats:
+    def test_matches_statistics_module(self):
+        values = [random.Random(1).gauss(60, 5) for _ in range(1000)]
+        stats = RunningStats()
+        for value in values:
+            stats.add(value)
+        assert stats.count == 1000
+        assert stats.mean == pytest.approx(statistics.mean(values))
+        assert stats.stddev == pytest.approx(statistics.stdev(values))
+        assert stats.minimum == min(values)
+        assert stats.maximum == max(values)
+
+    def test_single_value_has_no_deviation(self):
+        stats = RunningStats()
+        stats.add(42.0)
+        assert stats.stddev == 0.0
+
+    def test_reset(self):
+        stats = RunningStats()
+        stats.add(1.0)
+        stats.reset()
+        assert stats.count == 0
+        assert stats.mean == 0.0
+
+
+class TestP2Quantile:
+    def test_estimates_p95(self):
+        rng = random.Random(2)
+        values = [rng.uniform(0, 100) for _ in range(5000)]
+        quantile = P2Quantile(0.95)
+        for value in values:
+            quantile.add(value)
+        exact = sorted(values)[int(0.95 * len(values))]
+        assert quantile.value() == pytest.approx(exact, abs=1.0)
+
+    def test_few_values_use_nearest_rank(self):
+        quantile = P2Quantile(0.95)
+        assert quantile.value() is None
+        for value in (3.0, 1.0, 2.0):
+            quantile.add(value)
+        assert quantile.value() == 3.0
+
+    def test_constant_stream(self):
+        quantile = P2Quantile(0.95)
+        for _ in range(100):
+            quantile.add(7.0)
+        assert quantile.value() == 7.0
+
+
+class TestWindowedQuantile:
+    def test_reports_last_completed_window(self):
+        quantile = WindowedQuantile(0.95, window=10)
+        for _ in range(10):
+            quantile.add(100.0)
+        for _ in range(5):
+            quantile.add(1.0)
+        assert quantile.value() == 100.0
+
+    def test_partial_window_before_first_completes(self):
+        quantile = WindowedQuantile(0.95, window=10)
+        quantile.add(5.0)
+        assert quantile.value() == 5.0
+
+
+class TestSourceStats:
+    def test_skips_unavailable_sensors(self):
+        stats = SourceStats()
+        stats.update([10.0, 20.0], [True, False])
+        stats.update([30.0, 40.0], [True, True])
+        assert stats.get(0, "mean") == 20.0
+        assert stats.get(1, "min") == 40.0
+        assert stats.get(2, "max") is None
+
+    def test_maximum_and_reset(self):
+        stats = SourceStats()
+        assert stats.maximum() is None
+        stats.update([10.0, 20.0], [True, True])
+        assert stats.maximum() == 20.0
+        stats.reset()
+        assert stats.get(0, "mean") is None
+
+    def test_unknown_statistic(self):
+        sensor = SensorStats()
+        sensor.add(1.0)
+        with pytest.raises(ValueError):
+            sensor.get("median")
+
+
+class TestParseStats:
+    def test_list(self):
+        assert parse_stats("max, p95") == ("max", "p95")
+
+    def test_unknown(self):
+        with pytest.raises(ValueError):
+            parse_stats("max,median")
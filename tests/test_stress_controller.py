@@ -2,7 +2,7 @@
 
 from unittest.mock import MagicMock
 
-from s_tui.s_tui import StressController
+from s_tui.stress_controller import StressController
 
 
 class TestStressControllerInit:
@@ -66,7 +66,7 @@ class TestStressControllerProcess:
 
     def test_kill_stress_process(self, mocker):
         """kill_stress_process calls kill_child_processes and resets to None."""
-        mocker.patch("s_tui.s_tui.kill_child_processes")
+        mocker.patch("s_tui.stress_controller.kill_child_processes")
         sc = StressController(True)
         mock_proc = MagicMock()
         sc.set_stress_process(mock_proc)
@@ -78,7 +78,7 @@ class TestStressControllerProcess:
         import psutil
 
         mocker.patch(
-            "s_tui.s_tui.kill_child_processes",
+            "s_tui.stress_controller.kill_child_processes",
             side_effect=psutil.NoSuchProcess(pid=12345),
         )
         sc = StressController(True)
@@ -88,7 +88,7 @@ class TestStressControllerProcess:
 
     def test_kill_stress_process_stops_builtin(self, mocker):
         """kill_stress_process also stops the builtin stresser if initialized."""
-        mocker.patch("s_tui.s_tui.kill_child_processes")
+        mocker.patch("s_tui.stress_controller.kill_child_processes")
         sc = StressController(True)
         sc._builtin_stresser = MagicMock()
         sc.kill_stress_process()
@@ -96,7 +96,7 @@ class TestStressControllerProcess:
 
     def test_kill_stress_process_skips_builtin_if_not_initialized(self, mocker):
         """kill_stress_process does not create builtin stresser just to stop it."""
-        mocker.patch("s_tui.s_tui.kill_child_processes")
+        mocker.patch("s_tui.stress_controller.kill_child_processes")
         sc = StressController(True)
         sc.kill_stress_process()
         assert sc._builtin_stresser is None
@@ -145,6 +145,39 @@ class TestStressControllerProcess:
         sc.start_builtin_stress(2, strategy="hashlib")
         sc._builtin_stresser.start.assert_called_once_with(2, strategy="hashlib")
 
+    def test_set_builtin_duty(self):
+        """set_builtin_duty delegates to builtin_stresser.set_duty."""
+        sc = StressController(False)
+        sc._builtin_stresser = MagicMock()
+        sc.set_builtin_duty(0.4)
+        sc._builtin_stresser.set_duty.assert_called_once_with(0.4)
+
+    def test_get_builtin_ops(self):
+        """No counters before the built-in stresser exists."""
+        sc = StressController(False)
+        assert sc.get_builtin_ops() == []
+        sc._builtin_stresser = MagicMock()
+        sc._builtin_stresser.get_ops.return_value = [3, 4]
+        assert sc.get_builtin_ops() == [3, 4]
+
+    def test_get_builtin_rotation(self):
+        """Only a rotating built-in stress reports its workload."""
+        sc = StressController(False)
+        assert sc.get_builtin_rotation() is None
+        sc._builtin_stresser = MagicMock()
+        sc._builtin_stresser.strategy = "hashlib"
+        assert sc.get_builtin_rotation() is None
+        sc._builtin_stresser.strategy = "rotate"
+        sc._builtin_stresser.current_workload.return_value = "int"
+        assert sc.get_builtin_rotation() == "int"
+
+    def test_get_builtin_traffic(self):
+        sc = StressController(False)
+        assert sc.get_builtin_traffic() == []
+        sc._builtin_stresser = MagicMock()
+        sc._builtin_stresser.get_traffic.return_value = [10]
+        assert sc.get_builtin_traffic() == [10]
+
     def test_start_builtin_stress_oserror_falls_back_to_monitor(self):
         """start_builtin_stress falls back to Monitor on OSError (e.g. no /dev/shm)."""
         sc = StressController(False)
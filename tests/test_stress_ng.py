@@ -0,0 +1,295 @@
+"""Tests for stress-ng: metrics parsing, the pipe reader and integration."""
+
+import os
+import stat
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from s_tui.report import StressReport, render_markdown
+from s_tui.sources.stress_source import StressNgSource
+from s_tui.stress_controller import StressController
+from s_tui.stress_menu import StressMenu
+from s_tui.stress_ng import (
+    StressNgOutput,
+    StressorMetrics,
+    is_stress_ng,
+    parse_metrics_line,
+    parse_yaml_metrics,
+)
+
+YAML = """\
+---
+system-info:
+      stress-ng-version: 0.17.06
+metrics:
+    - stressor: cpu
+      bogo-ops: 40123
+      bogo-ops-per-second-usr-sys-time: 1003.32
+      bogo-ops-per-second-real-time: 4012.10
+      wall-clock-time: 10.00
+    - stressor: vm
+      bogo-ops: 812
+      bogo-ops-per-second-real-time: 81.20
+      wall-clock-time: 10.00
+times:
+      run-time: 10.00
+...
+"""
+
+# Stands in for stress-ng: reports its metrics when interrupted
+FAKE_STRESS_NG = """\
+#!/bin/sh
+yaml=""
+while [ $# -gt 0 ]; do
+    [ "$1" = --yaml ] && yaml=$2
+    shift
+done
+report() {
+    echo "stress-ng: metrc: [1] cpu 4000 10.00 9.90 0.01 400.00 404.00"
+    printf 'metrics:\\n    - stressor: cpu\\n      bogo-ops: 4001\\n' > "$yaml"
+    printf '      bogo-ops-per-second-real-time: 400.10\\n' >> "$yaml"
+    exit 0
+}
+trap report INT
+echo "stress-ng: info:  [1] dispatching hogs: 1 cpu"
+touch "$0.ready"
+while :; do sleep 0.05; done
+"""
+
+# A stress-ng that ignores the interrupt
+STUCK_STRESS_NG = """\
+#!/bin/sh
+trap "" INT
+touch "$0.ready"
+while :; do sleep 0.05; done
+"""
+
+
+def _wait_for(path):
+    deadline = time.monotonic() + 5
+    while not os.path.exists(path):
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+class TestParsing:
+    def test_is_stress_ng(self):
+        assert is_stress_ng("/usr/bin/stress-ng")
+        assert not is_stress_ng("/usr/bin/stress")
+        assert not is_stress_ng(None)
+
+    @pytest.mark.parametrize("tag", ["metrc", "info"])
+    def test_metrics_line(self, tag):
+        line = (
+            "stress-ng: " + tag + ": [1234] cpu            40123     10.00"
+            "     39.98      0.01      4012.10        1003.32"
+        )
+        assert parse_metrics_line(line) == StressorMetrics("cpu", 40123, 10.0, 4012.1)
+
+    def test_other_lines(self):
+        assert parse_metrics_line("stress-ng: info:  [1] dispatching hogs") is None
+        assert (
+            parse_metrics_line(
+                "stress-ng: metrc: [1] stressor bogo ops real time  usr time"
+            )
+            is None
+        )
+
+    def test_yaml(self):
+        assert parse_yaml_metrics(YAML) == [
+            StressorMetrics("cpu", 40123, 10.0, 4012.1),
+            StressorMetrics("vm", 812, 10.0, 81.2),
+        ]
+
+    def test_yaml_without_metrics(self):
+        assert parse_yaml_metrics("times:\n      run-time: 1.00\n") == []
+
+
+class TestStressNgOutput:
+    def test_poll_does_not_block(self):
+        read_fd, write_fd = os.pipe()
+        output = StressNgOutput(os.fdopen(read_fd, "rb"))
+        output.poll()
+        assert output.metrics == {}
+        os.close(write_fd)
+        output.close()
+
+    def test_partial_lines(self):
+        read_fd, write_fd = os.pipe()
+        output = StressNgOutput(os.fdopen(read_fd, "rb"))
+        os.write(write_fd, b"stress-ng: metrc: [1] cpu 40 1.00 ")
+        output.poll()
+        assert output.metrics == {}
+        os.write(write_fd, b"0.99 0.00 40.00 40.40\n")
+        output.poll()
+        assert output.metrics["cpu"].bogo_ops == 40
+        os.close(write_fd)
+        output.close()
+
+    def test_end_reads_yaml(self, tmp_path):
+        yaml_path = tmp_path / "metrics.yaml"
+        yaml_path.write_text(YAML)
+        read_fd, write_fd = os.pipe()
+        output = StressNgOutput(os.fdopen(read_fd, "rb"), str(yaml_path))
+        os.write(write_fd, b"stress-ng: metrc: [1] cpu 40000 10.00 9 0 4000.00 1")
+        os.close(write_fd)
+        output.poll()
+        # The YAML file has the more precise values
+        assert output.metrics["cpu"].bogo_ops == 40123
+        assert output.metrics["vm"].rate == 81.2
+        assert output.stream is None
+        assert not yaml_path.exists()
+
+
+class TestStressController:
+    @staticmethod
+    def _script(tmp_path, text):
+        exe = tmp_path / "stress-ng"
+        exe.write_text(text)
+        exe.chmod(exe.stat().st_mode | stat.S_IXUSR)
+        return str(exe)
+
+    @pytest.fixture
+    def stress_ng(self, tmp_path):
+        return self._script(tmp_path, FAKE_STRESS_NG)
+
+    def test_start_adds_metrics_options(self, mocker):
+        popen = mocker.patch("subprocess.Popen")
+        mocker.patch("psutil.Process")
+        mocker.patch("os.set_blocking")
+        sc = StressController(stress_installed=True)
+        sc.start_stress(["/usr/bin/stress-ng", "--cpu", "2"])
+        cmd = popen.call_args[0][0]
+        assert cmd[:5] == [
+            "/usr/bin/stress-ng",
+            "--cpu",
+            "2",
+            "--metrics-brief",
+            "--yaml",
+        ]
+        assert popen.call_args[1]["start_new_session"]
+        assert sc.runs_stress_ng()
+        os.unlink(cmd[5])
+
+    def test_stop_collects_metrics(self, stress_ng):
+        sc = StressController(stress_installed=True)
+        sc.start_stress([stress_ng, "--cpu", "1"])
+        # The script handles the interrupt once it is ready
+        _wait_for(stress_ng + ".ready")
+        assert sc.get_stress_ng_metrics() == {}
+        sc.kill_stress_process()
+        assert sc.stress_process is None
+        sc.wait_stress_ng()
+        assert not sc.poll_stress_ng()
+        metrics = {"cpu": StressorMetrics("cpu", 4001, 0.0, 400.1)}
+        assert sc.get_last_stress_ng_metrics() == metrics
+        assert sc.get_stress_ng_metrics() == metrics
+
+    def test_stop_does_not_wait(self, tmp_path, mocker):
+        mocker.patch("s_tui.stress_controller.STRESS_NG_STOP_TIMEOUT", 1.5)
+        stress_ng = self._script(tmp_path, STUCK_STRESS_NG)
+        sc = StressController(stress_installed=True)
+        sc.start_stress([stress_ng, "--cpu", "1"])
+        _wait_for(stress_ng + ".ready")
+        start = time.monotonic()
+        sc.kill_stress_process()
+        assert time.monotonic() - start < 1.0
+        assert sc.poll_stress_ng()
+        # Killed once the stop timeout passed
+        sc.wait_stress_ng()
+        assert sc.get_last_stress_ng_metrics() == {}
+
+    def test_classic_stress_has_no_metrics(self, mocker):
+        mocker.patch("subprocess.Popen")
+        mocker.patch("psutil.Process")
+        sc = StressController(stress_installed=True)
+        sc.start_stress(["stress", "-c", "2"])
+        assert not sc.runs_stress_ng()
+        assert sc.get_stress_ng_metrics() == {}
+
+
+class TestStressMenu:
+    @pytest.fixture
+    def menu(self, mocker):
+        mocker.patch("psutil.cpu_count", return_value=4)
+        return StressMenu(MagicMock(), "/usr/bin/stress-ng")
+
+    def test_default_cmd(self, menu):
+        assert menu.get_stress_cmd() == [
+            "/usr/bin/stress-ng",
+            "--cpu",
+            "4",
+            "--cpu-method",
+            "all",
+        ]
+
+    def test_stressors(self, menu):
+        menu.cpu_method_ctrl.set_edit_text("fft")
+        menu.matrix_workers_ctrl.set_edit_text("2")
+        menu.cache_workers_ctrl.set_edit_text("1")
+        menu.memory_workers_ctrl.set_edit_text("1")
+        menu.no_malloc_ctrl.set_state(True)
+        menu.time_out_ctrl.set_edit_text("60")
+        menu.on_save(None)
+        assert menu.get_stress_cmd() == [
+            "/usr/bin/stress-ng",
+            "--cpu",
+            "4",
+            "--cpu-method",
+            "fft",
+            "--matrix",
+            "2",
+            "--cache",
+            "1",
+            "--vm",
+            "1",
+            "--vm-bytes",
+            "256M",
+            "--vm-keep",
+            "-t",
+            "60",
+        ]
+
+    def test_invalid_method(self, menu):
+        menu.cpu_method_ctrl.set_edit_text("fft; rm")
+        menu.on_save(None)
+        assert menu.cpu_method == "all"
+
+
+class TestStressNgSource:
+    def test_not_available_for_stress(self):
+        assert not StressNgSource(MagicMock(), "/usr/bin/stress").get_is_available()
+
+    def test_rates(self):
+        controller = MagicMock()
+        controller.get_stress_ng_metrics.return_value = {}
+        source = StressNgSource(controller, "/usr/bin/stress-ng")
+        source.update()
+        assert source.get_sensors_summary()["cpu"] == "N/A"
+        controller.get_stress_ng_metrics.return_value = {
+            "cpu": StressorMetrics("cpu", 40123, 10.0, 4012.1)
+        }
+        source.update()
+        assert source.get_sensors_summary()["cpu"] == "4012"
+        assert source.get_sensors_summary()["vm"] == "N/A"
+        assert source.get_maximum() == 4012.1
+
+    def test_titled_as_last_run(self):
+        source = StressNgSource(MagicMock(), "/usr/bin/stress-ng")
+        assert source.get_summary()["stress-ng"] == "[bogo ops/s] last run"
+
+
+class TestReport:
+    def test_bogo_ops(self):
+        report = StressReport("Stress (ext)", start=0.0, monotonic=0.0)
+        report.set_bogo_ops([StressorMetrics("cpu", 40123, 10.0, 4012.1)])
+        result = report.finish(10.0)
+        assert result["bogo_ops"] == [{"stressor": "cpu", "ops": 40123, "rate": 4012.1}]
+        assert "| cpu | 40123 | 4012.1 |" in render_markdown(result)
+
+    def test_no_bogo_ops(self):
+        report = StressReport("Stress (ext)", start=0.0, monotonic=0.0)
+        report.set_bogo_ops([])
+        assert report.finish(10.0)["bogo_ops"] is None
@@ -0,0 +1,109 @@
+"""Tests for StressSource, the throughput of the built-in stress workers."""
+
+import pytest
+
+from s_tui.sources.stress_source import BandwidthSource, StressSource
+
+
+@pytest.fixture
+def clock(mocker):
+    now = [100.0]
+    mocker.patch("s_tui.sources.stress_source.time.monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def controller(mocker):
+    controller = mocker.Mock()
+    controller.get_builtin_ops.return_value = []
+    controller.get_builtin_traffic.return_value = []
+    return controller
+
+
+class TestStressSourceInit:
+    def test_name_and_unit(self, controller):
+        src = StressSource(controller, num_workers=2)
+        assert src.get_source_name() == "Stress"
+        assert src.get_measurement_unit() == "ops/s"
+
+    def test_sensors(self, controller):
+        src = StressSource(controller, num_workers=2)
+        assert src.get_sensor_list() == ["Total", "Worker 0", "Worker 1"]
+        assert src.get_reading_list() == [0.0, 0.0, 0.0]
+
+    def test_defaults_to_a_worker_per_cpu(self, controller, mocker):
+        mocker.patch.object(StressSource, "_get_total_core_count", return_value=3)
+        assert len(StressSource(controller).get_sensor_list()) == 4
+
+    def test_only_total_graphed_by_default(self, controller):
+        src = StressSource(controller, num_workers=2)
+        assert src.default_graphs_conf() == {
+            "Stress": {"worker 0": False, "worker 1": False}
+        }
+
+
+class TestStressSourceUpdate:
+    def test_rates(self, controller, clock):
+        src = StressSource(controller, num_workers=2)
+        controller.get_builtin_ops.return_value = [100, 50]
+        clock[0] += 2.0
+        src.update()
+        assert src.get_reading_list() == [75.0, 50.0, 25.0]
+        controller.get_builtin_ops.return_value = [300, 50]
+        clock[0] += 1.0
+        src.update()
+        assert src.get_reading_list() == [200.0, 200.0, 0.0]
+        assert src.get_maximum() == 200.0
+
+    def test_no_pool(self, controller, clock):
+        src = StressSource(controller, num_workers=1)
+        clock[0] += 1.0
+        src.update()
+        assert src.get_reading_list() == [0.0, 0.0]
+
+    def test_new_pool_does_not_go_negative(self, controller, clock):
+        src = StressSource(controller, num_workers=1)
+        controller.get_builtin_ops.return_value = [500]
+        clock[0] += 1.0
+        src.update()
+        controller.get_builtin_ops.return_value = [20]
+        clock[0] += 1.0
+        src.update()
+        assert src.get_reading_list() == [0.0, 0.0]
+
+    def test_extra_workers_count_in_total(self, controller, clock):
+        src = StressSource(controller, num_workers=1)
+        controller.get_builtin_ops.return_value = [10, 30]
+        clock[0] += 1.0
+        src.update()
+        assert src.get_reading_list() == [40.0, 10.0]
+
+    def test_reset(self, controller, clock):
+        src = StressSource(controller, num_workers=1)
+        controller.get_builtin_ops.return_value = [10]
+        clock[0] += 1.0
+        src.update()
+        src.reset()
+        assert src.get_maximum() == 0.0
+        assert src.get_edge_triggered() is False
+
+
+class TestBandwidthSource:
+    def test_name_and_unit(self, controller):
+        src = BandwidthSource(controller, num_workers=1)
+        assert src.get_source_name() == "Bandwidth"
+        assert src.get_measurement_unit() == "GB/s"
+
+    def test_rates_in_gigabytes(self, controller, clock):
+        src = BandwidthSource(controller, num_workers=2)
+        controller.get_builtin_traffic.return_value = [4_000_000_000, 0]
+        clock[0] += 2.0
+        src.update()
+        assert src.get_reading_list() == [2.0, 2.0, 0.0]
+        assert src.get_sensors_summary()["Total"] == "2.0"
+
+    def test_hidden_by_default(self, controller):
+        src = BandwidthSource(controller, num_workers=1)
+        assert src.default_graphs_conf() == {
+            "Bandwidth": {"total": False, "worker 0": False}
+        }
@@ -127,6 +127,11 @@ class TestTempSourceEdgeTriggered:
         src.reset()
         assert src.max_temp == 10
 
+    def test_maximum_follows_updates(self, basic_temp_mock):
+        src = TempSource()
+        src.update()
+        assert src.get_maximum() == pytest.approx(60.0)
+
 
 class TestTempSourceAlerts:
     def test_no_alerts_below_threshold(self, basic_temp_mock):
@@ -0,0 +1,103 @@
+"""Tests for the throttle episode journal."""
+
+import csv
+
+from s_tui.sinks.sink import Sample, SourceReading
+from s_tui.sinks.throttle_journal import (
+    JOURNAL_HEADER,
+    ThrottleJournal,
+    ThrottleJournalSink,
+)
+
+
+def _sample(t, labels, temp=70.0, power=30.0):
+    sensors = ["Avg"] + ["Core " + str(i) for i in range(len(labels))]
+    first = next((label for label in labels if label), "")
+    return Sample(
+        [
+            SourceReading("Temp", "C", ["Package"], [temp], [""]),
+            SourceReading(
+                "Frequency", "MHz", sensors, [2000.0] * len(sensors), [first, *labels]
+            ),
+            SourceReading("Power", "W", ["package-0,0"], [power], [""]),
+        ],
+        throttle=first,
+        timestamp=1700000000.0 + t,
+        monotonic=t,
+    )
+
+
+class TestThrottleJournal:
+    def test_consecutive_ticks_coalesce(self):
+        journal = ThrottleJournal()
+        for t in range(1, 6):
+            journal.add(_sample(float(t), ["T", ""], temp=90.0 + t))
+        assert journal.count == 1
+        assert list(journal.open) == [("Core 0", "T")]
+        episode = journal.open[("Core 0", "T")]
+        assert episode.start == 1.0
+        assert episode.temp == 91.0
+        assert episode.power == 30.0
+
+    def test_episode_per_core_and_reason(self):
+        journal = ThrottleJournal()
+        journal.add(_sample(1.0, ["T/W", "W"]))
+        closed = journal.add(_sample(2.0, ["T", ""]))
+        assert [(e.core, e.reason, e.end) for e in closed] == [
+            ("Core 0", "W", 2.0),
+            ("Core 1", "W", 2.0),
+        ]
+        assert list(journal.open) == [("Core 0", "T")]
+        assert journal.count == 3
+
+    def test_close_ends_open_episodes(self):
+        journal = ThrottleJournal()
+        journal.add(_sample(1.0, ["Tc"]))
+        journal.add(_sample(3.0, ["Tc"]))
+        closed = journal.close()
+        assert closed[0].duration(10.0) == 2.0
+        assert journal.open == {}
+        assert len(journal.episodes()) == 1
+
+    def test_average_label_without_cores(self):
+        """Replays only know the label of the whole CPU"""
+        sample = Sample(
+            [
+                SourceReading(
+                    "Frequency", "MHz", ["Avg", "Core 0"], [1.0, 1.0], ["Tp", ""]
+                )
+            ],
+            monotonic=1.0,
+        )
+        journal = ThrottleJournal()
+        journal.add(sample)
+        assert list(journal.open) == [("Avg", "Tp")]
+
+    def test_memory_is_bounded(self):
+        journal = ThrottleJournal(max_episodes=10)
+        for t in range(100):
+            journal.add(_sample(float(t), ["T" if t % 2 else ""]))
+        assert len(journal.closed) == 10
+        assert journal.count == 50
+
+
+class TestThrottleJournalSink:
+    def test_writes_finished_episodes(self, tmp_path):
+        path = tmp_path / "throttle.csv"
+        sink = ThrottleJournalSink(str(path))
+        sink.write(_sample(1.0, ["W"]))
+        sink.write(_sample(2.5, [""]))
+        sink.write(_sample(3.0, ["T"]))
+        sink.close()
+        rows = list(csv.reader(path.open()))
+        assert rows[0] == JOURNAL_HEADER
+        assert [row[1:4] for row in rows[1:]] == [
+            ["Core 0", "W", "1.5"],
+            ["Core 0", "T", "0.0"],
+        ]
+
+    def test_header_written_once(self, tmp_path):
+        path = tmp_path / "throttle.csv"
+        ThrottleJournalSink(str(path)).close()
+        ThrottleJournalSink(str(path)).close()
+        assert path.read_text().count("Start monotonic") == 1
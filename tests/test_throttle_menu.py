@@ -0,0 +1,48 @@
+"""Tests for the throttle log menu."""
+
+from s_tui.sinks.sink import Sample, SourceReading
+from s_tui.sinks.throttle_journal import ThrottleJournal
+from s_tui.throttle_menu import HEADER, ThrottleMenu
+
+
+def _journal():
+    journal = ThrottleJournal()
+    for t, label in enumerate(["", "W", "W", ""]):
+        journal.add(
+            Sample(
+                [
+                    SourceReading(
+                        "Frequency", "MHz", ["Avg", "Core 0"], [1.0, 1.0], [label] * 2
+                    )
+                ],
+                monotonic=float(t),
+            )
+        )
+    return journal
+
+
+class TestThrottleMenu:
+    def test_lists_episodes(self):
+        menu = ThrottleMenu(lambda: None, _journal())
+        menu.refresh()
+        rows = [w.text for w in menu.walker[len(menu.titles) :]]
+        assert len(rows) == 1
+        assert "Core 0" in rows[0]
+        assert "2.0s" in rows[0]
+        assert menu.summary.text.startswith("1 episodes, 0 ongoing")
+
+    def test_empty(self):
+        menu = ThrottleMenu(lambda: None, ThrottleJournal())
+        menu.refresh()
+        assert menu.walker[-1].text == "No throttling so far"
+
+    def test_rows_align_with_header(self):
+        menu = ThrottleMenu(lambda: None, _journal())
+        menu.refresh()
+        assert len(menu.walker[-1].text) == len(HEADER)
+
+    def test_exit_returns(self):
+        called = []
+        menu = ThrottleMenu(lambda: called.append(True), ThrottleJournal())
+        menu.on_cancel(None)
+        assert called == [True]
@@ -126,6 +126,14 @@ class TestLabeledBarGraphVector:
         v.set_title("New Title")
         # Should not crash
 
+    def test_set_highlighted_marks_sub_titles(self):
+        """Highlighted sub graphs show a bracketed title."""
+        v = self._make(2)
+        v.set_highlighted([1])
+        text = b"".join(v.render((40, 5)).text)
+        assert b"[sub1]" in text
+        assert b"[sub0]" not in text
+
     def test_check_label_empty(self):
         """Empty y_label is valid."""
         v = self._make(1)
@@ -149,6 +157,7 @@ class TestBarGraphVector:
         src = MagicMock()
         src.get_source_name.return_value = "CPU Util"
         src.get_measurement_unit.return_value = "%"
+        src.get_title_note.return_value = ""
         src.get_sensor_list.return_value = ["Avg", "Core 0"]
         src.get_is_available.return_value = True
         src.get_reading_list.return_value = [25.0, 30.0]